@@ -1,23 +1,37 @@
+import os
 from datetime import datetime, timezone
 from typing import Annotated
 
 from fastapi import FastAPI, HTTPException, File, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
-from api.routers import chat_router, devices_router, rentals_router, reservations_router, settings_router
-from api.src.s3_service import S3Service
+from api.routers import devices_router, rentals_router, reservations_router, settings_router
+from api.src.metrics import RequestMetricsMiddleware, metrics_registry
+from api.src.s3_service import PRESIGNED_URL_EXPIRY_SECONDS, S3Service
+from api.src.tracing import TracedRoute, TracingMiddleware
+from common.data_models import RentalFormURL
+from common.tracing import configure_tracing
 
+configure_tracing(service_name="cne-api")
 app = FastAPI()
+app.router.route_class = TracedRoute
+app.add_middleware(RequestMetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 # add the routers
 app.include_router(devices_router)
 app.include_router(reservations_router)
 app.include_router(rentals_router)
 app.include_router(settings_router)
-app.include_router(chat_router)
+# the chatbot is optional - replicas that don't serve it (CHAT_ENABLED=false) never import its router, nor pydantic-ai
+if os.getenv("CHAT_ENABLED", default="True").lower() == "true":
+    from api.routers.chat import router as chat_router  # pylint: disable=import-outside-toplevel
+
+    app.include_router(chat_router)
 s3_service = S3Service()
 
 
 # ==============================
-# HEALTH CHECK
+# HEALTH CHECK & METRICS
 # ==============================
 
 @app.get("/health")
@@ -26,13 +40,44 @@ def health_check():
     return {"status": "ok", "time": datetime.now(timezone.utc).isoformat()}
 
 
+@app.get("/metrics", include_in_schema=False)
+def get_metrics() -> Response:
+    """The API's metrics, in Prometheus' text format"""
+    return Response(content=generate_latest(metrics_registry), media_type=CONTENT_TYPE_LATEST)
+
+
 # ==============================
 # RENTAL FORMS
 # ==============================
 
-@app.get("/forms/download_rental_form", responses={404: {"description": "Rental form not found"}})
+@app.get("/forms/rental_form_upload_url")
+def get_rental_form_upload_url(rental_id: str) -> RentalFormURL:
+    """Get a short-lived presigned URL to upload a rental form directly to S3"""
+    return RentalFormURL(
+        url=s3_service.get_rental_form_upload_url(rental_id=rental_id),
+        expires_in=PRESIGNED_URL_EXPIRY_SECONDS,
+    )
+
+
+@app.get("/forms/rental_form_download_url", responses={404: {"description": "Rental form not found"}})
+def get_rental_form_download_url(rental_id: str) -> RentalFormURL:
+    """Get a short-lived presigned URL to download a rental form directly from S3"""
+    try:
+        return RentalFormURL(
+            url=s3_service.get_rental_form_download_url(rental_id=rental_id),
+            expires_in=PRESIGNED_URL_EXPIRY_SECONDS,
+        )
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@app.get(
+    "/forms/download_rental_form",
+    responses={404: {"description": "Rental form not found"}},
+    deprecated=True,
+)
 def download_rental_form(rental_id: str) -> Response:
-    """Download a rental form from S3"""
+    """Download a rental form from S3 (proxied through the API - use /forms/rental_form_download_url instead)"""
     try:
         content = s3_service.download_rental_form(rental_id=rental_id)
         return Response(
@@ -44,7 +89,7 @@ def download_rental_form(rental_id: str) -> Response:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
-@app.put("/forms/upload_rental_form")
+@app.put("/forms/upload_rental_form", deprecated=True)
 def upload_rental_form(pdf_bytes: Annotated[bytes, File()], rental_id: str):
-    """Upload a rental form to S3"""
+    """Upload a rental form to S3 (proxied through the API - use /forms/rental_form_upload_url instead)"""
     s3_service.upload_rental_form(pdf_bytes=pdf_bytes, rental_id=rental_id)
@@ -1,4 +1,3 @@
-from api.routers.chat import router as chat_router
 from api.routers.devices import router as devices_router
 from api.routers.rentals import router as rentals_router
 from api.routers.reservations import router as reservations_router
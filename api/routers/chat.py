@@ -1,15 +1,76 @@
-from fastapi import APIRouter
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, AsyncIterator
 
-from api.src.chat_service import ChatService
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from api.src.exceptions import ChatBusyException
+from api.src.tracing import TracedRoute
 from api.src.utils import auto_process_database_errors
-from common.data_models import ChatRequest, ChatResponse
+from common.data_models import ChatRequest, ChatResponse, ChatStreamEvent, ChatStreamEventType
+from common.logger import initialize_logger
+
+if TYPE_CHECKING:
+    from api.src.chat_service import ChatService
+
+logger = initialize_logger()
+
+router = APIRouter(prefix="/chat", tags=["chat"], route_class=TracedRoute)
+_chat_service_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _build_chat_service() -> "ChatService":
+    from api.src.chat_service import ChatService  # pylint: disable=import-outside-toplevel
+    return ChatService()
+
 
-chat_service = ChatService()
-router = APIRouter(prefix="/chat", tags=["chat"])
+def get_chat_service() -> "ChatService":
+    """Get the chat service, built by the first chat - so starting the API doesn't import pydantic-ai and the Gemini
+    client, or read the reservations manual, until someone actually uses the chatbot"""
+    # the lock makes sure concurrent first chats build a single service between them
+    with _chat_service_lock:
+        return _build_chat_service()
 
 
 @router.post("/ask")
 @auto_process_database_errors
 def ask(request: ChatRequest) -> ChatResponse:
     """Answer a chatbot question about CNE rentals, reservations, and inventory"""
-    return chat_service.answer(message=request.message, history=request.history)
+    return get_chat_service().answer(message=request.message, history=request.history, user=request.user)
+
+
+async def _to_server_sent_events(events: AsyncIterator[ChatStreamEvent]) -> AsyncIterator[str]:
+    """Format the chatbot's stream events as server-sent events.
+
+    The response headers have already been sent by the time the agent fails, so errors are reported as a final
+    error event rather than an HTTP error status.
+    """
+    try:
+        async for event in events:
+            yield f"event: {event.type}\ndata: {event.model_dump_json()}\n\n"
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        logger.exception("Chatbot failed to answer: %s", exc)
+        event = ChatStreamEvent(type=ChatStreamEventType.ERROR, text=str(exc))
+        yield f"event: {event.type}\ndata: {event.model_dump_json()}\n\n"
+
+
+@router.post("/ask_stream")
+async def ask_stream(request: ChatRequest) -> StreamingResponse:
+    """Answer a chatbot question, streaming the answer back as server-sent events while it is generated.
+
+    Unlike /chat/ask, this does not hold an API worker thread for the whole LLM call: the agent runs on the event
+    loop and only its (blocking) database tools are run in worker threads.
+    """
+    # the first chat builds the chat service, which mustn't hold up the event loop
+    chat_service = await run_in_threadpool(get_chat_service)
+    # the chat is queued before the response starts, so a chat turned away still gets a 503 (as on /chat/ask)
+    try:
+        events = await chat_service.open_answer_stream(
+            message=request.message, history=request.history, user=request.user
+        )
+    except ChatBusyException as exc:
+        raise HTTPException(status_code=503, detail=exc.message) from exc
+    return StreamingResponse(_to_server_sent_events(events), media_type="text/event-stream")
@@ -3,13 +3,14 @@ from typing import Annotated, List, Optional
 from fastapi import APIRouter
 from pydantic import StringConstraints
 
-from api.src.dynamodb_service import DynamoDBService
+from api.src.dynamodb_service import get_db_service
+from api.src.tracing import TracedRoute
 from api.src.utils import auto_process_database_errors
 from common.constants import DeviceType, Location, DEVICE_ID_PATTERN, DeviceStatus
 from common.data_models import Device, NewDevice
 
-db_service = DynamoDBService()
-router = APIRouter(prefix="/devices", tags=["devices"])
+db_service = get_db_service()
+router = APIRouter(prefix="/devices", tags=["devices"], route_class=TracedRoute)
 
 @router.post("/add")
 @auto_process_database_errors
@@ -3,13 +3,14 @@ from typing import List
 
 from fastapi import APIRouter
 
-from api.src.dynamodb_service import DynamoDBService
+from api.src.dynamodb_service import get_db_service
+from api.src.tracing import TracedRoute
 from api.src.utils import auto_process_database_errors
 from common.constants import DeviceType
 from common.data_models import ChangeDeviceInfo, CompletedRental, NewRental, RentalSummary
 
-db_service = DynamoDBService()
-router = APIRouter(prefix="/rentals", tags=["rentals"])
+db_service = get_db_service()
+router = APIRouter(prefix="/rentals", tags=["rentals"], route_class=TracedRoute)
 
 
 @router.post("/add")
@@ -4,13 +4,14 @@ from typing import Annotated, List, Optional
 from fastapi import APIRouter
 from pydantic import StringConstraints
 
-from api.src.dynamodb_service import DynamoDBService
+from api.src.dynamodb_service import get_db_service
+from api.src.tracing import TracedRoute
 from api.src.utils import auto_process_database_errors
 from common.constants import DeviceType, RESERVATION_ID_PATTERN, ReservationStatus
 from common.data_models import NewReservation, Reservation, ReservationCount
 
-db_service = DynamoDBService()
-router = APIRouter(prefix="/reservations", tags=["reservations"])
+db_service = get_db_service()
+router = APIRouter(prefix="/reservations", tags=["reservations"], route_class=TracedRoute)
 
 
 @router.get("/get_reservation_count")
@@ -2,11 +2,12 @@ from typing import Any, Dict
 
 from fastapi import APIRouter
 
-from api.src.dynamodb_service import DynamoDBService
+from api.src.dynamodb_service import get_db_service
+from api.src.tracing import TracedRoute
 from api.src.utils import auto_process_database_errors
 
-db_service = DynamoDBService()
-router = APIRouter(prefix="/settings", tags=["settings"])
+db_service = get_db_service()
+router = APIRouter(prefix="/settings", tags=["settings"], route_class=TracedRoute)
 
 
 @router.get("/get")
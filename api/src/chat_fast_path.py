@@ -0,0 +1,172 @@
+"""Fast path for the chatbot's most frequent lookups.
+
+Questions like "where is W04?" or "how many scooters are available at BLC?" are answered straight from the
+chatbot's tool methods (and their result cache), skipping the model round trips. Only messages that match one of
+the patterns below in full take the fast path - anything else, including any rephrasing it doesn't recognise, is
+left to the agent.
+"""
+import datetime
+import re
+import threading
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from common.constants import (
+    DEVICE_ID_PATTERN,
+    RENTAL_ID_PATTERN,
+    RESERVATION_ID_PATTERN,
+    WALK_IN_RESERVATION_ID,
+    DeviceStatus,
+    DeviceType,
+)
+from common.logger import initialize_logger
+from common.utils import get_default_timezone
+
+logger = initialize_logger()
+
+# the model name reported for (and shown in the UI with) answers that didn't go through the agent
+FAST_PATH_MODEL = "fast-path"
+
+
+def _unanchored(pattern: str) -> str:
+    """Turn an anchored ID pattern (e.g. DEVICE_ID_PATTERN) into one that matches the ID within a message"""
+    alternatives = [alternative.removeprefix("^").removesuffix("$") for alternative in pattern.split("|")]
+    return f"(?:{'|'.join(alternatives)})"
+
+
+_DEVICE_ID = _unanchored(DEVICE_ID_PATTERN)
+_RENTAL_ID = _unanchored(RENTAL_ID_PATTERN)
+# booked reservations' IDs only - the walk-in placeholder isn't a reservation that can be looked up
+_RESERVATION_ID = _unanchored("|".join(
+    alternative for alternative in RESERVATION_ID_PATTERN.split("|")
+    if not re.fullmatch(alternative, WALK_IN_RESERVATION_ID)
+))
+
+_DEVICE_STATUS_PATTERNS = [
+    rf"(?:where is|where's|who has|what is the status of|what's the status of|status of) (?:device )?"
+    rf"(?P<device_id>{_DEVICE_ID})",
+    rf"is (?:device )?(?P<device_id>{_DEVICE_ID}) (?:available|rented|rented out|out|in)(?: right now| now)?",
+]
+_RENTAL_PATTERN = rf"(?:(?:show|show me|look up|lookup|find|get) )?(?:the )?rental (?:id )?(?P<rental_id>{_RENTAL_ID})"
+_RESERVATION_PATTERN = (
+    rf"(?:(?:show|show me|look up|lookup|find|get) )?(?:the )?reservation (?:id )?(?P<reservation_id>{_RESERVATION_ID})"
+)
+_AVAILABLE_COUNT_PATTERN = (
+    r"how many (?P<device_type>scooters?|wheelchairs?) (?:are )?(?:available|free)"
+    r"(?: (?:at|in) (?:the )?(?P<location>BLC|PG))?(?: right now| now| today)?"
+)
+
+
+def _format_time(value: str) -> str:
+    """Format an ISO timestamp from a tool result as e.g. "10:15 AM on 2025-08-21", in the CNE's timezone"""
+    timestamp = datetime.datetime.fromisoformat(value).astimezone(get_default_timezone())
+    return f"{timestamp:%I:%M %p} on {timestamp.date().isoformat()}".lstrip("0")
+
+
+def _format_phone_number(value: str) -> str:
+    """Format a phone number from a tool result, which is serialized as an RFC 3966 URI (tel:+1-416-555-0100)"""
+    return value.removeprefix("tel:")
+
+
+def _plural(count: int, noun: str) -> str:
+    return f"{count} {noun}" if count == 1 else f"{count} {noun}s"
+
+
+class ChatFastPath:
+    """Matches chat messages against the fast path's intents, answering the ones it recognises from the chatbot's
+    tools, and keeps count of its hit rate."""
+
+    def __init__(self, tools):
+        # the ChatService whose (cached) tool methods the fast path answers from
+        self.tools = tools
+        self._intents: List[Tuple[str, re.Pattern, Callable[[re.Match], str]]] = [
+            *(
+                ("device_status", re.compile(pattern, re.IGNORECASE), self._device_status)
+                for pattern in _DEVICE_STATUS_PATTERNS
+            ),
+            ("rental_by_id", re.compile(_RENTAL_PATTERN, re.IGNORECASE), self._rental_by_id),
+            ("reservation_by_id", re.compile(_RESERVATION_PATTERN, re.IGNORECASE), self._reservation_by_id),
+            ("available_count", re.compile(_AVAILABLE_COUNT_PATTERN, re.IGNORECASE), self._available_count),
+        ]
+        self._stats: Dict[str, int] = Counter()
+        self._lock = threading.Lock()
+
+    def answer(self, message: str) -> Optional[str]:
+        """Answer the message if it matches one of the fast path's intents, otherwise return None (for the agent to
+        answer it)"""
+        question = " ".join(message.split()).rstrip("?.! ")
+        for intent, pattern, handler in self._intents:
+            match = pattern.fullmatch(question)
+            if match:
+                answer = handler(match)
+                self._log_hit_rate(intent)
+                return answer
+        self._log_hit_rate(None)
+        return None
+
+    def _log_hit_rate(self, intent: Optional[str]) -> None:
+        with self._lock:
+            self._stats["messages"] += 1
+            if intent:
+                self._stats["hits"] += 1
+            messages, hits = self._stats["messages"], self._stats["hits"]
+        logger.info(
+            "Chatbot fast path %s: hit rate %.1f%% (%s of %s messages)",
+            f"hit ({intent})" if intent else "miss", 100 * hits / messages, hits, messages,
+        )
+
+    def _device_status(self, match: re.Match) -> str:
+        device_id = match["device_id"].upper()
+        device = self.tools.lookup_device_by_id(device_id)
+        if device is None:
+            return f"There is no device {device_id} in the {self.tools.cne_year} inventory."
+        description = f"{device_id} ({device['type']})"
+        if device["status"] == DeviceStatus.RENTED:
+            rental = self.tools.lookup_current_rental_for_device(device_id)
+            if rental is not None:
+                return (
+                    f"{description} is rented out to {rental['name']} (rental {rental['id']}), picked up at "
+                    f"{rental['pickup_location']} at {_format_time(rental['pickup_time'])}."
+                )
+        return f"{description} is at {device['location']}, with status {device['status']}."
+
+    def _rental_by_id(self, match: re.Match) -> str:
+        rental_id = match["rental_id"].upper()
+        rental = self.tools.lookup_rental_by_id(rental_id)
+        if rental is None:
+            return f"There is no rental {rental_id} in {self.tools.cne_year}."
+        answer = (
+            f"Rental {rental_id}: {rental['device_type']} {rental['device_id']} for {rental['name']} "
+            f"({_format_phone_number(rental['phone_number'])}), picked up at {rental['pickup_location']} at "
+            f"{_format_time(rental['pickup_time'])}. Status: {rental['status']}."
+        )
+        if rental.get("return_time"):
+            answer += f" Returned to {rental['return_location']} at {_format_time(rental['return_time'])}."
+        return answer
+
+    def _reservation_by_id(self, match: re.Match) -> str:
+        reservation_id = match["reservation_id"].upper()
+        reservation = self.tools.lookup_reservation_by_id(reservation_id)
+        if reservation is None:
+            return f"There is no reservation {reservation_id} in {self.tools.cne_year}."
+        answer = (
+            f"Reservation {reservation_id}: {reservation['device_type']} for {reservation['name']} "
+            f"({_format_phone_number(reservation['phone_number'])}) at {reservation['location']} at "
+            f"{_format_time(reservation['reservation_time'])}. Status: {reservation['status']}."
+        )
+        if reservation.get("rental_id"):
+            answer += f" Rental: {reservation['rental_id']}."
+        return answer
+
+    def _available_count(self, match: re.Match) -> str:
+        device_type = DeviceType(match["device_type"].removesuffix("s").capitalize())
+        counts = self.tools.count_available_devices_by_location(device_type)
+        noun = device_type.value.lower()
+        if match["location"]:
+            location = match["location"].upper()
+            count = counts.get(location, 0)
+            return f"There {'is' if count == 1 else 'are'} {_plural(count, noun)} available at {location}."
+        total = sum(counts.values())
+        by_location = ", ".join(f"{count} at {location}" for location, count in sorted(counts.items()) if count)
+        answer = f"There {'is' if total == 1 else 'are'} {_plural(total, noun)} available"
+        return f"{answer}: {by_location}." if total else f"{answer}."
@@ -0,0 +1,248 @@
+"""Scheduling of the chatbot's model calls: per-model rate budgets, and a fair queue of the chats being answered.
+
+Gemini limits each model's requests and tokens per minute. Rather than only reacting once a model returns a 429 - by
+which time every chat running at once hits it together - the requests and tokens each model is sent are tracked
+against token buckets, so a chat goes to the next model in the fallback chain *before* the preferred one runs out.
+The chats themselves are answered a few at a time, with the rest queued round-robin across staff members, so one
+person's burst of questions doesn't hold everyone else up.
+"""
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Collection, Deque, Dict, Iterator, Optional, Sequence, Tuple
+
+from api.src.exceptions import ChatBusyException
+from common.logger import initialize_logger
+
+logger = initialize_logger()
+
+# the per-model limits of Gemini's free tier for the flash-lite models
+REQUESTS_PER_MINUTE = 15
+TOKENS_PER_MINUTE = 250_000
+# how long a model that returned a 429 anyway is skipped for, doubling for each 429 in a row (up to the maximum)
+RATE_LIMIT_COOLDOWN_SECONDS = 60
+MAX_RATE_LIMIT_COOLDOWN_SECONDS = 15 * 60
+# how many chats are answered at once, how many more may wait for their turn, and for how long
+MAX_CONCURRENT_CHATS = 4
+MAX_QUEUED_CHATS = 32
+QUEUE_TIMEOUT_SECONDS = 60
+
+
+class _TokenBucket:
+    """A budget that refills continuously, at its capacity per minute. Its level may go below zero when more was
+    used than reserved, which delays the next reservation until it is paid back."""
+
+    def __init__(self, per_minute: float, now: float):
+        self.capacity = per_minute
+        self.level = float(per_minute)
+        self._refill_per_second = per_minute / 60
+        self._updated = now
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self._refill_per_second)
+        self._updated = now
+
+    def seconds_until(self, amount: float) -> float:
+        """How long until the bucket holds the amount (or is full, for an amount beyond its capacity)"""
+        return max(0.0, (min(amount, self.capacity) - self.level) / self._refill_per_second)
+
+
+class _ModelBudget:
+    """A model's request and token buckets, and the cooldown it is in after a 429"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, now: float):
+        self.requests = _TokenBucket(requests_per_minute, now)
+        self.tokens = _TokenBucket(tokens_per_minute, now)
+        self.blocked_until = 0.0
+        self.rate_limits_in_a_row = 0
+
+    def seconds_until_available(self, tokens: int, now: float) -> float:
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        return max(self.blocked_until - now, self.requests.seconds_until(1), self.tokens.seconds_until(tokens), 0.0)
+
+
+class ModelRateBudgets:
+    """Thread-safe request and token budgets for each model in the fallback chain"""
+
+    def __init__(
+            self,
+            model_names: Sequence[str],
+            requests_per_minute: int = REQUESTS_PER_MINUTE,
+            tokens_per_minute: int = TOKENS_PER_MINUTE,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        now = clock()
+        # in fallback chain order, so the preferred model is always tried first
+        self._budgets: Dict[str, _ModelBudget] = {
+            model_name: _ModelBudget(requests_per_minute, tokens_per_minute, now) for model_name in model_names
+        }
+        self._lock = threading.Lock()
+
+    def reserve(self, estimated_tokens: int, exclude: Collection[str] = ()) -> Tuple[Optional[str], float]:
+        """Reserve a request and the estimated tokens from the first model in the chain (other than the excluded
+        ones) with the budget for them. Returns that model, or None and how long until one of them will have it."""
+        with self._lock:
+            now = self._clock()
+            wait = math.inf
+            for model_name, budget in self._budgets.items():
+                if model_name in exclude:
+                    continue
+                model_wait = budget.seconds_until_available(estimated_tokens, now)
+                if model_wait == 0:
+                    budget.requests.level -= 1
+                    budget.tokens.level -= estimated_tokens
+                    return model_name, 0.0
+                wait = min(wait, model_wait)
+            return None, wait
+
+    def record_usage(self, model_name: str, estimated_tokens: int, requests: int, tokens: int) -> None:
+        """Settle a reservation with the requests and tokens the chat actually used - the agent makes a model
+        request for each round of tool calls, so a chat may take several."""
+        with self._lock:
+            budget = self._budgets[model_name]
+            budget.requests.level -= max(requests - 1, 0)
+            budget.tokens.level -= tokens - estimated_tokens
+            budget.rate_limits_in_a_row = 0
+
+    def release(self, model_name: str, estimated_tokens: int) -> None:
+        """Give back a reservation that won't be settled (the chat failed, or was turned away, before it was
+        answered)."""
+        with self._lock:
+            budget = self._budgets[model_name]
+            budget.requests.level = min(budget.requests.capacity, budget.requests.level + 1)
+            budget.tokens.level = min(budget.tokens.capacity, budget.tokens.level + estimated_tokens)
+
+    def record_rate_limit(self, model_name: str) -> float:
+        """Skip a model that returned a 429 for a cooldown, which doubles for each 429 in a row - its actual limits
+        evidently don't match its budget (e.g. its daily quota ran out). Returns the cooldown, in seconds."""
+        with self._lock:
+            budget = self._budgets[model_name]
+            budget.rate_limits_in_a_row += 1
+            cooldown = min(
+                RATE_LIMIT_COOLDOWN_SECONDS * 2 ** (budget.rate_limits_in_a_row - 1), MAX_RATE_LIMIT_COOLDOWN_SECONDS
+            )
+            budget.blocked_until = self._clock() + cooldown
+            return cooldown
+
+
+def _set_result_if_pending(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _Ticket:
+    """A chat's place in the queue, which is granted a slot from whichever thread releases one"""
+
+    def __init__(self, user: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.user = user
+        self.granted = False
+        self._loop = loop
+        self.event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+
+    def grant(self) -> None:
+        self.granted = True
+        if self.future is not None:
+            self._loop.call_soon_threadsafe(_set_result_if_pending, self.future)
+        else:
+            self.event.set()
+
+
+class FairRequestQueue:
+    """Limits how many chats are answered at once, queueing the rest fairly: each freed slot goes to the next staff
+    member in turn (round-robin), rather than to whoever queued the most questions.
+
+    Slots can be taken from worker threads (``slot``) and from the event loop (``async_slot``) alike.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_CHATS, max_queued: int = MAX_QUEUED_CHATS):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._active = 0
+        self._num_queued = 0
+        # each waiting user's tickets, in the order the users get their turns
+        self._queued: "OrderedDict[str, Deque[_Ticket]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _enqueue(self, user: Optional[str], loop: Optional[asyncio.AbstractEventLoop] = None) -> _Ticket:
+        ticket = _Ticket(user or "", loop)
+        with self._lock:
+            if self._active < self.max_concurrent and not self._num_queued:
+                self._active += 1
+                ticket.granted = True
+                return ticket
+            if self._num_queued >= self.max_queued:
+                raise ChatBusyException("The chatbot is busy answering other questions - please try again shortly.")
+            self._queued.setdefault(ticket.user, deque()).append(ticket)
+            self._num_queued += 1
+        return ticket
+
+    def _grant_next(self) -> None:
+        """Grant the free slots to the users next in turn, each going to the back of the rotation (call while
+        holding the lock)"""
+        while self._active < self.max_concurrent and self._queued:
+            user, tickets = self._queued.popitem(last=False)
+            ticket = tickets.popleft()
+            if tickets:
+                self._queued[user] = tickets
+            self._num_queued -= 1
+            self._active += 1
+            ticket.grant()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._active -= 1
+            self._grant_next()
+
+    def _abandon(self, ticket: _Ticket) -> None:
+        """Take a ticket that timed out or was cancelled out of the queue (or, if it was granted a slot in the
+        meantime, free the slot for the next one)"""
+        with self._lock:
+            if not ticket.granted:
+                tickets = self._queued[ticket.user]
+                tickets.remove(ticket)
+                if not tickets:
+                    del self._queued[ticket.user]
+                self._num_queued -= 1
+                return
+        self._release()
+
+    @staticmethod
+    def _timed_out(user: str, timeout: float) -> ChatBusyException:
+        logger.warning("Chat from %r waited %s seconds in the queue without being answered", user, timeout)
+        return ChatBusyException("The chatbot is busy answering other questions - please try again shortly.")
+
+    @contextmanager
+    def slot(self, user: Optional[str], timeout: float = QUEUE_TIMEOUT_SECONDS) -> Iterator[None]:
+        """Hold one of the slots for the duration, waiting for one in the user's turn if none is free"""
+        ticket = self._enqueue(user)
+        if not ticket.granted and not ticket.event.wait(timeout):
+            self._abandon(ticket)
+            raise self._timed_out(ticket.user, timeout)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def async_slot(self, user: Optional[str], timeout: float = QUEUE_TIMEOUT_SECONDS) -> AsyncIterator[None]:
+        """Like ``slot``, but waits for a slot without blocking the event loop"""
+        ticket = self._enqueue(user, asyncio.get_running_loop())
+        if not ticket.granted:
+            try:
+                await asyncio.wait_for(ticket.future, timeout)
+            except asyncio.TimeoutError as exc:
+                self._abandon(ticket)
+                raise self._timed_out(ticket.user, timeout) from exc
+            except asyncio.CancelledError:
+                self._abandon(ticket)
+                raise
+        try:
+            yield
+        finally:
+            self._release()
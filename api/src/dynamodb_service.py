@@ -1,11 +1,11 @@
 import os
+import threading
 from datetime import datetime
-from functools import wraps
-from typing import Any, Dict, List, Optional
+from functools import cache, cached_property, wraps
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 import boto3
 import botocore
-import pandas as pd
 from boto3.dynamodb.conditions import Attr, Key
 from pydantic import TypeAdapter, ValidationError
 
@@ -17,12 +17,16 @@ from api.src.exceptions import (
     DeviceNotFoundOrInvalidStatusException,
     UniqueViolation,
 )
+from api.src.metrics import instrument_dynamodb_client
 from common.constants import DeviceType, Location, DeviceStatus, ReservationStatus, RentalStatus
 from common.data_models import CompletedRental, NewDevice, NewReservation, Reservation, NewRental, ChangeDeviceInfo
 from common.data_models.fields import PhoneNumberField
 from common.logger import initialize_logger, timeit
 from common.utils import read_secret
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = initialize_logger()
 
 # phone numbers are stored in a normalized form (e.g. "tel:+1-416-820-2370"), so search inputs must be
@@ -41,22 +45,72 @@ def _normalize_phone_number(phone_number: str) -> str:
 class DynamoDBService:
     """Service class to interact with DynamoDB."""
 
+    # bumped by every write made through any DynamoDBService in this process, so that read caches keyed on it
+    # (e.g. the chatbot's tool results) never serve data from before the latest write
+    _data_version = 0
+    _data_version_lock = threading.Lock()
+
     def __init__(self):
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=read_secret(os.getenv("AWS_ACCESS_KEY_ID")),
-            aws_secret_access_key=read_secret(os.getenv("AWS_SECRET_ACCESS_KEY")),
-        )
-        is_dev = os.getenv("DEV_MODE", default="False").lower() == "true"
-        self.devices_table = self.dynamodb.Table("cne_devices" if not is_dev else "cne_devices_test")
-        self.rentals_table = self.dynamodb.Table("cne_rentals" if not is_dev else "cne_rentals_test")
-        self.reservations_table = self.dynamodb.Table("cne_reservations" if not is_dev else "cne_reservations_test")
-        self.settings_table = self.dynamodb.Table("cne_settings" if not is_dev else "cne_settings_test")
+        # the boto3 resource (and its tables) is only created on first use, so starting the API doesn't wait for
+        # boto3 to load DynamoDB's service model
+        self._credentials = {
+            "aws_access_key_id": read_secret(os.getenv("AWS_ACCESS_KEY_ID")),
+            "aws_secret_access_key": read_secret(os.getenv("AWS_SECRET_ACCESS_KEY")),
+        }
+        self._is_dev = os.getenv("DEV_MODE", default="False").lower() == "true"
+        self._dynamodb = None
+        self._dynamodb_lock = threading.Lock()
+
+    @property
+    def dynamodb(self):
+        """The DynamoDB resource, created on first use (boto3's default session isn't thread-safe, hence the lock)"""
+        with self._dynamodb_lock:
+            if self._dynamodb is None:
+                self._dynamodb = boto3.resource('dynamodb', **self._credentials)
+                instrument_dynamodb_client(self._dynamodb.meta.client)
+            return self._dynamodb
+
+    def _get_table(self, table_name: str):
+        """Get one of the tables, using its test counterpart in dev mode"""
+        return self.dynamodb.Table(table_name if not self._is_dev else f"{table_name}_test")
+
+    @cached_property
+    def devices_table(self):
+        return self._get_table("cne_devices")
+
+    @cached_property
+    def rentals_table(self):
+        return self._get_table("cne_rentals")
+
+    @cached_property
+    def reservations_table(self):
+        return self._get_table("cne_reservations")
+
+    @cached_property
+    def settings_table(self):
+        return self._get_table("cne_settings")
 
     # ==============================
     # HELPER FUNCTIONS
     # ==============================
 
+    @classmethod
+    def get_data_version(cls) -> int:
+        """Get the current data version, which changes whenever data is written through the API"""
+        return cls._data_version
+
+    @staticmethod
+    def _bump_data_version(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                # bumped even if the write failed, since a failed write may still have changed some data
+                with DynamoDBService._data_version_lock:
+                    DynamoDBService._data_version += 1
+        return wrapper
+
     @staticmethod
     def _auto_raise_device_not_found_exception(func):
         @wraps(func)
@@ -170,6 +224,7 @@ class DynamoDBService:
     # ==============================
 
     @timeit(logger=logger)
+    @_bump_data_version
     def add_devices(self, devices: List[NewDevice]):
         """Add devices to the inventory"""
         all_items = self._paginate(self.devices_table.scan, ProjectionExpression="cne_year, id")
@@ -282,6 +337,7 @@ class DynamoDBService:
         return response.get("Items", [])
 
     @timeit(logger=logger)
+    @_bump_data_version
     @_auto_raise_device_not_found_exception
     def remove_devices(self, cne_year: int, device_ids: List[str]):
         """Remove devices from the inventory"""
@@ -299,6 +355,7 @@ class DynamoDBService:
         )
 
     @timeit(logger=logger)
+    @_bump_data_version
     @_auto_raise_device_not_found_exception
     def update_devices_location(self, cne_year: int, device_ids: List[str], location: str):
         """Update the location of devices"""
@@ -319,6 +376,7 @@ class DynamoDBService:
         )
 
     @timeit(logger=logger)
+    @_bump_data_version
     @_auto_raise_device_not_found_exception
     def update_devices_status(self, cne_year: int, device_ids: List[str], status: DeviceStatus):
         """Update the status of devices"""
@@ -344,6 +402,7 @@ class DynamoDBService:
     # ==============================
 
     @timeit(logger=logger)
+    @_bump_data_version
     def change_rental_device(self, change_info: ChangeDeviceInfo):
         """Change the device of a rental."""
         transact_items = [
@@ -407,6 +466,7 @@ class DynamoDBService:
             raise exc
 
     @timeit(logger=logger)
+    @_bump_data_version
     def complete_rental(self, rental: CompletedRental):
         """Complete a rental."""
         transact_items = [
@@ -604,6 +664,7 @@ class DynamoDBService:
         )
 
     @timeit(logger=logger)
+    @_bump_data_version
     def insert_rental(self, rental: NewRental):
         """Insert a new rental."""
         rental_id = self._get_new_rental_or_reservation_id(
@@ -687,8 +748,9 @@ class DynamoDBService:
     # ==============================
 
     @timeit(logger=logger)
-    def get_reservation_count(self, cne_year: int) -> pd.DataFrame:
+    def get_reservation_count(self, cne_year: int) -> "pd.DataFrame":
         """Get the count of reservations for each device type on each date in the given range."""
+        import pandas as pd  # pylint: disable=import-outside-toplevel
 
         reservations = self.reservations_table.query(
             KeyConditionExpression=Key("cne_year").eq(cne_year),
@@ -708,8 +770,9 @@ class DynamoDBService:
         return reservations.value_counts().reset_index(drop=False)
 
     @timeit(logger=logger)
-    def get_reservation_status_counts(self, cne_year: int) -> pd.DataFrame:
+    def get_reservation_status_counts(self, cne_year: int) -> "pd.DataFrame":
         """Get the count of reservations broken down by status and device type for the given CNE year."""
+        import pandas as pd  # pylint: disable=import-outside-toplevel
         reservations = self.reservations_table.query(
             KeyConditionExpression=Key("cne_year").eq(cne_year),
             ProjectionExpression="#status, #device_type",
@@ -796,6 +859,7 @@ class DynamoDBService:
         return response.get('Items', [])
 
     @timeit(logger=logger)
+    @_bump_data_version
     def insert_reservation(self, reservation: NewReservation):
         """Insert a new reservation."""
         reservation.id = self._get_new_rental_or_reservation_id(
@@ -835,6 +899,7 @@ class DynamoDBService:
         )
 
     @timeit(logger=logger)
+    @_bump_data_version
     @_auto_raise_reservation_not_found_exception
     def update_reservation(self, reservation: Reservation):
         """Update an existing reservation in the DynamoDB table."""
@@ -852,6 +917,7 @@ class DynamoDBService:
         )
 
     @timeit(logger=logger)
+    @_bump_data_version
     @_auto_raise_reservation_not_found_exception
     def update_reservation_status(self, cne_year: int, reservation_id: str, status: ReservationStatus):
         """Update the status of an existing reservation in the DynamoDB table"""
@@ -878,6 +944,7 @@ class DynamoDBService:
         return response[0]["value"]
 
     @timeit(logger=logger)
+    @_bump_data_version
     def update_settings(self, cne_year: int, settings: Dict[str, Any]):
         """Set settings for a specific CNE year."""
         for setting_id, setting_value in settings.items():
@@ -887,3 +954,9 @@ class DynamoDBService:
                 ExpressionAttributeNames={"#value": "value"},
                 ExpressionAttributeValues={":value": setting_value},
             )
+
+
+@cache
+def get_db_service() -> DynamoDBService:
+    """Get the DynamoDB service shared by the API's routers"""
+    return DynamoDBService()
@@ -56,3 +56,11 @@ class UniqueViolation(ValueError):
     def __init__(self, message: str):
         self.message = message
         super().__init__(self.message)
+
+
+class ChatBusyException(Exception):
+    """Exception raised when the chatbot cannot take on another question right now (too many are waiting to be
+    answered, or every model is at its rate limit)."""
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,145 @@
+"""The API's metrics: latency histograms per route, DynamoDB and S3 operation, and counts of the requests' outcomes.
+
+The metrics are kept in memory, per process, in their own prometheus_client registry, which the API's /metrics
+endpoint serves. DynamoDB and S3 operations are measured through botocore's event hooks on the services' clients, so
+every call is covered without touching the services' methods - DynamoDB operations are also asked to return the
+capacity they consumed, which is recorded along with the number of items they read.
+"""
+import time
+from typing import Any, Dict
+
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+from api.src.middleware import ResponseStatus
+
+CAPACITY_UNIT_BUCKETS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500)
+ITEM_COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+metrics_registry = CollectorRegistry()
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time taken to handle API requests, until their responses were sent, by route",
+    ("method", "route", "status"),
+    registry=metrics_registry,
+)
+request_outcomes = Counter(
+    "request_outcomes",
+    "Outcomes of the endpoints whose database errors are turned into HTTP errors",
+    ("endpoint", "outcome"),
+    registry=metrics_registry,
+)
+dynamodb_operation_duration = Histogram(
+    "dynamodb_operation_duration_seconds",
+    "Time taken by DynamoDB operations, including retries",
+    ("operation", "table"),
+    registry=metrics_registry,
+)
+dynamodb_consumed_capacity = Histogram(
+    "dynamodb_consumed_capacity_units",
+    "Capacity units consumed by each DynamoDB operation, per table",
+    ("operation", "table"),
+    buckets=CAPACITY_UNIT_BUCKETS,
+    registry=metrics_registry,
+)
+dynamodb_items = Histogram(
+    "dynamodb_items",
+    "Number of items returned by each DynamoDB read",
+    ("operation", "table"),
+    buckets=ITEM_COUNT_BUCKETS,
+    registry=metrics_registry,
+)
+s3_operation_duration = Histogram(
+    "s3_operation_duration_seconds",
+    "Time taken by S3 operations, including retries",
+    ("operation",),
+    registry=metrics_registry,
+)
+
+_START_TIME_KEY = "metrics_start_time"
+_TABLE_KEY = "metrics_table"
+
+
+def _get_table_names(params: Dict[str, Any]) -> str:
+    """The names of the tables an operation's parameters refer to"""
+    if "TableName" in params:
+        return params["TableName"]
+    table_names = set(params.get("RequestItems", {}))
+    for item in params.get("TransactItems", []):
+        table_names.update(action["TableName"] for action in item.values() if "TableName" in action)
+    return ",".join(sorted(table_names)) or "none"
+
+
+def _before_dynamodb_call(params: Dict[str, Any], model, context: Dict[str, Any], **_) -> None:
+    if "ReturnConsumedCapacity" in model.input_shape.members:
+        params.setdefault("ReturnConsumedCapacity", "TOTAL")
+    context[_TABLE_KEY] = _get_table_names(params)
+    context[_START_TIME_KEY] = time.perf_counter()
+
+
+def _after_dynamodb_call(parsed: Dict[str, Any], model, context: Dict[str, Any], **_) -> None:
+    if _START_TIME_KEY not in context:
+        return
+    operation, table = model.name, context[_TABLE_KEY]
+    dynamodb_operation_duration.labels(operation=operation, table=table).observe(
+        time.perf_counter() - context[_START_TIME_KEY]
+    )
+
+    consumed_capacity = parsed.get("ConsumedCapacity", [])
+    for capacity in consumed_capacity if isinstance(consumed_capacity, list) else [consumed_capacity]:
+        if "CapacityUnits" in capacity:
+            dynamodb_consumed_capacity.labels(operation=operation, table=capacity.get("TableName", table)).observe(
+                float(capacity["CapacityUnits"])
+            )
+
+    items = dynamodb_items.labels(operation=operation, table=table)
+    if "Count" in parsed:
+        items.observe(parsed["Count"])
+    elif "Items" in parsed:
+        items.observe(len(parsed["Items"]))
+    elif operation == "GetItem":
+        items.observe(1 if "Item" in parsed else 0)
+
+
+def _before_s3_call(context: Dict[str, Any], **_) -> None:
+    context[_START_TIME_KEY] = time.perf_counter()
+
+
+def _after_s3_call(model, context: Dict[str, Any], **_) -> None:
+    if _START_TIME_KEY in context:
+        s3_operation_duration.labels(operation=model.name).observe(time.perf_counter() - context[_START_TIME_KEY])
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording how long each request takes, until its response was sent (including the whole of a
+    streamed response), labelled with its route's path template so IDs in paths don't each get their own series"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = ResponseStatus(send)
+        try:
+            await self.app(scope, receive, status.send)
+        finally:
+            # the router adds the matched route to the scope
+            route = scope.get("route")
+            http_request_duration.labels(
+                method=scope["method"], route=getattr(route, "path", "unmatched"), status=str(status.code)
+            ).observe(time.perf_counter() - start)
+
+
+def instrument_dynamodb_client(client) -> None:
+    """Record the duration, consumed capacity and items read of every operation made with a DynamoDB client"""
+    client.meta.events.register("before-parameter-build.dynamodb", _before_dynamodb_call)
+    client.meta.events.register("after-call.dynamodb", _after_dynamodb_call)
+
+
+def instrument_s3_client(client) -> None:
+    """Record the duration of every operation made with an S3 client"""
+    client.meta.events.register("before-parameter-build.s3", _before_s3_call)
+    client.meta.events.register("after-call.s3", _after_s3_call)
@@ -0,0 +1,16 @@
+"""Helpers shared by the API's ASGI middleware."""
+
+
+class ResponseStatus:
+    """Wraps a request's ASGI ``send`` to record the status of the response it starts - 500 until one is started, as
+    for a request that failed before it was answered"""
+
+    def __init__(self, send):
+        self.code = 500
+        self._send = send
+
+    async def send(self, message):
+        """Send the message on, recording the status if it starts the response"""
+        if message["type"] == "http.response.start":
+            self.code = message["status"]
+        await self._send(message)
@@ -1,22 +1,43 @@
 import os
+import threading
 from typing import Optional
 
 import boto3
+import botocore
 
+from api.src.metrics import instrument_s3_client
+from common.tracing import traced
 from common.utils import read_secret
 
+RENTAL_FORM_CONTENT_TYPE = "application/pdf"
+# presigned URLs are handed straight to the UI and used immediately, so they only need to live long enough for
+# one upload/download of a rental form
+PRESIGNED_URL_EXPIRY_SECONDS = 300
+
 
 class S3Service:
     """Service class to interact with AWS S3"""
 
     def __init__(self):
-        self.s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=read_secret(os.environ["AWS_ACCESS_KEY_ID"]),
-            aws_secret_access_key=read_secret(os.environ["AWS_SECRET_ACCESS_KEY"]),
-        )
+        # the boto3 client is only created on first use, so starting the API doesn't wait for boto3 to load S3's
+        # service model
+        self._credentials = {
+            "aws_access_key_id": read_secret(os.environ["AWS_ACCESS_KEY_ID"]),
+            "aws_secret_access_key": read_secret(os.environ["AWS_SECRET_ACCESS_KEY"]),
+        }
+        self._s3_client = None
+        self._s3_client_lock = threading.Lock()
         self.bucket = os.environ["S3_BUCKET"]
 
+    @property
+    def s3_client(self):
+        """The S3 client, created on first use"""
+        with self._s3_client_lock:
+            if self._s3_client is None:
+                self._s3_client = boto3.client("s3", **self._credentials)
+                instrument_s3_client(self._s3_client)
+            return self._s3_client
+
     @staticmethod
     def _get_form_path(rental_id: str) -> str:
         """Get the S3 key for a rental form based on rental ID"""
@@ -26,10 +47,12 @@ class S3Service:
 
         return os.path.join(form_folder, f"rental_form_{rental_id}.pdf")
 
+    @traced()
     def upload_rental_form(self, pdf_bytes: bytes, rental_id: str):
         """Upload a rental form to S3"""
         self.s3_client.put_object(Bucket=self.bucket, Key=self._get_form_path(rental_id=rental_id), Body=pdf_bytes)
 
+    @traced()
     def download_rental_form(self, rental_id: str) -> Optional[bytes]:
         """Download a rental form from S3, raise Exception if not found"""
         try:
@@ -37,3 +60,33 @@ class S3Service:
             return response["Body"].read()
         except self.s3_client.exceptions.NoSuchKey as exc:
             raise FileNotFoundError(f"Rental form not found for rental ID {rental_id}") from exc
+
+    @traced()
+    def get_rental_form_upload_url(self, rental_id: str, expires_in: int = PRESIGNED_URL_EXPIRY_SECONDS) -> str:
+        """Get a presigned URL to PUT a rental form directly to S3 (the upload must send the PDF content type)"""
+        return self.s3_client.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self._get_form_path(rental_id=rental_id),
+                "ContentType": RENTAL_FORM_CONTENT_TYPE,
+            },
+            ExpiresIn=expires_in,
+        )
+
+    @traced()
+    def get_rental_form_download_url(self, rental_id: str, expires_in: int = PRESIGNED_URL_EXPIRY_SECONDS) -> str:
+        """Get a presigned URL to GET a rental form directly from S3, raise Exception if not found"""
+        key = self._get_form_path(rental_id=rental_id)
+        try:
+            # presigning never touches S3, so check the form exists first to keep the 404 behaviour of downloads
+            self.s3_client.head_object(Bucket=self.bucket, Key=key)
+        except botocore.exceptions.ClientError as exc:
+            if exc.response["Error"]["Code"] in {"404", "NoSuchKey"}:
+                raise FileNotFoundError(f"Rental form not found for rental ID {rental_id}") from exc
+            raise exc
+        return self.s3_client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=expires_in,
+        )
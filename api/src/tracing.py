@@ -0,0 +1,51 @@
+"""The API's request spans: one per request, joining the trace of the UI page that sent it, and one around each
+endpoint, so the time spent validating requests and serialising responses is the gap between the two."""
+from fastapi.routing import APIRoute
+
+from api.src.middleware import ResponseStatus
+from common.tracing import extract_trace_context, is_tracing_enabled, start_span, traced
+
+
+class TracingMiddleware:
+    """ASGI middleware recording a server span for each request, named after its route's path template, in the trace
+    whose context the request's headers carry (if any)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not is_tracing_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        attributes = {"http.request.method": scope["method"], "url.path": scope["path"]}
+        status = ResponseStatus(send)
+        with start_span(
+                f"{scope['method']} {scope['path']}",
+                attributes=attributes,
+                kind="server",
+                context=extract_trace_context(headers),
+        ) as span:
+            try:
+                await self.app(scope, receive, status.send)
+            finally:
+                # the router adds the matched route to the scope
+                route = scope.get("route")
+                if route is not None:
+                    span.update_name(f"{scope['method']} {route.path}")
+                    span.set_attribute("http.route", route.path)
+                span.set_attribute("http.response.status_code", status.code)
+                if status.code >= 500:
+                    from opentelemetry.trace import StatusCode  # pylint: disable=import-outside-toplevel
+
+                    span.set_status(StatusCode.ERROR)
+
+
+class TracedRoute(APIRoute):
+    """Route recording a span around each call of its endpoint, named after its module and function (e.g.
+    ``devices.get_full_inventory``)"""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        span_name = f"{endpoint.__module__.rsplit('.', 1)[-1]}.{endpoint.__name__}"
+        super().__init__(path, traced(span_name)(endpoint), **kwargs)
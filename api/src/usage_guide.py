@@ -0,0 +1,195 @@
+"""The app usage guide (the reservations manual) that the chatbot answers how-to questions from.
+
+The manual is split into sections by heading, with a small BM25 index over them, so a how-to question only needs the
+few sections relevant to it rather than the whole manual. The manual is reloaded whenever the file changes, so an
+edit takes effect without restarting the API, and the answers the chatbot cached from the previous version are
+dropped along with it.
+"""
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from common.logger import initialize_logger
+
+logger = initialize_logger()
+
+MANUAL_PATH = Path(__file__).resolve().parent.parent / "assets" / "reservations_manual.md"
+# how many how-to answers are cached
+ANSWER_CACHE_SIZE = 256
+# how many sections a search of the manual returns, at most
+SEARCH_RESULT_SECTIONS = 3
+# the BM25 parameters: how quickly repeats of a word stop adding to a section's score, and how much a section's
+# score is normalized by its length
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+
+_HEADING_PATTERN = re.compile(r"^#+\s+(.*)$", re.MULTILINE)
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "could", "do", "does", "for", "from", "how", "i", "if",
+    "in", "is", "it", "me", "my", "of", "on", "or", "should", "that", "the", "this", "to", "we", "what", "when",
+    "where", "which", "with", "would", "you",
+})
+# words that don't change what a how-to question asks (e.g. "how do I create a new rental, please?" asks the same as
+# "how do I create a rental"), left out of the answer cache's keys - unlike the rest of the stop words, which include
+# words that do (e.g. "can" or "should", "when" or "where")
+_QUESTION_FILLER_WORDS = frozenset({
+    "a", "able", "an", "do", "does", "explain", "i", "me", "my", "need", "new", "please", "tell", "the", "want", "we",
+    "you",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase words, leaving out stop words"""
+    return [word for word in _WORD_PATTERN.findall(text.lower()) if word not in _STOP_WORDS]
+
+
+def _singular(word: str) -> str:
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+
+def question_key(question: str) -> str:
+    """Normalize a how-to question to its words in order, with the content words singular and without filler words -
+    so questions only share a key when they ask the same thing in the same words. Questions without a content word
+    (e.g. "how do I do that?") get an empty key, as they can only be answered in the context of a conversation."""
+    words = [
+        word if word in _STOP_WORDS else _singular(word)
+        for word in _WORD_PATTERN.findall(question.lower()) if word not in _QUESTION_FILLER_WORDS
+    ]
+    if all(word in _STOP_WORDS for word in words):
+        return ""
+    return " ".join(words)
+
+
+class Section(NamedTuple):
+    """A section of the manual: its heading, and its text (heading included)"""
+    heading: str
+    text: str
+
+
+def split_sections(text: str) -> List[Section]:
+    """Split the manual into one section per heading (any text before the first heading is a section of its own)"""
+    starts = [match.start() for match in _HEADING_PATTERN.finditer(text)]
+    if not starts or starts[0] > 0:
+        starts.insert(0, 0)
+    sections = []
+    for start, end in zip(starts, starts[1:] + [len(text)]):
+        section_text = text[start:end].strip()
+        heading = _HEADING_PATTERN.match(section_text)
+        if section_text:
+            sections.append(Section(heading=heading.group(1) if heading else "", text=section_text))
+    return sections
+
+
+class UsageGuide:
+    """The manual's text, hash and sections (indexed for search), reloaded whenever the file is modified"""
+
+    def __init__(self, path: Path = MANUAL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._modified_ns: Optional[int] = None
+        self.text = ""
+        self.digest = ""
+        self.sections: List[Section] = []
+        self.idf: Dict[str, float] = {}
+        self._section_words: List[Counter] = []
+        self._average_section_length = 0.0
+        self.refresh()
+
+    def refresh(self) -> "UsageGuide":
+        """Reload the manual if the file was modified since it was last loaded"""
+        modified_ns = self.path.stat().st_mtime_ns
+        with self._lock:
+            if modified_ns != self._modified_ns:
+                text = self.path.read_text(encoding="utf-8")
+                digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                if digest != self.digest:
+                    if self.digest:
+                        logger.info("Reloaded the usage guide from %s", self.path)
+                    self.text, self.digest = text, digest
+                    self.sections = split_sections(text)
+                    self.idf = self._inverse_document_frequencies(self.sections)
+                    self._section_words = [Counter(tokenize(section.text)) for section in self.sections]
+                    self._average_section_length = (
+                        sum(sum(words.values()) for words in self._section_words) / max(len(self.sections), 1)
+                    )
+                self._modified_ns = modified_ns
+        return self
+
+    @staticmethod
+    def _inverse_document_frequencies(sections: List[Section]) -> Dict[str, float]:
+        """Weigh each word of the manual by how few of its sections use it (smoothed, as in scikit-learn)"""
+        document_frequencies = Counter(word for section in sections for word in set(tokenize(section.text)))
+        return {
+            word: math.log((1 + len(sections)) / (1 + frequency)) + 1
+            for word, frequency in document_frequencies.items()
+        }
+
+    def search(self, query: str, max_sections: int = SEARCH_RESULT_SECTIONS) -> List[Section]:
+        """Find the sections most relevant to the query, best first, by their BM25 score (sections that share no
+        words with the query are left out)"""
+        self.refresh()
+        with self._lock:
+            sections, section_words = self.sections, self._section_words
+            average_length, idf = self._average_section_length, self.idf
+        query_words = set(tokenize(query))
+        scores = []
+        for index, words in enumerate(section_words):
+            length_norm = 1 - _BM25_B + _BM25_B * sum(words.values()) / max(average_length, 1)
+            score = sum(
+                idf[word] * words[word] * (_BM25_K1 + 1) / (words[word] + _BM25_K1 * length_norm)
+                for word in query_words if words[word]
+            )
+            if score > 0:
+                scores.append((score, index))
+        return [sections[index] for _, index in sorted(scores, key=lambda entry: (-entry[0], entry[1]))[:max_sections]]
+
+
+class _CachedAnswer(NamedTuple):
+    digest: str
+    answer: str
+
+
+class UsageGuideAnswerCache:
+    """A thread-safe cache of the chatbot's answers to how-to questions, looked up by the questions' words in order
+    (see question_key), so rewordings that only add or drop filler words, like "how do I create a new rental,
+    please?", find the answer to "How do I create a rental?" - but a question that differs by any other word (e.g.
+    "scooter" for "wheelchair", "can" for "how", or "not"), or asks about the same words in another order, doesn't.
+    The answers are tied to the hash of the manual they were given from, and are dropped once it changes.
+    """
+
+    def __init__(self, guide: UsageGuide, max_size: int = ANSWER_CACHE_SIZE):
+        self.guide = guide
+        self.max_size = max_size
+        self._answers: "OrderedDict[str, _CachedAnswer]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, question: str) -> Optional[str]:
+        """Get the cached answer to a question with the same key, if any"""
+        digest = self.guide.refresh().digest
+        key = question_key(question)
+        with self._lock:
+            self._answers = OrderedDict(
+                (cached_key, cached) for cached_key, cached in self._answers.items() if cached.digest == digest
+            )
+            if key not in self._answers:
+                return None
+            self._answers.move_to_end(key)
+            logger.debug("Usage guide answer cache hit: %r", key)
+            return self._answers[key].answer
+
+    def put(self, question: str, answer: str) -> None:
+        """Cache the answer to a how-to question, evicting the least recently used answer when full"""
+        key = question_key(question)
+        if not key:
+            return
+        cached = _CachedAnswer(digest=self.guide.refresh().digest, answer=answer)
+        with self._lock:
+            self._answers[key] = cached
+            self._answers.move_to_end(key)
+            while len(self._answers) > self.max_size:
+                self._answers.popitem(last=False)
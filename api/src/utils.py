@@ -4,18 +4,23 @@ from fastapi import HTTPException
 
 from api.src.exceptions import DeviceNotFoundException, ReservationNotFoundOrNotEditableException, \
     DeviceNotFoundOrInvalidStatusException, RentalNotFoundOrNotEditableException, \
-    NewReservationNotFoundOrNotEditableException
+    NewReservationNotFoundOrNotEditableException, ChatBusyException
+from api.src.metrics import request_outcomes
 
 
 def auto_process_database_errors(func):
-    """Automatically process database errors and raise appropriate HTTPExceptions."""
+    """Automatically process database errors and raise appropriate HTTPExceptions, counting each outcome."""
 
     @wraps(func)
     def wrapper(*args, **kwargs):
         """Wrap the function and process database errors."""
+        outcome = "error"
         try:
-            return func(*args, **kwargs)
+            result = func(*args, **kwargs)
+            outcome = "ok"
+            return result
         except DeviceNotFoundException as exc:
+            outcome = "not_found"
             raise HTTPException(status_code=404, detail=exc.message) from exc
         except (
                 DeviceNotFoundOrInvalidStatusException,
@@ -23,6 +28,12 @@ def auto_process_database_errors(func):
                 ReservationNotFoundOrNotEditableException,
                 NewReservationNotFoundOrNotEditableException,
         ) as exc:
+            outcome = "invalid"
             raise HTTPException(status_code=400, detail=exc.message) from exc
+        except ChatBusyException as exc:
+            outcome = "busy"
+            raise HTTPException(status_code=503, detail=exc.message) from exc
+        finally:
+            request_outcomes.labels(endpoint=func.__name__, outcome=outcome).inc()
 
     return wrapper
@@ -0,0 +1 @@
+"""Offline performance benchmarks, run against moto-backed AWS services and stubbed models (no credentials needed)"""
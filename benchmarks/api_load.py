@@ -0,0 +1,644 @@
+"""Offline API load test: concurrent desk clients driving every API route over a moto-backed synthetic season.
+
+The whole CNE season (every fair day, see benchmarks.season) is loaded into a moto-backed DynamoDB, with a rental form
+in a moto-backed S3 bucket for every rental, and concurrent clients send a weighted mix of requests to the API app
+in-process, through httpx's ASGI transport - mostly the reads the UI's pages make, with the desks' tasks (rentals from
+pickup to return, reservations, inventory changes, settings and forms) and chatbot questions (answered by the chatbot
+benchmark's scripted model) in between. Rental forms are mostly uploaded and downloaded as the UI does, with presigned
+S3 URLs from the API, and now and then through the API's deprecated /forms routes that proxy them. For every route
+(and the presigned S3 requests), the number of requests, failures, throughput and p50/p95/p99 latency are reported:
+
+    python -m benchmarks.api_load
+    python -m benchmarks.api_load --clients 16 --requests 5000
+
+With --slow-chat, the scripted model takes as long to respond as Gemini does, and extra clients keep the chatbot busy
+with streamed questions throughout. Chats then take seconds, and the rental routes must not wait on them: instead of
+being compared against the baseline, their p95 latency is checked against a fixed budget:
+
+    python -m benchmarks.api_load --slow-chat
+
+Each client writes on its own fair day with its own devices, so the writes don't conflict and every request should
+succeed. moto handles one AWS request at a time (its in-memory tables aren't thread-safe), so the latencies include
+waiting for it under load, where DynamoDB would serve the requests concurrently.
+
+The requests only depend on the options, but the latencies depend on the machine, so they are compared against the
+stored baseline (benchmarks/api_load_baseline.json) with a generous tolerance, to catch large regressions only; pass
+--update-baseline to store the current results as the new baseline after an intended change, or on a new machine.
+"""
+import argparse
+import asyncio
+import logging
+import math
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence
+from unittest.mock import patch
+
+import httpx
+from requests import Response as S3Response, request as s3_request
+
+from benchmarks.baseline import exit_with_regressions, read_baseline, write_baseline
+from benchmarks.chatbot import build_questions, scripted_model
+from benchmarks.season import Season, mock_season
+from common.cne_dates import CNEDates
+from common.constants import DeviceStatus, DeviceType, Location, PaymentMethod, ReservationStatus
+from common.data_models import ChatStreamEventType
+from common.utils import get_default_timezone
+
+BASELINE_PATH = Path(__file__).resolve().parent / "api_load_baseline.json"
+# how much slower than the baseline a route's median latency may get (relatively, and at least absolutely, so that
+# the fastest routes don't flag noise) before it is reported as a regression - the tail latencies of the rarer routes
+# are too noisy to compare
+LATENCY_TOLERANCE = 1.0
+LATENCY_SLACK_MS = 10.0
+DEFAULT_CLIENTS = 8
+DEFAULT_REQUESTS = 1000
+# a stand-in for a filled-in rental form, about the size of a real one
+FORM_BYTES = b"%PDF-1.7\n" + bytes(64 * 1024)
+# the presigned S3 requests the clients make, reported alongside the API's routes
+S3_UPLOAD_ROUTE = "S3 PUT rental form"
+S3_DOWNLOAD_ROUTE = "S3 GET rental form"
+# --slow-chat: every model response takes about as long as one from Gemini, and this many clients do nothing but chat,
+# which fills the chatbot's concurrency limit and queue - a rental request that had to wait on a chat would take
+# seconds, so the rental routes' p95 latency must stay well below the model's latency
+SLOW_CHAT_MODEL_LATENCY_SECONDS = 3.0
+SLOW_CHAT_CLIENTS = 8
+RENTAL_P95_BUDGET_MS = 2000.0
+
+
+@dataclass
+class RouteResult:
+    """The measurements for a single route"""
+    route: str
+    requests: int
+    failures: int
+    requests_per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+@dataclass
+class _RouteSamples:
+    latencies_ms: List[float] = field(default_factory=list)
+    failures: int = 0
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """Get the nearest-rank percentile of sorted values"""
+    return sorted_values[max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)]
+
+
+@dataclass
+class _LoadTest:
+    """What every client of a load test shares: the API client, the season, the seed and each route's samples"""
+    http_client: httpx.AsyncClient
+    season: Season
+    seed: int = 0
+    samples: Dict[str, _RouteSamples] = field(default_factory=lambda: defaultdict(_RouteSamples))
+
+
+class _WorkflowFailed(Exception):
+    """A request of a desk task failed, so the rest of the task is skipped"""
+
+
+# pylint: disable=too-many-instance-attributes,too-many-public-methods
+class DeskClient:
+    """A client sending one rental desk's requests: the reads of the UI's pages, and whole desk tasks (e.g. a rental
+    from pickup to return) one request after another, on the client's own fair day and devices"""
+
+    def __init__(self, index: int, load_test: _LoadTest, devices: Dict[DeviceType, List[str]]):
+        self.index = index
+        self.http_client = load_test.http_client
+        self.season = load_test.season
+        self.samples = load_test.samples
+        self.rng = random.Random(f"{load_test.seed}-{index}")
+        self.cne_year = CNEDates.get_cne_year()
+        # the fair day this client adds rentals and reservations on, so no two clients generate the same new IDs
+        self.day = self.season.days[index % len(self.season.days)]
+        self.devices = devices
+        self.requests_sent = 0
+        self.questions = [question.question for question in build_questions()]
+        # (weight, action) - reads send one request, tasks send several
+        self.actions = [
+            (2, self.health),
+            (1, self.metrics),
+            (10, self.available_devices),
+            (6, self.full_inventory),
+            (3, self.reservation_count),
+            (8, self.reservations_on_date),
+            (8, self.rentals_on_date),
+            (6, self.setting),
+            (1, self.update_settings),
+            (3, self.view_rental_form),
+            (1, self.chat),
+            (1, self.chat_stream),
+            (3, self.rental_task),
+            (2, self.reservation_task),
+            (1, self.device_task),
+            (1, self.proxied_rental_form_task),
+        ]
+        if index == 0:
+            # the API picks new devices' IDs itself, so only one client adds (and then removes) devices
+            self.actions.append((1, self.new_device_task))
+
+    async def run(self, requests: int):
+        """Send (about) the number of requests, finishing the task in progress once it is reached"""
+        weights, actions = zip(*self.actions)
+        while self.requests_sent < requests:
+            try:
+                await self.rng.choices(actions, weights=weights)[0]()
+            except _WorkflowFailed:
+                pass
+
+    async def send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request, recording its latency, and raise _WorkflowFailed if it failed"""
+        start = time.perf_counter()
+        response = await self.http_client.request(method, path, **kwargs)
+        self._record(path, start, response.status_code, response.text)
+        return response
+
+    async def send_to_s3(self, method: str, url: str, route: str, **kwargs) -> S3Response:
+        """Send a request to a presigned S3 URL (through requests, which moto intercepts, as the UI does) in a worker
+        thread, recording its latency under the route, and raise _WorkflowFailed if it failed"""
+        start = time.perf_counter()
+        response = await asyncio.to_thread(s3_request, method, url, timeout=60, **kwargs)
+        self._record(route, start, response.status_code, response.text)
+        return response
+
+    def _record(self, route: str, start: float, status_code: int, text: str):
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.requests_sent += 1
+        route_samples = self.samples[route]
+        route_samples.latencies_ms.append(latency_ms)
+        if status_code != 200:
+            route_samples.failures += 1
+            raise _WorkflowFailed(f"{route}: {status_code} {text[:200]}")
+
+    def _random_day(self) -> str:
+        return self.rng.choice(self.season.days).isoformat()
+
+    def _random_rental_id(self) -> str:
+        return self.rng.choice(self.season.rentals).id
+
+    # ==============================
+    # READS
+    # ==============================
+
+    async def health(self):
+        """Check the API is up"""
+        await self.send("GET", "/health")
+
+    async def metrics(self):
+        """Scrape the API's metrics"""
+        await self.send("GET", "/metrics")
+
+    async def available_devices(self):
+        """List the available devices of a type, at one of the locations or at either"""
+        params = {"cne_year": self.cne_year, "device_type": self.rng.choice(list(DeviceType))}
+        if self.rng.random() < 0.5:
+            params["location"] = self.rng.choice(list(Location))
+        await self.send("GET", "/devices/get_available_devices", params=params)
+
+    async def full_inventory(self):
+        """Get the whole inventory, as the inventory page does"""
+        await self.send("GET", "/devices/get_full_inventory", params={"cne_year": self.cne_year})
+
+    async def reservation_count(self):
+        """Count the reservations per day and device type, as the reservations dashboard does"""
+        await self.send("GET", "/reservations/get_reservation_count", params={"cne_year": self.cne_year})
+
+    async def reservations_on_date(self):
+        """List a fair day's reservations of a device type"""
+        await self.send("GET", "/reservations/get_reservations_on_date", params={
+            "date": self._random_day(),
+            "device_type": self.rng.choice(list(DeviceType)),
+            "exclude_picked_up_reservations": self.rng.random() < 0.5,
+        })
+
+    async def rentals_on_date(self):
+        """List a fair day's rentals of a device type"""
+        await self.send("GET", "/rentals/get_rentals_on_date", params={
+            "date": self._random_day(),
+            "device_type": self.rng.choice(list(DeviceType)),
+            "in_progress_rentals_only": self.rng.random() < 0.5,
+        })
+
+    async def setting(self):
+        """Get a device type's fee or deposit"""
+        device_type = self.rng.choice(list(DeviceType))
+        setting_id = self.rng.choice([DeviceType.get_fee_setting_id, DeviceType.get_deposit_setting_id])(device_type)
+        await self.send("GET", "/settings/get", params={"cne_year": self.cne_year, "setting_id": setting_id})
+
+    async def view_rental_form(self):
+        """Download a rental's form through a presigned S3 URL, as the manage rental page does"""
+        url = (await self.send(
+            "GET", "/forms/rental_form_download_url", params={"rental_id": self._random_rental_id()}
+        )).json()["url"]
+        await self.send_to_s3("GET", url, S3_DOWNLOAD_ROUTE)
+
+    async def chat(self):
+        """Ask the chatbot one of the benchmark's questions"""
+        await self.send("POST", "/chat/ask", json={"message": self.rng.choice(self.questions), "history": []})
+
+    async def chat_stream(self):
+        """Ask the chatbot one of the benchmark's questions, streaming the answer"""
+        response = await self.send(
+            "POST", "/chat/ask_stream", json={"message": self.rng.choice(self.questions), "history": []}
+        )
+        # the stream has started by the time the chatbot fails, so failures are error events rather than statuses
+        if f"event: {ChatStreamEventType.ERROR}\n" in response.text:
+            self.samples["/chat/ask_stream"].failures += 1
+
+    async def chat_until(self, done: asyncio.Event):
+        """Keep the chatbot busy with streamed questions, as the UI's chatbot page asks them, until done is set"""
+        while not done.is_set():
+            await self.chat_stream()
+
+    # ==============================
+    # TASKS
+    # ==============================
+
+    async def update_settings(self):
+        """Save a device type's fee, as the settings page does (unchanged, so other clients' reads hold)"""
+        device_type = self.rng.choice(list(DeviceType))
+        fee = (await self.send("GET", "/settings/get", params={
+            "cne_year": self.cne_year, "setting_id": DeviceType.get_fee_setting_id(device_type)
+        })).json()
+        await self.send(
+            "PUT", "/settings/update", params={"cne_year": self.cne_year},
+            json={DeviceType.get_fee_setting_id(device_type): fee},
+        )
+
+    async def rental_task(self):
+        """Rent one of the client's devices out, upload its form, swap the device, then return it"""
+        device_type = self.rng.choice([device_type for device_type in DeviceType if len(self.devices[device_type]) > 1])
+        device_id, new_device_id = self.devices[device_type][:2]
+        pickup_time = get_default_timezone().localize(
+            datetime.combine(self.day, datetime.min.time()) + timedelta(hours=10, minutes=self.rng.randrange(480))
+        )
+        location = self.rng.choice(list(Location))
+        rental_id = (await self.send("POST", "/rentals/add", json={
+            "cne_year": self.cne_year,
+            "date": self.day.isoformat(),
+            "device_id": device_id,
+            "device_type": device_type,
+            "reservation_id": None,
+            "pickup_location": location,
+            "pickup_time": pickup_time.isoformat(),
+            "status": "In Progress",
+            "name": "Load Test Renter",
+            "phone_number": f"416{self.rng.randint(2000000, 9999999)}",
+            "address": "100 Princes' Blvd",
+            "city": "Toronto",
+            "province": "ON",
+            "postal_code": "M6K 3C3",
+            "country": "CAN",
+            "fee_payment_amount": 20,
+            "fee_payment_method": sorted(PaymentMethod.get_accepted_fee_payment_methods())[0],
+            "deposit_payment_amount": 50,
+            "deposit_payment_method": sorted(PaymentMethod.get_accepted_deposit_payment_methods())[0],
+            "items_left_behind": [],
+            "notes": None,
+            "staff_name": "Load Test Staff",
+        })).json()
+        upload_url = (await self.send(
+            "GET", "/forms/rental_form_upload_url", params={"rental_id": rental_id}
+        )).json()["url"]
+        await self.send_to_s3(
+            "PUT", upload_url, S3_UPLOAD_ROUTE, data=FORM_BYTES, headers={"Content-Type": "application/pdf"}
+        )
+        await self.send("POST", "/rentals/change_device", json={
+            "cne_year": self.cne_year,
+            "date": self.day.isoformat(),
+            "id": rental_id,
+            "device_type": device_type,
+            "location": location,
+            "old_device_id": device_id,
+            "new_device_id": new_device_id,
+            "staff_name": "Load Test Staff",
+        })
+        await self.send("POST", "/rentals/complete_rental", json={
+            "cne_year": self.cne_year,
+            "id": rental_id,
+            "date": self.day.isoformat(),
+            "device_id": new_device_id,
+            "reservation_id": None,
+            "name": "Load Test Renter",
+            "return_location": location,
+            "return_time": (pickup_time + timedelta(hours=3)).isoformat(),
+            "return_staff_name": "Load Test Staff",
+        })
+
+    async def reservation_task(self):
+        """Book a reservation, edit it, then cancel it"""
+        reservation = {
+            "cne_year": self.cne_year,
+            "date": self.day.isoformat(),
+            "device_type": self.rng.choice(list(DeviceType)),
+            "location": self.rng.choice(list(Location)),
+            "reservation_time": get_default_timezone().localize(
+                datetime.combine(self.day, datetime.min.time()) + timedelta(hours=self.rng.randint(10, 17))
+            ).isoformat(),
+            "name": "Load Test Booker",
+            "phone_number": f"416{self.rng.randint(2000000, 9999999)}",
+            "notes": None,
+            "status": ReservationStatus.CONFIRMED,
+        }
+        reservation["id"] = (await self.send("POST", "/reservations/add", json=reservation)).json()
+        await self.send("POST", "/reservations/update_reservation", json={**reservation, "notes": "Needs a cushion"})
+        await self.send("POST", "/reservations/update_reservation_status", params={
+            "cne_year": self.cne_year, "reservation_id": reservation["id"], "reservation_status": "Cancelled",
+        })
+
+    async def device_task(self):
+        """Move one of the client's devices to another location and back, and take it out of service and back"""
+        device_id = self.devices[self.rng.choice(list(DeviceType))][-1]
+        for location in (Location.PG, Location.BLC):
+            await self.send(
+                "POST", "/devices/update_location", params={"cne_year": self.cne_year, "location": location},
+                json=[device_id],
+            )
+        for status in (DeviceStatus.BACKUP, DeviceStatus.AVAILABLE):
+            await self.send(
+                "POST", "/devices/update_status", params={"cne_year": self.cne_year, "status": status},
+                json=[device_id],
+            )
+
+    async def proxied_rental_form_task(self):
+        """Upload a rental's form and download it through the API, as older UIs still do (the deprecated /forms
+        routes the presigned URLs replaced)"""
+        rental_id = self._random_rental_id()
+        await self.send(
+            "PUT", "/forms/upload_rental_form", params={"rental_id": rental_id},
+            files={"pdf_bytes": (f"rental_form_{rental_id}.pdf", FORM_BYTES, "application/pdf")},
+        )
+        await self.send("GET", "/forms/download_rental_form", params={"rental_id": rental_id})
+
+    async def new_device_task(self):
+        """Add a device to the inventory, then remove it"""
+        device_type = self.rng.choice(list(DeviceType))
+        await self.send("POST", "/devices/add", json=[{
+            "cne_year": self.cne_year, "type": device_type, "status": DeviceStatus.AVAILABLE, "location": Location.BLC,
+        }])
+        inventory = (await self.send("GET", "/devices/get_full_inventory", params={"cne_year": self.cne_year})).json()
+        device_ids = [device["id"] for device in inventory if device["type"] == device_type]
+        await self.send(
+            "POST", "/devices/remove", params={"cne_year": self.cne_year},
+            json=[max(device_ids, key=lambda device_id: int(device_id[1:]))],
+        )
+
+
+def _share_devices(season: Season, clients: int) -> List[Dict[DeviceType, List[str]]]:
+    """Share the devices that are available at the end of the season between the clients, so each one only changes
+    its own"""
+    shares = [{device_type: [] for device_type in DeviceType} for _ in range(clients)]
+    available = [device for device in season.devices if device.status == DeviceStatus.AVAILABLE]
+    for position, device in enumerate(sorted(available, key=lambda device: device.id)):
+        shares[position % clients][device.type].append(device.id)
+    return shares
+
+
+@contextmanager
+def _serialised_moto() -> Iterator[None]:
+    """Let moto handle one AWS request at a time: its in-memory tables aren't thread-safe (e.g. a transaction copies a
+    table while another request writes to it), unlike DynamoDB, while the API makes its calls from worker threads -
+    and so do the clients, with their presigned S3 requests (which moto serves through the requests library)"""
+    # pylint: disable=import-outside-toplevel
+    from moto.core.botocore_stubber import BotocoreStubber
+    from moto.core.custom_responses_mock import CallbackResponse
+
+    lock = threading.RLock()
+    process_request = BotocoreStubber.process_request
+    get_response = CallbackResponse.get_response
+
+    def process_request_serially(stubber, request):
+        with lock:
+            return process_request(stubber, request)
+
+    def get_response_serially(callback_response, request):
+        with lock:
+            return get_response(callback_response, request)
+
+    with patch.object(BotocoreStubber, "process_request", process_request_serially), \
+            patch.object(CallbackResponse, "get_response", get_response_serially):
+        yield
+
+
+async def _run_clients(
+        app, season: Season, seed: int, desk_requests: Sequence[int], chat_clients: int
+) -> Dict[str, _RouteSamples]:
+    """Run a desk client for each number of requests, and the chatting clients until the desk clients are done"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=60) as http_client:
+        load_test = _LoadTest(http_client, season, seed)
+        desk_clients = [
+            DeskClient(index, load_test, devices)
+            for index, devices in enumerate(_share_devices(season, len(desk_requests)))
+        ]
+        chatting_clients = [
+            DeskClient(len(desk_requests) + index, load_test, {}) for index in range(chat_clients)
+        ]
+        done = asyncio.Event()
+
+        async def run_desk_clients():
+            try:
+                await asyncio.gather(*(
+                    desk_client.run(requests) for desk_client, requests in zip(desk_clients, desk_requests)
+                ))
+            finally:
+                done.set()
+
+        await asyncio.gather(run_desk_clients(), *(client.chat_until(done) for client in chatting_clients))
+    return load_test.samples
+
+
+def _create_forms_bucket(season: Season) -> None:
+    """Create the API's S3 bucket, holding a rental form for every rental of the season"""
+    from api.src.s3_service import S3Service  # pylint: disable=import-outside-toplevel
+
+    s3_service = S3Service()
+    region = s3_service.s3_client.meta.region_name
+    s3_service.s3_client.create_bucket(
+        Bucket=s3_service.bucket,
+        **({} if region == "us-east-1" else {"CreateBucketConfiguration": {"LocationConstraint": region}}),
+    )
+    for rental in season.rentals:
+        s3_service.upload_rental_form(pdf_bytes=FORM_BYTES, rental_id=rental.id)
+
+
+def _summarise(samples: Dict[str, _RouteSamples], elapsed: float) -> List[RouteResult]:
+    """Summarise each route's samples, over the time the clients took"""
+    results = []
+    for route, route_samples in sorted(samples.items()):
+        latencies = sorted(route_samples.latencies_ms)
+        results.append(RouteResult(
+            route=route,
+            requests=len(latencies),
+            failures=route_samples.failures,
+            requests_per_second=len(latencies) / elapsed,
+            p50_ms=percentile(latencies, 50),
+            p95_ms=percentile(latencies, 95),
+            p99_ms=percentile(latencies, 99),
+        ))
+    return results
+
+
+def run_api_load_test(
+        clients: int = DEFAULT_CLIENTS,
+        requests: int = DEFAULT_REQUESTS,
+        seed: int = 0,
+        chat_clients: int = 0,
+        model_latency_seconds: float = 0.0,
+        **season_kwargs,
+) -> List[RouteResult]:
+    """
+    Send about `requests` requests to the API from `clients` concurrent desk clients, over a synthetic season (the
+    whole fair by default, see benchmarks.season.generate_season for the options) generated from the seed, and measure
+    every route. Meanwhile, `chat_clients` more clients ask the chatbot one streamed question after another, and the
+    scripted model takes `model_latency_seconds` for each response. Requires the API's environment (e.g. S3_BUCKET, a
+    dummy GEMINI_API_KEY), which main() fills in.
+    """
+    # pylint: disable=import-outside-toplevel
+    # the API reads its settings when it's imported
+    import api.main
+    from api.routers.chat import get_chat_service
+
+    season_kwargs.setdefault("days", len(CNEDates.get_cne_date_list()))
+    if clients > season_kwargs["days"]:
+        raise ValueError(f"Each client needs a fair day of its own - got {clients} clients for {season_kwargs['days']}")
+    desk_requests = [requests // clients + (index < requests % clients) for index in range(clients)]
+    with mock_season(seed=seed, **season_kwargs) as season:
+        _create_forms_bucket(season)
+        model = scripted_model(build_questions(), latency_seconds=model_latency_seconds)
+        with _serialised_moto(), get_chat_service().override_model(model):
+            start = time.perf_counter()
+            samples = asyncio.run(_run_clients(api.main.app, season, seed, desk_requests, chat_clients))
+            elapsed = time.perf_counter() - start
+    return _summarise(samples, elapsed)
+
+
+def get_api_routes() -> List[str]:
+    """Get the paths of every route the API serves (but its docs)"""
+    import api.main  # pylint: disable=import-outside-toplevel
+
+    return sorted([*api.main.app.openapi()["paths"], "/metrics"])
+
+
+def get_load_test_routes() -> List[str]:
+    """Get every route the load test measures: the API's routes, and the presigned S3 requests"""
+    return sorted([*get_api_routes(), S3_UPLOAD_ROUTE, S3_DOWNLOAD_ROUTE])
+
+
+def _describe_failures(result: RouteResult) -> List[str]:
+    return [f"{result.route}: {result.failures} of {result.requests} requests failed"] if result.failures else []
+
+
+def compare_to_baseline(results: Sequence[RouteResult], baseline: Dict[str, dict]) -> List[str]:
+    """Describe every route that failed, is missing from the results, or got slower than the baseline (beyond
+    LATENCY_TOLERANCE and LATENCY_SLACK_MS) at the median"""
+    regressions = []
+    by_route = {result.route: result for result in results}
+    for route in sorted(set(baseline) - set(by_route)):
+        regressions.append(f"{route}: not requested")
+    for result in results:
+        regressions.extend(_describe_failures(result))
+        expected = baseline.get(result.route)
+        if expected is not None and result.p50_ms > expected["p50_ms"] * (1 + LATENCY_TOLERANCE) + LATENCY_SLACK_MS:
+            regressions.append(f"{result.route} p50: {result.p50_ms:.1f} ms (baseline {expected['p50_ms']:.1f} ms)")
+    return regressions
+
+
+def check_rental_latency_budget(
+        results: Sequence[RouteResult], budget_ms: float = RENTAL_P95_BUDGET_MS
+) -> List[str]:
+    """Describe every route that failed, and every rental route whose p95 latency is over the budget"""
+    regressions = []
+    for result in results:
+        regressions.extend(_describe_failures(result))
+        if result.route.startswith("/rentals/") and result.p95_ms > budget_ms:
+            regressions.append(f"{result.route} p95: {result.p95_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, dict]:
+    """Load the stored baseline measurements, by route"""
+    return read_baseline(path)
+
+
+def save_baseline(results: Sequence[RouteResult], path: Path = BASELINE_PATH):
+    """Store the measurements as the new baseline"""
+    write_baseline({
+        result.route: {
+            metric: round(value, 2) for metric, value in asdict(result).items() if metric not in ("route", "failures")
+        }
+        for result in results
+    }, path)
+
+
+def main():
+    """Run the load test, print the results and compare them against the baseline"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=DEFAULT_CLIENTS, help="Number of concurrent clients")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="Number of requests to send in total")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic season")
+    parser.add_argument(
+        "--slow-chat", action="store_true",
+        help="Give the model Gemini's latency, keep the chatbot busy, and check the rental routes' latency budget",
+    )
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline")
+    args = parser.parse_args()
+    if args.slow_chat and args.update_baseline:
+        parser.error("--slow-chat results are checked against a fixed budget rather than a baseline")
+
+    # no real AWS or Gemini calls are made, but the clients still need (dummy) settings to be built
+    for variable, value in (
+            ("AWS_ACCESS_KEY_ID", "benchmark"), ("AWS_SECRET_ACCESS_KEY", "benchmark"),
+            ("AWS_DEFAULT_REGION", "us-east-1"), ("GEMINI_API_KEY", "benchmark"), ("S3_BUCKET", "benchmark-forms"),
+            ("CHAT_ENABLED", "true"),
+    ):
+        os.environ.setdefault(variable, value)
+    os.environ.setdefault("CNE_YEAR", str(CNEDates.get_cne_year()))
+    # the API logs every write, which would swamp the results
+    logging.disable(logging.INFO)
+
+    start = time.perf_counter()
+    results = run_api_load_test(
+        clients=args.clients,
+        requests=args.requests,
+        seed=args.seed,
+        **({"chat_clients": SLOW_CHAT_CLIENTS, "model_latency_seconds": SLOW_CHAT_MODEL_LATENCY_SECONDS}
+           if args.slow_chat else {}),
+    )
+    total_requests = sum(result.requests for result in results)
+
+    print(f"{'route':<42}{'requests':>9}{'failed':>7}{'req/s':>8}{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}")
+    for result in results:
+        print(
+            f"{result.route:<42}{result.requests:>9}{result.failures:>7}{result.requests_per_second:>8.1f}"
+            f"{result.p50_ms:>8.1f}{result.p95_ms:>8.1f}{result.p99_ms:>8.1f}"
+        )
+    print(f"{total_requests} requests from {args.clients} clients in {time.perf_counter() - start:.1f} s (with setup)")
+
+    if args.slow_chat:
+        exit_with_regressions(
+            check_rental_latency_budget(results),
+            heading="Over the rental routes' latency budget:",
+            no_regressions="Within budget",
+        )
+    elif args.update_baseline:
+        save_baseline(results)
+        print(f"Stored the results as the new baseline in {BASELINE_PATH}")
+    elif args.clients == DEFAULT_CLIENTS and args.requests == DEFAULT_REQUESTS and args.seed == 0:
+        exit_with_regressions(compare_to_baseline(results, load_baseline()))
+
+
+if __name__ == "__main__":
+    main()
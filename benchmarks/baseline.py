@@ -0,0 +1,27 @@
+"""The stored baselines the benchmarks compare their (deterministic) measurements against, as JSON files by the name
+of what was measured (a route, a question)."""
+import json
+import sys
+from pathlib import Path
+from typing import Dict, NoReturn, Sequence
+
+
+def read_baseline(path: Path) -> Dict[str, dict]:
+    """Read the stored baseline measurements (none if no baseline was stored yet)"""
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+def write_baseline(baseline: Dict[str, dict], path: Path):
+    """Store the measurements as the new baseline"""
+    path.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+
+
+def exit_with_regressions(
+        regressions: Sequence[str],
+        heading: str = "Regressions against the baseline:",
+        no_regressions: str = "No regressions",
+) -> NoReturn:
+    """Print the regressions found (or that there were none), and exit - with status 1 if there were any, so a
+    benchmark run fails CI"""
+    print("\n".join([heading, *regressions]) if regressions else no_regressions)
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,153 @@
+"""Benchmark the input tokens spent on the chatbot's list tool results.
+
+Stubs out both Gemini and DynamoDB: for each benchmark question, the model calls
+one list tool over a busy day's data (198 devices, 150 rentals and 120
+reservations by default), then answers. The turn's ``ChatResponse.input_tokens``
+(estimated by pydantic-ai's FunctionModel from the messages it was sent) is
+reported next to the size of the tool result sent back to the model:
+
+    python -m benchmarks.chat_tokens --rentals 150 --reservations 120
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+from typing import List
+
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from api.src.chat_service import GEMINI_MODEL_FALLBACK_CHAIN, ChatService
+from common.constants import DeviceStatus, DeviceType, Location, ReservationStatus
+from common.utils import get_default_timezone
+
+CNE_YEAR = 2025
+BENCHMARK_DATE = datetime.date(2025, 8, 25)
+BENCHMARK_QUESTIONS = [
+    ("What does the inventory look like?", "lookup_full_inventory", {}),
+    ("Which scooters are rented out?", "lookup_devices_by_status", {"status": DeviceStatus.RENTED}),
+    ("Who rented on August 25?", "lookup_rentals_on_date", {"date": BENCHMARK_DATE}),
+    ("Which rentals are still out?", "lookup_outstanding_rentals", {}),
+    ("Who has a reservation on August 25?", "lookup_reservations_on_date", {"date": BENCHMARK_DATE}),
+]
+
+
+class SeasonDynamoDBService:  # pylint: disable=unused-argument
+    """Stands in for DynamoDBService, answering the list tools' queries from a synthetic busy day"""
+
+    def __init__(self, num_rentals: int, num_reservations: int):
+        self.devices = [
+            {
+                "cne_year": CNE_YEAR,
+                "id": f"{device_type.get_prefix()}{i:02}",
+                "type": device_type,
+                "status": DeviceStatus.RENTED if i % 4 else DeviceStatus.AVAILABLE,
+                "location": Location.BLC if i % 3 else Location.PG,
+            }
+            for device_type in DeviceType
+            for i in range(1, 100)
+        ]
+        pickup_start = get_default_timezone().localize(datetime.datetime(2025, 8, 25, 10))
+        self.rentals = [
+            {
+                "cne_year": CNE_YEAR,
+                "id": f"{device_type.get_prefix()}0825{i:03}",
+                "date": BENCHMARK_DATE,
+                "device_id": f"{device_type.get_prefix()}{i % 99 + 1:02}",
+                "device_type": device_type,
+                "reservation_id": None,
+                "pickup_location": Location.BLC if i % 3 else Location.PG,
+                "pickup_time": pickup_start + datetime.timedelta(minutes=2 * i),
+                "status": "Completed" if i % 2 else "In Progress",
+                "name": f"Guest Number {i}",
+                "phone_number": f"416555{i:04}",
+                "deposit_payment_method": "Cash",
+                "deposit_payment_amount": 50,
+                "items_left_behind": [],
+                "notes": None,
+                "return_location": Location.BLC if i % 2 else None,
+                "return_time": pickup_start + datetime.timedelta(hours=4, minutes=2 * i) if i % 2 else None,
+            }
+            for i in range(1, num_rentals + 1)
+            for device_type in (DeviceType.WHEELCHAIR if i % 2 else DeviceType.SCOOTER,)
+        ]
+        self.reservations = [
+            {
+                "cne_year": CNE_YEAR,
+                "id": f"{device_type.get_prefix()}0825{i:03}",
+                "date": BENCHMARK_DATE,
+                "device_type": device_type,
+                "location": Location.BLC if i % 3 else Location.PG,
+                "reservation_time": pickup_start + datetime.timedelta(minutes=3 * i),
+                "name": f"Guest Number {i}",
+                "phone_number": f"416555{i:04}",
+                "notes": None,
+                "status": ReservationStatus.RESERVED,
+                "rental_id": None,
+            }
+            for i in range(1, num_reservations + 1)
+            for device_type in (DeviceType.WHEELCHAIR if i % 2 else DeviceType.SCOOTER,)
+        ]
+
+    def get_full_inventory(self, cne_year: int) -> List[dict]:
+        """Get every device"""
+        return self.devices
+
+    def get_devices_by_status(self, cne_year: int, status: DeviceStatus, device_type=None, location=None) -> List[dict]:
+        """Get the devices with the given status"""
+        return [device for device in self.devices if device["status"] == status]
+
+    def get_rentals_on_date(self, date: datetime.date, device_type=None, in_progress_rentals_only=False) -> List[dict]:
+        """Get the day's rentals"""
+        return self.rentals
+
+    def get_outstanding_rentals(self, cne_year: int, device_type=None) -> List[dict]:
+        """Get the rentals that are still in progress"""
+        return [rental for rental in self.rentals if rental["status"] == "In Progress"]
+
+    def get_reservations_on_date(self, date: datetime.date, device_type=None) -> List[dict]:
+        """Get the day's reservations"""
+        return self.reservations
+
+
+def call_tool_then_answer(messages, _info: AgentInfo) -> ModelResponse:
+    """Stub model: call the question's tool, then answer"""
+    if len(messages) == 1:
+        question = messages[0].parts[-1].content
+        _, tool_name, tool_args = next(entry for entry in BENCHMARK_QUESTIONS if entry[0] == question)
+        return ModelResponse(parts=[ToolCallPart(tool_name, {name: str(value) for name, value in tool_args.items()})])
+    return ModelResponse(parts=[TextPart("Here is what I found.")])
+
+
+def main():
+    """Run the benchmark and print the token usage and tool result size per question"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rentals", type=int, default=150, help="Number of rentals on the benchmark day")
+    parser.add_argument("--reservations", type=int, default=120, help="Number of reservations on the benchmark day")
+    args = parser.parse_args()
+
+    # the chatbot debug-logs every tool call and response, which would swamp the results
+    logging.getLogger("api.src.chat_service").setLevel(logging.INFO)
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    service = ChatService()
+    service.cne_year = CNE_YEAR
+    service.db_service = SeasonDynamoDBService(args.rentals, args.reservations)
+    service._model_names = GEMINI_MODEL_FALLBACK_CHAIN[:1]  # pylint: disable=protected-access
+    agent = service._get_agent(GEMINI_MODEL_FALLBACK_CHAIN[0])  # pylint: disable=protected-access
+
+    print(f"{'tool':<30}{'result KB':>10}{'input tokens':>14}")
+    total_tokens = 0
+    with agent.override(model=FunctionModel(call_tool_then_answer)):
+        for question, tool_name, tool_args in BENCHMARK_QUESTIONS:
+            result = getattr(service, tool_name)(**tool_args)
+            response = service.answer(question)
+            total_tokens += response.input_tokens
+            print(f"{tool_name:<30}{len(json.dumps(result)) / 1024:>10.1f}{response.input_tokens:>14}")
+    print(f"{'total':<30}{'':>10}{total_tokens:>14}")
+
+
+if __name__ == "__main__":
+    main()
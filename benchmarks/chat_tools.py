@@ -0,0 +1,138 @@
+"""Benchmark a chatbot turn in which the model calls several tools at once.
+
+Stubs out both Gemini and DynamoDB: the model asks for
+``count_available_devices_by_location`` for both device types plus
+``reservation_counts`` and ``reservation_status_counts`` in a single step, then
+answers, while every DynamoDB query sleeps for a fixed latency (50 ms by
+default). Each turn is timed end to end, through ``ChatService.answer`` and
+``ChatService.answer_stream``, with the tool calls run one after another and
+concurrently:
+
+    python -m benchmarks.chat_tools --latency-ms 50 --repeat 10
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, List
+
+import pandas as pd
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, FunctionModel
+
+from api.src.chat_service import GEMINI_MODEL_FALLBACK_CHAIN, ChatService
+from common.constants import DeviceType, Location
+
+TOOL_CALLS = [
+    ToolCallPart("count_available_devices_by_location", {"device_type": DeviceType.SCOOTER}, tool_call_id="1"),
+    ToolCallPart("count_available_devices_by_location", {"device_type": DeviceType.WHEELCHAIR}, tool_call_id="2"),
+    ToolCallPart("reservation_counts", {}, tool_call_id="3"),
+    ToolCallPart("reservation_status_counts", {}, tool_call_id="4"),
+]
+
+
+class SlowDynamoDBService:  # pylint: disable=unused-argument
+    """Stands in for DynamoDBService, answering the benchmarked queries after a fixed latency"""
+
+    def __init__(self, latency_seconds: float):
+        self.latency_seconds = latency_seconds
+
+    def count_available_devices_by_location(self, cne_year: int, device_type: DeviceType) -> Dict[str, int]:
+        """Count the available devices of a type per location"""
+        time.sleep(self.latency_seconds)
+        return {Location.BLC.value: 10, Location.PG.value: 5}
+
+    def get_reservation_count(self, cne_year: int) -> pd.DataFrame:
+        """Get the reservation counts, of which there are none"""
+        time.sleep(self.latency_seconds)
+        return pd.DataFrame()
+
+    def get_reservation_status_counts(self, cne_year: int) -> pd.DataFrame:
+        """Get the reservation status counts, of which there are none"""
+        time.sleep(self.latency_seconds)
+        return pd.DataFrame()
+
+
+def call_tools_then_answer(messages, _info: AgentInfo) -> ModelResponse:
+    """Stub model: call every benchmarked tool in the first step, then answer"""
+    if len(messages) == 1:
+        return ModelResponse(parts=TOOL_CALLS)
+    return ModelResponse(parts=[TextPart("There are 15 scooters and 15 wheelchairs available.")])
+
+
+async def stream_tools_then_answer(messages, info: AgentInfo):
+    """Streaming version of call_tools_then_answer"""
+    parts = call_tools_then_answer(messages, info).parts
+    if isinstance(parts[0], TextPart):
+        yield parts[0].content
+    else:
+        yield {
+            index: DeltaToolCall(name=call.tool_name, json_args=call.args_as_json_str(), tool_call_id=call.tool_call_id)
+            for index, call in enumerate(parts)
+        }
+
+
+def build_chat_service(latency_seconds: float) -> ChatService:
+    """Build a chat service on the stubbed database, with its agent built (but never sent to Gemini)"""
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    service = ChatService()
+    service.db_service = SlowDynamoDBService(latency_seconds)
+    service._model_names = GEMINI_MODEL_FALLBACK_CHAIN[:1]  # pylint: disable=protected-access
+    return service
+
+
+def time_turns(service: ChatService, answer: Callable[[], None], sequential: bool, repeat: int) -> List[float]:
+    """Time `repeat` chat turns, returning the durations in milliseconds"""
+    agent = service._get_agent(GEMINI_MODEL_FALLBACK_CHAIN[0])  # pylint: disable=protected-access
+    model = FunctionModel(call_tools_then_answer, stream_function=stream_tools_then_answer)
+    durations = []
+    with agent.override(model=model), (Agent.sequential_tool_calls() if sequential else nullcontext()):
+        for _ in range(repeat):
+            # every turn queries the database, rather than reusing the previous turn's tool results
+            service._tool_cache.clear()  # pylint: disable=protected-access
+            start = time.perf_counter()
+            answer()
+            durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def main():
+    """Run the benchmark and print a summary per entry point and tool execution mode"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=50, help="Latency of each stubbed DynamoDB query")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of timed turns per entry point and mode")
+    args = parser.parse_args()
+
+    # the chatbot debug-logs every tool call and response, which would swamp the timings
+    logging.getLogger("api.src.chat_service").setLevel(logging.INFO)
+    service = build_chat_service(args.latency_ms / 1000)
+    question = "How many devices are available, and how many reservations are there?"
+
+    async def consume_stream():
+        async for _ in service.answer_stream(question):
+            pass
+
+    entry_points = {
+        "answer": lambda: service.answer(question),
+        "answer_stream": lambda: asyncio.run(consume_stream()),
+    }
+
+    print(f"{len(TOOL_CALLS)} tool calls per turn, {args.latency_ms:g} ms per DynamoDB query")
+    print(f"{'entry point':<15}{'tools':<12}{'min ms':>9}{'median ms':>11}{'max ms':>9}")
+    for name, answer in entry_points.items():
+        for mode, sequential in (("sequential", True), ("concurrent", False)):
+            durations = time_turns(service, answer, sequential=sequential, repeat=args.repeat)
+            print(
+                f"{name:<15}{mode:<12}"
+                f"{min(durations):>9.1f}{statistics.median(durations):>11.1f}{max(durations):>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
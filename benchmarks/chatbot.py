@@ -0,0 +1,273 @@
+"""Offline chatbot benchmark: a scripted question set answered by a fake model over a moto-backed season.
+
+Each benchmark question is answered by ``ChatService.answer`` with the agent's model swapped for a fake one - by
+default a scripted FunctionModel that calls the tools a real model would for that question - against a synthetic
+season in a moto-backed DynamoDB (see benchmarks.season). No Gemini key or AWS account is needed. For every question,
+the number of tool calls, DynamoDB reads, the size of the tool results sent back to the model, its (estimated) input
+tokens and the wall time are reported:
+
+    python -m benchmarks.chatbot
+    python -m benchmarks.chatbot --model test  # pydantic-ai's TestModel, which calls every tool for each question
+
+Everything but the wall time is deterministic, and is compared against the stored baseline
+(benchmarks/chatbot_baseline.json) to catch regressions in the tool layer; pass --update-baseline to store the
+current results as the new baseline once a change is intended.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+
+from pydantic_ai import capture_run_messages
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models import Model
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, DeltaToolCalls, FunctionModel
+from pydantic_ai.models.test import TestModel
+
+from api.src.chat_service import ChatService
+from benchmarks.baseline import exit_with_regressions, read_baseline, write_baseline
+from benchmarks.season import mock_season
+from common.cne_dates import CNEDates
+from common.constants import DeviceStatus, DeviceType, Location
+
+BASELINE_PATH = Path(__file__).resolve().parent / "chatbot_baseline.json"
+# how much larger than the baseline a tool result or prompt may get before it is reported as a regression - the
+# tool call and DynamoDB read counts must not grow at all
+SIZE_TOLERANCE = 0.1
+_DYNAMODB_READ_OPERATIONS = {"GetItem", "BatchGetItem", "Query", "Scan"}
+
+# the tool calls the model makes for a question: one list of (tool name, arguments) per agent step
+ToolSteps = List[List[Tuple[str, dict]]]
+# what a streamed model response is made of: text, or tool calls by index
+StreamedParts = Union[str, DeltaToolCalls]
+
+
+@dataclass(frozen=True)
+class BenchmarkQuestion:
+    """A benchmark question, and the tool calls a model would make to answer it"""
+    question: str
+    tool_steps: ToolSteps
+
+
+@dataclass
+class QuestionResult:
+    """The measurements for answering a single benchmark question"""
+    question: str
+    tool_calls: int
+    dynamodb_reads: int
+    payload_bytes: int
+    input_tokens: int
+    wall_ms: float
+
+
+def build_questions() -> List[BenchmarkQuestion]:
+    """Build the scripted question set, which calls every chatbot tool at least once (the questions don't name dates
+    or IDs, so the baseline is the same from one CNE year to the next)"""
+    fair_days = CNEDates.get_cne_date_list()
+    first_day, third_day = fair_days[0].isoformat(), fair_days[2].isoformat()
+    first_day_id = f"{fair_days[0]:%m%d}001"
+    return [
+        BenchmarkQuestion("What's the date today?", [[("get_today", {})]]),
+        BenchmarkQuestion("How do I create a rental?", [[("search_usage_guide", {"query": "create a rental"})]]),
+        BenchmarkQuestion("What can I do in the application?", [[("get_usage_guide", {})]]),
+        BenchmarkQuestion("Who rented on the first day?", [[("lookup_rentals_on_date", {"date": first_day})]]),
+        BenchmarkQuestion(
+            "Which scooter reservations are there on the third day?",
+            [[("lookup_reservations_on_date", {"date": third_day, "device_type": DeviceType.SCOOTER})]],
+        ),
+        BenchmarkQuestion(
+            "Which wheelchairs are available at BLC?",
+            [[("lookup_available_devices", {"device_type": DeviceType.WHEELCHAIR, "location": Location.BLC})]],
+        ),
+        BenchmarkQuestion("Show me the full inventory.", [[("lookup_full_inventory", {})]]),
+        BenchmarkQuestion(
+            "Show me the first wheelchair rental.", [[("lookup_rental_by_id", {"rental_id": f"W{first_day_id}"})]]
+        ),
+        BenchmarkQuestion(
+            "Show me the first scooter reservation.",
+            [[("lookup_reservation_by_id", {"reservation_id": f"S{first_day_id}"})]],
+        ),
+        BenchmarkQuestion("Which scooters are out of service?", [[
+            ("lookup_devices_by_status", {"status": DeviceStatus.OUT_OF_SERVICE, "device_type": DeviceType.SCOOTER}),
+        ]]),
+        BenchmarkQuestion("Who has W04 and where was it picked up?", [
+            [("lookup_device_by_id", {"device_id": "W04"})],
+            [("lookup_current_rental_for_device", {"device_id": "W04"})],
+        ]),
+        BenchmarkQuestion("Which rentals are still out?", [[("lookup_outstanding_rentals", {})]]),
+        BenchmarkQuestion("Does Alice Smith have a reservation?", [[("search_reservations", {"name": "Alice Smith"})]]),
+        BenchmarkQuestion(
+            "How many of the third day's rentals are still out?",
+            [[("count_unreturned_rentals_on_date", {"date": third_day})]],
+        ),
+        BenchmarkQuestion("How many rentals were there on the first day?", [[
+            ("count_rentals_on_date", {"date": first_day}),
+        ]]),
+        BenchmarkQuestion("How many devices are available at each location?", [[
+            ("count_available_devices_by_location", {"device_type": DeviceType.SCOOTER}),
+            ("count_available_devices_by_location", {"device_type": DeviceType.WHEELCHAIR}),
+        ]]),
+        BenchmarkQuestion("How many reservations are there each day?", [[("reservation_counts", {})]]),
+        BenchmarkQuestion("How many reservations were no-shows?", [[("reservation_status_counts", {})]]),
+        BenchmarkQuestion("How much is the scooter deposit?", [[("fee_and_deposit_schedule", {})]]),
+    ]
+
+
+def scripted_model(questions: Sequence[BenchmarkQuestion], latency_seconds: float = 0.0) -> FunctionModel:
+    """Build a fake model that makes each question's scripted tool calls, one step at a time, then answers (streamed or
+    not), taking `latency_seconds` for each response - waiting on the event loop, as a call to Gemini does"""
+    tool_steps = {question.question: question.tool_steps for question in questions}
+
+    async def respond(messages: List[ModelMessage], _info: AgentInfo) -> ModelResponse:
+        if latency_seconds:
+            await asyncio.sleep(latency_seconds)
+        question = messages[0].parts[-1].content
+        step = sum(isinstance(message, ModelResponse) for message in messages)
+        steps = tool_steps[question]
+        if step < len(steps):
+            return ModelResponse(parts=[
+                ToolCallPart(tool_name, json.dumps(args), tool_call_id=f"{step}-{index}")
+                for index, (tool_name, args) in enumerate(steps[step])
+            ])
+        return ModelResponse(parts=[TextPart("Here is what I found.")])
+
+    async def respond_in_stream(messages: List[ModelMessage], info: AgentInfo) -> AsyncIterator[StreamedParts]:
+        parts = (await respond(messages, info)).parts
+        if isinstance(parts[0], TextPart):
+            yield parts[0].content
+        else:
+            yield {
+                index: DeltaToolCall(part.tool_name, part.args, tool_call_id=part.tool_call_id)
+                for index, part in enumerate(parts)
+            }
+
+    return FunctionModel(respond, stream_function=respond_in_stream)
+
+
+class _DynamoDBReadCounter:
+    """Count the read requests a DynamoDB resource's client sends (from any thread)"""
+
+    def __init__(self, dynamodb):
+        self.reads = 0
+        self._lock = threading.Lock()
+        dynamodb.meta.client.meta.events.register("before-call.dynamodb", self._count)
+
+    def _count(self, model, **_kwargs):
+        if model.name in _DYNAMODB_READ_OPERATIONS:
+            with self._lock:
+                self.reads += 1
+
+
+def run_chatbot_benchmark(model: Optional[Model] = None, **season_kwargs) -> List[QuestionResult]:
+    """
+    Answer every benchmark question with the given fake model (the scripted model by default) against a synthetic
+    season (see benchmarks.season.generate_season for the options), measuring each one from a cold tool cache.
+    Requires a (dummy) GEMINI_API_KEY in the environment to build the agent.
+    """
+    questions = build_questions()
+    model = model or scripted_model(questions)
+    results = []
+    with mock_season(**season_kwargs):
+        service = ChatService()
+        read_counter = _DynamoDBReadCounter(service.db_service.dynamodb)
+        # the benchmark measures the tools rather than Gemini's rate limits, so every question goes to the first model
+        with service.override_model(model):
+            for question in questions:
+                service._tool_cache.clear()  # pylint: disable=protected-access
+                reads_before = read_counter.reads
+                with capture_run_messages() as messages:
+                    start = time.perf_counter()
+                    response = service.answer(question.question)
+                    wall_ms = (time.perf_counter() - start) * 1000
+                tool_returns = [
+                    part for message in messages if isinstance(message, ModelRequest)
+                    for part in message.parts if isinstance(part, ToolReturnPart)
+                ]
+                results.append(QuestionResult(
+                    question=question.question,
+                    tool_calls=len(tool_returns),
+                    dynamodb_reads=read_counter.reads - reads_before,
+                    payload_bytes=sum(len(part.model_response_str().encode()) for part in tool_returns),
+                    input_tokens=response.input_tokens,
+                    wall_ms=wall_ms,
+                ))
+    return results
+
+
+def compare_to_baseline(results: Sequence[QuestionResult], baseline: Dict[str, dict]) -> List[str]:
+    """Describe every measurement that got worse than the baseline (beyond SIZE_TOLERANCE for sizes)"""
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.question)
+        if expected is None:
+            continue
+        for metric, tolerance in (
+                ("tool_calls", 0),
+                ("dynamodb_reads", 0),
+                ("payload_bytes", SIZE_TOLERANCE),
+                ("input_tokens", SIZE_TOLERANCE),
+        ):
+            actual = getattr(result, metric)
+            if actual > expected[metric] * (1 + tolerance):
+                regressions.append(f"{result.question} {metric}: {actual} (baseline {expected[metric]})")
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, dict]:
+    """Load the stored baseline measurements, by question"""
+    return read_baseline(path)
+
+
+def save_baseline(results: Sequence[QuestionResult], path: Path = BASELINE_PATH):
+    """Store the (deterministic) measurements as the new baseline"""
+    write_baseline({
+        result.question: {
+            metric: value for metric, value in asdict(result).items() if metric not in ("question", "wall_ms")
+        }
+        for result in results
+    }, path)
+
+
+def main():
+    """Run the benchmark, print the results and compare them against the baseline"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", choices=("scripted", "test"), default="scripted", help="Fake model to answer with")
+    parser.add_argument("--days", type=int, default=3, help="Number of days of the season to load")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic season")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline")
+    args = parser.parse_args()
+
+    # no real AWS or Gemini calls are made, but the clients still need (dummy) settings to be built
+    for variable, value in (
+            ("AWS_ACCESS_KEY_ID", "benchmark"), ("AWS_SECRET_ACCESS_KEY", "benchmark"),
+            ("AWS_DEFAULT_REGION", "us-east-1"), ("GEMINI_API_KEY", "benchmark"),
+    ):
+        os.environ.setdefault(variable, value)
+    # the chatbot and DynamoDB service log every tool call and query, which would swamp the results
+    logging.disable(logging.INFO)
+
+    model = TestModel() if args.model == "test" else None
+    results = run_chatbot_benchmark(model=model, days=args.days, seed=args.seed)
+
+    print(f"{'question':<52}{'tools':>6}{'reads':>6}{'result KB':>10}{'tokens':>8}{'ms':>8}")
+    for result in results:
+        print(
+            f"{result.question[:51]:<52}{result.tool_calls:>6}{result.dynamodb_reads:>6}"
+            f"{result.payload_bytes / 1024:>10.1f}{result.input_tokens:>8}{result.wall_ms:>8.1f}"
+        )
+
+    if args.update_baseline:
+        save_baseline(results)
+        print(f"Stored the results as the new baseline in {BASELINE_PATH}")
+    elif args.model == "scripted" and args.days == 3 and args.seed == 0:
+        exit_with_regressions(compare_to_baseline(results, load_baseline()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark the inventory charts as the fleet grows.
+
+Builds a synthetic inventory for each fleet size (50, 200 and 1000 devices by
+default) and times ``create_inventory_chart`` and
+``create_dashboard_inventory_chart``, reporting the number of traces in each
+figure and the size of the JSON sent to the browser alongside the build times:
+
+    python -m benchmarks.inventory_charts --sizes 50 200 1000 --repeat 10
+"""
+
+import argparse
+import statistics
+import time
+from functools import partial
+from typing import Callable, List
+
+import pandas as pd
+from plotly import graph_objects as go
+
+from common.constants import DeviceStatus, DeviceType, Location
+from ui.src.device_utils import create_dashboard_inventory_chart, create_inventory_chart
+
+
+def build_inventory(num_devices: int) -> pd.DataFrame:
+    """Build an inventory shaped like DataService.get_inventory's output, with a mix of statuses and locations"""
+    statuses = list(DeviceStatus)
+    return pd.DataFrame([
+        {
+            "id": f"{DeviceType.SCOOTER.get_prefix()}{i:04}",
+            "type": DeviceType.SCOOTER,
+            "status": statuses[i % len(statuses)],
+            "location": Location.BLC if i % 3 else Location.PG,
+        }
+        for i in range(1, num_devices + 1)
+    ])
+
+
+def time_chart(create_chart: Callable[[], go.Figure], repeat: int) -> List[float]:
+    """Time building the chart `repeat` times, returning the durations in milliseconds"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        create_chart()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def main():
+    """Run the benchmark and print a summary per chart and fleet size"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000], help="Fleet sizes to chart")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of timed builds per chart and fleet size")
+    args = parser.parse_args()
+
+    charts = {"inventory": create_inventory_chart, "dashboard": create_dashboard_inventory_chart}
+
+    print(f"{'chart':<11}{'devices':>8}{'traces':>8}{'json KB':>9}{'min ms':>9}{'median ms':>11}{'max ms':>9}")
+    for num_devices in args.sizes:
+        inventory = build_inventory(num_devices)
+        for name, create_chart in charts.items():
+            fig = create_chart(inventory)
+            durations = time_chart(partial(create_chart, inventory), repeat=args.repeat)
+            print(
+                f"{name:<11}{num_devices:>8}{len(fig.data):>8}{len(fig.to_json()) / 1024:>9.1f}"
+                f"{min(durations):>9.1f}{statistics.median(durations):>11.1f}{max(durations):>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
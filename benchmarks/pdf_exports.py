@@ -0,0 +1,98 @@
+"""Benchmark the reservation and late-return PDF exports on a busy day.
+
+Builds a synthetic day of reservations/rentals (300 rows by default) and times
+``export_reservations_to_pdf`` and ``export_late_returns_to_pdf``, reporting the
+first (cold) export separately from the warm ones, since the first export in a
+process also registers the fonts and builds the shared report styles:
+
+    python -m benchmarks.pdf_exports --rows 300 --repeat 10
+"""
+
+import argparse
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, List
+
+import pandas as pd
+
+from common.constants import DeviceType, Location, PaymentMethod, ReservationStatus
+from ui.src.rental_utils import export_late_returns_to_pdf
+from ui.src.reservation_utils import export_reservations_to_pdf
+
+EXPORT_DATE = date(2025, 8, 25)
+
+
+def build_reservations(rows: int) -> pd.DataFrame:
+    """Build a day of reservations shaped like DataService.get_reservations_on_date's output"""
+    start = datetime(2025, 8, 25, 14, tzinfo=None)
+    return pd.DataFrame([
+        {
+            "id": f"{device_type.get_prefix()}0825{i:03}",
+            "device_type": device_type,
+            "name": f"Guest Number {i} With A Fairly Long Name",
+            "phone_number": f"tel:+1-416-555-{i:04}",
+            "reservation_time": pd.Timestamp(start + timedelta(minutes=2 * i), tz="UTC"),
+            "location": Location.BLC if i % 3 else Location.PG,
+            "status": ReservationStatus.RESERVED,
+            "notes": "Needs a seat cushion and assistance at pickup" if i % 4 == 0 else None,
+        }
+        for i in range(1, rows + 1)
+        for device_type in [DeviceType.WHEELCHAIR if i % 2 else DeviceType.SCOOTER]
+    ])
+
+
+def build_rentals(rows: int) -> pd.DataFrame:
+    """Build a day of unreturned rentals shaped like DataService.get_rentals_on_date's output"""
+    return pd.DataFrame([
+        {
+            "id": f"{device_type.get_prefix()}0825{i:03}",
+            "name": f"Guest Number {i} With A Fairly Long Name",
+            "phone_number": f"tel:+1-416-555-{i:04}",
+            "device_id": f"{device_type.get_prefix()}{i % 99 + 1:02}",
+            "device_type": device_type,
+            "pickup_location": Location.BLC if i % 3 else Location.PG,
+            "deposit_payment_method": PaymentMethod.CASH,
+            "deposit_payment_amount": 100 if device_type == DeviceType.SCOOTER else 50,
+            "items_left_behind": ["Walker", "Stroller"] if i % 5 == 0 else [],
+            "return_time": None,
+        }
+        for i in range(1, rows + 1)
+        for device_type in [DeviceType.WHEELCHAIR if i % 2 else DeviceType.SCOOTER]
+    ])
+
+
+def time_export(export: Callable[[], bytes], repeat: int) -> List[float]:
+    """Time the export `repeat` times, returning the durations in milliseconds"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        export()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def main():
+    """Run the benchmark and print a summary per export"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=300, help="Number of reservations/rentals in the day")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of timed exports per report")
+    args = parser.parse_args()
+
+    reservations = build_reservations(args.rows)
+    rentals = build_rentals(args.rows)
+    exports = {
+        "reservations": lambda: export_reservations_to_pdf(reservations_df=reservations.copy(), date=EXPORT_DATE),
+        "late returns": lambda: export_late_returns_to_pdf(rentals.copy(), EXPORT_DATE),
+    }
+
+    print(f"{'export':<14}{'rows':>6}{'cold ms':>10}{'min ms':>9}{'median ms':>11}{'max ms':>9}")
+    for name, export in exports.items():
+        cold, *warm = time_export(export, repeat=args.repeat + 1)
+        print(
+            f"{name:<14}{args.rows:>6}{cold:>10.1f}{min(warm):>9.1f}{statistics.median(warm):>11.1f}{max(warm):>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,463 @@
+"""Synthetic CNE seasons for the offline benchmarks: any number of fair days, devices, reservations and rentals,
+loaded into a moto-backed DynamoDB or written to JSONL or Parquet files (one per table, with the items as stored in
+DynamoDB):
+
+    python -m benchmarks.season --output season
+    python -m benchmarks.season --output season --format parquet --devices-per-type 99 --walk-ins-per-day 400
+
+A season is generated from its options and seed alone (and the CNE year), so every run of a benchmark sees the same
+data. The weekends and Labour Day are busier than the weekdays, and the desks' arrivals peak in the early afternoon.
+Reservations are booked ahead (pending confirmation for scooters, reserved for wheelchairs), then are picked up,
+cancelled, no-shows, or waitlisted if no device is free when the renter arrives. Each device is rented to one renter at
+a time, and moves to wherever it is returned; a few renters bring theirs back the next morning, and the last day's late
+returns are still out - the season is as of the end of its last day.
+"""
+import argparse
+import json
+import math
+import random
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import boto3
+from moto import mock_aws
+
+from common.cne_dates import CNEDates
+from common.constants import (
+    DeviceStatus,
+    DeviceType,
+    HoldItem,
+    Location,
+    PaymentMethod,
+    RentalStatus,
+    ReservationStatus,
+)
+from common.data_models import Device, NewDevice, NewRental, NewReservation, Rental, Reservation
+from common.utils import get_default_timezone
+
+_KEY_SCHEMA = [
+    {"AttributeName": "cne_year", "KeyType": "HASH"},
+    {"AttributeName": "id", "KeyType": "RANGE"},
+]
+_DATE_INDEX = {
+    "IndexName": "cne_year-date",
+    "KeySchema": [
+        {"AttributeName": "cne_year", "KeyType": "HASH"},
+        {"AttributeName": "date", "KeyType": "RANGE"},
+    ],
+    "Projection": {"ProjectionType": "ALL"},
+}
+_FEES_AND_DEPOSITS = {DeviceType.SCOOTER: (45, 100), DeviceType.WHEELCHAIR: (20, 50)}
+_FIRST_NAMES = ["Alice", "Bob", "Carol", "David", "Emma", "Farid", "Grace", "Hiro", "Irene", "Jamal", "Kofi", "Lena"]
+_LAST_NAMES = ["Smith", "Jones", "White", "Brown", "Nguyen", "Patel", "Singh", "Wong", "Garcia", "Martin", "Chen"]
+
+# the rental desks are open from 10 AM to 10 PM, and are busiest a few hours after opening
+_OPENING_TIME = time(10)
+_OPEN_MINUTES = 12 * 60
+_BUSIEST_MINUTES = 3 * 60
+# how much busier than a weekday the weekends and Labour Day (the last day) are
+_BUSY_DAY_FACTOR = 1.5
+# the daily counts vary around their average by a tenth of it, up to three times that
+_DAY_COUNT_DEVIATION = 0.1
+_MAX_DAY_COUNT_FACTOR = 1 + 3 * _DAY_COUNT_DEVIATION
+# the IDs have two digits for a device's number, and three for a rental's or reservation's number on its day
+MAX_DEVICES_PER_TYPE = 99
+MAX_IDS_PER_TYPE_PER_DAY = 999
+_RESERVATION_OUTCOMES = {
+    ReservationStatus.PICKED_UP: 8,
+    ReservationStatus.CANCELLED: 1,
+    ReservationStatus.NO_SHOW: 1,
+}
+_LATE_RETURN_RATE = 0.05
+_ITEM_LEFT_BEHIND_RATE = 0.1
+SEASON_TABLES = ("cne_devices", "cne_reservations", "cne_rentals", "cne_settings")
+FILE_FORMATS = ("jsonl", "parquet")
+
+
+@dataclass
+class Season:
+    """The items of a synthetic season, by table"""
+    days: List[date]
+    devices: List[Device]
+    reservations: List[Reservation]
+    rentals: List[Rental]
+    settings: Dict[str, int]
+
+    def get_items(self) -> Dict[str, List[dict]]:
+        """Get the items as they are stored in each table"""
+        cne_year = CNEDates.get_cne_year()
+        return {
+            "cne_devices": [device.model_dump(mode="json") for device in self.devices],
+            "cne_reservations": [reservation.model_dump(mode="json") for reservation in self.reservations],
+            "cne_rentals": [rental.model_dump(mode="json") for rental in self.rentals],
+            "cne_settings": [
+                {"cne_year": cne_year, "id": setting_id, "value": value} for setting_id, value in self.settings.items()
+            ],
+        }
+
+
+def create_tables():
+    """Create the devices, rentals, reservations and settings tables (call inside a moto mock)"""
+    dynamodb = boto3.resource("dynamodb")
+    for table_name in SEASON_TABLES:
+        has_date_index = table_name in ("cne_rentals", "cne_reservations")
+        attributes = [
+            {"AttributeName": "cne_year", "AttributeType": "N"},
+            {"AttributeName": "id", "AttributeType": "S"},
+        ]
+        if has_date_index:
+            attributes.append({"AttributeName": "date", "AttributeType": "S"})
+        dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=_KEY_SCHEMA,
+            AttributeDefinitions=attributes,
+            BillingMode="PAY_PER_REQUEST",
+            **({"GlobalSecondaryIndexes": [_DATE_INDEX]} if has_date_index else {}),
+        )
+    return dynamodb
+
+
+def _random_name(rng: random.Random) -> str:
+    return f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+
+
+def _random_phone_number(rng: random.Random) -> str:
+    return f"416{rng.randint(2000000, 9999999)}"
+
+
+def _at(day: date, minutes_after_opening: int) -> datetime:
+    """Get the time some minutes after the rental desks open on a day"""
+    opening = get_default_timezone().localize(datetime.combine(day, _OPENING_TIME))
+    return opening + timedelta(minutes=minutes_after_opening)
+
+
+def _arrival_minutes(rng: random.Random) -> int:
+    """Draw when a renter arrives at the desks, in minutes after opening"""
+    return int(rng.triangular(0, _OPEN_MINUTES - 60, _BUSIEST_MINUTES))
+
+
+def _max_day_count(expected: float) -> int:
+    return math.floor(expected * _MAX_DAY_COUNT_FACTOR)
+
+
+def _day_count(rng: random.Random, weekday_count: int, day: date, fair_days: List[date]) -> int:
+    """Draw how many reservations or walk-ins there are on a day, averaging the count given for weekdays"""
+    is_busy_day = day.weekday() >= 5 or day == fair_days[-1]
+    expected = weekday_count * (_BUSY_DAY_FACTOR if is_busy_day else 1)
+    return min(max(0, round(rng.gauss(expected, expected * _DAY_COUNT_DEVIATION))), _max_day_count(expected))
+
+
+class _IDSequence:
+    """Rental and reservation IDs: the device type's prefix, the date and a daily sequence number per type"""
+
+    def __init__(self, day: date):
+        self.day = day
+        self.sequence = {device_type: 0 for device_type in DeviceType}
+
+    def next_id(self, device_type: DeviceType) -> str:
+        """Get the next ID for a device type"""
+        self.sequence[device_type] += 1
+        return f"{device_type.get_prefix()}{self.day:%m%d}{self.sequence[device_type]:03}"
+
+
+def _check_season_size(
+        days: Optional[int], devices_per_type: int, reservations_per_day: int, walk_ins_per_day: int
+) -> List[date]:
+    """Get the fair days of a season, checking its devices, reservations and rentals fit in their IDs"""
+    fair_days = CNEDates.get_cne_date_list()
+    if days is not None and not 0 < days <= len(fair_days):
+        raise ValueError(f"The CNE has {len(fair_days)} days - got {days}")
+    if not 0 < devices_per_type <= MAX_DEVICES_PER_TYPE:
+        raise ValueError(f"There can be 1 to {MAX_DEVICES_PER_TYPE} devices of each type - got {devices_per_type}")
+    # on the busiest day, all of the reservations, and all of the rentals, could be for the same type of device
+    max_reservations = _max_day_count(reservations_per_day * _BUSY_DAY_FACTOR)
+    max_rentals = max_reservations + _max_day_count(walk_ins_per_day * _BUSY_DAY_FACTOR)
+    if max(max_reservations, max_rentals) > MAX_IDS_PER_TYPE_PER_DAY:
+        raise ValueError(
+            f"The busiest day could have up to {max_reservations} reservations and {max_rentals} rentals, but there can"
+            f" be at most {MAX_IDS_PER_TYPE_PER_DAY} of each for each type of device per day - lower the reservations"
+            " or walk-ins per day"
+        )
+    return fair_days[:days]
+
+
+def _generate_devices(cne_year: int, devices_per_type: int) -> Dict[str, Device]:
+    """Generate the fleet, by ID: every tenth device of each type is a backup, and one scooter is out of service"""
+    devices: Dict[str, Device] = {}
+    for device_type in DeviceType:
+        for i in range(1, devices_per_type + 1):
+            new_device = NewDevice(
+                cne_year=cne_year,
+                type=device_type,
+                status=DeviceStatus.AVAILABLE if i % 10 else DeviceStatus.BACKUP,
+                location=Location.BLC if i % 3 else Location.PG,
+            )
+            device_id = f"{device_type.get_prefix()}{i:02}"
+            devices[device_id] = Device(**new_device.model_dump(exclude={"id"}), id=device_id)
+    devices["S01"].status = DeviceStatus.OUT_OF_SERVICE
+    return devices
+
+
+def _generate_day_reservations(rng: random.Random, cne_year: int, day: date, count: int) -> List[Reservation]:
+    """Generate a day's reservations, each picked up, cancelled or missed (as the day has passed)"""
+    # reservations are booked ahead, so their IDs come in booking order, unlike their times
+    reservation_ids = _IDSequence(day)
+    day_reservations = []
+    for _ in range(count):
+        device_type = rng.choice(list(DeviceType))
+        new_reservation = NewReservation(
+            cne_year=cne_year,
+            date=day,
+            device_type=device_type,
+            location=rng.choice(list(Location)),
+            # reservations are for quarter hours
+            reservation_time=_at(day, _arrival_minutes(rng) // 15 * 15),
+            name=_random_name(rng),
+            phone_number=_random_phone_number(rng),
+            notes=None,
+            status=ReservationStatus.get_default_reservation_status(device_type),
+        )
+        reservation = Reservation(**new_reservation.model_dump(exclude={"id"}), id=reservation_ids.next_id(device_type))
+        # the day has passed, so the booking was picked up (unless no device was free), cancelled or missed
+        reservation.status = rng.choices(*zip(*_RESERVATION_OUTCOMES.items()))[0]
+        day_reservations.append(reservation)
+    return day_reservations
+
+
+_Arrival = Tuple[datetime, DeviceType, Optional[Reservation]]
+
+
+def _day_arrivals(
+        rng: random.Random, day: date, day_reservations: List[Reservation], walk_ins: int
+) -> List[_Arrival]:
+    """Get the renters who turn up on a day - those picking up their reservations, and the walk-ins - in order of
+    arrival (which the rental IDs follow)"""
+    arrivals = [
+        (reservation.reservation_time, reservation.device_type, reservation)
+        for reservation in day_reservations if reservation.status == ReservationStatus.PICKED_UP
+    ] + [
+        (_at(day, _arrival_minutes(rng)), rng.choice(list(DeviceType)), None)
+        for _ in range(walk_ins)
+    ]
+    arrivals.sort(key=lambda arrival: (arrival[0], arrival[1], arrival[2] is None))
+    return arrivals
+
+
+class _RentalDesks:
+    """The devices the rental desks hand out, and when each one that was rented out is back at the desks"""
+
+    def __init__(self, devices: Dict[str, Device]):
+        self.devices = devices
+        self.free_at: Dict[str, datetime] = {}
+
+    def find_device(
+            self, rng: random.Random, device_type: DeviceType, pickup_time: datetime, pickup_location: Location
+    ) -> Optional[Device]:
+        """Pick a free device of the type, from the pickup location when one is there (None if none is free)"""
+        free = [
+            device for device in self.devices.values()
+            if device.type == device_type and device.status == DeviceStatus.AVAILABLE
+            and self.free_at.get(device.id, pickup_time) <= pickup_time
+        ]
+        if not free:
+            return None
+        # the desks hand out a device from their own location when they have one
+        return rng.choice([device for device in free if device.location == pickup_location] or free)
+
+    def rent_out(self, device: Device, rental: Rental) -> None:
+        """Take a device out until its rental's return (for good, if it isn't returned)"""
+        if rental.return_time:
+            self.free_at[device.id] = rental.return_time
+            device.location = rental.return_location
+        else:
+            device.status = DeviceStatus.RENTED
+            device.location = rental.pickup_location
+
+
+def _rent_device(
+        rng: random.Random, desks: _RentalDesks, rental_ids: _IDSequence, arrival: _Arrival, is_last_day: bool
+) -> Optional[Rental]:
+    """Rent a device out to a renter who turned up (None if no device was free, which waitlists a reservation)"""
+    pickup_time, device_type, reservation = arrival
+    day = rental_ids.day
+    pickup_location = reservation.location if reservation else rng.choice(list(Location))
+    device = desks.find_device(rng, device_type, pickup_time, pickup_location)
+    if device is None:
+        if reservation:
+            reservation.status = ReservationStatus.WAITLISTED
+        return None
+
+    return_time = min(pickup_time + timedelta(minutes=rng.randint(60, 6 * 60)), _at(day, _OPEN_MINUTES))
+    if rng.random() < _LATE_RETURN_RATE:
+        # brought back the next morning, or still out at the end of the season
+        return_time = None if is_last_day else _at(day + timedelta(days=1), rng.randint(0, 120))
+    return_location = rng.choice(list(Location)) if return_time else None
+    new_rental = NewRental(
+        cne_year=CNEDates.get_cne_year(),
+        date=day,
+        device_id=device.id,
+        device_type=device_type,
+        reservation_id=reservation.id if reservation else None,
+        pickup_location=pickup_location,
+        pickup_time=pickup_time,
+        status=RentalStatus.COMPLETED if return_time else RentalStatus.IN_PROGRESS,
+        name=reservation.name if reservation else _random_name(rng),
+        phone_number=reservation.phone_number if reservation else _random_phone_number(rng),
+        address=f"{rng.randint(1, 999)} Lakeshore Blvd W",
+        city="Toronto",
+        province="ON",
+        postal_code="M6K 3C3",
+        country="CAN",
+        fee_payment_amount=_FEES_AND_DEPOSITS[device_type][0],
+        fee_payment_method=rng.choice(sorted(PaymentMethod.get_accepted_fee_payment_methods())),
+        deposit_payment_amount=_FEES_AND_DEPOSITS[device_type][1],
+        deposit_payment_method=rng.choice(sorted(PaymentMethod.get_accepted_deposit_payment_methods())),
+        items_left_behind=[rng.choice(list(HoldItem))] if rng.random() < _ITEM_LEFT_BEHIND_RATE else [],
+        notes=None,
+        staff_name="Benchmark Staff",
+        return_location=return_location,
+        return_time=return_time,
+        return_staff_name="Benchmark Staff" if return_time else None,
+    )
+    rental = Rental(**new_rental.model_dump(), id=rental_ids.next_id(device_type))
+    desks.rent_out(device, rental)
+    if reservation:
+        reservation.rental_id = rental.id
+        reservation.status = ReservationStatus.COMPLETED if return_time else ReservationStatus.PICKED_UP
+    return rental
+
+
+def _rent_devices(
+        rng: random.Random, desks: _RentalDesks, day: date, arrivals: List[_Arrival], is_last_day: bool
+) -> List[Rental]:
+    """Rent devices out to a day's renters, in order of arrival"""
+    rental_ids = _IDSequence(day)
+    rentals = [_rent_device(rng, desks, rental_ids, arrival, is_last_day) for arrival in arrivals]
+    return [rental for rental in rentals if rental is not None]
+
+
+def _generate_settings() -> Dict[str, int]:
+    """Get each device type's fee and deposit, by setting ID"""
+    settings = {}
+    for device_type, (fee, deposit) in _FEES_AND_DEPOSITS.items():
+        settings[DeviceType.get_fee_setting_id(device_type)] = fee
+        settings[DeviceType.get_deposit_setting_id(device_type)] = deposit
+    return settings
+
+
+def generate_season(
+        days: Optional[int] = 3,
+        devices_per_type: int = 40,
+        reservations_per_day: int = 20,
+        walk_ins_per_day: int = 20,
+        seed: int = 0,
+) -> Season:
+    """
+    Generate the first `days` days of the current CNE year's fair (all of them if None), as of the end of the last
+    day. The reservations and walk-ins per day are the averages for a weekday, and the weekends and Labour Day have
+    more. The items are validated as the new devices, reservations and rentals the API adds, then given their IDs.
+    """
+    fair_days = _check_season_size(days, devices_per_type, reservations_per_day, walk_ins_per_day)
+    rng = random.Random(seed)
+    cne_year = CNEDates.get_cne_year()
+    desks = _RentalDesks(_generate_devices(cne_year, devices_per_type))
+
+    reservations: List[Reservation] = []
+    rentals: List[Rental] = []
+    for day in fair_days:
+        day_reservations = _generate_day_reservations(
+            rng, cne_year, day, _day_count(rng, reservations_per_day, day, fair_days)
+        )
+        reservations.extend(day_reservations)
+        arrivals = _day_arrivals(rng, day, day_reservations, _day_count(rng, walk_ins_per_day, day, fair_days))
+        rentals.extend(_rent_devices(rng, desks, day, arrivals, is_last_day=day == fair_days[-1]))
+
+    return Season(
+        days=fair_days,
+        devices=list(desks.devices.values()),
+        reservations=reservations,
+        rentals=rentals,
+        settings=_generate_settings(),
+    )
+
+
+def write_season_to_dynamodb(season: Season, dynamodb):
+    """Write a season's items to its tables (see create_tables) with batch writes"""
+    for table_name, items in season.get_items().items():
+        with dynamodb.Table(table_name).batch_writer() as batch:
+            for item in items:
+                batch.put_item(Item=item)
+
+
+def write_season_to_files(season: Season, directory: Path, file_format: str = "jsonl") -> List[Path]:
+    """Write a season's items to one file per table (e.g. cne_rentals.jsonl) in the directory, as JSON lines or
+    Parquet (which needs pyarrow), returning the files"""
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"Unrecognized file format {file_format}")
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for table_name, items in season.get_items().items():
+        path = directory / f"{table_name}.{file_format}"
+        if file_format == "parquet":
+            import pandas as pd  # pylint: disable=import-outside-toplevel
+
+            pd.DataFrame(items).to_parquet(path, index=False)
+        else:
+            with open(path, "w", encoding="utf-8") as file:
+                file.writelines(json.dumps(item) + "\n" for item in items)
+        paths.append(path)
+    return paths
+
+
+def load_season(dynamodb, **season_kwargs) -> Season:
+    """Generate a season (see generate_season for the options) and write it to the tables"""
+    season = generate_season(**season_kwargs)
+    write_season_to_dynamodb(season, dynamodb)
+    return season
+
+
+@contextmanager
+def mock_season(**season_kwargs) -> Iterator[Season]:
+    """Mock AWS with the tables created and loaded with a synthetic season (see generate_season) for the duration"""
+    with mock_aws():
+        yield load_season(create_tables(), **season_kwargs)
+
+
+def main():
+    """Generate a season and write it to files"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, required=True, help="Directory to write the files to")
+    parser.add_argument("--format", choices=FILE_FORMATS, default="jsonl", help="Format of the files")
+    parser.add_argument("--days", type=int, help="Number of fair days (default: all of them)")
+    parser.add_argument(
+        "--devices-per-type", type=int, default=40,
+        help=f"Number of scooters, and of wheelchairs (at most {MAX_DEVICES_PER_TYPE})",
+    )
+    parser.add_argument("--reservations-per-day", type=int, default=20, help="Reservations on an average weekday")
+    parser.add_argument("--walk-ins-per-day", type=int, default=20, help="Walk-in rentals on an average weekday")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic season")
+    args = parser.parse_args()
+
+    try:
+        season = generate_season(
+            days=args.days,
+            devices_per_type=args.devices_per_type,
+            reservations_per_day=args.reservations_per_day,
+            walk_ins_per_day=args.walk_ins_per_day,
+            seed=args.seed,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    for path in write_season_to_files(season, args.output, file_format=args.format):
+        print(path)
+    print(
+        f"{len(season.days)} days: {len(season.devices)} devices, {len(season.reservations)} reservations, "
+        f"{len(season.rentals)} rentals"
+    )
+
+
+if __name__ == "__main__":
+    main()
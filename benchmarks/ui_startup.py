@@ -0,0 +1,107 @@
+"""Benchmark the UI pages' time to first paint in a freshly started process.
+
+Runs each page (every page in ui/ui_pages but the login page, by default) with Streamlit's AppTest as a logged-in
+user, against mocked API responses, and times its first run - which includes importing everything the page needs -
+and a rerun. Each sample runs in a fresh Python process, both cold (as a page was opened right after a restart before
+ui/warmup.py) and warm (after ``ui.warmup.warm_up``, as the container now starts), so the imports aren't shared
+between pages or samples:
+
+    python -m benchmarks.ui_startup --repeat 3
+    python -m benchmarks.ui_startup --pages home.py new_rental.py
+
+The authenticator is imported (and mocked) before the timed run in both modes, since ui/main.py imports it before any
+page runs.
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+from unittest.mock import MagicMock, patch
+
+PAGES_DIR = os.path.join("ui", "ui_pages")
+# the login page only renders for a logged-out user, which the other pages redirect to it
+EXCLUDED_PAGES = ("__init__.py", "login.py")
+
+
+def time_page(page: str, warm: bool) -> Dict[str, float]:
+    """Time the page's first run and a rerun in this process, returning the durations in milliseconds (run in a fresh
+    process only)"""
+    # pylint: disable=import-outside-toplevel
+    import requests
+    from streamlit.testing.v1 import AppTest
+
+    from tests.unit.mock_requests import MockRequests
+    from ui.auth.local_authenticator import LocalAuthenticator
+
+    os.environ.setdefault("API_HOST", "localhost")
+    os.environ.setdefault("API_PORT", "8000")
+    if warm:
+        from ui.warmup import warm_up
+        warm_up()
+
+    mock_requests = MockRequests()
+    at = AppTest.from_file(os.path.join(PAGES_DIR, page), default_timeout=60)
+    at.session_state["authentication_status"] = True
+    at.session_state["username"] = "benchmark_user"
+    durations = {}
+    with patch.multiple(
+            requests,
+            get=mock_requests.mock_requests_get,
+            post=mock_requests.mock_requests_post,
+            put=mock_requests.mock_requests_put,
+    ), patch.multiple(
+        LocalAuthenticator,
+        login=MagicMock(return_value=True),
+        _initialize_authenticator=MagicMock(),
+        get_current_user=MagicMock(return_value="benchmark_user"),
+    ):
+        for run in ("first_paint", "rerun"):
+            start = time.perf_counter()
+            at.run()
+            durations[run] = (time.perf_counter() - start) * 1000
+    durations["errors"] = len(at.exception) + len(at.error)
+    return durations
+
+
+def sample_page(page: str, warm: bool) -> Dict[str, float]:
+    """Time the page in a fresh Python process"""
+    command = [sys.executable, "-m", __spec__.name, "--sample", page] + (["--warm"] if warm else [])
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Run the benchmark and print a summary per page"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", nargs="+", help="Pages in ui/ui_pages to time (default: all but login)")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of fresh processes per page and mode")
+    parser.add_argument("--sample", help=argparse.SUPPRESS)
+    parser.add_argument("--warm", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.sample:
+        print(json.dumps(time_page(args.sample, warm=args.warm)))
+        return
+
+    all_pages = map(os.path.basename, glob.glob(os.path.join(PAGES_DIR, "*.py")))
+    pages = args.pages or sorted(page for page in all_pages if page not in EXCLUDED_PAGES)
+    print(f"{'page':<30}{'cold ms':>10}{'warm ms':>10}{'rerun ms':>10}{'errors':>8}")
+    for page in pages:
+        samples: Dict[bool, List[Dict[str, float]]] = {
+            warm: [sample_page(page, warm) for _ in range(args.repeat)] for warm in (False, True)
+        }
+        cold = statistics.median(sample["first_paint"] for sample in samples[False])
+        warm = statistics.median(sample["first_paint"] for sample in samples[True])
+        rerun = statistics.median(sample["rerun"] for sample in samples[True])
+        errors = max(sample["errors"] for page_samples in samples.values() for sample in page_samples)
+        print(f"{page:<30}{cold:>10.1f}{warm:>10.1f}{rerun:>10.1f}{errors:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
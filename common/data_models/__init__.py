@@ -1,4 +1,12 @@
-from common.data_models.chat import ChatMessage, ChatRequest, ChatResponse, ChatRole
+from common.data_models.chat import (
+    ChatMessage,
+    ChatRequest,
+    ChatResponse,
+    ChatRole,
+    ChatStreamEvent,
+    ChatStreamEventType,
+)
 from common.data_models.device import Device, NewDevice
 from common.data_models.rental import ChangeDeviceInfo, CompletedRental, NewRental, Rental, RentalSummary
+from common.data_models.rental_form import RentalFormURL
 from common.data_models.reservation import NewReservation, Reservation, ReservationCount, ReservationStatusCount
@@ -1,5 +1,5 @@
 from enum import StrEnum
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -24,6 +24,12 @@ class ChatRequest(BaseModel):
 
     message: str = Field(title="Message")
     history: List[ChatMessage] = Field(title="Conversation History", default_factory=list)
+    user: Optional[str] = Field(
+        title="User",
+        description="The staff member asking, so that chats waiting to be answered are taken in turns by user. It "
+                    "is taken as sent (the API doesn't authenticate it), so it only decides whose turn it is.",
+        default=None,
+    )
 
 
 class ChatResponse(BaseModel):
@@ -31,8 +37,36 @@ class ChatResponse(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     answer: str = Field(title="Answer")
-    model: str = Field(title="Model", description="The Gemini model that produced this answer.")
+    model: str = Field(
+        title="Model",
+        description="The Gemini model that produced this answer, or 'fast-path' / 'answer-cache' if it was looked up "
+                    "or reused without one.",
+    )
     input_tokens: int = Field(title="Input Tokens")
     output_tokens: int = Field(title="Output Tokens")
     cache_read_tokens: int = Field(title="Cache Read Tokens", description="Input tokens served from cache.")
     total_tokens: int = Field(title="Total Tokens", description="Input tokens plus output tokens.")
+
+
+class ChatStreamEventType(StrEnum):
+    """Type of event streamed back while the chatbot answers a message"""
+    TOKEN = "token"
+    TOOL_CALL = "tool_call"
+    DONE = "done"
+    ERROR = "error"
+
+
+class ChatStreamEvent(BaseModel):
+    """A single server-sent event from the streaming chatbot endpoint"""
+    model_config = ConfigDict(extra="forbid")
+
+    type: ChatStreamEventType = Field(title="Event Type")
+    text: Optional[str] = Field(
+        title="Text",
+        description="The next chunk of the answer (token), the name of the tool being called (tool_call), or the "
+                    "error message (error).",
+        default=None,
+    )
+    response: Optional[ChatResponse] = Field(
+        title="Response", description="The complete answer and its token usage (done).", default=None
+    )
@@ -1,4 +1,6 @@
-import pandas as pd
+import math
+import sys
+
 from pydantic import BaseModel, ConfigDict, field_validator, model_validator
 
 from common.data_models.fields import (
@@ -193,7 +195,15 @@ class RentalSummary(BaseModel):
     @classmethod
     def convert_nat_to_none(cls, value):
         """Convert pandas NaT/NA to None"""
+        if isinstance(value, float) and math.isnan(value):
+            return None
+        # a value can only be one of pandas' own missing values once pandas was imported (i.e. in the UI), so the
+        # API, which never needs pandas otherwise, doesn't import it just for this check - nor uses it while another
+        # thread is still importing it
+        isna = getattr(sys.modules.get("pandas"), "isna", None)
+        if isna is None:
+            return value
         try:
-            return None if pd.isna(value) else value
+            return None if isna(value) else value
         except (TypeError, ValueError):
             return value
@@ -0,0 +1,11 @@
+from typing import Annotated
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class RentalFormURL(BaseModel):
+    """Data model for a short-lived presigned URL to upload/download a rental form directly to/from S3"""
+    model_config = ConfigDict(extra="forbid")
+
+    url: str = Field(title="URL")
+    expires_in: Annotated[int, Field(title="Expires In", description="Seconds until the URL expires.", gt=0)]
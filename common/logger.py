@@ -1,42 +1,68 @@
-import inspect
 import logging
+import os
+import sys
+import threading
 import time
 from functools import wraps
+from typing import Optional, Set, Union
 
+from common.tracing import is_tracing_enabled, start_span
 
-def initialize_logger(log_level: int = logging.DEBUG) -> logging.Logger:
-    """Initialize and return a logger."""
-    logger = logging.getLogger(inspect.stack()[1].frame.f_globals["__name__"])
-    logger.setLevel(log_level)
+LOG_FORMAT = '%(asctime)s - %(name)s [%(levelname)s]: %(message)s'
+# the level logged at unless the LOG_LEVEL environment variable says otherwise (timeit's timings are DEBUG messages)
+DEFAULT_LOG_LEVEL = "INFO"
 
-    if not logger.hasHandlers():
-        # Create a console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(log_level)
+_configured_packages: Set[str] = set()
+_configure_lock = threading.Lock()
 
-        # Create a formatter and set it for handlers
-        formatter = logging.Formatter('%(asctime)s - %(name)s [%(levelname)s]: %(message)s')
-        console_handler.setFormatter(formatter)
 
-        # Add the handlers to the logger
-        logger.addHandler(console_handler)
+def configure_logging(package: str, log_level: Optional[Union[int, str]] = None) -> None:
+    """Set up the console handler and level of a top-level package's logger (once), which the loggers of all of its
+    modules propagate to."""
+    with _configure_lock:
+        if package in _configured_packages:
+            return
+        package_logger = logging.getLogger(package)
+        package_logger.setLevel(log_level or os.getenv("LOG_LEVEL", DEFAULT_LOG_LEVEL).upper())
+        if not package_logger.handlers:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            package_logger.addHandler(console_handler)
+        _configured_packages.add(package)
 
+
+def initialize_logger(name: Optional[str] = None, log_level: Optional[int] = None) -> logging.Logger:
+    """Initialize and return the logger for a module - the calling module's, unless another name is given."""
+    if name is None:
+        # only the caller's frame is needed, unlike inspect.stack(), which reads the source of every frame on the stack
+        name = sys._getframe(1).f_globals["__name__"]  # pylint: disable=protected-access
+    configure_logging(name.split(".")[0])
+    logger = logging.getLogger(name)
+    if log_level is not None:
+        logger.setLevel(log_level)
     return logger
 
 
-def timeit(logger: logging.Logger = None):
-    """Decorator that reports the execution time using the provided logger or initializes one if not provided."""
-    if logger is None:
-        logger = initialize_logger()
+def timeit(logger: logging.Logger = None, level: int = logging.DEBUG):
+    """Decorator that reports the execution time at the level using the provided logger, or the decorated function's
+    module's logger if not provided, and records each call as a span while tracing is enabled. Functions are called as
+    they are, without timing, while neither the level nor tracing is enabled."""
 
     def decorator(func):
+        func_logger = logger or initialize_logger(func.__module__)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.perf_counter()
-            result = func(*args, **kwargs)
-            end_time = time.perf_counter()
-            elapsed_time = end_time - start_time
-            logger.info("Function %r executed in %.4f seconds", func.__name__, elapsed_time)
+            log_time = func_logger.isEnabledFor(level)
+            if not log_time and not is_tracing_enabled():
+                return func(*args, **kwargs)
+            with start_span(func.__qualname__):
+                if not log_time:
+                    return func(*args, **kwargs)
+                start_time = time.perf_counter()
+                result = func(*args, **kwargs)
+                elapsed_time = time.perf_counter() - start_time
+            func_logger.log(level, "Function %r executed in %.4f seconds", func.__name__, elapsed_time)
             return result
         return wrapper
     return decorator
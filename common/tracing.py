@@ -0,0 +1,136 @@
+"""Request tracing with OpenTelemetry spans, from the UI's pages through the API down to DynamoDB and S3.
+
+Tracing is off unless the TRACE_FILE environment variable is set, in which case each process (the UI and the API) writes
+its finished spans to that file as JSON lines, to be inspected with scripts/show_traces.py. The UI sends the current
+trace's context to the API in the W3C ``traceparent`` header, so the API's spans join the UI's traces.
+
+While tracing is off, none of the OpenTelemetry SDK is imported and spans cost a single check.
+"""
+import functools
+import inspect
+import json
+import os
+import threading
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Callable, ContextManager, Dict, Optional
+
+
+@dataclass
+class _TracingState:
+    """The process' tracer and tracer provider (None while tracing is off), set up once by configure_tracing"""
+    tracer: Any = None
+    tracer_provider: Any = None
+    configured: bool = False
+
+
+_state = _TracingState()
+_configure_lock = threading.Lock()
+
+
+def _to_json_line(span) -> str:
+    return json.dumps(json.loads(span.to_json()), separators=(",", ":")) + "\n"
+
+
+def configure_tracing(service_name: str) -> bool:
+    """Start writing the process' spans to TRACE_FILE if it is set (once per process), returning whether spans are
+    recorded"""
+    # pylint: disable=import-outside-toplevel
+    with _configure_lock:
+        if not _state.configured and os.getenv("TRACE_FILE"):
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+            # the spans are written by a background thread, in batches, so recording them adds little to a request
+            trace_file = open(os.environ["TRACE_FILE"], "a", encoding="utf-8")  # pylint: disable=consider-using-with
+            tracer_provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+            tracer_provider.add_span_processor(
+                BatchSpanProcessor(ConsoleSpanExporter(out=trace_file, formatter=_to_json_line))
+            )
+            _state.tracer_provider = tracer_provider
+            _state.tracer = tracer_provider.get_tracer(__name__)
+        _state.configured = True
+        return _state.tracer is not None
+
+
+def is_tracing_enabled() -> bool:
+    """Whether spans are being recorded"""
+    return _state.tracer is not None
+
+
+def get_tracer_provider():
+    """Get the OpenTelemetry tracer provider spans are recorded with (None while tracing is off)"""
+    return _state.tracer_provider
+
+
+def start_span(
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        kind: str = "internal",
+        context=None,
+        record_exception: bool = True,
+) -> ContextManager:
+    """Start a span as the current span, as a context manager giving the span (or None while tracing is off).
+
+    :param kind: the span's kind (``internal``, ``server`` or ``client``)
+    :param context: the context to start the span in, if not the current one (e.g. extracted from a request's headers)
+    :param record_exception: whether exceptions raised in the span are recorded and fail it (which control flow
+        exceptions shouldn't)
+    """
+    if _state.tracer is None:
+        return nullcontext()
+    from opentelemetry.trace import SpanKind  # pylint: disable=import-outside-toplevel
+
+    return _state.tracer.start_as_current_span(
+        name,
+        context=context,
+        kind=SpanKind[kind.upper()],
+        attributes=attributes,
+        record_exception=record_exception,
+        set_status_on_exception=record_exception,
+    )
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator recording a span (named after the function unless a name is given) around each call of a function or
+    coroutine function"""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with start_span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with start_span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def inject_trace_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Add the current trace's context to the headers of a request (as a new dict if none are given), so the spans of
+    the service it is sent to join the trace"""
+    headers = {} if headers is None else headers
+    if _state.tracer is not None:
+        # pylint: disable=import-outside-toplevel
+        from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+
+        TraceContextTextMapPropagator().inject(headers)
+    return headers
+
+
+def extract_trace_context(headers: Dict[str, str]):
+    """Get the trace context a request's headers carry (None while tracing is off)"""
+    if _state.tracer is None:
+        return None
+    # pylint: disable=import-outside-toplevel
+    from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+
+    return TraceContextTextMapPropagator().extract(headers)
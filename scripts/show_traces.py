@@ -0,0 +1,117 @@
+"""Show the traces recorded in trace files (see common/tracing.py) as trees of spans with their durations.
+
+Start the UI and the API with TRACE_FILE set, use the UI, then pass both processes' files to merge their spans into
+one tree per page rerun:
+
+    python scripts/show_traces.py ui_traces.jsonl api_traces.jsonl --last 5
+    python scripts/show_traces.py api_traces.jsonl --slowest 3
+    python scripts/show_traces.py ui_traces.jsonl api_traces.jsonl --trace-id 3b457f53584d52353653dd537a51079a
+
+The spans are written in batches, every few seconds, so the latest traces may take a moment to show up.
+"""
+
+import argparse
+import json
+import os
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+# attributes that the spans' names already show
+HIDDEN_ATTRIBUTES = ("url.path",)
+
+
+def _timestamp(value: str) -> float:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def load_spans(paths: Iterable[str]) -> List[dict]:
+    """Load the spans in the trace files, adding their start, end and service to each"""
+    spans = []
+    for path in paths:
+        with open(path, encoding="utf-8") as trace_file:
+            for line in trace_file:
+                if not line.strip():
+                    continue
+                span = json.loads(line)
+                span["start"] = _timestamp(span["start_time"])
+                span["end"] = _timestamp(span["end_time"])
+                span["service"] = span["resource"]["attributes"].get("service.name", "?")
+                spans.append(span)
+    return spans
+
+
+def group_traces(spans: List[dict]) -> Dict[str, List[dict]]:
+    """Group the spans by trace ID (without its 0x prefix)"""
+    traces = defaultdict(list)
+    for span in spans:
+        traces[span["context"]["trace_id"].removeprefix("0x")].append(span)
+    return dict(traces)
+
+
+def _duration(spans: List[dict]) -> float:
+    return max(span["end"] for span in spans) - min(span["start"] for span in spans)
+
+
+def format_trace(spans: List[dict]) -> List[str]:
+    """Format a trace's spans as an indented tree, each span with its duration and offset from the trace's start"""
+    span_ids = {span["context"]["span_id"] for span in spans}
+    children = defaultdict(list)
+    for span in spans:
+        # spans whose parent isn't in the files (e.g. the UI's, when only the API's file is given) are roots
+        parent_id = span["parent_id"] if span["parent_id"] in span_ids else None
+        children[parent_id].append(span)
+    trace_start = min(span["start"] for span in spans)
+
+    lines = []
+
+    def add_lines(span: dict, depth: int):
+        attributes = ", ".join(
+            f"{name}={value}" for name, value in span["attributes"].items() if name not in HIDDEN_ATTRIBUTES
+        )
+        failed = " FAILED" if span["status"]["status_code"] == "ERROR" else ""
+        lines.append(
+            f"{(span['start'] - trace_start) * 1000:>9.1f} ms {(span['end'] - span['start']) * 1000:>9.1f} ms  "
+            f"{'  ' * depth}{span['name']} [{span['service']}]{failed}" + (f"  ({attributes})" if attributes else "")
+        )
+        for child in sorted(children[span["context"]["span_id"]], key=lambda child: child["start"]):
+            add_lines(child, depth + 1)
+
+    for root in sorted(children[None], key=lambda root: root["start"]):
+        add_lines(root, 0)
+    return lines
+
+
+def main():
+    """Print the selected traces"""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="Trace files to read (default: $TRACE_FILE)")
+    parser.add_argument("--trace-id", help="Show only this trace")
+    parser.add_argument("--last", type=int, default=10, help="Number of most recent traces to show")
+    parser.add_argument("--slowest", type=int, help="Show the slowest traces instead of the most recent")
+    args = parser.parse_args()
+
+    files = args.files or ([os.environ["TRACE_FILE"]] if os.getenv("TRACE_FILE") else [])
+    if not files:
+        parser.error("no trace files given, and TRACE_FILE is not set")
+    traces = group_traces(load_spans(files))
+
+    if args.trace_id:
+        trace_id = args.trace_id.removeprefix("0x")
+        selected = [trace_id] if trace_id in traces else []
+    elif args.slowest:
+        selected = sorted(traces, key=lambda trace_id: _duration(traces[trace_id]), reverse=True)[:args.slowest]
+    else:
+        selected = sorted(traces, key=lambda trace_id: min(span["start"] for span in traces[trace_id]))[-args.last:]
+
+    if not selected:
+        print("No matching traces")
+    for trace_id in selected:
+        print(f"Trace {trace_id}")
+        print(f"{'offset':>12} {'duration':>12}  span")
+        print("\n".join(format_trace(traces[trace_id])))
+        print()
+
+
+if __name__ == "__main__":
+    main()
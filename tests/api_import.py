@@ -0,0 +1,37 @@
+"""Helpers importing api.main in a fresh interpreter, shared by the import-time unit and benchmark tests."""
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _run_python(code: str, *options: str, **env: str) -> subprocess.CompletedProcess:
+    """Run the code in a fresh interpreter, so nothing the test suite already imported is shared"""
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True, text=True, check=True, cwd=REPO_ROOT,
+        env={**os.environ, "PYTHONPATH": REPO_ROOT, **env},
+    )
+
+
+def import_api(**env: str) -> Tuple[float, Dict[str, int]]:
+    """Import api.main in a fresh interpreter with -X importtime, returning how long it took (in seconds) and the
+    cumulative import time of every module it imported (in microseconds)"""
+    result = _run_python("import api.main", "-X", "importtime", **env)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            cumulative[match.group(3)] = int(match.group(1))
+    return cumulative["api.main"] / 1_000_000, cumulative
+
+
+def get_api_route_paths(**env: str) -> List[str]:
+    """Get the paths api.main serves, imported in a fresh interpreter (from its OpenAPI schema, since the app's routes
+    only hold the routers it includes, rather than their routes)"""
+    result = _run_python("import api.main; print(*api.main.app.openapi()['paths'])", **env)
+    return result.stdout.strip().splitlines()[-1].split()
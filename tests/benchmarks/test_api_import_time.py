@@ -0,0 +1,21 @@
+from unittest import TestCase
+
+from tests.api_import import import_api
+
+# importing api.main took ~3s before the chat subsystem, pandas and the AWS clients were deferred, and ~1s after -
+# so the budget leaves room for slower machines while still catching a heavy import creeping back in
+IMPORT_TIME_BUDGET_SECONDS = 2.0
+
+
+class TestApiImportTime(TestCase):
+
+    def test_import_stays_within_budget(self):
+        # the fastest of a few imports, as the slower ones mostly measure whatever else the machine was doing
+        durations, cumulative = zip(*(import_api() for _ in range(3)))
+        slowest = sorted(cumulative[0].items(), key=lambda item: item[1], reverse=True)[1:11]
+
+        self.assertLess(
+            min(durations), IMPORT_TIME_BUDGET_SECONDS,
+            "Importing api.main is over budget. Slowest imports (us): "
+            + ", ".join(f"{name}={micros}" for name, micros in slowest),
+        )
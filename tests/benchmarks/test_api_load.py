@@ -0,0 +1,48 @@
+import logging
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmarks.api_load import (
+    SLOW_CHAT_CLIENTS,
+    SLOW_CHAT_MODEL_LATENCY_SECONDS,
+    check_rental_latency_budget,
+    get_load_test_routes,
+    run_api_load_test,
+)
+
+_SEASON_KWARGS = {"days": 2, "devices_per_type": 10, "reservations_per_day": 5, "walk_ins_per_day": 5}
+
+
+class TestApiLoadTest(TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        patcher = patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_every_route_is_requested_without_failures(self):
+        results = run_api_load_test(clients=2, requests=300, **_SEASON_KWARGS)
+
+        self.assertListEqual([result.route for result in results], get_load_test_routes())
+        # each client finishes the task it is in the middle of
+        self.assertGreaterEqual(sum(result.requests for result in results), 300)
+        for result in results:
+            self.assertEqual(result.failures, 0, result.route)
+            self.assertLessEqual(result.p50_ms, result.p95_ms)
+            self.assertLessEqual(result.p95_ms, result.p99_ms)
+
+    def test_rental_routes_are_not_held_up_by_slow_chats(self):
+        results = run_api_load_test(
+            clients=2,
+            requests=200,
+            chat_clients=SLOW_CHAT_CLIENTS,
+            model_latency_seconds=SLOW_CHAT_MODEL_LATENCY_SECONDS,
+            **_SEASON_KWARGS,
+        )
+
+        chats = {result.route: result for result in results}["/chat/ask_stream"]
+        self.assertGreater(chats.p50_ms, SLOW_CHAT_MODEL_LATENCY_SECONDS * 1000)
+        self.assertListEqual(check_rental_latency_budget(results), [])
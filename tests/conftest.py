@@ -2,13 +2,17 @@
 
 Sets required environment variables and suppresses Streamlit's benign
 "missing ScriptRunContext" warning using both logging configuration and
-a filter on sys.stderr.
+a filter on sys.stderr. The benchmark tests in tests/benchmarks run whole
+load tests and benchmarks, so they are only collected with --benchmarks.
 """
 import logging
 import os
 import sys
 
 from datetime import datetime
+from pathlib import Path
+
+BENCHMARK_TESTS_PATH = Path(__file__).resolve().parent / "benchmarks"
 
 
 class _ScriptRunContextSuppressor:
@@ -45,6 +49,18 @@ class _SuppressScriptRunContextFilter(logging.Filter):
         return True
 
 
+def pytest_addoption(parser):
+    """Add the --benchmarks option."""
+    parser.addoption("--benchmarks", action="store_true", help="Also run the (slow) tests in tests/benchmarks")
+
+
+def pytest_ignore_collect(collection_path, config):
+    """Leave out the benchmark tests unless --benchmarks is given."""
+    if collection_path == BENCHMARK_TESTS_PATH and not config.getoption("--benchmarks"):
+        return True
+    return None
+
+
 def pytest_configure(config):
     """Configure pytest with required env vars and suppress the ScriptRunContext warning."""
     os.environ.setdefault("API_HOST", "localhost")
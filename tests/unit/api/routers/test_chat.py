@@ -1,13 +1,14 @@
 from unittest import TestCase
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from moto import mock_aws
 
 import api.routers.chat as chat_module
-from api.routers import chat_router
-from common.data_models import ChatResponse
+from api.routers.chat import router as chat_router
+from api.src.exceptions import ChatBusyException
+from common.data_models import ChatResponse, ChatStreamEvent, ChatStreamEventType
 
 
 def _make_app():
@@ -22,7 +23,7 @@ class TestChatRouter(TestCase):
 
     def setUp(self):
         self.mock_service = MagicMock()
-        self.patcher = patch.object(chat_module, "chat_service", self.mock_service)
+        self.patcher = patch.object(chat_module, "get_chat_service", return_value=self.mock_service)
         self.patcher.start()
         self.client = TestClient(_make_app())
 
@@ -85,3 +86,79 @@ class TestChatRouter(TestCase):
             json={"message": "hi", "history": [{"role": "system", "content": "x"}]},
         )
         self.assertEqual(response.status_code, 422)
+
+    @staticmethod
+    def _parse_events(response):
+        return [
+            ChatStreamEvent.model_validate_json(line.removeprefix("data:"))
+            for line in response.text.splitlines()
+            if line.startswith("data:")
+        ]
+
+    def test_ask_stream_streams_server_sent_events(self):
+        response_body = ChatResponse(
+            answer="There is 1 rental.", model="gemini-3.5-flash-lite", input_tokens=1, output_tokens=1,
+            cache_read_tokens=0, total_tokens=2,
+        )
+
+        async def answer_stream():
+            yield ChatStreamEvent(type=ChatStreamEventType.TOOL_CALL, text="count_rentals_on_date")
+            yield ChatStreamEvent(type=ChatStreamEventType.TOKEN, text="There is ")
+            yield ChatStreamEvent(type=ChatStreamEventType.TOKEN, text="1 rental.")
+            yield ChatStreamEvent(type=ChatStreamEventType.DONE, response=response_body)
+
+        self.mock_service.open_answer_stream = AsyncMock(return_value=answer_stream())
+        response = self.client.post("/chat/ask_stream", json={"message": "how many rentals?"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        self.assertIn("event: tool_call", response.text)
+        events = self._parse_events(response)
+        self.assertEqual(
+            ["tool_call", "token", "token", "done"], [event.type for event in events]
+        )
+        self.assertEqual(response_body, events[-1].response)
+
+    def test_ask_stream_reports_errors_as_an_error_event(self):
+        async def answer_stream():
+            yield ChatStreamEvent(type=ChatStreamEventType.TOKEN, text="There")
+            raise RuntimeError("model unavailable")
+
+        self.mock_service.open_answer_stream = AsyncMock(return_value=answer_stream())
+        response = self.client.post("/chat/ask_stream", json={"message": "how many rentals?"})
+
+        self.assertEqual(response.status_code, 200)
+        events = self._parse_events(response)
+        self.assertEqual(["token", "error"], [event.type for event in events])
+        self.assertEqual("model unavailable", events[-1].text)
+
+    def test_ask_stream_returns_503_when_the_chatbot_is_busy(self):
+        self.mock_service.open_answer_stream = AsyncMock(
+            side_effect=ChatBusyException("The chatbot is busy answering other questions - please try again shortly.")
+        )
+        response = self.client.post("/chat/ask_stream", json={"message": "how many rentals?", "user": "alice"})
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("busy", response.json()["detail"])
+        self.mock_service.open_answer_stream.assert_awaited_once_with(
+            message="how many rentals?", history=[], user="alice"
+        )
+
+    def test_ask_stream_rejects_invalid_role(self):
+        response = self.client.post(
+            "/chat/ask_stream",
+            json={"message": "hi", "history": [{"role": "system", "content": "x"}]},
+        )
+        self.assertEqual(response.status_code, 422)
+
+
+class TestGetChatService(TestCase):
+
+    def test_chat_service_is_built_once_by_the_first_chat(self):
+        chat_module._build_chat_service.cache_clear()  # pylint: disable=protected-access
+        self.addCleanup(chat_module._build_chat_service.cache_clear)  # pylint: disable=protected-access
+        with patch("api.src.chat_service.ChatService") as mock_chat_service:
+            mock_chat_service.assert_not_called()
+            self.assertIs(chat_module.get_chat_service(), chat_module.get_chat_service())
+
+        mock_chat_service.assert_called_once_with()
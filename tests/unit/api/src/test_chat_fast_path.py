@@ -0,0 +1,138 @@
+import asyncio
+import datetime
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from api.src.chat_fast_path import FAST_PATH_MODEL
+from common.constants import DeviceStatus, DeviceType, Location, ReservationStatus
+from common.data_models import ChatStreamEventType
+from common.utils import get_default_timezone
+from tests.unit.api.src.test_chat_service import _make_chat_service, _make_rental, _make_reservation
+
+
+class TestChatFastPath(TestCase):
+    """Tests for the fast path's intents, with a mocked DynamoDBService."""
+
+    def setUp(self):
+        self.service = _make_chat_service()
+        self.fast_path = self.service._fast_path  # pylint: disable=protected-access
+        self.db = self.service.db_service
+
+    def test_device_status(self):
+        self.db.get_device_by_id.return_value = {
+            "cne_year": 2025, "id": "W04", "type": DeviceType.WHEELCHAIR, "status": DeviceStatus.AVAILABLE,
+            "location": Location.PG,
+        }
+        for message in ("Where is W04?", "where's w04", "What is the status of device W04?", "Is W04 available?"):
+            with self.subTest(message=message):
+                self.assertEqual("W04 (Wheelchair) is at PG, with status Available.", self.fast_path.answer(message))
+        self.db.get_device_by_id.assert_called_with(cne_year=2025, device_id="W04")
+        self.db.get_current_rental_for_device.assert_not_called()
+
+    def test_rented_device_reports_who_has_it(self):
+        self.db.get_device_by_id.return_value = {
+            "cne_year": 2025, "id": "W01", "type": DeviceType.WHEELCHAIR, "status": DeviceStatus.RENTED,
+            "location": Location.BLC,
+        }
+        self.db.get_current_rental_for_device.return_value = _make_rental().model_dump()
+
+        self.assertEqual(
+            "W01 (Wheelchair) is rented out to Test Renter Name (rental W0820001), picked up at BLC at "
+            "11:00 AM on 2025-08-20.",
+            self.fast_path.answer("Who has W01?"),
+        )
+
+    def test_unknown_device(self):
+        self.db.get_device_by_id.return_value = None
+        self.assertEqual("There is no device S99 in the 2025 inventory.", self.fast_path.answer("where is S99"))
+
+    def test_rental_by_id(self):
+        self.db.get_rental_by_id.return_value = _make_rental(
+            status="Completed",
+            return_location=Location.PG,
+            return_time=get_default_timezone().localize(datetime.datetime(2025, 8, 20, 15, 30)),
+            return_staff_name="Test Staff",
+        ).model_dump()
+
+        self.assertEqual(
+            "Rental W0820001: Wheelchair W01 for Test Renter Name (+1-416-820-2370), picked up at BLC at 11:00 AM on "
+            "2025-08-20. Status: Completed. Returned to PG at 3:30 PM on 2025-08-20.",
+            self.fast_path.answer("Show me rental w0820001"),
+        )
+        self.db.get_rental_by_id.assert_called_once_with(cne_year=2025, rental_id="W0820001")
+
+    def test_reservation_by_id(self):
+        self.db.get_reservation_by_id.return_value = _make_reservation(
+            status=ReservationStatus.PICKED_UP, rental_id="W0820003"
+        ).model_dump()
+
+        self.assertEqual(
+            "Reservation W0820001: Wheelchair for Test Reservation Name (+1-416-820-2370) at BLC at 11:00 AM on "
+            "2025-08-20. Status: Picked Up. Rental: W0820003.",
+            self.fast_path.answer("look up reservation W0820001"),
+        )
+
+    def test_unknown_reservation(self):
+        self.db.get_reservation_by_id.return_value = None
+        self.assertEqual("There is no reservation S0901001 in 2025.", self.fast_path.answer("reservation S0901001?"))
+
+    def test_available_count(self):
+        self.db.count_available_devices_by_location.return_value = {"BLC": 8, "PG": 1}
+
+        self.assertEqual(
+            "There are 9 scooters available: 8 at BLC, 1 at PG.",
+            self.fast_path.answer("How many scooters are available?"),
+        )
+        self.assertEqual(
+            "There is 1 scooter available at PG.", self.fast_path.answer("how many scooters available at the PG now?")
+        )
+        self.db.count_available_devices_by_location.assert_called_with(cne_year=2025, device_type=DeviceType.SCOOTER)
+
+    def test_anything_else_is_left_to_the_agent(self):
+        for message in (
+                "How do I change the status of W04?",
+                "Where is W04 and who rented it yesterday?",
+                "How many rentals were there on August 20?",
+                "Show me the first wheelchair rental.",
+                "show reservation walk-in - no reservation",
+        ):
+            with self.subTest(message=message):
+                self.assertIsNone(self.fast_path.answer(message))
+        self.db.assert_not_called()
+
+    def test_hit_rate_is_logged(self):
+        self.db.get_device_by_id.return_value = None
+        with self.assertLogs("api.src.chat_fast_path", level="INFO") as logs:
+            self.fast_path.answer("where is W04?")
+            self.fast_path.answer("how do I return a rental?")
+
+        self.assertIn("hit (device_status): hit rate 100.0% (1 of 1 messages)", logs.output[0])
+        self.assertIn("miss: hit rate 50.0% (1 of 2 messages)", logs.output[1])
+
+
+class TestChatServiceFastPath(TestCase):
+    """Tests for answering through the fast path instead of the agent."""
+
+    def setUp(self):
+        self.service = _make_chat_service()
+        self.service.db_service.get_device_by_id.return_value = None
+        self.agent = MagicMock()
+        self.service._agents = {"any": self.agent}  # pylint: disable=protected-access
+
+    def test_answer_skips_the_agent(self):
+        response = self.service.answer("Where is W04?")
+
+        self.assertEqual("There is no device W04 in the 2025 inventory.", response.answer)
+        self.assertEqual(FAST_PATH_MODEL, response.model)
+        self.assertEqual(0, response.total_tokens)
+        self.agent.run_sync.assert_not_called()
+
+    def test_answer_stream_skips_the_agent(self):
+        async def collect():
+            return [event async for event in self.service.answer_stream("Where is W04?")]
+
+        events = asyncio.run(collect())
+
+        self.assertEqual([ChatStreamEventType.TOKEN, ChatStreamEventType.DONE], [event.type for event in events])
+        self.assertEqual("There is no device W04 in the 2025 inventory.", events[0].text)
+        self.assertEqual(FAST_PATH_MODEL, events[1].response.model)
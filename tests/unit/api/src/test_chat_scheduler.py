@@ -0,0 +1,295 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from pydantic_ai import Agent, ModelHTTPError
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.test import TestModel
+
+from api.src.chat_scheduler import (
+    MAX_RATE_LIMIT_COOLDOWN_SECONDS,
+    RATE_LIMIT_COOLDOWN_SECONDS,
+    FairRequestQueue,
+    ModelRateBudgets,
+)
+from api.src.chat_service import GEMINI_MODEL_FALLBACK_CHAIN
+from api.src.exceptions import ChatBusyException
+from tests.unit.api.src.test_chat_service import _make_chat_service
+
+MODELS = ("model-a", "model-b")
+
+
+class TestModelRateBudgets(TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.budgets = ModelRateBudgets(MODELS, requests_per_minute=2, tokens_per_minute=1000, clock=lambda: self.now)
+
+    def test_reserves_from_the_first_model_with_budget(self):
+        self.assertEqual(("model-a", 0.0), self.budgets.reserve(100))
+        self.assertEqual(("model-a", 0.0), self.budgets.reserve(100))
+        self.assertEqual(("model-b", 0.0), self.budgets.reserve(100))
+        self.assertEqual(("model-b", 0.0), self.budgets.reserve(100))
+
+        # every model is out of requests, until one refills (2 per minute, i.e. one every 30 seconds)
+        self.assertEqual((None, 30.0), self.budgets.reserve(100))
+        self.now = 30.0
+        self.assertEqual(("model-a", 0.0), self.budgets.reserve(100))
+
+    def test_falls_back_when_the_model_is_short_of_tokens(self):
+        self.budgets.reserve(800)
+
+        self.assertEqual(("model-b", 0.0), self.budgets.reserve(800))
+        self.assertEqual(("model-a", 0.0), self.budgets.reserve(200))
+
+    def test_excluded_models_are_skipped(self):
+        self.assertEqual(("model-b", 0.0), self.budgets.reserve(100, exclude={"model-a"}))
+
+    def test_usage_beyond_the_reservation_is_paid_back_before_the_next_one(self):
+        self.budgets.reserve(100)
+        # the chat took 2000 tokens rather than the 100 reserved, leaving the bucket 1000 tokens short
+        self.budgets.record_usage("model-a", 100, requests=1, tokens=2000)
+
+        model_name, _ = self.budgets.reserve(100)
+        self.assertEqual("model-b", model_name)
+        # at 1000 tokens per minute, it takes 66 seconds to pay back the 1000 tokens and cover 100 more
+        self.assertAlmostEqual(66.0, self.budgets.reserve(100, exclude={"model-b"})[1])
+
+        # extra model requests are paid back the same way
+        self.budgets.record_usage("model-b", 100, requests=3, tokens=100)
+        self.assertAlmostEqual(60.0, self.budgets.reserve(100, exclude={"model-a"})[1])
+
+    def test_rate_limit_cooldown_doubles_for_each_429_in_a_row(self):
+        self.assertEqual(RATE_LIMIT_COOLDOWN_SECONDS, self.budgets.record_rate_limit("model-a"))
+        self.assertEqual(("model-b", 0.0), self.budgets.reserve(100))
+        self.assertEqual(2 * RATE_LIMIT_COOLDOWN_SECONDS, self.budgets.record_rate_limit("model-a"))
+        for _ in range(10):
+            cooldown = self.budgets.record_rate_limit("model-a")
+        self.assertEqual(MAX_RATE_LIMIT_COOLDOWN_SECONDS, cooldown)
+
+        self.now = MAX_RATE_LIMIT_COOLDOWN_SECONDS
+        model_name, _ = self.budgets.reserve(100)
+        self.assertEqual("model-a", model_name)
+        # a successful chat resets the cooldown
+        self.budgets.record_usage("model-a", 100, requests=1, tokens=100)
+        self.assertEqual(RATE_LIMIT_COOLDOWN_SECONDS, self.budgets.record_rate_limit("model-a"))
+
+    def test_reservations_from_many_threads_never_overdraw_the_budget(self):
+        budgets = ModelRateBudgets(MODELS, requests_per_minute=50, clock=lambda: 0.0)
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            models = list(executor.map(lambda _: budgets.reserve(10)[0], range(200)))
+
+        self.assertEqual({"model-a": 50, "model-b": 50, None: 100}, dict(Counter(models)))
+
+    def test_released_reservations_are_given_back(self):
+        self.budgets.reserve(800)
+        self.budgets.release("model-a", 800)
+
+        self.assertEqual(("model-a", 0.0), self.budgets.reserve(800))
+        # but never beyond the bucket's capacity: 6 seconds until 100 more tokens, at 1000 tokens per minute
+        self.budgets.release("model-b", 800)
+        self.assertEqual(("model-b", 0.0), self.budgets.reserve(1000))
+        self.assertAlmostEqual(6.0, self.budgets.reserve(100, exclude={"model-a"})[1])
+
+
+class TestFairRequestQueue(TestCase):
+
+    def _hold_slot(self, queue: FairRequestQueue, user: str, served: list, release: threading.Event):
+        with queue.slot(user, timeout=5):
+            served.append(user)
+            release.wait(5)
+
+    def test_queued_chats_are_served_round_robin_by_user(self):
+        queue = FairRequestQueue(max_concurrent=1, max_queued=10)
+        served = []
+        release = threading.Event()
+        release.set()
+        with queue.slot("alice"):
+            threads = []
+            # alice queues three more questions before bob and carol ask theirs
+            for user in ("alice", "alice", "alice", "bob", "carol"):
+                thread = threading.Thread(target=self._hold_slot, args=(queue, user, served, release))
+                thread.start()
+                threads.append(thread)
+                # wait for the thread to join the queue, so the queueing order is deterministic
+                while queue._num_queued < len(threads):  # pylint: disable=protected-access
+                    time.sleep(0.001)
+        for thread in threads:
+            thread.join(5)
+
+        self.assertListEqual(["alice", "bob", "carol", "alice", "alice"], served)
+
+    def test_full_queue_turns_chats_away(self):
+        queue = FairRequestQueue(max_concurrent=1, max_queued=0)
+        with queue.slot("alice"):
+            with self.assertRaises(ChatBusyException):
+                with queue.slot("bob"):
+                    pass
+        with queue.slot("bob"):
+            pass
+
+    def test_chat_that_waits_too_long_leaves_the_queue(self):
+        queue = FairRequestQueue(max_concurrent=1, max_queued=1)
+        with queue.slot("alice"):
+            with self.assertRaises(ChatBusyException):
+                with queue.slot("bob", timeout=0.01):
+                    pass
+            self.assertEqual(0, queue._num_queued)  # pylint: disable=protected-access
+        with queue.slot("bob", timeout=0.01):
+            pass
+
+    def test_async_slots_wait_without_blocking_the_event_loop(self):
+        queue = FairRequestQueue(max_concurrent=2, max_queued=10)
+        active = []
+        most_active = []
+
+        async def chat(user: str):
+            async with queue.async_slot(user, timeout=5):
+                active.append(user)
+                most_active.append(len(active))
+                await asyncio.sleep(0.01)
+                active.remove(user)
+
+        async def chats():
+            await asyncio.gather(*(chat(user) for user in ("alice", "alice", "alice", "bob", "bob")))
+
+        asyncio.run(chats())
+
+        self.assertEqual(2, max(most_active))
+
+    def test_cancelled_async_chat_leaves_the_queue(self):
+        queue = FairRequestQueue(max_concurrent=1, max_queued=1)
+
+        async def cancel_waiting_chat():
+            with queue.slot("alice"):
+                async def wait_for_slot():
+                    async with queue.async_slot("bob"):
+                        pass
+
+                task = asyncio.ensure_future(wait_for_slot())
+                await asyncio.sleep(0.01)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+
+        asyncio.run(cancel_waiting_chat())
+
+        self.assertEqual(0, queue._num_queued)  # pylint: disable=protected-access
+        self.assertEqual(0, queue._active)  # pylint: disable=protected-access
+
+
+class TestChatServiceRateBudgeting(TestCase):
+    """Many chats at once against fake models, each of which returns a 429 beyond a fixed number of requests."""
+
+    def setUp(self):
+        self.service = _make_chat_service()
+        self.requests = Counter()
+        self.rate_limits = Counter()
+        self.lock = threading.Lock()
+
+    def _fake_model(self, model_name: str, request_limit: int) -> FunctionModel:
+        def respond(_messages, _info: AgentInfo) -> ModelResponse:
+            with self.lock:
+                self.requests[model_name] += 1
+                if self.requests[model_name] > request_limit:
+                    self.rate_limits[model_name] += 1
+                    raise ModelHTTPError(status_code=429, model_name=model_name)
+            time.sleep(0.01)
+            return ModelResponse(parts=[TextPart(f"answered by {model_name}")])
+
+        return FunctionModel(respond)
+
+    def _ask_concurrently(self, num_chats: int):
+        with ThreadPoolExecutor(max_workers=num_chats) as executor:
+            return list(executor.map(
+                lambda i: self.service.answer(f"question {i}", user=f"user {i % 3}"), range(num_chats)
+            ))
+
+    def test_chats_are_spread_across_the_models_before_any_429(self):
+        self.service._rate_budgets = ModelRateBudgets(  # pylint: disable=protected-access
+            GEMINI_MODEL_FALLBACK_CHAIN, requests_per_minute=4, clock=lambda: 0.0
+        )
+        self.service._agents = {  # pylint: disable=protected-access
+            model_name: Agent(self._fake_model(model_name, request_limit=4))
+            for model_name in GEMINI_MODEL_FALLBACK_CHAIN
+        }
+
+        responses = self._ask_concurrently(12)
+
+        self.assertEqual({model_name: 4 for model_name in GEMINI_MODEL_FALLBACK_CHAIN}, dict(self.requests))
+        self.assertEqual(0, sum(self.rate_limits.values()))
+        self.assertEqual(
+            {model_name: 4 for model_name in GEMINI_MODEL_FALLBACK_CHAIN},
+            dict(Counter(response.model for response in responses)),
+        )
+
+    def test_a_model_that_returns_429_early_is_skipped(self):
+        # the first model's real limit is far below its budget
+        self.service._agents = {  # pylint: disable=protected-access
+            model_name: Agent(self._fake_model(model_name, request_limit=2 if index == 0 else 100))
+            for index, model_name in enumerate(GEMINI_MODEL_FALLBACK_CHAIN)
+        }
+
+        responses = self._ask_concurrently(12)
+
+        self.assertTrue(all(response.answer.startswith("answered by") for response in responses))
+        # only the chats that were already on their way to the first model when it returned its first 429 hit it
+        self.assertLessEqual(self.rate_limits[GEMINI_MODEL_FALLBACK_CHAIN[0]], 4)
+        self.assertEqual(0, self.rate_limits[GEMINI_MODEL_FALLBACK_CHAIN[1]])
+
+    def test_a_chat_that_fails_gives_its_budget_back(self):
+        self.service._rate_budgets = ModelRateBudgets(  # pylint: disable=protected-access
+            GEMINI_MODEL_FALLBACK_CHAIN, requests_per_minute=1, clock=lambda: 0.0
+        )
+
+        def fail(_messages, _info: AgentInfo) -> ModelResponse:
+            raise ModelHTTPError(status_code=500, model_name=GEMINI_MODEL_FALLBACK_CHAIN[0])
+
+        self.service._agents = {  # pylint: disable=protected-access
+            GEMINI_MODEL_FALLBACK_CHAIN[0]: Agent(FunctionModel(fail))
+        }
+        with self.assertRaises(ModelHTTPError):
+            self.service.answer("hello")
+
+        self.assertEqual(
+            (GEMINI_MODEL_FALLBACK_CHAIN[0], 0.0),
+            self.service._rate_budgets.reserve(100),  # pylint: disable=protected-access
+        )
+
+    def test_a_chat_waiting_for_a_budget_does_not_hold_a_slot(self):
+        # every model has used up its requests, which come back at one a second
+        self.service._rate_budgets = ModelRateBudgets(  # pylint: disable=protected-access
+            GEMINI_MODEL_FALLBACK_CHAIN, requests_per_minute=60
+        )
+        while self.service._rate_budgets.reserve(0)[0] is not None:  # pylint: disable=protected-access
+            pass
+        self.service._chat_queue = FairRequestQueue(max_concurrent=1)  # pylint: disable=protected-access
+        self.service._agents = {  # pylint: disable=protected-access
+            model_name: Agent(self._fake_model(model_name, request_limit=1))
+            for model_name in GEMINI_MODEL_FALLBACK_CHAIN
+        }
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            waiting_chat = executor.submit(self.service.answer, "hello", user="alice")
+            time.sleep(0.1)
+            # the only slot is free for another chat while the first one waits for a model's budget
+            with self.service._chat_queue.slot("bob", timeout=0.5):  # pylint: disable=protected-access
+                pass
+            self.assertTrue(waiting_chat.result(timeout=5).answer.startswith("answered by"))
+
+    def test_a_streamed_chat_is_turned_away_before_any_event(self):
+        self.service._rate_budgets = ModelRateBudgets(  # pylint: disable=protected-access
+            GEMINI_MODEL_FALLBACK_CHAIN, requests_per_minute=1, clock=lambda: 0.0
+        )
+        for _ in GEMINI_MODEL_FALLBACK_CHAIN:
+            self.service._rate_budgets.reserve(0)  # pylint: disable=protected-access
+        self.service._agents = {  # pylint: disable=protected-access
+            model_name: Agent(TestModel()) for model_name in GEMINI_MODEL_FALLBACK_CHAIN
+        }
+
+        with self.assertRaises(ChatBusyException):
+            asyncio.run(self.service.open_answer_stream("hello"))
@@ -1,19 +1,48 @@
+import asyncio
 import datetime
+import os
 import re
+import tempfile
+import threading
 from decimal import Decimal
+from pathlib import Path
+from typing import List
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
 from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, ToolCallPart, ToolReturnPart
 
-from pydantic_ai import ModelHTTPError
-
-from api.src.chat_service import GEMINI_MODEL_FALLBACK_CHAIN, ChatService, _to_model_messages
+from pydantic_ai import Agent, ModelHTTPError
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, FunctionModel
+
+from api.src.chat_service import (
+    ANSWER_CACHE_MODEL,
+    GEMINI_MODEL_FALLBACK_CHAIN,
+    HISTORY_RECENT_MESSAGES,
+    TOOL_CACHE_TTL_SECONDS,
+    TOOL_RESULT_ROW_BUDGET,
+    ChatService,
+    _compact_history,
+    _to_model_messages,
+)
+from api.src.chat_scheduler import RATE_LIMIT_COOLDOWN_SECONDS, REQUESTS_PER_MINUTE, ModelRateBudgets
+from api.src.dynamodb_service import DynamoDBService
+from api.src.exceptions import ChatBusyException
+from api.src.usage_guide import MANUAL_PATH, UsageGuide
 from common.cne_dates import CNEDates
 from common.constants import DeviceStatus, DeviceType, Location, PaymentMethod, ReservationStatus
-from common.data_models import ChatMessage, ChatRole, Device, Rental, RentalSummary, Reservation
+from common.data_models import (
+    ChatMessage,
+    ChatRole,
+    ChatStreamEventType,
+    Device,
+    Rental,
+    RentalSummary,
+    Reservation,
+)
 from common.utils import get_default_timezone
+from tests.unit.base_tests import BaseTestCases
 
 
 def _make_chat_service() -> ChatService:
@@ -27,11 +56,24 @@ def _make_chat_service() -> ChatService:
     service.db_service = MagicMock()
     service.cne_year = 2025
     service._model_names = GEMINI_MODEL_FALLBACK_CHAIN  # pylint: disable=protected-access
-    service._current_model_index = 0  # pylint: disable=protected-access
+    service._rate_budgets = ModelRateBudgets(GEMINI_MODEL_FALLBACK_CHAIN)  # pylint: disable=protected-access
     service._agents = {}  # pylint: disable=protected-access
     return service
 
 
+def _from_table(table: dict) -> List[dict]:
+    """Expand a list tool's compact table back into one dict per record."""
+    return [dict(zip(table["columns"], row)) for row in table["rows"]]
+
+
+def _compact(record) -> dict:
+    """The fields of a single record that a list tool's table keeps (the CNE year and empty fields are dropped)."""
+    return {
+        field: value for field, value in record.model_dump(mode="json").items()
+        if field != "cne_year" and value not in (None, "", [])
+    }
+
+
 def _make_rental(**overrides) -> Rental:
     """Build a full Rental for tests."""
     params = {
@@ -122,9 +164,17 @@ class TestChatServiceTools(TestCase):
         self.assertEqual(self.service.get_today(), today)
 
     def test_get_usage_guide_returns_manual_text(self):
-        from api.src.chat_service import _APP_USAGE_GUIDE  # pylint: disable=import-outside-toplevel
+        self.assertEqual(self.service.get_usage_guide(), MANUAL_PATH.read_text(encoding="utf-8"))
+
+    def test_search_usage_guide_returns_only_the_relevant_sections(self):
+        result = self.service.search_usage_guide("credit card deposit")
 
-        self.assertEqual(self.service.get_usage_guide(), _APP_USAGE_GUIDE)
+        self.assertTrue(result.startswith("#### 2.1.1 Credit Card Deposits"))
+        self.assertNotIn("### 1.1 Creating a New Reservation", result)
+        self.assertLess(len(result), len(self.service.get_usage_guide()) / 2)
+
+    def test_search_usage_guide_with_no_matching_section(self):
+        self.assertIn("get_usage_guide", self.service.search_usage_guide("quantum entanglement"))
 
     # ── lookup tools ────────────────────────────────────
 
@@ -152,7 +202,7 @@ class TestChatServiceTools(TestCase):
 
         result = self.service.lookup_rentals_on_date(date=datetime.date(2025, 8, 20))
 
-        self.assertEqual(result, [summary.model_dump(mode="json")])
+        self.assertEqual(_from_table(result), [_compact(summary)])
         self.service.db_service.get_rentals_on_date.assert_called_once_with(
             date=datetime.date(2025, 8, 20), device_type=None, in_progress_rentals_only=False
         )
@@ -163,7 +213,7 @@ class TestChatServiceTools(TestCase):
         result = self.service.lookup_rentals_on_date(
             date=datetime.date(2025, 8, 20), device_type=DeviceType.SCOOTER, in_progress_only=True
         )
-        self.assertEqual(result, [summary.model_dump(mode="json")])
+        self.assertEqual(_from_table(result), [_compact(summary)])
         self.service.db_service.get_rentals_on_date.assert_called_once_with(
             date=datetime.date(2025, 8, 20), device_type=DeviceType.SCOOTER, in_progress_rentals_only=True
         )
@@ -180,7 +230,7 @@ class TestChatServiceTools(TestCase):
         result = self.service.lookup_reservations_on_date(
             date=datetime.date(2025, 8, 20), device_type=DeviceType.WHEELCHAIR
         )
-        self.assertEqual(result, [reservation.model_dump(mode="json")])
+        self.assertEqual(_from_table(result), [_compact(reservation)])
         self.service.db_service.get_reservations_on_date.assert_called_once_with(
             date=datetime.date(2025, 8, 20), device_type=DeviceType.WHEELCHAIR
         )
@@ -212,7 +262,10 @@ class TestChatServiceTools(TestCase):
         )
         self.service.db_service.get_full_inventory.return_value = [device.model_dump()]
         result = self.service.lookup_full_inventory()
-        self.assertEqual(result, [device.model_dump(mode="json")])
+        self.assertEqual(result, {
+            "columns": ["id", "type", "status", "location"],
+            "rows": [["W01", "Wheelchair", "Available", "BLC"]],
+        })
         self.service.db_service.get_full_inventory.assert_called_once_with(cne_year=2025)
 
     def test_lookup_full_inventory_reports_no_data_instead_of_empty_list(self):
@@ -266,7 +319,7 @@ class TestChatServiceTools(TestCase):
         result = self.service.lookup_devices_by_status(
             status=DeviceStatus.OUT_OF_SERVICE, device_type=DeviceType.WHEELCHAIR, location=Location.PG
         )
-        self.assertEqual(result, [device.model_dump(mode="json")])
+        self.assertEqual(_from_table(result), [_compact(device)])
         self.service.db_service.get_devices_by_status.assert_called_once_with(
             cne_year=2025, status=DeviceStatus.OUT_OF_SERVICE, device_type=DeviceType.WHEELCHAIR, location=Location.PG
         )
@@ -311,7 +364,7 @@ class TestChatServiceTools(TestCase):
         )
         self.service.db_service.get_outstanding_rentals.return_value = [summary.model_dump()]
         result = self.service.lookup_outstanding_rentals(device_type=DeviceType.WHEELCHAIR)
-        self.assertEqual(result, [summary.model_dump(mode="json")])
+        self.assertEqual(_from_table(result), [_compact(summary)])
         self.service.db_service.get_outstanding_rentals.assert_called_once_with(
             cne_year=2025, device_type=DeviceType.WHEELCHAIR
         )
@@ -325,7 +378,7 @@ class TestChatServiceTools(TestCase):
         reservation = _make_reservation()
         self.service.db_service.search_reservations.return_value = [reservation.model_dump()]
         result = self.service.search_reservations(name="Test", phone_number="4168202370")
-        self.assertEqual(result, [reservation.model_dump(mode="json")])
+        self.assertEqual(_from_table(result), [_compact(reservation)])
         self.service.db_service.search_reservations.assert_called_once_with(
             cne_year=2025, name="Test", phone_number="4168202370"
         )
@@ -335,6 +388,54 @@ class TestChatServiceTools(TestCase):
         result = self.service.search_reservations(name="Nobody")
         self.assertIsInstance(result, str)
 
+    def test_list_tools_leave_out_columns_that_are_empty_for_every_record(self):
+        returned = _make_rental_summary(
+            id="W0820002", device_id="W02", reservation_id="W0820002", status="Completed",
+            return_location=Location.BLC,
+            return_time=get_default_timezone().localize(datetime.datetime(2025, 8, 20, 15)),
+        )
+        self.service.db_service.get_rentals_on_date.return_value = [
+            _make_rental_summary(notes=None, return_location=None, return_time=None).model_dump(),
+            returned.model_dump(),
+        ]
+        result = self.service.lookup_rentals_on_date(date=datetime.date(2025, 8, 20))
+
+        self.assertNotIn("cne_year", result["columns"])
+        self.assertNotIn("notes", result["columns"])
+        self.assertNotIn("items_left_behind", result["columns"])
+        # a column empty for only some records is kept, with the gaps as nulls
+        return_locations = [row["return_location"] for row in _from_table(result)]
+        self.assertEqual([None, "BLC"], return_locations)
+
+    def test_list_tools_cut_off_results_over_the_row_budget_with_counts(self):
+        devices = [
+            Device(
+                cne_year=2025, id=f"{device_type.get_prefix()}{i:02}", type=device_type,
+                location=Location.BLC if i % 2 else Location.PG,
+                status=DeviceStatus.AVAILABLE if i % 3 else DeviceStatus.RENTED,
+            ).model_dump()
+            for device_type in DeviceType
+            for i in range(1, TOOL_RESULT_ROW_BUDGET // 2 + 6)
+        ]
+        self.service.db_service.get_full_inventory.return_value = devices
+
+        result = self.service.lookup_full_inventory()
+
+        self.assertEqual(TOOL_RESULT_ROW_BUDGET, len(result["rows"]))
+        self.assertEqual(len(devices), result["total_rows"])
+        self.assertEqual({"Scooter": len(devices) // 2, "Wheelchair": len(devices) // 2}, result["counts"]["type"])
+        self.assertEqual(len(devices), sum(result["counts"]["location"].values()))
+        self.assertEqual(len(devices), sum(result["counts"]["status"].values()))
+
+    def test_list_tools_within_the_row_budget_are_not_cut_off(self):
+        device = Device(
+            cne_year=2025, id="W01", type=DeviceType.WHEELCHAIR, status=DeviceStatus.AVAILABLE, location=Location.BLC
+        )
+        self.service.db_service.get_full_inventory.return_value = [device.model_dump()] * TOOL_RESULT_ROW_BUDGET
+        result = self.service.lookup_full_inventory()
+        self.assertEqual(TOOL_RESULT_ROW_BUDGET, len(result["rows"]))
+        self.assertNotIn("total_rows", result)
+
     # ── aggregate tools ────────────────────────────────
 
     def test_count_unreturned_rentals_on_date(self):
@@ -368,8 +469,10 @@ class TestChatServiceTools(TestCase):
             {"date": "2025-08-20", "device_type": "Scooter", "location": "BLC", "count": 5},
         ])
         result = self.service.reservation_counts()
-        self.assertEqual(len(result), 1)
-        self.assertEqual(result[0]["count"], 5)
+        self.assertEqual(
+            result,
+            {"columns": ["date", "device_type", "location", "count"], "rows": [["2025-08-20", "Scooter", "BLC", 5]]},
+        )
         self.service.db_service.get_reservation_count.assert_called_once_with(2025)
 
     def test_reservation_counts_reports_no_data_instead_of_empty_list(self):
@@ -385,8 +488,8 @@ class TestChatServiceTools(TestCase):
             {"status": "Picked Up", "device_type": "Scooter", "count": 2},
         ])
         result = self.service.reservation_status_counts()
-        self.assertEqual(len(result), 2)
-        self.assertEqual({row["status"] for row in result}, {"Reserved", "Picked Up"})
+        self.assertEqual(len(result["rows"]), 2)
+        self.assertEqual({row["status"] for row in _from_table(result)}, {"Reserved", "Picked Up"})
         self.service.db_service.get_reservation_status_counts.assert_called_once_with(2025)
 
     def test_reservation_status_counts_reports_no_data_instead_of_empty_list(self):
@@ -428,8 +531,9 @@ class TestChatServiceSystemPrompt(TestCase):
         self.assertIn(fair_end.date().isoformat(), prompt)
 
     def test_system_prompt_references_usage_guide_tool_instead_of_inlining_it(self):
-        """The guide is fetched on demand via get_usage_guide, not resent on every model call."""
+        """The guide is searched on demand via search_usage_guide, not resent on every model call."""
         prompt = self.service._system_prompt()  # pylint: disable=protected-access
+        self.assertIn("search_usage_guide", prompt)
         self.assertIn("get_usage_guide", prompt)
         self.assertNotIn("===== APP USAGE GUIDE =====", prompt)
 
@@ -446,7 +550,10 @@ class TestChatServiceSystemPrompt(TestCase):
     def test_get_usage_guide_survives_braces_in_manual(self):
         """Braces in the manual must not break tool output (the guide is not .format()-ed)."""
         guide_text = 'Set {"limit": 5} in the {config} field.'
-        with patch("api.src.chat_service._APP_USAGE_GUIDE", guide_text):
+        with tempfile.TemporaryDirectory() as directory:
+            manual_path = Path(directory) / "manual.md"
+            manual_path.write_text(guide_text, encoding="utf-8")
+            self.service._usage_guide = UsageGuide(manual_path)  # pylint: disable=protected-access
             result = self.service.get_usage_guide()
         self.assertEqual(result, guide_text)
 
@@ -467,6 +574,76 @@ class TestChatServiceAnswer(TestCase):
     def test_to_model_messages_empty(self):
         self.assertEqual(_to_model_messages([]), [])
 
+    @staticmethod
+    def _long_conversation(num_exchanges: int) -> List[ChatMessage]:
+        history = []
+        for i in range(num_exchanges):
+            history.append(ChatMessage(role=ChatRole.USER, content=f"question {i}: who rented on August {i + 1}?"))
+            history.append(ChatMessage(role=ChatRole.ASSISTANT, content=f"answer {i}\n" + "| W0820001 | Name |\n" * 40))
+        return history
+
+    @staticmethod
+    def _contents(messages) -> List[List[str]]:
+        return [[part.content for part in message.parts] for message in messages]
+
+    def test_compact_history_sends_short_conversations_as_they_are(self):
+        history = self._long_conversation(3)
+        self.assertEqual(
+            self._contents(_to_model_messages(history)),
+            self._contents(_compact_history(history, token_budget=100_000)),
+        )
+
+    def test_compact_history_keeps_recent_messages_and_summarizes_older_ones(self):
+        history = self._long_conversation(10)
+
+        messages = _compact_history(history, token_budget=2000)
+
+        self.assertEqual(HISTORY_RECENT_MESSAGES, len(messages))
+        self.assertEqual(
+            self._contents(_to_model_messages(history[-HISTORY_RECENT_MESSAGES + 1:])), self._contents(messages[1:])
+        )
+        summary, first_recent_question = messages[0].parts
+        self.assertEqual(history[-HISTORY_RECENT_MESSAGES].content, first_recent_question.content)
+        self.assertIn("Staff asked: question 0: who rented on August 1?", summary.content)
+        # only the first line of each older answer is kept
+        self.assertIn("You answered: answer 6", summary.content)
+        self.assertNotIn("W0820001", summary.content)
+
+    def test_compact_history_stays_within_the_budget_as_the_conversation_grows(self):
+        for num_exchanges in (100, 1000, 5000):
+            with self.subTest(num_exchanges=num_exchanges):
+                messages = _compact_history(self._long_conversation(num_exchanges), token_budget=2000)
+                summary = messages[0].parts[0].content
+                self.assertRegex(summary, r"\(\d+ earlier messages omitted\)")
+                self.assertLessEqual(sum(map(len, sum(self._contents(messages), []))), 2000 * 4 + 200)
+
+    def test_compact_history_budget_can_be_set_from_the_environment(self):
+        with patch.dict(os.environ, {"CHAT_HISTORY_TOKEN_BUDGET": "500"}):
+            service = _make_chat_service()
+        mock_agent = MagicMock()
+        mock_agent.run_sync.return_value = MagicMock(
+            output="the answer", usage=self._mock_usage(), **{"new_messages.return_value": []}
+        )
+        service._agents = {GEMINI_MODEL_FALLBACK_CHAIN[0]: mock_agent}  # pylint: disable=protected-access
+
+        service.answer("and the day after?", self._long_conversation(10))
+
+        _, kwargs = mock_agent.run_sync.call_args
+        self.assertEqual(HISTORY_RECENT_MESSAGES, len(kwargs["message_history"]))
+
+    def test_override_model_answers_with_the_given_model_without_rate_limits(self):
+        service = _make_chat_service()
+        rate_budgets = service._rate_budgets  # pylint: disable=protected-access
+        model = FunctionModel(lambda _messages, _info: ModelResponse(parts=[TextPart("from the fake model")]))
+
+        with patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"}), service.override_model(model):
+            # more chats than Gemini's per-minute limit allows
+            responses = [service.answer("Summarize the fair so far") for _ in range(REQUESTS_PER_MINUTE + 1)]
+
+        self.assertSetEqual({"from the fake model"}, {response.answer for response in responses})
+        self.assertEqual(GEMINI_MODEL_FALLBACK_CHAIN[0], responses[-1].model)
+        self.assertIs(rate_budgets, service._rate_budgets)  # pylint: disable=protected-access
+
     @staticmethod
     def _mock_usage(input_tokens=10, output_tokens=5, cache_read_tokens=0, cache_write_tokens=0):
         """Build a mock `RunUsage`-like object with a working `total_tokens` property."""
@@ -538,66 +715,82 @@ class TestChatServiceAnswer(TestCase):
             log_output,
         )
 
-    def test_answer_resets_to_first_model_for_a_new_conversation(self):
-        """A fresh (empty-history) conversation always starts at the first model in the chain, even if a
-        prior conversation had fallen back to a later one."""
-        service = _make_chat_service()
-        service._current_model_index = 2  # pylint: disable=protected-access
-        mock_agent = MagicMock()
-        mock_agent.run_sync.return_value = MagicMock(
-            output="hi", usage=self._mock_usage(), **{"new_messages.return_value": []}
-        )
-        service._agents = {GEMINI_MODEL_FALLBACK_CHAIN[0]: mock_agent}  # pylint: disable=protected-access
-
-        result = service.answer("hello")
-
-        self.assertEqual(result.model, GEMINI_MODEL_FALLBACK_CHAIN[0])
-        self.assertEqual(service._current_model_index, 0)  # pylint: disable=protected-access
+    @classmethod
+    def _agent_answering(cls, output: str) -> MagicMock:
+        return MagicMock(run_sync=MagicMock(return_value=MagicMock(
+            output=output, usage=cls._mock_usage(), **{"new_messages.return_value": []}
+        )))
 
     def test_answer_falls_back_to_next_model_on_rate_limit(self):
-        """If the current model's rate limit is hit, the next model in the chain should be tried."""
+        """If the current model's rate limit is hit, the next model in the chain should be tried - and the rate
+        limited model is skipped by the chats that follow, rather than each of them hitting it again."""
         service = _make_chat_service()
         rate_limited_agent = MagicMock()
         rate_limited_agent.run_sync.side_effect = ModelHTTPError(
             status_code=429, model_name=GEMINI_MODEL_FALLBACK_CHAIN[0]
         )
-        healthy_agent = MagicMock()
-        healthy_agent.run_sync.return_value = MagicMock(
-            output="ok", usage=self._mock_usage(), **{"new_messages.return_value": []}
-        )
+        healthy_agent = self._agent_answering("ok")
         service._agents = {  # pylint: disable=protected-access
             GEMINI_MODEL_FALLBACK_CHAIN[0]: rate_limited_agent,
             GEMINI_MODEL_FALLBACK_CHAIN[1]: healthy_agent,
         }
 
         result = service.answer("hello")
+        next_result = service.answer("hello again")
 
         self.assertEqual(result.model, GEMINI_MODEL_FALLBACK_CHAIN[1])
-        self.assertEqual(service._current_model_index, 1)  # pylint: disable=protected-access
+        self.assertEqual(next_result.model, GEMINI_MODEL_FALLBACK_CHAIN[1])
         rate_limited_agent.run_sync.assert_called_once()
-        healthy_agent.run_sync.assert_called_once()
+        self.assertEqual(2, healthy_agent.run_sync.call_count)
 
-    def test_answer_wraps_around_after_the_last_model_is_rate_limited(self):
-        """After the last model in the chain hits its limit, the rotation should wrap back to the first."""
+    def test_answer_returns_to_the_first_model_after_its_cooldown(self):
+        now = [0.0]
         service = _make_chat_service()
-        service._current_model_index = len(GEMINI_MODEL_FALLBACK_CHAIN) - 1  # pylint: disable=protected-access
-        rate_limited_agent = MagicMock()
-        rate_limited_agent.run_sync.side_effect = ModelHTTPError(
-            status_code=429, model_name=GEMINI_MODEL_FALLBACK_CHAIN[-1]
+        service._rate_budgets = ModelRateBudgets(  # pylint: disable=protected-access
+            GEMINI_MODEL_FALLBACK_CHAIN, clock=lambda: now[0]
         )
-        healthy_agent = MagicMock()
-        healthy_agent.run_sync.return_value = MagicMock(
-            output="ok", usage=self._mock_usage(), **{"new_messages.return_value": []}
+        first_agent = self._agent_answering("first")
+        first_agent.run_sync.side_effect = [
+            ModelHTTPError(status_code=429, model_name=GEMINI_MODEL_FALLBACK_CHAIN[0]), first_agent.run_sync.return_value
+        ]
+        service._agents = {  # pylint: disable=protected-access
+            GEMINI_MODEL_FALLBACK_CHAIN[0]: first_agent,
+            GEMINI_MODEL_FALLBACK_CHAIN[1]: self._agent_answering("second"),
+        }
+
+        self.assertEqual("second", service.answer("hello").answer)
+        now[0] += RATE_LIMIT_COOLDOWN_SECONDS
+        self.assertEqual("first", service.answer("hello").answer)
+
+    def test_answer_falls_back_before_the_first_model_runs_out_of_requests(self):
+        """Once the first model's requests per minute are used up, chats go to the next model without a 429."""
+        service = _make_chat_service()
+        service._rate_budgets = ModelRateBudgets(  # pylint: disable=protected-access
+            GEMINI_MODEL_FALLBACK_CHAIN, requests_per_minute=2, clock=lambda: 0.0
         )
         service._agents = {  # pylint: disable=protected-access
-            GEMINI_MODEL_FALLBACK_CHAIN[-1]: rate_limited_agent,
-            GEMINI_MODEL_FALLBACK_CHAIN[0]: healthy_agent,
+            model_name: self._agent_answering(model_name) for model_name in GEMINI_MODEL_FALLBACK_CHAIN
         }
 
-        result = service.answer("hello", [ChatMessage(role=ChatRole.USER, content="hi")])
+        models = [service.answer(f"question {i}").model for i in range(5)]
 
-        self.assertEqual(result.model, GEMINI_MODEL_FALLBACK_CHAIN[0])
-        self.assertEqual(service._current_model_index, 0)  # pylint: disable=protected-access
+        self.assertListEqual([GEMINI_MODEL_FALLBACK_CHAIN[0]] * 2 + [GEMINI_MODEL_FALLBACK_CHAIN[1]] * 2, models[:4])
+        self.assertEqual(GEMINI_MODEL_FALLBACK_CHAIN[2], models[4])
+
+    def test_answer_raises_busy_when_every_model_is_out_of_budget(self):
+        service = _make_chat_service()
+        service._rate_budgets = ModelRateBudgets(  # pylint: disable=protected-access
+            GEMINI_MODEL_FALLBACK_CHAIN, requests_per_minute=1, clock=lambda: 0.0
+        )
+        service._queue_timeout = 1  # pylint: disable=protected-access
+        service._agents = {  # pylint: disable=protected-access
+            model_name: self._agent_answering(model_name) for model_name in GEMINI_MODEL_FALLBACK_CHAIN
+        }
+        for i in range(len(GEMINI_MODEL_FALLBACK_CHAIN)):
+            service.answer(f"question {i}")
+
+        with self.assertRaises(ChatBusyException):
+            service.answer("one question too many")
 
     def test_answer_raises_when_every_model_is_rate_limited(self):
         """If every model in the chain is rate-limited, the last error should propagate."""
@@ -619,4 +812,345 @@ class TestChatServiceAnswer(TestCase):
 
         with self.assertRaises(ModelHTTPError):
             service.answer("hello")
-        self.assertEqual(service._current_model_index, 0)  # pylint: disable=protected-access
+        failing_agent.run_sync.assert_called_once()
+
+
+class TestChatServiceAnswerStream(TestCase):
+    """Tests for answer_stream(), using pydantic-ai FunctionModel agents in place of Gemini."""
+
+    @staticmethod
+    def _make_agent(service: ChatService, stream_function) -> Agent:
+        agent = Agent(FunctionModel(stream_function=stream_function))
+        agent.tool_plain(service.get_today)
+        return agent
+
+    @staticmethod
+    def _collect(service: ChatService, message: str, history=None):
+        async def collect():
+            return [event async for event in service.answer_stream(message, history)]
+
+        return asyncio.run(collect())
+
+    @staticmethod
+    async def _call_get_today_then_answer(messages, _info: AgentInfo):
+        if len(messages) == 1:
+            yield {0: DeltaToolCall(name="get_today", json_args="{}")}
+        else:
+            yield "Today is "
+            yield "a good day."
+
+    @staticmethod
+    async def _rate_limited(_messages, _info: AgentInfo):
+        raise ModelHTTPError(status_code=429, model_name=GEMINI_MODEL_FALLBACK_CHAIN[0])
+        yield  # pylint: disable=unreachable
+
+    def test_answer_stream_streams_tool_calls_tokens_then_the_response(self):
+        service = _make_chat_service()
+        service._agents = {  # pylint: disable=protected-access
+            GEMINI_MODEL_FALLBACK_CHAIN[0]: self._make_agent(service, self._call_get_today_then_answer),
+        }
+
+        events = self._collect(service, "what day is it?")
+
+        self.assertEqual(
+            [
+                ChatStreamEventType.TOOL_CALL,
+                ChatStreamEventType.TOKEN,
+                ChatStreamEventType.TOKEN,
+                ChatStreamEventType.DONE,
+            ],
+            [event.type for event in events],
+        )
+        self.assertEqual("get_today", events[0].text)
+        self.assertEqual("Today is a good day.", "".join(event.text for event in events[1:3]))
+        response = events[-1].response
+        self.assertEqual("Today is a good day.", response.answer)
+        self.assertEqual(GEMINI_MODEL_FALLBACK_CHAIN[0], response.model)
+        self.assertEqual(response.input_tokens + response.output_tokens, response.total_tokens)
+
+    def test_answer_stream_falls_back_to_next_model_on_rate_limit(self):
+        service = _make_chat_service()
+        service._agents = {  # pylint: disable=protected-access
+            GEMINI_MODEL_FALLBACK_CHAIN[0]: self._make_agent(service, self._rate_limited),
+            GEMINI_MODEL_FALLBACK_CHAIN[1]: self._make_agent(service, self._call_get_today_then_answer),
+        }
+
+        events = self._collect(service, "what day is it?")
+
+        self.assertEqual(GEMINI_MODEL_FALLBACK_CHAIN[1], events[-1].response.model)
+
+    def test_answer_stream_does_not_fall_back_once_the_answer_has_started(self):
+        """Falling back after tokens were streamed would repeat the answer, so the rate limit is raised."""
+
+        async def rate_limited_mid_answer(messages, _info: AgentInfo):
+            if len(messages) == 1:
+                yield "Let me check. "
+                yield {0: DeltaToolCall(name="get_today", json_args="{}")}
+            else:
+                raise ModelHTTPError(status_code=429, model_name=GEMINI_MODEL_FALLBACK_CHAIN[0])
+
+        service = _make_chat_service()
+        fallback_stream = MagicMock()
+        service._agents = {  # pylint: disable=protected-access
+            GEMINI_MODEL_FALLBACK_CHAIN[0]: self._make_agent(service, rate_limited_mid_answer),
+            GEMINI_MODEL_FALLBACK_CHAIN[1]: MagicMock(run_stream_events=fallback_stream),
+        }
+
+        with self.assertRaises(ModelHTTPError):
+            self._collect(service, "what day is it?")
+        fallback_stream.assert_not_called()
+
+    def test_answer_stream_falls_back_on_a_rate_limit_after_a_tool_call(self):
+        """A tool call only shows progress, so the next model can still answer once it was streamed."""
+
+        async def rate_limited_after_tool_call(messages, _info: AgentInfo):
+            if len(messages) == 1:
+                yield {0: DeltaToolCall(name="get_today", json_args="{}")}
+            else:
+                raise ModelHTTPError(status_code=429, model_name=GEMINI_MODEL_FALLBACK_CHAIN[0])
+
+        service = _make_chat_service()
+        service._agents = {  # pylint: disable=protected-access
+            GEMINI_MODEL_FALLBACK_CHAIN[0]: self._make_agent(service, rate_limited_after_tool_call),
+            GEMINI_MODEL_FALLBACK_CHAIN[1]: self._make_agent(service, self._call_get_today_then_answer),
+        }
+
+        events = self._collect(service, "what day is it?")
+
+        self.assertEqual(GEMINI_MODEL_FALLBACK_CHAIN[1], events[-1].response.model)
+        self.assertEqual("Today is a good day.", events[-1].response.answer)
+
+    def test_answer_stream_raises_when_every_model_is_rate_limited(self):
+        service = _make_chat_service()
+        service._agents = {  # pylint: disable=protected-access
+            name: self._make_agent(service, self._rate_limited) for name in GEMINI_MODEL_FALLBACK_CHAIN
+        }
+
+        with self.assertRaises(ModelHTTPError):
+            self._collect(service, "hello")
+
+
+class TestChatServiceToolCache(TestCase):
+    """Tests for the short-lived cache of tool results."""
+
+    def setUp(self):
+        self.service = _make_chat_service()
+        self.service.db_service.get_full_inventory.return_value = []
+
+    def test_repeated_tool_call_is_served_from_the_cache(self):
+        self.service.lookup_full_inventory()
+        self.service.lookup_full_inventory()
+        self.service.db_service.get_full_inventory.assert_called_once()
+
+    def test_tool_calls_with_different_arguments_are_cached_separately(self):
+        self.service.db_service.count_rentals_on_date.side_effect = [3, 5]
+        self.assertEqual(3, self.service.count_rentals_on_date(date=datetime.date(2025, 8, 20)))
+        self.assertEqual(5, self.service.count_rentals_on_date(date=datetime.date(2025, 8, 21)))
+        # the default device_type is the same argument as passing it explicitly
+        self.assertEqual(3, self.service.count_rentals_on_date(datetime.date(2025, 8, 20), device_type=None))
+        self.assertEqual(2, self.service.db_service.count_rentals_on_date.call_count)
+
+    def test_write_invalidates_cached_results(self):
+        self.service.lookup_full_inventory()
+        with patch.object(DynamoDBService, "get_data_version", return_value=DynamoDBService.get_data_version() + 1):
+            self.service.lookup_full_inventory()
+        self.assertEqual(2, self.service.db_service.get_full_inventory.call_count)
+
+    def test_cached_results_expire(self):
+        with patch("api.src.chat_service.time.monotonic", return_value=1000.0):
+            self.service.lookup_full_inventory()
+        with patch("api.src.chat_service.time.monotonic", return_value=1000.0 + TOOL_CACHE_TTL_SECONDS + 1):
+            self.service.lookup_full_inventory()
+        self.assertEqual(2, self.service.db_service.get_full_inventory.call_count)
+
+    def test_tool_cache_hits_are_logged_with_the_token_usage(self):
+        async def look_up_inventory_twice(messages, _info: AgentInfo):
+            if len(messages) < 5:
+                yield {0: DeltaToolCall(name="lookup_full_inventory", json_args="{}")}
+            else:
+                yield "There are no devices."
+
+        agent = Agent(FunctionModel(stream_function=look_up_inventory_twice))
+        agent.tool_plain(self.service.lookup_full_inventory)
+        self.service._agents = {GEMINI_MODEL_FALLBACK_CHAIN[0]: agent}  # pylint: disable=protected-access
+
+        async def collect():
+            return [event async for event in self.service.answer_stream("how many devices?")]
+
+        with self.assertLogs("api.src.chat_service", level="DEBUG") as captured:
+            asyncio.run(collect())
+
+        self.service.db_service.get_full_inventory.assert_called_once()
+        self.assertIn("tool_cache_hits=1 tool_cache_misses=1", "\n".join(captured.output))
+
+
+class TestChatServiceConcurrentTools(TestCase):
+    """Tests that the database tools the model calls in a single step run concurrently."""
+
+    def setUp(self):
+        self.service = _make_chat_service()
+        # every tool waits at the barrier until all three are running, so it only passes if the calls overlap
+        barrier = threading.Barrier(3, timeout=5)
+        self.thread_names = set()
+
+        def count_available_devices_by_location(cne_year, device_type):  # pylint: disable=unused-argument
+            self.thread_names.add(threading.current_thread().name)
+            barrier.wait()
+            return {"BLC": 2 if device_type == DeviceType.SCOOTER else 3}
+
+        def get_reservation_count(cne_year):  # pylint: disable=unused-argument
+            self.thread_names.add(threading.current_thread().name)
+            barrier.wait()
+            return pd.DataFrame()
+
+        self.service.db_service.count_available_devices_by_location.side_effect = count_available_devices_by_location
+        self.service.db_service.get_reservation_count.side_effect = get_reservation_count
+
+        with patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"}):
+            self.agent = self.service._build_agent(GEMINI_MODEL_FALLBACK_CHAIN[0])  # pylint: disable=protected-access
+        self.service._agents = {GEMINI_MODEL_FALLBACK_CHAIN[0]: self.agent}  # pylint: disable=protected-access
+
+    @staticmethod
+    def _call_three_tools(messages, _info: AgentInfo) -> ModelResponse:
+        if len(messages) == 1:
+            return ModelResponse(parts=[
+                ToolCallPart("count_available_devices_by_location", {"device_type": "Scooter"}, tool_call_id="1"),
+                ToolCallPart("count_available_devices_by_location", {"device_type": "Wheelchair"}, tool_call_id="2"),
+                ToolCallPart("reservation_counts", {}, tool_call_id="3"),
+            ])
+        returns = [part.content for part in messages[-1].parts if isinstance(part, ToolReturnPart)]
+        return ModelResponse(parts=[TextPart(f"{returns}")])
+
+    @classmethod
+    async def _stream_three_tools(cls, messages, info: AgentInfo):
+        parts = cls._call_three_tools(messages, info).parts
+        if isinstance(parts[0], TextPart):
+            yield parts[0].content
+        else:
+            yield {
+                index: DeltaToolCall(
+                    name=call.tool_name, json_args=call.args_as_json_str(), tool_call_id=call.tool_call_id
+                )
+                for index, call in enumerate(parts)
+            }
+
+    def test_answer_runs_tool_calls_concurrently(self):
+        with self.agent.override(model=FunctionModel(self._call_three_tools)):
+            response = self.service.answer("how many devices are available and how many reservations are there?")
+
+        self.assertIn("{'BLC': 2}", response.answer)
+        self.assertIn("{'BLC': 3}", response.answer)
+        self.assertIn("no reservations recorded", response.answer)
+        self.assertEqual(3, len(self.thread_names))
+        self.assertTrue(all(name.startswith("chat-tool") for name in self.thread_names))
+
+    def test_answer_stream_runs_tool_calls_concurrently(self):
+        async def collect():
+            return [event async for event in self.service.answer_stream("how many devices are available?")]
+
+        with self.agent.override(model=FunctionModel(stream_function=self._stream_three_tools)):
+            events = asyncio.run(collect())
+
+        self.assertIn("{'BLC': 2}", events[-1].response.answer)
+        self.assertEqual(3, len(self.thread_names))
+
+
+class TestChatServiceUsageGuideAnswerCache(TestCase):
+    """Tests for reusing the answers to how-to questions that were answered from the usage guide."""
+
+    def setUp(self):
+        self.service = _make_chat_service()
+        self.service.db_service.get_device_by_id.return_value = None
+        self.model_calls = 0
+        self.agent = Agent(FunctionModel(self._answer_from_tool))
+        self.agent.tool_plain(self.service.get_usage_guide)
+        self.agent.tool_plain(self.service.lookup_device_by_id)
+        self.service._agents = {GEMINI_MODEL_FALLBACK_CHAIN[0]: self.agent}  # pylint: disable=protected-access
+
+    def _answer_from_tool(self, messages, _info: AgentInfo) -> ModelResponse:
+        self.model_calls += 1
+        if len(messages) == 1:
+            question = messages[0].parts[-1].content
+            if "W04" in question:
+                return ModelResponse(parts=[ToolCallPart("lookup_device_by_id", {"device_id": "W04"})])
+            return ModelResponse(parts=[ToolCallPart("get_usage_guide", {})])
+        return ModelResponse(parts=[TextPart(f"Answer {self.model_calls}")])
+
+    def test_similar_how_to_question_is_answered_from_the_cache(self):
+        first = self.service.answer("How do I create a rental?")
+        second = self.service.answer("how do I create a new rental")
+
+        self.assertEqual("Answer 2", first.answer)
+        self.assertEqual("Answer 2", second.answer)
+        self.assertEqual(ANSWER_CACHE_MODEL, second.model)
+        self.assertEqual(0, second.total_tokens)
+        self.assertEqual(2, self.model_calls)
+
+    def test_different_how_to_question_is_not_answered_from_the_cache(self):
+        self.service.answer("How do I create a rental?")
+        response = self.service.answer("How do I complete a rental?")
+
+        self.assertEqual(GEMINI_MODEL_FALLBACK_CHAIN[0], response.model)
+        self.assertEqual(4, self.model_calls)
+
+    def test_answers_that_used_other_tools_are_not_cached(self):
+        self.service.answer("Tell me about W04 please")
+        response = self.service.answer("Tell me about W04 please")
+
+        self.assertEqual(GEMINI_MODEL_FALLBACK_CHAIN[0], response.model)
+
+    def test_answers_later_in_a_conversation_are_not_cached(self):
+        history = [ChatMessage(role=ChatRole.USER, content="hi"), ChatMessage(role=ChatRole.ASSISTANT, content="hi")]
+        self.service.answer("How do I create a rental?", history)
+        response = self.service.answer("How do I create a rental?")
+
+        self.assertEqual(GEMINI_MODEL_FALLBACK_CHAIN[0], response.model)
+
+    def test_follow_up_questions_are_not_answered_from_the_cache(self):
+        history = [ChatMessage(role=ChatRole.USER, content="hi"), ChatMessage(role=ChatRole.ASSISTANT, content="hi")]
+        self.service.answer("How do I create a rental?")
+
+        response = self.service.answer("How do I create a rental?", history)
+
+        self.assertEqual(GEMINI_MODEL_FALLBACK_CHAIN[0], response.model)
+        # answer_stream goes through the same local lookup
+        answer_locally = self.service._answer_locally  # pylint: disable=protected-access
+        self.assertIsNone(answer_locally("How do I create a rental?", history))
+
+    def test_answer_stream_uses_the_cache(self):
+        async def collect():
+            return [event async for event in self.service.answer_stream("How do I create a rental")]
+
+        self.service.answer("How do I create a rental?")
+        events = asyncio.run(collect())
+
+        self.assertEqual([ChatStreamEventType.TOKEN, ChatStreamEventType.DONE], [event.type for event in events])
+        self.assertEqual("Answer 2", events[0].text)
+        self.assertEqual(ANSWER_CACHE_MODEL, events[1].response.model)
+
+
+class TestChatServiceTracing(BaseTestCases.BaseTracingTest):
+    """Tests for the agent's spans while tracing is enabled."""
+
+    def test_agent_is_only_instrumented_while_tracing(self):
+        with patch("api.src.chat_service.is_tracing_enabled", return_value=False):
+            self.assertEqual([], ChatService._capabilities())  # pylint: disable=protected-access
+
+    def test_tool_calls_are_recorded_without_content(self):
+        def call_tool_then_answer(messages, _: AgentInfo) -> ModelResponse:
+            if len(messages) == 1:
+                return ModelResponse(parts=[ToolCallPart(tool_name="get_secret", args={})])
+            return ModelResponse(parts=[TextPart("The renter's phone number is 555-0100")])
+
+        agent = Agent(
+            FunctionModel(call_tool_then_answer),
+            capabilities=ChatService._capabilities(),  # pylint: disable=protected-access
+        )
+        agent.tool_plain(lambda: "555-0100", name="get_secret")
+        asyncio.run(agent.run("What is the renter's phone number?"))
+
+        spans = self.get_spans()
+        self.assertIn("running tool", spans)
+        self.assertEqual("get_secret", spans["running tool"].attributes["gen_ai.tool.name"])
+        for span in spans.values():
+            self.assertNotIn("555-0100", str(dict(span.attributes)))
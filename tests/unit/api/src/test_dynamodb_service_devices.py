@@ -37,6 +37,21 @@ class TestDynamoDBServiceDevices(BaseTestCases.BaseDynamoDBServiceTest):
         ]
         self.service.add_devices(devices)
 
+    def test_writes_bump_the_data_version_but_reads_do_not(self):
+        version = self.service.get_data_version()
+        self.service.get_full_inventory(cne_year=2025)
+        self.assertEqual(version, self.service.get_data_version())
+
+        self.service.add_devices([
+            NewDevice(cne_year=2025, type=DeviceType.SCOOTER, location=Location.BLC, status=DeviceStatus.AVAILABLE),
+        ])
+        self.assertEqual(version + 1, self.service.get_data_version())
+
+        # a failed write still bumps the version, since it may have changed some of the data
+        with self.assertRaises(DeviceNotFoundException):
+            self.service.remove_devices(cne_year=2025, device_ids=["S99"])
+        self.assertEqual(version + 2, self.service.get_data_version())
+
     def test_get_available_device_ids(self):
         devices = [
             NewDevice(cne_year=2025, type=DeviceType.SCOOTER, location=Location.BLC, status=DeviceStatus.AVAILABLE),
@@ -0,0 +1,99 @@
+import os
+from unittest import TestCase
+
+import boto3
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from moto import mock_aws
+
+from api.src.metrics import RequestMetricsMiddleware, instrument_dynamodb_client, instrument_s3_client, metrics_registry
+
+
+def _sample(name: str, **labels) -> float:
+    """Get a sample's value from the API's metrics, or 0 if it hasn't been recorded yet"""
+    return metrics_registry.get_sample_value(name, labels) or 0.0
+
+
+class TestRequestMetricsMiddleware(TestCase):
+
+    def setUp(self):
+        app = FastAPI()
+        app.add_middleware(RequestMetricsMiddleware)
+
+        @app.get("/items/{item_id}")
+        def get_item(item_id: str):
+            return {"id": item_id}
+
+        self.client = TestClient(app)
+
+    def test_requests_are_labelled_with_their_route_template(self):
+        labels = {"method": "GET", "route": "/items/{item_id}", "status": "200"}
+        before = _sample("http_request_duration_seconds_count", **labels)
+
+        self.client.get("/items/1")
+        self.client.get("/items/2")
+
+        self.assertEqual(before + 2, _sample("http_request_duration_seconds_count", **labels))
+
+    def test_unmatched_requests_share_a_label(self):
+        labels = {"method": "GET", "route": "unmatched", "status": "404"}
+        before = _sample("http_request_duration_seconds_count", **labels)
+
+        self.client.get("/no/such/path")
+
+        self.assertEqual(before + 1, _sample("http_request_duration_seconds_count", **labels))
+
+
+@mock_aws
+class TestBotocoreInstrumentation(TestCase):
+
+    def setUp(self):
+        region = os.getenv("AWS_DEFAULT_REGION", "us-east-2")
+        self.dynamodb = boto3.client("dynamodb", region_name=region)
+        instrument_dynamodb_client(self.dynamodb)
+        self.dynamodb.create_table(
+            TableName="metrics_test",
+            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        self.s3 = boto3.client("s3", region_name=region)
+        instrument_s3_client(self.s3)
+
+    def test_dynamodb_reads_record_duration_capacity_and_items(self):
+        labels = {"operation": "Query", "table": "metrics_test"}
+        before = (
+            _sample("dynamodb_operation_duration_seconds_count", **labels),
+            _sample("dynamodb_consumed_capacity_units_count", **labels),
+            _sample("dynamodb_items_sum", **labels),
+        )
+        self.dynamodb.put_item(TableName="metrics_test", Item={"id": {"S": "W01"}})
+
+        self.dynamodb.query(
+            TableName="metrics_test",
+            KeyConditionExpression="id = :id",
+            ExpressionAttributeValues={":id": {"S": "W01"}},
+        )
+
+        self.assertEqual(before[0] + 1, _sample("dynamodb_operation_duration_seconds_count", **labels))
+        self.assertEqual(before[1] + 1, _sample("dynamodb_consumed_capacity_units_count", **labels))
+        self.assertEqual(before[2] + 1, _sample("dynamodb_items_sum", **labels))
+        self.assertGreater(
+            _sample("dynamodb_operation_duration_seconds_count", operation="PutItem", table="metrics_test"), 0
+        )
+
+    def test_get_item_records_whether_the_item_was_found(self):
+        labels = {"operation": "GetItem", "table": "metrics_test"}
+        before = _sample("dynamodb_items_count", **labels), _sample("dynamodb_items_sum", **labels)
+
+        self.dynamodb.get_item(TableName="metrics_test", Key={"id": {"S": "missing"}})
+
+        self.assertEqual(before[0] + 1, _sample("dynamodb_items_count", **labels))
+        self.assertEqual(before[1], _sample("dynamodb_items_sum", **labels))
+
+    def test_s3_operations_record_duration(self):
+        before = _sample("s3_operation_duration_seconds_count", operation="ListBuckets")
+
+        self.s3.list_buckets()
+
+        self.assertEqual(before + 1, _sample("s3_operation_duration_seconds_count", operation="ListBuckets"))
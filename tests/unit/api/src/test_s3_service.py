@@ -3,6 +3,7 @@ from unittest import TestCase
 from unittest.mock import patch
 
 import boto3
+import requests
 from moto import mock_aws
 
 from api.src.s3_service import S3Service
@@ -47,3 +48,21 @@ class TestS3Service(TestCase):
         with patch.dict(os.environ, {"DEV_MODE": "false", "CNE_YEAR": "2025"}):
             with self.assertRaises(FileNotFoundError):
                 self.service.download_rental_form(rental_id="W9999999")
+
+    def test_presigned_upload_and_download_urls(self):
+        pdf_content = b"%PDF-presigned-content"
+        with patch.dict(os.environ, {"DEV_MODE": "false", "CNE_YEAR": "2025"}):
+            upload_url = self.service.get_rental_form_upload_url(rental_id="W0820001")
+            response = requests.put(upload_url, data=pdf_content, headers={"Content-Type": "application/pdf"})
+            self.assertEqual(200, response.status_code)
+
+            download_url = self.service.get_rental_form_download_url(rental_id="W0820001")
+            response = requests.get(download_url)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(pdf_content, response.content)
+        self.assertIn("rental_form_W0820001.pdf", download_url)
+
+    def test_presigned_download_url_for_missing_form_raises_file_not_found(self):
+        with patch.dict(os.environ, {"DEV_MODE": "false", "CNE_YEAR": "2025"}):
+            with self.assertRaises(FileNotFoundError):
+                self.service.get_rental_form_download_url(rental_id="W9999999")
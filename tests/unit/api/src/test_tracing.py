@@ -0,0 +1,54 @@
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from opentelemetry.trace import StatusCode
+
+from api.src.tracing import TracedRoute, TracingMiddleware
+from common.tracing import inject_trace_headers, start_span
+from tests.unit.base_tests import BaseTestCases
+
+
+class TestRequestTracing(BaseTestCases.BaseTracingTest):
+
+    def setUp(self):
+        super().setUp()
+        router = APIRouter(prefix="/items", route_class=TracedRoute)
+
+        @router.get("/get/{item_id}")
+        def get_item(item_id: int):
+            return {"id": item_id}
+
+        @router.get("/fail")
+        async def fail():
+            raise HTTPException(status_code=503, detail="busy")
+
+        app = FastAPI()
+        app.include_router(router)
+        app.add_middleware(TracingMiddleware)
+        self.client = TestClient(app)
+
+    def test_requests_join_the_trace_in_their_headers(self):
+        with start_span("streamlit rerun") as ui_span:
+            response = self.client.get("/items/get/1", headers=inject_trace_headers())
+
+        self.assertEqual(200, response.status_code)
+        spans = self.get_spans()
+        server_span = spans["GET /items/get/{item_id}"]
+        self.assertEqual(ui_span.get_span_context().trace_id, server_span.context.trace_id)
+        self.assertEqual(ui_span.get_span_context().span_id, server_span.parent.span_id)
+        self.assertEqual("/items/get/{item_id}", server_span.attributes["http.route"])
+        self.assertEqual(200, server_span.attributes["http.response.status_code"])
+        # the endpoint's span (run in the thread pool) is a child of the request's
+        self.assertEqual(server_span.context.span_id, spans["test_tracing.get_item"].parent.span_id)
+
+    def test_server_errors_fail_the_request_span(self):
+        self.assertEqual(503, self.client.get("/items/fail").status_code)
+
+        spans = self.get_spans()
+        self.assertIsNone(spans["GET /items/fail"].parent)
+        self.assertEqual(StatusCode.ERROR, spans["GET /items/fail"].status.status_code)
+        self.assertIn("test_tracing.fail", spans)
+
+    def test_unmatched_requests_keep_their_path(self):
+        self.assertEqual(404, self.client.get("/no/such/path").status_code)
+
+        self.assertEqual(["GET /no/such/path"], list(self.get_spans()))
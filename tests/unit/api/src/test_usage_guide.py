@@ -0,0 +1,149 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from api.src.usage_guide import (
+    MANUAL_PATH,
+    UsageGuide,
+    UsageGuideAnswerCache,
+    question_key,
+    split_sections,
+    tokenize,
+)
+
+
+class _ManualTestCase(TestCase):
+    """Provides a temporary manual file that the tests can edit"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        self.manual_path = Path(directory.name) / "manual.md"
+        self.manual_path.write_text("# Manual\n\n## 1 Rentals\n\nCreate a rental.\n", encoding="utf-8")
+
+    def _edit_manual(self, text: str):
+        self.manual_path.write_text(text, encoding="utf-8")
+        # make sure the modification time changes, even on file systems with a coarse timestamp resolution
+        modified_ns = self.manual_path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(self.manual_path, ns=(modified_ns, modified_ns))
+
+
+class TestUsageGuide(_ManualTestCase):
+
+    def test_tokenize_drops_case_punctuation_and_stop_words(self):
+        self.assertListEqual(["create", "new", "rental"], tokenize("How do I create a NEW rental?"))
+
+    def test_split_sections(self):
+        sections = split_sections("Intro\n# Title\nText\n\n## 1.1 Part\nMore text\n")
+
+        self.assertListEqual(["", "Title", "1.1 Part"], [section.heading for section in sections])
+        self.assertListEqual(
+            ["Intro", "# Title\nText", "## 1.1 Part\nMore text"], [section.text for section in sections]
+        )
+
+    def test_split_sections_of_the_manual(self):
+        sections = split_sections(MANUAL_PATH.read_text(encoding="utf-8"))
+
+        self.assertIn("2.1 Creating a New Rental", [section.heading for section in sections])
+        self.assertEqual(MANUAL_PATH.read_text(encoding="utf-8").count("\n#"), len(sections) - 1)
+
+    def test_search_ranks_the_most_relevant_sections_first(self):
+        guide = UsageGuide()
+
+        self.assertListEqual(
+            ["2.2 Modifying an Existing Rental"],
+            [section.heading for section in guide.search("swap a wheelchair during a rental", max_sections=1)],
+        )
+        self.assertEqual("2.4 Retrieving a Rental Form", guide.search("reprint the rental form")[0].heading)
+        self.assertEqual("1.3 Reservation Availability", guide.search("maximum reservations per day")[0].heading)
+        self.assertEqual(3, len(guide.search("rental")))
+
+    def test_search_leaves_out_sections_without_the_query_words(self):
+        self.assertListEqual([], UsageGuide().search("quantum entanglement"))
+        self.assertListEqual([], UsageGuide().search("how do I"))
+
+    def test_search_a_manual_of_only_stop_words(self):
+        self._edit_manual("# How\n\nDo it.\n")
+
+        self.assertListEqual([], UsageGuide(self.manual_path).search("rental"))
+
+    def test_search_uses_the_reloaded_manual(self):
+        guide = UsageGuide(self.manual_path)
+        self._edit_manual("# Manual\n\n## 1 Scooters\n\nCharge the scooter.\n")
+
+        self.assertListEqual(["1 Scooters"], [section.heading for section in guide.search("charge a scooter")])
+
+    def test_reloads_when_the_manual_changes(self):
+        guide = UsageGuide(self.manual_path)
+        digest = guide.digest
+
+        self._edit_manual("# Manual\n\nUpdated.\n")
+
+        self.assertEqual("# Manual\n\nUpdated.\n", guide.refresh().text)
+        self.assertNotEqual(digest, guide.digest)
+        self.assertEqual(1, len(guide.sections))
+
+
+class TestUsageGuideAnswerCache(_ManualTestCase):
+
+    def test_similar_questions_share_an_answer(self):
+        cache = UsageGuideAnswerCache(UsageGuide())
+        cache.put("How do I create a rental?", "the answer")
+
+        self.assertEqual("the answer", cache.get("how do i create a rental"))
+        self.assertEqual("the answer", cache.get("How do I create a new rental, please?"))
+        self.assertIsNone(cache.get("How do I create a reservation?"))
+        self.assertIsNone(cache.get("How do I complete a rental?"))
+        self.assertIsNone(cache.get("How many rentals were created today?"))
+
+    def test_questions_differing_by_a_content_word_do_not_share_an_answer(self):
+        for cached, asked in (
+                ("How do I change the pickup date of a reservation?",
+                 "How do I change the pickup location of a reservation?"),
+                ("How do I cancel a wheelchair reservation?", "How do I cancel a reservation for a scooter?"),
+                ("How do I cancel?", "How do I not cancel?"),
+                ("How do I cancel a reservation?", "Can I cancel a reservation?"),
+                ("Where do I return a wheelchair?", "When do I return a wheelchair?"),
+                ("How do I refund the deposit?", "Should I refund the deposit?"),
+                ("How do I change a reservation to a rental?", "How do I change a rental to a reservation?"),
+        ):
+            with self.subTest(asked=asked):
+                cache = UsageGuideAnswerCache(UsageGuide())
+                cache.put(cached, "the answer")
+
+                self.assertIsNone(cache.get(asked))
+                self.assertEqual("the answer", cache.get(cached))
+
+    def test_question_key(self):
+        self.assertEqual("rental", question_key("Rentals?"))
+        self.assertEqual(question_key("How do I return devices?"), question_key("how do I return a device please"))
+        self.assertEqual("how not cancel", question_key("how do I not cancel"))
+        self.assertEqual("can cancel reservation", question_key("Can I cancel a reservation?"))
+        self.assertEqual("change rental to reservation", question_key("change a rental to a reservation"))
+        self.assertEqual("", question_key("How do I do that?"))
+
+    def test_questions_of_only_stop_words_are_not_cached(self):
+        cache = UsageGuideAnswerCache(UsageGuide())
+        cache.put("How do I do that?", "the answer")
+
+        self.assertIsNone(cache.get("How do I do that?"))
+
+    def test_answers_are_dropped_when_the_manual_changes(self):
+        cache = UsageGuideAnswerCache(UsageGuide(self.manual_path))
+        cache.put("How do I create a rental?", "the answer")
+
+        self._edit_manual("# Manual\n\n## 1 Rentals\n\nCreate a rental on the New Rental page.\n")
+
+        self.assertIsNone(cache.get("How do I create a rental?"))
+
+    def test_least_recently_used_answer_is_evicted(self):
+        cache = UsageGuideAnswerCache(UsageGuide(), max_size=2)
+        cache.put("How do I create a rental?", "create")
+        cache.put("How do I complete a rental?", "complete")
+        cache.get("How do I create a rental?")
+        cache.put("How do I cancel a reservation?", "cancel")
+
+        self.assertEqual("create", cache.get("How do I create a rental?"))
+        self.assertIsNone(cache.get("How do I complete a rental?"))
+        self.assertEqual("cancel", cache.get("How do I cancel a reservation?"))
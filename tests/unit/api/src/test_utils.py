@@ -9,6 +9,7 @@ from api.src.exceptions import (
     RentalNotFoundOrNotEditableException,
     ReservationNotFoundOrNotEditableException,
 )
+from api.src.metrics import metrics_registry
 from api.src.utils import auto_process_database_errors
 
 
@@ -82,3 +83,22 @@ class TestAutoProcessDatabaseErrors(TestCase):
 
         with self.assertRaises(ValueError):
             func()
+
+    def test_outcomes_are_counted_per_endpoint(self):
+        @auto_process_database_errors
+        def counted_endpoint(fail: bool):
+            if fail:
+                raise DeviceNotFoundException("Device not found")
+            return "success"
+
+        def count(outcome: str) -> float:
+            labels = {"endpoint": "counted_endpoint", "outcome": outcome}
+            return metrics_registry.get_sample_value("request_outcomes_total", labels) or 0.0
+
+        before = count("ok")
+        counted_endpoint(False)
+        with self.assertRaises(HTTPException):
+            counted_endpoint(True)
+
+        self.assertEqual(before + 1, count("ok"))
+        self.assertEqual(1, count("not_found"))
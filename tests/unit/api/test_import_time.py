@@ -0,0 +1,20 @@
+from unittest import TestCase
+
+from tests.api_import import get_api_route_paths, import_api
+
+# modules only the chatbot and the reservation count aggregations need
+DEFERRED_MODULES = ("pydantic_ai", "google.genai", "pandas", "numpy", "api.src.chat_service")
+
+
+class TestApiImportTime(TestCase):
+
+    def test_chat_and_pandas_are_not_imported(self):
+        _, cumulative = import_api()
+
+        self.assertListEqual([], [module for module in DEFERRED_MODULES if module in cumulative])
+
+    def test_chat_router_is_only_mounted_when_enabled(self):
+        self.assertIn("/chat/ask", get_api_route_paths(CHAT_ENABLED="true"))
+        self.assertNotIn("/chat/ask", get_api_route_paths(CHAT_ENABLED="false"))
+        _, disabled = import_api(CHAT_ENABLED="false")
+        self.assertNotIn("api.routers.chat", disabled)
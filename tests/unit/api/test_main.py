@@ -0,0 +1,57 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+from moto import mock_aws
+from prometheus_client import CONTENT_TYPE_LATEST
+
+import api.main as main_module
+
+
+@mock_aws
+class TestRentalFormEndpoints(TestCase):
+    """Integration tests for the rental form endpoints in api/main.py."""
+
+    def setUp(self):
+        self.mock_s3 = MagicMock()
+        self.patcher = patch.object(main_module, "s3_service", self.mock_s3)
+        self.patcher.start()
+        self.client = TestClient(main_module.app)
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_get_rental_form_upload_url(self):
+        self.mock_s3.get_rental_form_upload_url.return_value = "https://bucket.s3.amazonaws.com/upload"
+        response = self.client.get("/forms/rental_form_upload_url", params={"rental_id": "W0820001"})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("https://bucket.s3.amazonaws.com/upload", response.json()["url"])
+        self.assertGreater(response.json()["expires_in"], 0)
+        self.mock_s3.get_rental_form_upload_url.assert_called_once_with(rental_id="W0820001")
+
+    def test_get_rental_form_download_url(self):
+        self.mock_s3.get_rental_form_download_url.return_value = "https://bucket.s3.amazonaws.com/download"
+        response = self.client.get("/forms/rental_form_download_url", params={"rental_id": "W0820001"})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("https://bucket.s3.amazonaws.com/download", response.json()["url"])
+        self.mock_s3.download_rental_form.assert_not_called()
+
+    def test_get_rental_form_download_url_not_found(self):
+        self.mock_s3.get_rental_form_download_url.side_effect = FileNotFoundError("Rental form not found")
+        response = self.client.get("/forms/rental_form_download_url", params={"rental_id": "W9999999"})
+        self.assertEqual(404, response.status_code)
+
+
+class TestMetricsEndpoint(TestCase):
+    """Tests for the /metrics endpoint in api/main.py."""
+
+    def test_metrics_include_the_requests_made(self):
+        client = TestClient(main_module.app)
+        client.get("/health")
+
+        response = client.get("/metrics")
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(CONTENT_TYPE_LATEST, response.headers["content-type"])
+        self.assertIn("# TYPE http_request_duration_seconds histogram", response.text)
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="/health",status="200"}', response.text)
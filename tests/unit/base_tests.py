@@ -9,9 +9,13 @@ import boto3
 import requests
 import streamlit as st
 from moto import mock_aws
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 from streamlit.testing.v1 import AppTest
 
 from api.src.dynamodb_service import DynamoDBService
+from common import tracing
 from common.constants import DeviceType, DeviceStatus, Location, PaymentMethod, RentalStatus, ReservationStatus
 from common.data_models import CompletedRental, NewRental, NewReservation, Reservation
 from common.utils import get_default_timezone
@@ -160,6 +164,24 @@ class BaseTestCases:
             return NewRental(**rental_params)
 
 
+    class BaseTracingTest(TestCase):
+        """Shared Test Cases for code recording spans, with tracing enabled and the spans kept in memory"""
+
+        def setUp(self):
+            self.span_exporter = InMemorySpanExporter()
+            tracer_provider = TracerProvider()
+            tracer_provider.add_span_processor(SimpleSpanProcessor(self.span_exporter))
+            state = tracing._TracingState(  # pylint: disable=protected-access
+                tracer=tracer_provider.get_tracer(__name__), tracer_provider=tracer_provider, configured=True
+            )
+            patcher = patch.object(tracing, "_state", state)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        def get_spans(self) -> dict:
+            """Get the finished spans by name"""
+            return {span.name: span for span in self.span_exporter.get_finished_spans()}
+
     class BaseFormFieldTest(TestCase):
         """Shared Test Cases for Form Fields"""
 
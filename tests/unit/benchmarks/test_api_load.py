@@ -0,0 +1,83 @@
+import logging
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmarks.api_load import (
+    S3_DOWNLOAD_ROUTE,
+    S3_UPLOAD_ROUTE,
+    RouteResult,
+    check_rental_latency_budget,
+    compare_to_baseline,
+    get_api_routes,
+    get_load_test_routes,
+    load_baseline,
+    percentile,
+    run_api_load_test,
+)
+
+
+class TestApiLoadTest(TestCase):
+
+    def test_smoke(self):
+        logging.disable(logging.INFO)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        with patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"}):
+            results = run_api_load_test(
+                clients=1, requests=50, days=1, devices_per_type=5, reservations_per_day=5, walk_ins_per_day=5
+            )
+        self.assertLessEqual({result.route for result in results}, set(get_load_test_routes()))
+        self.assertGreaterEqual(sum(result.requests for result in results), 50)
+        for result in results:
+            self.assertEqual(result.failures, 0, result.route)
+
+    def test_routes(self):
+        self.assertIn("/forms/rental_form_upload_url", get_api_routes())
+        self.assertIn("/metrics", get_api_routes())
+        # the proxied form routes are deprecated, but still served
+        self.assertIn("/forms/upload_rental_form", get_api_routes())
+        self.assertIn("/forms/download_rental_form", get_api_routes())
+        self.assertListEqual(get_load_test_routes(), sorted([*get_api_routes(), S3_UPLOAD_ROUTE, S3_DOWNLOAD_ROUTE]))
+
+    def test_baseline_covers_every_route(self):
+        self.assertListEqual(sorted(load_baseline()), get_load_test_routes())
+
+    def test_too_many_clients(self):
+        with self.assertRaises(ValueError):
+            run_api_load_test(clients=3, days=2)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7.0], 99), 7.0)
+
+    def test_compare_to_baseline(self):
+        baseline = {"/health": {"p50_ms": 10.0}, "/settings/get": {"p50_ms": 100.0}}
+
+        within_tolerance = [RouteResult("/health", 10, 0, 1.0, 29.0, 50.0, 90.0),
+                            RouteResult("/settings/get", 10, 0, 1.0, 210.0, 500.0, 900.0)]
+        self.assertListEqual(compare_to_baseline(within_tolerance, baseline), [])
+
+        regressions = compare_to_baseline([RouteResult("/health", 10, 1, 1.0, 31.0, 50.0, 90.0)], baseline)
+        self.assertListEqual(regressions, [
+            "/settings/get: not requested",
+            "/health: 1 of 10 requests failed",
+            "/health p50: 31.0 ms (baseline 10.0 ms)",
+        ])
+
+        # routes missing from the baseline are not compared
+        self.assertListEqual(compare_to_baseline([RouteResult("/new", 1, 0, 1.0, 9e3, 9e3, 9e3)], {}), [])
+
+    def test_check_rental_latency_budget(self):
+        results = [
+            RouteResult("/rentals/add", 10, 0, 1.0, 100.0, 900.0, 2500.0),
+            RouteResult("/rentals/complete_rental", 10, 0, 1.0, 100.0, 1100.0, 1200.0),
+            RouteResult("/chat/ask_stream", 10, 2, 1.0, 9e3, 9e3, 9e3),
+        ]
+
+        self.assertListEqual(check_rental_latency_budget(results, budget_ms=1000), [
+            "/rentals/complete_rental p95: 1100.0 ms (budget 1000 ms)",
+            "/chat/ask_stream: 2 of 10 requests failed",
+        ])
@@ -0,0 +1,55 @@
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmarks.chatbot import (
+    QuestionResult,
+    build_questions,
+    compare_to_baseline,
+    load_baseline,
+    run_chatbot_benchmark,
+)
+from api.src.chat_service import GEMINI_MODEL_FALLBACK_CHAIN, ChatService
+
+
+class TestChatbotBenchmark(TestCase):
+
+    def test_questions_call_every_tool(self):
+        with patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"}):
+            agent = ChatService()._build_agent(GEMINI_MODEL_FALLBACK_CHAIN[0])  # pylint: disable=protected-access
+        registered_tools = set(agent._function_toolset.tools)  # pylint: disable=protected-access
+        called_tools = {
+            tool_name
+            for question in build_questions()
+            for step in question.tool_steps
+            for tool_name, _ in step
+        }
+        self.assertSetEqual(registered_tools, called_tools)
+
+    def test_smoke(self):
+        with patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"}):
+            results = run_chatbot_benchmark(days=1, devices_per_type=5, reservations_per_day=5, walk_ins_per_day=5)
+        self.assertListEqual([result.question for result in results], [q.question for q in build_questions()])
+        for result in results:
+            self.assertGreater(result.tool_calls, 0)
+
+    def test_no_regressions_against_baseline(self):
+        baseline = load_baseline()
+        with patch.dict(os.environ, {"GEMINI_API_KEY": "test-key"}):
+            results = run_chatbot_benchmark()
+        self.assertSetEqual({result.question for result in results}, set(baseline))
+        self.assertListEqual(compare_to_baseline(results, baseline), [])
+        for result in results:
+            self.assertGreater(result.tool_calls, 0)
+
+    def test_compare_to_baseline(self):
+        baseline = {"Q": {"tool_calls": 1, "dynamodb_reads": 1, "payload_bytes": 1000, "input_tokens": 100}}
+
+        within_tolerance = QuestionResult("Q", 1, 1, 1100, 110, 5.0)
+        self.assertListEqual(compare_to_baseline([within_tolerance], baseline), [])
+
+        regressions = compare_to_baseline([QuestionResult("Q", 1, 2, 1101, 90, 5.0)], baseline)
+        self.assertListEqual(regressions, ["Q dynamodb_reads: 2 (baseline 1)", "Q payload_bytes: 1101 (baseline 1000)"])
+
+        # questions missing from the baseline are not compared
+        self.assertListEqual(compare_to_baseline([QuestionResult("New", 5, 5, 5, 5, 5.0)], baseline), [])
@@ -0,0 +1,132 @@
+import json
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from unittest import TestCase
+
+import boto3
+import pandas as pd
+
+from benchmarks.season import SEASON_TABLES, generate_season, mock_season, write_season_to_files
+from common.cne_dates import CNEDates
+from common.constants import DeviceStatus, RentalStatus, ReservationStatus
+
+
+class TestGenerateSeason(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.season = generate_season(days=None, devices_per_type=20, reservations_per_day=15, walk_ins_per_day=15)
+
+    def test_same_seed_same_season(self):
+        self.assertEqual(generate_season(seed=3), generate_season(seed=3))
+        self.assertNotEqual(generate_season(seed=3).rentals, generate_season(seed=4).rentals)
+
+    def test_days(self):
+        self.assertListEqual(self.season.days, CNEDates.get_cne_date_list())
+        self.assertListEqual(generate_season(days=2).days, CNEDates.get_cne_date_list()[:2])
+        with self.assertRaises(ValueError):
+            generate_season(days=len(CNEDates.get_cne_date_list()) + 1)
+
+    def test_id_limits(self):
+        season = generate_season(days=1, devices_per_type=99, reservations_per_day=512, walk_ins_per_day=0)
+        self.assertIn("W99", {device.id for device in season.devices})
+        for kwargs in (
+                {"devices_per_type": 100},
+                {"devices_per_type": 0},
+                {"reservations_per_day": 513, "walk_ins_per_day": 0},
+                {"reservations_per_day": 300, "walk_ins_per_day": 300},
+        ):
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                generate_season(days=1, **kwargs)
+
+    def test_ids_are_unique(self):
+        for items in (self.season.devices, self.season.reservations, self.season.rentals):
+            ids = [item.id for item in items]
+            self.assertEqual(len(ids), len(set(ids)))
+
+    def test_weekends_are_busier(self):
+        rentals_per_day = defaultdict(int)
+        for rental in self.season.rentals:
+            rentals_per_day[rental.date] += 1
+        weekend = [count for day, count in rentals_per_day.items() if day.weekday() >= 5]
+        weekdays = [count for day, count in rentals_per_day.items() if day.weekday() < 5]
+        self.assertGreater(sum(weekend) / len(weekend), sum(weekdays) / len(weekdays))
+
+    def test_devices_are_rented_one_at_a_time(self):
+        rentals_by_device = defaultdict(list)
+        for rental in self.season.rentals:
+            rentals_by_device[rental.device_id].append(rental)
+        for rentals in rentals_by_device.values():
+            rentals.sort(key=lambda rental: rental.pickup_time)
+            for rental, next_rental in zip(rentals, rentals[1:]):
+                self.assertIsNotNone(rental.return_time)
+                self.assertLessEqual(rental.return_time, next_rental.pickup_time)
+
+    def test_late_returns(self):
+        last_day = self.season.days[-1]
+        returned_next_day = [
+            rental for rental in self.season.rentals
+            if rental.return_time is not None and rental.return_time.date() > rental.date
+        ]
+        self.assertTrue(returned_next_day)
+        for rental in self.season.rentals:
+            if rental.status == RentalStatus.IN_PROGRESS:
+                self.assertEqual(rental.date, last_day)
+                self.assertIsNone(rental.return_time)
+
+        devices = {device.id: device for device in self.season.devices}
+        rented = {rental.device_id for rental in self.season.rentals if rental.status == RentalStatus.IN_PROGRESS}
+        self.assertSetEqual(rented, {device.id for device in devices.values() if device.status == DeviceStatus.RENTED})
+
+    def test_reservation_statuses_match_their_rentals(self):
+        rentals = {rental.id: rental for rental in self.season.rentals}
+        for reservation in self.season.reservations:
+            rental = rentals.get(reservation.rental_id)
+            match reservation.status:
+                case ReservationStatus.COMPLETED:
+                    self.assertEqual(rental.status, RentalStatus.COMPLETED)
+                case ReservationStatus.PICKED_UP:
+                    self.assertEqual(rental.status, RentalStatus.IN_PROGRESS)
+                case _:
+                    self.assertIsNone(rental)
+            if rental is not None:
+                self.assertEqual(rental.reservation_id, reservation.id)
+                self.assertEqual(rental.pickup_time, reservation.reservation_time)
+
+    def test_waitlisted_when_no_device_is_free(self):
+        season = generate_season(devices_per_type=2, reservations_per_day=30)
+        self.assertIn(ReservationStatus.WAITLISTED, {reservation.status for reservation in season.reservations})
+
+
+class TestWriteSeason(TestCase):
+
+    def setUp(self):
+        self.season = generate_season(days=2)
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_jsonl(self):
+        paths = write_season_to_files(self.season, self.directory)
+        self.assertListEqual([path.name for path in paths], [f"{table}.jsonl" for table in SEASON_TABLES])
+        items = self.season.get_items()
+        for table, path in zip(SEASON_TABLES, paths):
+            with open(path, encoding="utf-8") as file:
+                self.assertListEqual([json.loads(line) for line in file], items[table])
+
+    def test_parquet(self):
+        paths = write_season_to_files(self.season, self.directory, file_format="parquet")
+        rentals = pd.read_parquet(paths[SEASON_TABLES.index("cne_rentals")])
+        self.assertListEqual(rentals["id"].tolist(), [rental.id for rental in self.season.rentals])
+
+    def test_unrecognized_format(self):
+        with self.assertRaises(ValueError):
+            write_season_to_files(self.season, self.directory, file_format="csv")
+
+    def test_mock_season(self):
+        with mock_season(days=2) as season:
+            dynamodb = boto3.resource("dynamodb")
+            for table, items in season.get_items().items():
+                self.assertEqual(dynamodb.Table(table).scan(Select="COUNT")["Count"], len(items))
+        self.assertEqual(season, self.season)
@@ -1,5 +1,8 @@
+import sys
 from datetime import date, datetime
+from types import ModuleType
 from unittest import TestCase
+from unittest.mock import patch
 
 import pandas as pd
 from pydantic import ValidationError
@@ -158,6 +161,12 @@ class TestRentalSummary(TestCase):
         summary = RentalSummary(**{**self._BASE, "return_time": pd.NaT})
         self.assertIsNone(summary.return_time)
 
+    def test_valid_while_pandas_is_being_imported(self):
+        # another thread's import of pandas is under way, so pandas has none of its functions yet
+        with patch.dict(sys.modules, {"pandas": ModuleType("pandas")}):
+            summary = RentalSummary(**{**self._BASE, "notes": "Brought back early"})
+        self.assertEqual("Brought back early", summary.notes)
+
     def test_device_id_type_mismatch_raises(self):
         with self.assertRaises(ValidationError):
             RentalSummary(**{**self._BASE, "device_id": "S01", "device_type": DeviceType.WHEELCHAIR})
@@ -0,0 +1,61 @@
+import logging
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from common.logger import configure_logging, initialize_logger, timeit
+
+
+class TestInitializeLogger(TestCase):
+
+    def test_logger_is_named_after_the_calling_module(self):
+        self.assertEqual(__name__, initialize_logger().name)
+        self.assertEqual("api.src.some_module", initialize_logger("api.src.some_module").name)
+
+    def test_handler_is_set_up_once_on_the_package_logger(self):
+        with patch.dict(os.environ, {"LOG_LEVEL": "warning"}):
+            first = initialize_logger("logger_test_package.first")
+            second = initialize_logger("logger_test_package.second")
+            # configuring the package again changes nothing
+            configure_logging("logger_test_package", logging.DEBUG)
+
+        package_logger = logging.getLogger("logger_test_package")
+        self.assertEqual(1, len(package_logger.handlers))
+        self.assertEqual(logging.WARNING, package_logger.level)
+        self.assertEqual([], first.handlers + second.handlers)
+        self.assertFalse(first.isEnabledFor(logging.INFO))
+        self.assertTrue(second.isEnabledFor(logging.WARNING))
+
+
+class TestTimeit(TestCase):
+
+    def setUp(self):
+        self.logger = logging.getLogger("tests.unit.common.test_logger.timeit")
+
+        @timeit(logger=self.logger)
+        def add(a, b):
+            return a + b
+
+        self.add = add
+
+    def test_timing_is_skipped_while_the_level_is_disabled(self):
+        self.logger.setLevel(logging.INFO)
+        with patch("common.logger.time.perf_counter") as mock_perf_counter, self.assertNoLogs(self.logger):
+            self.assertEqual(3, self.add(1, 2))
+
+        mock_perf_counter.assert_not_called()
+
+    def test_execution_time_is_logged_at_debug(self):
+        with self.assertLogs(self.logger, level=logging.DEBUG) as captured:
+            self.assertEqual(3, self.add(1, 2))
+
+        self.assertEqual(["DEBUG"], [record.levelname for record in captured.records])
+        self.assertIn("'add' executed in", captured.output[0])
+
+    def test_module_logger_is_used_by_default(self):
+        @timeit()
+        def noop():
+            pass
+
+        with self.assertLogs(__name__, level=logging.DEBUG):
+            noop()
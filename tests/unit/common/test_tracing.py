@@ -0,0 +1,127 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from opentelemetry.trace import StatusCode
+
+from common import tracing
+from common.logger import timeit
+from common.tracing import (
+    configure_tracing,
+    extract_trace_context,
+    inject_trace_headers,
+    is_tracing_enabled,
+    start_span,
+    traced,
+)
+from tests.unit.base_tests import BaseTestCases
+
+
+class TestTracingDisabled(TestCase):
+
+    def test_spans_are_no_ops(self):
+        @traced()
+        def add(a, b):
+            return a + b
+
+        with start_span("nothing") as span:
+            self.assertIsNone(span)
+        self.assertFalse(is_tracing_enabled())
+        self.assertEqual(3, add(1, 2))
+        self.assertEqual({}, inject_trace_headers())
+        self.assertEqual({"Accept": "text/plain"}, inject_trace_headers({"Accept": "text/plain"}))
+        traceparent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+        self.assertIsNone(extract_trace_context({"traceparent": traceparent}))
+
+    def test_tracing_stays_off_without_a_trace_file(self):
+        environ = {name: value for name, value in os.environ.items() if name != "TRACE_FILE"}
+        unconfigured = tracing._TracingState()  # pylint: disable=protected-access
+        with patch.dict(os.environ, environ, clear=True), patch.object(tracing, "_state", unconfigured):
+            self.assertFalse(configure_tracing(service_name="test"))
+
+
+class TestConfigureTracing(TestCase):
+
+    def test_spans_are_written_to_the_trace_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            trace_file = os.path.join(directory, "traces.jsonl")
+            unconfigured = tracing._TracingState()  # pylint: disable=protected-access
+            with patch.dict(os.environ, {"TRACE_FILE": trace_file}), patch.object(tracing, "_state", unconfigured):
+                self.assertTrue(configure_tracing(service_name="test-service"))
+                # configuring again changes nothing
+                tracer_provider = tracing.get_tracer_provider()
+                self.assertTrue(configure_tracing(service_name="another-service"))
+                self.assertIs(tracer_provider, tracing.get_tracer_provider())
+
+                with start_span("parent"), start_span("child", attributes={"rows": 3}):
+                    pass
+                tracer_provider.shutdown()
+
+            with open(trace_file, encoding="utf-8") as file:
+                spans = {span["name"]: span for span in map(json.loads, file)}
+
+        self.assertEqual({"parent", "child"}, set(spans))
+        self.assertEqual(spans["parent"]["context"]["span_id"], spans["child"]["parent_id"])
+        self.assertEqual({"rows": 3}, spans["child"]["attributes"])
+        self.assertEqual("test-service", spans["child"]["resource"]["attributes"]["service.name"])
+
+
+class TestTracing(BaseTestCases.BaseTracingTest):
+
+    def test_traced_functions_and_coroutines_record_spans(self):
+        @traced()
+        def add(a, b):
+            return a + b
+
+        @traced("custom name")
+        async def add_async(a, b):
+            return add(a, b)
+
+        self.assertEqual(3, asyncio.run(add_async(1, 2)))
+
+        spans = self.get_spans()
+        self.assertEqual(
+            spans["custom name"].context.span_id,
+            spans["TestTracing.test_traced_functions_and_coroutines_record_spans.<locals>.add"].parent.span_id,
+        )
+
+    def test_exceptions_fail_spans_unless_told_otherwise(self):
+        with self.assertRaises(ValueError), start_span("failing"):
+            raise ValueError("failed")
+        with self.assertRaises(KeyError), start_span("control flow", record_exception=False):
+            raise KeyError("rerun")
+
+        spans = self.get_spans()
+        self.assertEqual(StatusCode.ERROR, spans["failing"].status.status_code)
+        self.assertEqual(["exception"], [event.name for event in spans["failing"].events])
+        self.assertEqual(StatusCode.UNSET, spans["control flow"].status.status_code)
+        self.assertEqual([], list(spans["control flow"].events))
+
+    def test_trace_context_is_propagated_through_headers(self):
+        with start_span("client", kind="client") as client_span:
+            headers = inject_trace_headers()
+        with start_span("server", kind="server", context=extract_trace_context(headers)):
+            pass
+
+        server_span = self.get_spans()["server"]
+        self.assertEqual(client_span.get_span_context().trace_id, server_span.context.trace_id)
+        self.assertEqual(client_span.get_span_context().span_id, server_span.parent.span_id)
+
+    def test_timeit_records_spans_while_its_level_is_disabled(self):
+        logger = logging.getLogger("tests.unit.common.test_tracing.timeit")
+        logger.setLevel(logging.INFO)
+
+        @timeit(logger=logger)
+        def add(a, b):
+            return a + b
+
+        with self.assertNoLogs(logger):
+            self.assertEqual(3, add(1, 2))
+
+        self.assertEqual(
+            ["TestTracing.test_timeit_records_spans_while_its_level_is_disabled.<locals>.add"], list(self.get_spans())
+        )
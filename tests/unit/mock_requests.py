@@ -2,7 +2,9 @@ from typing import Dict, List, Optional
 from unittest.mock import Mock
 
 from common.constants import DeviceStatus
-from common.data_models import ChatRequest, Device
+from common.data_models import ChatRequest, ChatResponse, ChatStreamEvent, ChatStreamEventType, Device
+
+MOCK_S3_URL = "https://test-bucket.s3.amazonaws.com"
 
 
 # pylint: disable=too-few-public-methods
@@ -19,6 +21,7 @@ class MockRequests:
             mock_chat_input_tokens: int = 80,
             mock_chat_output_tokens: int = 20,
             mock_chat_cache_read_tokens: int = 0,
+            mock_chat_error: Optional[str] = None,
     ):
         self.mock_inventory_data = mock_inventory_data if mock_inventory_data is not None else []
         self.mock_reservations_data = mock_reservations_data if mock_reservations_data is not None else []
@@ -28,10 +31,16 @@ class MockRequests:
         self.mock_chat_input_tokens = mock_chat_input_tokens
         self.mock_chat_output_tokens = mock_chat_output_tokens
         self.mock_chat_cache_read_tokens = mock_chat_cache_read_tokens
+        self.mock_chat_error = mock_chat_error
 
     def mock_requests_get(self, url, *args, **kwargs):  # pylint: disable=unused-argument,too-many-return-statements
         """Mock the requests.get method"""
-        if "download_rental_form" in url:
+        if "rental_form_download_url" in url:
+            return Mock(
+                status_code=200,
+                json=Mock(return_value={"url": f"{MOCK_S3_URL}/rental_form.pdf", "expires_in": 300}),
+            )
+        if url.startswith(MOCK_S3_URL):
             return Mock(status_code=200, content=b"Mocked rental form content")
         if "get_full_inventory" in url:
             return Mock(status_code=200, json=Mock(return_value=self.mock_inventory_data))
@@ -72,19 +81,41 @@ class MockRequests:
             # validate against the real request model, mirroring the API, so a payload the real
             # endpoint would reject (e.g. extra keys) fails here too instead of only in production
             ChatRequest(**kwargs["json"])
-            return Mock(
-                status_code=200,
-                json=Mock(return_value={
-                    "answer": self.mock_chat_response,
-                    "model": self.mock_chat_model,
-                    "input_tokens": self.mock_chat_input_tokens,
-                    "output_tokens": self.mock_chat_output_tokens,
-                    "cache_read_tokens": self.mock_chat_cache_read_tokens,
-                    "total_tokens": self.mock_chat_input_tokens + self.mock_chat_output_tokens,
-                }),
-            )
+            if "chat/ask_stream" in url:
+                return Mock(status_code=200, iter_lines=Mock(return_value=self._mock_chat_stream_lines()))
+            return Mock(status_code=200, json=Mock(return_value=self._mock_chat_response().model_dump(mode="json")))
         raise ValueError(f"Unsupported API url for mocking requests.post: {url}")
 
+    def _mock_chat_response(self) -> ChatResponse:
+        """Build the mocked chatbot response"""
+        return ChatResponse(
+            answer=self.mock_chat_response,
+            model=self.mock_chat_model,
+            input_tokens=self.mock_chat_input_tokens,
+            output_tokens=self.mock_chat_output_tokens,
+            cache_read_tokens=self.mock_chat_cache_read_tokens,
+            total_tokens=self.mock_chat_input_tokens + self.mock_chat_output_tokens,
+        )
+
+    def _mock_chat_stream_lines(self) -> List[str]:
+        """Build the server-sent event lines streamed back for the mocked chatbot response, one token per word"""
+        if self.mock_chat_error is not None:
+            event = ChatStreamEvent(type=ChatStreamEventType.ERROR, text=self.mock_chat_error)
+            return [f"event: {event.type}", f"data: {event.model_dump_json()}", ""]
+        words = self.mock_chat_response.split(" ")
+        events = [
+            ChatStreamEvent(type=ChatStreamEventType.TOOL_CALL, text="get_today"),
+            *(
+                ChatStreamEvent(type=ChatStreamEventType.TOKEN, text=word if i == 0 else f" {word}")
+                for i, word in enumerate(words)
+            ),
+            ChatStreamEvent(type=ChatStreamEventType.DONE, response=self._mock_chat_response()),
+        ]
+        lines = []
+        for event in events:
+            lines.extend([f"event: {event.type}", f"data: {event.model_dump_json()}", ""])
+        return lines
+
     @staticmethod
     def mock_requests_put(url, *args, **kwargs):  # pylint: disable=unused-argument
         """Mock the requests.put method"""
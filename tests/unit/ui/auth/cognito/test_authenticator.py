@@ -1,12 +1,14 @@
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
+import boto3
 from moto import mock_aws
 from streamlit.testing.v1 import AppTest
 
 from ui.auth.cognito.authenticator import CognitoAuthenticator
 from ui.auth.cognito.credentials import Credentials
 from ui.auth.cognito.session_state_manager import CognitoAuthSessionStateManager
+from ui.auth.cognito.utils import USER_GROUPS_TTL_SECONDS, UserGroupsCache
 
 
 # pylint: disable=import-outside-toplevel, reimported
@@ -155,42 +157,49 @@ class TestCognitoAuthenticator(TestCase):
         component and leave empty space at the top of every page)."""
         authenticator = self._build_authenticator()
         with patch(
-                "ui.auth.cognito.authenticator.verify_access_token",
-                return_value=({"username": "u"}, MagicMock(email="u@example.com")),
+                "ui.auth.cognito.authenticator.verify_access_token", return_value={"username": "u"}
+        ), patch(
+            "ui.auth.cognito.authenticator.verify_id_token", return_value={"email": "u@example.com"}
         ), patch.object(CognitoAuthenticator, "_get_user_groups", return_value=[]):
             logged_in = authenticator._set_state_login(self._mock_credentials(), persist=False)
 
         self.assertTrue(logged_in)
         authenticator.cookie_manager.set_credentials.assert_not_called()
 
-    def test_set_state_login_persist_true_writes_cookie(self):
-        """A fresh login must persist the credentials to cookies, and must wait for the
-        cookie component's browser round-trip to complete before returning.
-
-        Without this wait, a caller that reruns immediately afterwards (as login() does)
-        tears down the cookie-setting component before its document.cookie write actually
-        lands in the browser -- confirmed by manual reproduction -- silently losing the
-        session, so a refresh right after logging in logs the user back out.
+    def test_set_state_login_persist_true_writes_cookie_without_waiting(self):
+        """A fresh login must persist the credentials to cookies, without blocking on the cookie component's
+        browser round-trip -- the write stays pending until the browser acknowledges it instead.
         """
         authenticator = self._build_authenticator()
         with patch(
-                "ui.auth.cognito.authenticator.verify_access_token",
-                return_value=({"username": "u"}, MagicMock(email="u@example.com")),
+                "ui.auth.cognito.authenticator.verify_access_token", return_value={"username": "u"}
+        ), patch(
+            "ui.auth.cognito.authenticator.verify_id_token", return_value={"email": "u@example.com"}
         ), patch.object(CognitoAuthenticator, "_get_user_groups", return_value=[]), patch(
-            "ui.auth.cognito.authenticator.time.sleep"
+            "time.sleep"
         ) as mock_sleep:
             logged_in = authenticator._set_state_login(self._mock_credentials(), persist=True)
 
         self.assertTrue(logged_in)
         authenticator.cookie_manager.set_credentials.assert_called_once()
-        mock_sleep.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_restored_session_finishes_pending_cookie_writes(self):
+        """The run after a fresh login must keep rendering the pending cookie writes, so the rerun doesn't drop them."""
+        authenticator = self._build_authenticator()
+        authenticator.session_manager = MagicMock()
+        with patch.object(CognitoAuthenticator, "_set_state_login", return_value=True):
+            self.assertTrue(authenticator.restore_session())
+
+        authenticator.cookie_manager.write_pending_credentials.assert_called_once()
 
     def test_set_state_login_persist_false_does_not_wait(self):
         """Restoring a session doesn't write cookies, so there's nothing to wait for."""
         authenticator = self._build_authenticator()
         with patch(
-                "ui.auth.cognito.authenticator.verify_access_token",
-                return_value=({"username": "u"}, MagicMock(email="u@example.com")),
+                "ui.auth.cognito.authenticator.verify_access_token", return_value={"username": "u"}
+        ), patch(
+            "ui.auth.cognito.authenticator.verify_id_token", return_value={"email": "u@example.com"}
         ), patch.object(CognitoAuthenticator, "_get_user_groups", return_value=[]), patch(
             "ui.auth.cognito.authenticator.time.sleep"
         ) as mock_sleep:
@@ -218,3 +227,71 @@ class TestCognitoAuthenticator(TestCase):
                     at.run()
                     self.assertEqual(at.error[0].value, "Username and/or password is empty")
                     mock_rerun.assert_not_called()
+
+
+@mock_aws
+class TestCognitoAuthenticatorGroupsCache(TestCase):
+    """Test cases for caching users' groups, against moto's Cognito user pool."""
+
+    def setUp(self):
+        self.client = boto3.client("cognito-idp", region_name="us-east-1")
+        self.pool_id = self.client.create_user_pool(PoolName="test-pool")["UserPool"]["Id"]
+        self.client.admin_create_user(UserPoolId=self.pool_id, Username="staff")
+        self.client.create_group(GroupName="cne-editor", UserPoolId=self.pool_id)
+        self.client.admin_add_user_to_group(UserPoolId=self.pool_id, Username="staff", GroupName="cne-editor")
+
+        self.group_lookups = 0
+        self.client.meta.events.register(
+            "before-call.cognito-idp.AdminListGroupsForUser", self._count_group_lookup
+        )
+        self.now = 0.0
+        patcher = patch(
+            "ui.auth.cognito.authenticator.user_groups_cache", UserGroupsCache(clock=lambda: self.now)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.authenticator = CognitoAuthenticator(
+            pool_id=self.pool_id, app_client_id="test-client-id", boto_client=self.client, use_cookies=False
+        )
+
+    def _count_group_lookup(self, **_kwargs):
+        self.group_lookups += 1
+
+    def _restore_session(self) -> bool:
+        """Restore a session whose access token doesn't list the user's groups"""
+        credentials = Credentials(
+            id_token="id-token", access_token="access-token", refresh_token="refresh-token", expires_in=3600,
+            token_type="Bearer",
+        )
+        with patch(
+                "ui.auth.cognito.authenticator.verify_access_token", return_value={"username": "staff"}
+        ), patch("ui.auth.cognito.authenticator.verify_id_token", return_value={}):
+            return self.authenticator._set_state_login(credentials, persist=False)
+
+    def test_restores_within_the_ttl_do_not_look_up_the_groups(self):
+        for _ in range(3):
+            self.assertTrue(self._restore_session())
+            self.assertEqual(["cne-editor"], self.authenticator.get_user_groups())
+
+        self.assertEqual(1, self.group_lookups)
+
+    def test_groups_are_looked_up_again_after_the_ttl(self):
+        self._restore_session()
+        self.client.admin_remove_user_from_group(UserPoolId=self.pool_id, Username="staff", GroupName="cne-editor")
+
+        self.now += USER_GROUPS_TTL_SECONDS - 1
+        self._restore_session()
+        self.assertEqual(["cne-editor"], self.authenticator.get_user_groups())
+
+        self.now += 1
+        self._restore_session()
+        self.assertEqual([], self.authenticator.get_user_groups())
+        self.assertEqual(2, self.group_lookups)
+
+    def test_logout_invalidates_the_cached_groups(self):
+        self._restore_session()
+        self.authenticator.logout()
+
+        self._restore_session()
+        self.assertEqual(2, self.group_lookups)
@@ -0,0 +1,55 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from ui.auth.cognito.cookie_manager import PENDING_COOKIES_KEY, CognitoAuthCookieManager
+from ui.auth.cognito.credentials import Credentials
+
+
+class TestCognitoAuthCookieManager(TestCase):
+    """Tests for the acknowledged writes of the credential cookies, with a mocked cookie component."""
+
+    def setUp(self):
+        self.session_state = {}
+        patcher = patch("ui.auth.cognito.cookie_manager.st.session_state", self.session_state)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = CognitoAuthCookieManager()
+        self.manager._cookie_manager = MagicMock()  # pylint: disable=protected-access
+        self.credentials = Credentials(
+            id_token="id-token",
+            access_token="access-token",
+            refresh_token="refresh-token",
+            expires_in=3600,
+            token_type="Bearer",
+        )
+
+    def _acknowledge(self, *names: str):
+        """Mimic the cookie components reporting back that the browser wrote their cookies"""
+        for name in names:
+            self.session_state[f"set_{name}"] = True
+
+    def test_cookies_stay_pending_until_the_browser_acknowledges_them(self):
+        self.manager.set_credentials(self.credentials)
+        self.assertEqual(5, self.manager.cookie_manager.set.call_count)
+
+        # the rerun right after logging in renders the same writes again, rather than tearing them down
+        self.assertFalse(self.manager.write_pending_credentials())
+        self._acknowledge("id_token", "access_token", "refresh_token", "expires_in")
+        self.assertFalse(self.manager.write_pending_credentials())
+        self.manager.cookie_manager.set.assert_called_with("token_type", "Bearer", key="set_token_type")
+        self.assertEqual(15, self.manager.cookie_manager.set.call_count)
+
+        self._acknowledge("token_type")
+        self.assertTrue(self.manager.write_pending_credentials())
+        self.assertNotIn(PENDING_COOKIES_KEY, self.session_state)
+
+        # once acknowledged, later runs don't render the cookie component at all
+        self.manager.cookie_manager.reset_mock()
+        self.assertTrue(self.manager.write_pending_credentials())
+        self.manager.cookie_manager.set.assert_not_called()
+
+    def test_logout_drops_pending_cookies(self):
+        self.manager.set_credentials(self.credentials)
+        self.manager.reset_credentials()
+
+        self.assertNotIn(PENDING_COOKIES_KEY, self.session_state)
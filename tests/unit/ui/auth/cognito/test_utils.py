@@ -0,0 +1,204 @@
+import json
+import time
+from typing import Any, Dict, List
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from ui.auth.cognito import utils
+from ui.auth.cognito.authenticator import CognitoAuthenticator
+from ui.auth.cognito.credentials import Credentials
+from ui.auth.cognito.exceptions import TokenVerificationException
+from ui.auth.cognito.utils import JWKS_REFETCH_INTERVAL_SECONDS, CognitoTokenVerifier, UserGroupsCache
+
+POOL_ID = "us-east-1_TestPool"
+CLIENT_ID = "test-client-id"
+REGION = "us-east-1"
+ISSUER = f"https://cognito-idp.{REGION}.amazonaws.com/{POOL_ID}"
+
+
+class _SigningKeys:
+    """RSA signing keys standing in for a user pool's, published as a JWKS that counts how often it is fetched"""
+
+    def __init__(self, *kids: str):
+        self.private_keys = {kid: rsa.generate_private_key(public_exponent=65537, key_size=2048) for kid in kids}
+        self.published = list(kids)
+        self.fetches = 0
+
+    def fetch_jwks(self, issuer: str) -> Dict[str, List[Dict[str, Any]]]:
+        assert issuer == ISSUER
+        self.fetches += 1
+        keys = []
+        for kid in self.published:
+            key = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(self.private_keys[kid].public_key()))
+            keys.append({**key, "kid": kid, "alg": "RS256", "use": "sig"})
+        return {"keys": keys}
+
+    def sign(self, kid: str, **claims) -> str:
+        return jwt.encode(claims, self.private_keys[kid], algorithm="RS256", headers={"kid": kid})
+
+    def access_token(self, kid: str = "key-1", **claims) -> str:
+        return self.sign(kid, **{
+            "sub": "user-sub", "username": "staff", "cognito:groups": ["cne-editor"], "token_use": "access",
+            "client_id": CLIENT_ID, "iss": ISSUER, "exp": int(time.time()) + 3600, **claims,
+        })
+
+    def id_token(self, kid: str = "key-1", **claims) -> str:
+        return self.sign(kid, **{
+            "sub": "user-sub", "cognito:username": "staff", "email": "staff@example.com", "token_use": "id",
+            "aud": CLIENT_ID, "iss": ISSUER, "exp": int(time.time()) + 3600, **claims,
+        })
+
+
+class TestCognitoTokenVerifier(TestCase):
+    """Tests for verifying tokens signed locally, in place of the user pool"""
+
+    def setUp(self):
+        self.keys = _SigningKeys("key-1", "key-2")
+        self.now = time.time()
+        self.verifier = CognitoTokenVerifier(
+            POOL_ID, CLIENT_ID, REGION, fetch_jwks=self.keys.fetch_jwks, clock=lambda: self.now
+        )
+
+    def test_verifies_access_and_id_tokens(self):
+        access_claims = self.verifier.verify(self.keys.access_token(), "access")
+        id_claims = self.verifier.verify(self.keys.id_token(kid="key-2"), "id")
+
+        self.assertEqual("staff", access_claims["username"])
+        self.assertEqual(["cne-editor"], access_claims["cognito:groups"])
+        self.assertEqual("staff@example.com", id_claims["email"])
+        self.assertEqual(1, self.keys.fetches)
+
+    def test_rejects_invalid_tokens(self):
+        other_pool_keys = _SigningKeys("key-1")
+        invalid_tokens = {
+            "empty": ("", "access"),
+            "expired": (self.keys.access_token(exp=int(time.time()) - 10), "access"),
+            "forged signature": (other_pool_keys.access_token(), "access"),
+            "other pool": (self.keys.access_token(iss="https://cognito-idp.us-east-1.amazonaws.com/other"), "access"),
+            "other client": (self.keys.access_token(client_id="other-client"), "access"),
+            "other audience": (self.keys.id_token(aud="other-client"), "id"),
+            "id token as access token": (self.keys.id_token(), "access"),
+            "access token as id token": (self.keys.access_token(aud=CLIENT_ID), "id"),
+            "not a token": ("not-a-token", "access"),
+        }
+        for name, (token, token_use) in invalid_tokens.items():
+            with self.subTest(name):
+                with self.assertRaises(TokenVerificationException):
+                    self.verifier.verify(token, token_use)
+
+    def test_verified_tokens_are_remembered_until_they_expire(self):
+        token = self.keys.access_token(exp=int(self.now) + 60)
+
+        with patch("ui.auth.cognito.utils.jwt.decode", wraps=jwt.decode) as mock_decode:
+            for _ in range(5):
+                self.verifier.verify(token, "access")
+            self.assertEqual(1, mock_decode.call_count)
+
+            self.now += 61
+            with self.assertRaises(TokenVerificationException):
+                self.verifier.verify(token, "access")
+
+    def test_keys_are_fetched_again_after_the_pool_rotates_them(self):
+        self.keys.published = ["key-1"]
+        self.verifier.verify(self.keys.access_token(), "access")
+
+        # the pool starts signing with a new key
+        self.keys.published = ["key-1", "key-2"]
+        self.now += JWKS_REFETCH_INTERVAL_SECONDS + 1
+        claims = self.verifier.verify(self.keys.access_token(kid="key-2"), "access")
+
+        self.assertEqual("staff", claims["username"])
+        self.assertEqual(2, self.keys.fetches)
+
+    def test_unknown_keys_do_not_refetch_the_keys_every_time(self):
+        self.keys.published = ["key-1"]
+        self.verifier.verify(self.keys.access_token(), "access")
+        for _ in range(5):
+            with self.assertRaises(TokenVerificationException):
+                self.verifier.verify(self.keys.access_token(kid="key-2"), "access")
+
+        self.assertEqual(1, self.keys.fetches)
+
+
+class TestUserGroupsCache(TestCase):
+    """Tests for the cache of users' groups"""
+
+    def setUp(self):
+        self.now = 0.0
+        self.cache = UserGroupsCache(ttl_seconds=60, clock=lambda: self.now)
+
+    def test_groups_expire_after_the_ttl(self):
+        self.cache.put(POOL_ID, "staff", ["cne-editor"])
+        self.now = 59
+        self.assertEqual(["cne-editor"], self.cache.get(POOL_ID, "staff"))
+        self.now = 60
+        self.assertIsNone(self.cache.get(POOL_ID, "staff"))
+
+    def test_groups_are_cached_per_pool_and_user(self):
+        self.cache.put(POOL_ID, "staff", ["cne-editor"])
+        self.cache.put(POOL_ID, "admin", ["cne-admin"])
+        self.cache.invalidate(POOL_ID, "staff")
+
+        self.assertIsNone(self.cache.get(POOL_ID, "staff"))
+        self.assertIsNone(self.cache.get("us-east-1_OtherPool", "admin"))
+        self.assertEqual(["cne-admin"], self.cache.get(POOL_ID, "admin"))
+
+
+class TestCognitoAuthenticatorSessionRestore(TestCase):
+    """Tests for restoring a session from locally signed tokens, without calling Cognito"""
+
+    def setUp(self):
+        self.keys = _SigningKeys("key-1")
+        verifier = CognitoTokenVerifier(POOL_ID, CLIENT_ID, REGION, fetch_jwks=self.keys.fetch_jwks)
+        verifiers = utils._verifiers  # pylint: disable=protected-access
+        for patcher in (
+                patch.dict(verifiers, {(POOL_ID, CLIENT_ID, REGION): verifier}),
+                patch("ui.auth.cognito.authenticator.user_groups_cache", UserGroupsCache()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = MagicMock()
+        self.authenticator = CognitoAuthenticator(
+            pool_id=POOL_ID, app_client_id=CLIENT_ID, boto_client=self.client, use_cookies=False
+        )
+
+    def _credentials(self, **access_claims) -> Credentials:
+        return Credentials(
+            id_token=self.keys.id_token(),
+            access_token=self.keys.access_token(**access_claims),
+            refresh_token="refresh-token",
+            expires_in=3600,
+            token_type="Bearer",
+        )
+
+    def test_session_restores_make_no_network_calls(self):
+        credentials = self._credentials()
+        with patch("requests.get") as mock_get:
+            for _ in range(3):
+                self.assertTrue(self.authenticator._set_state_login(credentials, persist=False))
+
+        self.assertEqual("staff", self.authenticator.get_username())
+        self.assertEqual("staff@example.com", self.authenticator.get_email())
+        self.assertEqual(["cne-editor"], self.authenticator.get_user_groups())
+        # the keys were only fetched for the first restore, and the groups came from the token
+        self.assertEqual(1, self.keys.fetches)
+        mock_get.assert_not_called()
+        self.client.admin_list_groups_for_user.assert_not_called()
+
+    def test_groups_are_looked_up_for_a_token_without_any(self):
+        self.client.admin_list_groups_for_user.return_value = {"Groups": [{"GroupName": "cne-display"}]}
+        credentials = self._credentials(**{"cognito:groups": None})
+
+        self.assertTrue(self.authenticator._set_state_login(credentials, persist=False))
+
+        self.assertEqual(["cne-display"], self.authenticator.get_user_groups())
+        self.client.admin_list_groups_for_user.assert_called_once_with(UserPoolId=POOL_ID, Username="staff")
+
+    def test_invalid_tokens_log_out(self):
+        credentials = self._credentials(client_id="other-client")
+
+        self.assertFalse(self.authenticator._set_state_login(credentials, persist=False))
+        self.assertFalse(self.authenticator.is_logged_in())
@@ -1,12 +1,18 @@
 import datetime
+import os
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
+import boto3
 import requests
 import streamlit as st
+from moto import mock_aws
 from pydantic import BaseModel
 
-from ui.src.data_service import DataService
+from api.src.s3_service import S3Service
+from common.data_models import ChatStreamEventType, RentalFormURL
+from tests.unit.base_tests import BaseTestCases
+from ui.src.data_service import APIError, DataService
 
 
 class DummyBaseModel(BaseModel):
@@ -36,6 +42,7 @@ class TestDataService(TestCase):
                 url="http://test_host:1234/test_path",
                 params={"cne_year": 1234},
                 json={"key_a": "a", "key_b": "b"},
+                headers={},
                 timeout=100,
             )
         with patch("requests.get", return_value=Mock(status_code=200, json=Mock(return_value={}))) as mock_get:
@@ -50,6 +57,7 @@ class TestDataService(TestCase):
                 url="http://test_host:1234/test_path",
                 params={"cne_year": 1234},
                 json={"a": "a", "b": "2023-10-01", "c": 1.0},
+                headers={},
                 timeout=100,
             )
 
@@ -101,3 +109,143 @@ class TestDataServiceCacheBypass(TestCase):
 
             self.data_service.get_rentals_on_date(date)
             self.assertEqual(2, mock_get.call_count, "The bypass call should not have evicted the shared cache")
+
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,protected-access
+@mock_aws
+class TestDataServiceRentalForms(TestCase):
+    """Tests that rental forms go straight to/from S3 using the presigned URLs, not through the API."""
+
+    def setUp(self):
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="test-bucket")
+        with patch.dict(os.environ, {"S3_BUCKET": "test-bucket", "CNE_YEAR": "2025", "DEV_MODE": "false"}):
+            self.s3_service = S3Service()
+        self.data_service = DataService(api_host="test_host", api_port="1234")
+        st.cache_data.clear()
+
+    # pylint: disable=unused-argument
+    def _get_presigned_url(self, url_path: str, rental_id: str, missing_ok: bool = False):
+        """Stand in for the API, issuing presigned URLs the same way the /forms endpoints do"""
+        with patch.dict(os.environ, {"CNE_YEAR": "2025", "DEV_MODE": "false"}):
+            if url_path.endswith("upload_url"):
+                url = self.s3_service.get_rental_form_upload_url(rental_id=rental_id)
+            else:
+                url = self.s3_service.get_rental_form_download_url(rental_id=rental_id)
+        return 200, RentalFormURL(url=url, expires_in=300)
+
+    def test_upload_and_download_rental_form_via_presigned_urls(self):
+        with patch.object(DataService, "_get_rental_form_url", side_effect=self._get_presigned_url):
+            status_code, _ = self.data_service.upload_rental_form(pdf_bytes=b"%PDF-test", rental_id="W0820001")
+            self.assertEqual(200, status_code)
+            status_code, content = self.data_service.download_rental_form(rental_id="W0820001")
+        self.assertEqual(200, status_code)
+        self.assertEqual(b"%PDF-test", content)
+
+    def test_upload_rental_form_raises_the_api_reason_if_it_cannot_get_a_url(self):
+        response = Mock(status_code=500, json=Mock(return_value={"detail": "S3 is not configured"}))
+        with patch("requests.get", return_value=response), patch("requests.put") as mock_put:
+            with self.assertRaises(APIError) as context:
+                self.data_service.upload_rental_form(pdf_bytes=b"%PDF-test", rental_id="W0820001")
+        self.assertEqual(
+            "Unable to get a URL for the rental form of rental `W0820001`: S3 is not configured",
+            context.exception.message,
+        )
+        mock_put.assert_not_called()
+
+    def test_upload_rental_form_describes_s3_errors(self):
+        s3_error = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            "<Error><Code>AccessDenied</Code><Message>Request has expired</Message></Error>"
+        )
+        url = RentalFormURL(url="https://test-bucket.s3.amazonaws.com/W0820001.pdf", expires_in=300)
+        with patch.object(DataService, "_get_rental_form_url", return_value=(200, url)), \
+                patch("requests.put", return_value=Mock(status_code=403, text=s3_error, reason="Forbidden")):
+            status_code, message = self.data_service.upload_rental_form(pdf_bytes=b"%PDF-test", rental_id="W0820001")
+        self.assertEqual(403, status_code)
+        self.assertEqual("Request has expired (AccessDenied)", message)
+
+    def test_download_rental_form_does_not_return_s3_errors(self):
+        s3_error = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            "<Error><Code>AccessDenied</Code><Message>Request has expired</Message></Error>"
+        )
+        url = RentalFormURL(url="https://test-bucket.s3.amazonaws.com/W0820001.pdf", expires_in=300)
+        with patch.object(DataService, "_get_rental_form_url", return_value=(200, url)), \
+                patch("requests.get", return_value=Mock(status_code=403, text=s3_error, reason="Forbidden")), \
+                self.assertLogs(level="WARNING") as logs:
+            status_code, content = self.data_service.download_rental_form(rental_id="W0820001")
+        self.assertEqual(403, status_code)
+        self.assertIsNone(content)
+        self.assertIn("Request has expired (AccessDenied)", logs.output[0])
+
+    def test_download_rental_form_not_found(self):
+        with patch("requests.get", return_value=Mock(status_code=404)) as mock_get:
+            status_code, content = self.data_service.download_rental_form(rental_id="W9999999")
+        self.assertEqual(404, status_code)
+        self.assertIsNone(content)
+        mock_get.assert_called_once()
+
+
+class TestDataServiceChatStream(TestCase):
+
+    def setUp(self):
+        self.data_service = DataService(api_host="test_host", api_port="1234")
+
+    def test_chat_stream_parses_server_sent_events(self):
+        lines = [
+            "event: tool_call", 'data: {"type": "tool_call", "text": "get_today"}', "",
+            "event: token", 'data: {"type": "token", "text": "Hello"}', "",
+            "event: token", 'data: {"type": "token", "text": " there"}', "",
+        ]
+        mock_response = Mock(status_code=200, iter_lines=Mock(return_value=lines))
+        with patch("requests.post", return_value=mock_response) as mock_post:
+            events = list(self.data_service.chat_stream(message="hi", history=[], user="staff@example.com"))
+
+        self.assertEqual(
+            [ChatStreamEventType.TOOL_CALL, ChatStreamEventType.TOKEN, ChatStreamEventType.TOKEN],
+            [event.type for event in events],
+        )
+        self.assertEqual("Hello there", "".join(event.text for event in events[1:]))
+        _, kwargs = mock_post.call_args
+        self.assertEqual("http://test_host:1234/chat/ask_stream", kwargs["url"])
+        self.assertTrue(kwargs["stream"])
+        self.assertEqual({"message": "hi", "history": [], "user": "staff@example.com"}, kwargs["json"])
+
+    def test_chat_stream_ends_with_an_error_event_if_the_connection_is_lost(self):
+        def lines():
+            yield 'data: {"type": "token", "text": "Hello"}'
+            raise requests.exceptions.ChunkedEncodingError("Connection broken")
+
+        mock_response = Mock(status_code=200, iter_lines=Mock(return_value=lines()))
+        with patch("requests.post", return_value=mock_response):
+            events = list(self.data_service.chat_stream(message="hi", history=[]))
+
+        self.assertEqual([ChatStreamEventType.TOKEN, ChatStreamEventType.ERROR], [event.type for event in events])
+        self.assertEqual("The connection to the chatbot was lost. Please try again.", events[-1].text)
+        mock_response.close.assert_called_once()
+
+    def test_chat_stream_ends_with_an_error_event_on_a_malformed_event(self):
+        mock_response = Mock(status_code=200, iter_lines=Mock(return_value=['data: {"type": "unknown"}']))
+        with patch("requests.post", return_value=mock_response):
+            events = list(self.data_service.chat_stream(message="hi", history=[]))
+
+        self.assertEqual([ChatStreamEventType.ERROR], [event.type for event in events])
+        self.assertEqual("The chatbot sent a response that could not be read.", events[0].text)
+
+    def test_chat_stream_raises_api_error_on_failure(self):
+        with patch("requests.post", return_value=Mock(status_code=422, text="invalid request")):
+            with self.assertRaises(APIError):
+                self.data_service.chat_stream(message="hi", history=[{"role": "system", "content": "x"}])
+
+
+# pylint: disable=missing-class-docstring,missing-function-docstring,protected-access
+class TestDataServiceTracing(BaseTestCases.BaseTracingTest):
+
+    def test_requests_carry_the_trace_context(self):
+        data_service = DataService(api_host="test_host", api_port="1234")
+        with patch("requests.get", return_value=Mock(status_code=200, json=Mock(return_value={}))) as mock_get:
+            data_service._make_request(request_method=requests.get, url_path="devices/get_full_inventory")
+
+        client_span = self.get_spans()["devices/get_full_inventory"]
+        trace_id, span_id = format(client_span.context.trace_id, "032x"), format(client_span.context.span_id, "016x")
+        self.assertTrue(mock_get.call_args.kwargs["headers"]["traceparent"].startswith(f"00-{trace_id}-{span_id}-"))
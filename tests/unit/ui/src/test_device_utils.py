@@ -11,6 +11,8 @@ from ui.src.device_utils import (
     create_dashboard_legend_chart,
     create_inventory_chart,
     get_dashboard_chart_column_weight,
+    get_dashboard_inventory_chart,
+    get_dashboard_legend_chart,
     get_manage_devices_str,
 )
 
@@ -54,7 +56,8 @@ class TestCreateInventoryChart(TestCase):
         self.assertGreater(len(fig.data), 0, "Figure should have traces for each device")
 
     def test_returns_figure_with_correct_trace_count(self):
-        """Each device gets two traces (filled rectangle + label text)."""
+        """The cells are drawn as one filled trace per device status, plus one trace for all the hover text and one
+        for all the labels."""
         import plotly.graph_objects as go
 
         inventory = pd.DataFrame([
@@ -62,26 +65,75 @@ class TestCreateInventoryChart(TestCase):
         ])
         fig = create_inventory_chart(inventory)
         self.assertIsInstance(fig, go.Figure)
-        self.assertEqual(2, len(fig.data), "Each device should produce exactly 2 traces")
+        self.assertEqual(3, len(fig.data), "A single device should produce exactly 3 traces")
+
+    def test_trace_count_does_not_grow_with_the_fleet(self):
+        statuses = list(DeviceStatus)
+        inventory = pd.DataFrame([
+            {"id": f"S{i:03d}", "status": statuses[i % len(statuses)], "location": "BLC"} for i in range(1000)
+        ])
+        fig = create_inventory_chart(inventory)
+        self.assertEqual(len(statuses) + 2, len(fig.data))
+        self.assertEqual(1000, len(fig.data[-1].text))
+
+    def test_cells_are_coloured_by_status_with_per_device_hover_text(self):
+        inventory = pd.DataFrame([
+            {"id": "S01", "status": "Available", "location": "BLC"},
+            {"id": "S02", "status": "Rented", "location": "PG"},
+            {"id": "S03", "status": "Available", "location": "PG"},
+        ])
+        fig = create_inventory_chart(inventory)
+
+        cell_traces = {trace.name: trace for trace in fig.data if trace.mode == "lines"}
+        self.assertEqual({"Available", "Rented"}, set(cell_traces))
+        self.assertEqual(
+            DeviceStatus.get_device_status_colour(DeviceStatus.RENTED), cell_traces["Rented"].fillcolor
+        )
+        # each rectangle is 5 corners followed by a gap separating it from the next
+        self.assertEqual(2 * 6, len(cell_traces["Available"].x))
+
+        label_trace = next(trace for trace in fig.data if trace.mode == "text")
+        self.assertEqual(("S01", "S02", "S03"), label_trace.text)
+        # the second device sits in the next column of the same row
+        self.assertAlmostEqual(1 + 0.4, label_trace.x[1])
+        self.assertAlmostEqual(label_trace.y[0], label_trace.y[1])
+
+    def test_hovering_anywhere_on_a_cell_shows_its_device(self):
+        inventory = pd.DataFrame([
+            {"id": "S01", "status": "Available", "location": "BLC"},
+            {"id": "S02", "status": "Rented", "location": "PG"},
+        ])
+        fig = create_inventory_chart(inventory)
+
+        hover_trace = next(trace for trace in fig.data if trace.mode == "markers")
+        s02_points = [
+            (x, y) for x, y, text in zip(hover_trace.x, hover_trace.y, hover_trace.hovertext)
+            if text == "<b>S02</b><br>Status: Rented<br>Location: PG"
+        ]
+        self.assertEqual(len(hover_trace.x) // 2, len(s02_points))
+        # S02's cell spans x 1 to 1.8 and y 0 to -1.5: its hover points are spread over all of it, not just its centre
+        xs, ys = zip(*s02_points)
+        self.assertTrue(1 < min(xs) < 1.2 and 1.6 < max(xs) < 1.8)
+        self.assertTrue(-0.3 < max(ys) < 0 and -1.5 < min(ys) < -1.2)
 
 
 class TestCreateDashboardInventoryChart(TestCase):
     """Tests for create_dashboard_inventory_chart."""
 
-    @staticmethod
-    def _get_rectangle_trace(fig, device_id: str):
-        for trace in fig.data:
-            if trace.mode == "lines" and trace.text and trace.text.startswith(f"<b>{device_id}</b>"):
-                return trace
-        raise AssertionError(f"No rectangle trace found for device {device_id}")
-
     @staticmethod
     def _get_label_trace(fig, device_id: str):
         for trace in fig.data:
-            if trace.mode == "text" and trace.text == device_id:
+            if trace.mode == "text" and trace.text and device_id in trace.text:
                 return trace
         raise AssertionError(f"No label trace found for device {device_id}")
 
+    @classmethod
+    def _get_cell_origin(cls, fig, device_id: str):
+        """Get the (x0, y0) top-left corner of a device's cell, from the centre of its label."""
+        label_trace = cls._get_label_trace(fig, device_id)
+        i = label_trace.text.index(device_id)
+        return label_trace.x[i] - 0.4, label_trace.y[i] + 0.75
+
     def test_device_labels_use_a_larger_font_than_the_view_inventory_chart(self):
         """The Inventory Dashboard's device labels should be more readable than
         create_inventory_chart's (the View Inventory page), which keeps its original, smaller font."""
@@ -96,7 +148,7 @@ class TestCreateDashboardInventoryChart(TestCase):
         """Column headers should be sized consistently with the device labels below them."""
         inventory = pd.DataFrame([{"id": "S01", "status": "Available", "location": "BLC"}])
         fig = create_dashboard_inventory_chart(inventory)
-        header_trace = next(trace for trace in fig.data if trace.mode == "text" and trace.text == "<b>BLC</b>")
+        header_trace = next(trace for trace in fig.data if trace.mode == "text" and "<b>BLC</b>" in trace.text)
         label_trace = self._get_label_trace(fig, "S01")
         self.assertEqual(label_trace.textfont.size, header_trace.textfont.size)
 
@@ -112,8 +164,9 @@ class TestCreateDashboardInventoryChart(TestCase):
         ])
         fig = create_dashboard_inventory_chart(inventory)
         self.assertIsInstance(fig, go.Figure)
-        # 2 column-header traces + 2 traces (rectangle + label) per device
-        self.assertEqual(2 + 2 * 3, len(fig.data))
+        # 1 column-header trace + 1 cell trace per status (Available, Rented, Backup) + 1 hover trace + 1 label trace
+        self.assertEqual(1 + 3 + 1 + 1, len(fig.data))
+        self.assertEqual(("<b>BLC</b>", "<b>PG</b>"), fig.data[0].text)
         self.assertAlmostEqual(
             2 + _DASHBOARD_CHART_LOCATION_GAP, fig.layout.xaxis.range[1],
             msg="Only one column per location should be needed",
@@ -129,18 +182,18 @@ class TestCreateDashboardInventoryChart(TestCase):
         ])
         fig = create_dashboard_inventory_chart(inventory)
 
-        s01, s02, s03 = (self._get_rectangle_trace(fig, device_id) for device_id in ("S01", "S02", "S03"))
-        self.assertEqual(0, s01.x[0], "S01 (BLC) should be in the first (BLC) column")
-        self.assertEqual(0, s02.x[0], "S02 (BLC) should be in the first (BLC) column")
+        s01, s02, s03 = (self._get_cell_origin(fig, device_id) for device_id in ("S01", "S02", "S03"))
+        self.assertAlmostEqual(0, s01[0], msg="S01 (BLC) should be in the first (BLC) column")
+        self.assertAlmostEqual(0, s02[0], msg="S02 (BLC) should be in the first (BLC) column")
         self.assertAlmostEqual(
-            1 + _DASHBOARD_CHART_LOCATION_GAP, s03.x[0], msg="S03 (PG) should be in the second (PG) column"
+            1 + _DASHBOARD_CHART_LOCATION_GAP, s03[0], msg="S03 (PG) should be in the second (PG) column"
         )
 
         # the two BLC devices stack in successive rows within their own column
-        self.assertEqual(-2, s01.y[0])
-        self.assertEqual(-4, s02.y[0])
+        self.assertAlmostEqual(-2, s01[1])
+        self.assertAlmostEqual(-4, s02[1])
         # PG's single device starts back at the top row of its own column, independent of BLC's rows
-        self.assertEqual(-2, s03.y[0])
+        self.assertAlmostEqual(-2, s03[1])
 
     def test_wraparound_creates_additional_column_within_the_same_location(self):
         """More than _DASHBOARD_CHART_MAX_ROWS devices at one location should wrap into an
@@ -156,21 +209,20 @@ class TestCreateDashboardInventoryChart(TestCase):
         # its own placeholder column (joined by the larger cross-location gap) -> 3 columns total
         expected_width = 3 + _DASHBOARD_CHART_COLUMN_GAP + _DASHBOARD_CHART_LOCATION_GAP
         self.assertAlmostEqual(expected_width, fig.layout.xaxis.range[1])
-        # 3 column-header traces + 2 traces (rectangle + label) per device
-        self.assertEqual(3 + 2 * num_devices, len(fig.data))
+        # 1 trace for the 3 column headers + 1 cell trace (all Available) + 1 hover trace + 1 label trace
+        self.assertEqual(1 + 1 + 1 + 1, len(fig.data))
+        self.assertEqual(3, len(fig.data[0].text))
 
         # the first device beyond _DASHBOARD_CHART_MAX_ROWS should wrap into BLC's second column,
         # offset by the small same-location gap
-        wrapped_device = self._get_rectangle_trace(fig, f"S{num_devices:02d}")
-        self.assertAlmostEqual(1 + _DASHBOARD_CHART_COLUMN_GAP, wrapped_device.x[0])
-        self.assertEqual(-2, wrapped_device.y[0], "The wrapped column's rows should restart from the top")
+        wrapped_x0, wrapped_y0 = self._get_cell_origin(fig, f"S{num_devices:02d}")
+        self.assertAlmostEqual(1 + _DASHBOARD_CHART_COLUMN_GAP, wrapped_x0)
+        self.assertAlmostEqual(-2, wrapped_y0, msg="The wrapped column's rows should restart from the top")
 
         # BLC's second column should still start further right than a plain 1-unit column width
         # would place it, confirming the inter-column gap was actually applied
-        first_column_device = self._get_rectangle_trace(fig, "S01")
-        self.assertGreater(
-            wrapped_device.x[0] - first_column_device.x[0], 1, "Columns should be visually separated"
-        )
+        first_column_x0, _ = self._get_cell_origin(fig, "S01")
+        self.assertGreater(wrapped_x0 - first_column_x0, 1, "Columns should be visually separated")
 
     def test_gap_within_a_location_is_smaller_than_the_gap_between_locations(self):
         """Wrapped columns belonging to the same location should sit closer together than the gap
@@ -181,12 +233,12 @@ class TestCreateDashboardInventoryChart(TestCase):
         inventory = pd.DataFrame(devices)
         fig = create_dashboard_inventory_chart(inventory)
 
-        blc_col1 = self._get_rectangle_trace(fig, "S01")
-        blc_col2 = self._get_rectangle_trace(fig, f"S{num_devices:02d}")
-        pg_col1 = self._get_rectangle_trace(fig, "P01")
+        blc_col1, _ = self._get_cell_origin(fig, "S01")
+        blc_col2, _ = self._get_cell_origin(fig, f"S{num_devices:02d}")
+        pg_col1, _ = self._get_cell_origin(fig, "P01")
 
-        within_location_gap = blc_col2.x[0] - blc_col1.x[0]
-        between_location_gap = pg_col1.x[0] - blc_col2.x[0]
+        within_location_gap = blc_col2 - blc_col1
+        between_location_gap = pg_col1 - blc_col2
         self.assertLess(
             within_location_gap, between_location_gap,
             "BLC's two wrapped columns should sit closer together than the gap to PG's column",
@@ -205,10 +257,10 @@ class TestCreateDashboardInventoryChart(TestCase):
         divider = fig.layout.shapes[0]
         self.assertEqual("line", divider.type)
 
-        blc_cell = self._get_rectangle_trace(fig, "S01")
-        pg_cell = self._get_rectangle_trace(fig, "S02")
-        self.assertGreater(divider.x0, blc_cell.x[2], "Divider should sit to the right of BLC's cell")
-        self.assertLess(divider.x0, pg_cell.x[0], "Divider should sit to the left of PG's cell")
+        blc_cell_x0, _ = self._get_cell_origin(fig, "S01")
+        pg_cell_x0, _ = self._get_cell_origin(fig, "S02")
+        self.assertGreater(divider.x0, blc_cell_x0 + 0.8, "Divider should sit to the right of BLC's cell")
+        self.assertLess(divider.x0, pg_cell_x0, "Divider should sit to the left of PG's cell")
 
     def test_one_location_without_devices_still_gets_its_own_placeholder_column(self):
         """If BLC doesn't fill its last column, PG must still start a new column rather than sharing
@@ -218,10 +270,11 @@ class TestCreateDashboardInventoryChart(TestCase):
         ])
         fig = create_dashboard_inventory_chart(inventory)
 
-        s01 = self._get_rectangle_trace(fig, "S01")
-        self.assertEqual(0, s01.x[0], "S01 (BLC) should be in the first (BLC) column")
-        # 2 column-header traces (one for BLC, one for empty PG) + 2 traces for S01
-        self.assertEqual(2 + 2, len(fig.data))
+        s01_x0, _ = self._get_cell_origin(fig, "S01")
+        self.assertAlmostEqual(0, s01_x0, msg="S01 (BLC) should be in the first (BLC) column")
+        # 1 trace for the column headers (one for BLC, one for empty PG) + 3 traces for S01's cell, hover and label
+        self.assertEqual(("<b>BLC</b>", "<b>PG</b>"), fig.data[0].text)
+        self.assertEqual(1 + 3, len(fig.data))
 
     def test_empty_inventory_still_shows_base_columns(self):
         """An empty inventory should still render the BLC/PG column headers, with no device traces."""
@@ -230,7 +283,34 @@ class TestCreateDashboardInventoryChart(TestCase):
         inventory = pd.DataFrame(columns=["id", "status", "location"])
         fig = create_dashboard_inventory_chart(inventory)
         self.assertIsInstance(fig, go.Figure)
-        self.assertEqual(2, len(fig.data), "Only the 2 column-header traces should be present")
+        self.assertEqual(1, len(fig.data), "Only the column-header trace should be present")
+        self.assertEqual(("<b>BLC</b>", "<b>PG</b>"), fig.data[0].text)
+
+
+class TestGetDashboardInventoryChart(TestCase):
+    """Tests for get_dashboard_inventory_chart."""
+
+    def setUp(self):
+        self.inventory = pd.DataFrame([
+            {"id": "S01", "status": "Available", "location": "BLC"},
+            {"id": "S02", "status": "Rented", "location": "PG"},
+        ])
+
+    def test_figure_is_reused_while_devices_are_unchanged(self):
+        first = get_dashboard_inventory_chart(self.inventory)
+        # a fresh fetch of the same devices, in a different order, is still the same chart
+        second = get_dashboard_inventory_chart(self.inventory.iloc[::-1].reset_index(drop=True))
+        self.assertIs(first, second)
+
+    def test_figure_is_rebuilt_once_a_device_changes(self):
+        first = get_dashboard_inventory_chart(self.inventory)
+        changed = self.inventory.copy()
+        changed.loc[1, "status"] = "Available"
+
+        second = get_dashboard_inventory_chart(changed)
+        self.assertIsNot(first, second)
+        hover_trace = next(trace for trace in second.data if trace.mode == "markers")
+        self.assertEqual("<b>S02</b><br>Status: Available<br>Location: PG", hover_trace.hovertext[-1])
 
 
 class TestGetDashboardChartColumnWeight(TestCase):
@@ -311,6 +391,9 @@ class TestCreateDashboardLegendChart(TestCase):
         inventory = pd.DataFrame([{"id": "S01", "status": "Available", "location": "BLC"}])
         dashboard_fig = create_dashboard_inventory_chart(inventory)
         dashboard_label = next(
-            trace for trace in dashboard_fig.data if trace.mode == "text" and trace.text == "S01"
+            trace for trace in dashboard_fig.data if trace.mode == "text" and "S01" in trace.text
         )
         self.assertEqual(dashboard_label.textfont.size, legend_label.textfont.size)
+
+    def test_cached_legend_is_built_once(self):
+        self.assertIs(get_dashboard_legend_chart(), get_dashboard_legend_chart())
@@ -1,10 +1,12 @@
 from datetime import date
 from unittest import TestCase
+from unittest.mock import patch
 
 import pandas as pd
 from streamlit.testing.v1 import AppTest
 
 from common.utils import get_default_timezone
+from ui.src import display_utils
 from ui.src.display_utils import coerce_pandas_aware_datetime, display_rentals_or_reservations_on_date
 
 _TZ = get_default_timezone()
@@ -102,3 +104,33 @@ class TestDisplayRentalsOrReservationsOnDate(TestCase):
 
         at = AppTest.from_function(run).run()
         self.assertGreater(len(at.subheader), 0, "Should show device-type subheaders")
+
+
+class TestDisplayDualIndicatorChart(TestCase):
+    """Tests for display_dual_indicator_chart."""
+
+    @staticmethod
+    def _display(left_value: int):
+        display_utils.display_dual_indicator_chart(
+            left_title="Scooter",
+            right_title="Wheelchair",
+            left_value=left_value,
+            right_value=1,
+            left_total=10,
+            right_total=10,
+            key="test_chart",
+        )
+
+    def test_chart_is_reused_until_its_values_change(self):
+        with patch("streamlit.plotly_chart") as mock_plotly_chart, \
+                patch.object(display_utils, "create_dual_indicator_chart",
+                             wraps=display_utils.create_dual_indicator_chart) as mock_create:
+            self._display(left_value=9001)
+            self._display(left_value=9001)
+            mock_create.assert_called_once()
+            first_fig, second_fig = (call.args[0] for call in mock_plotly_chart.call_args_list)
+            self.assertIs(first_fig, second_fig)
+
+            self._display(left_value=9002)
+            self.assertEqual(2, mock_create.call_count)
+            self.assertEqual(9002, mock_plotly_chart.call_args.args[0].data[0].value)
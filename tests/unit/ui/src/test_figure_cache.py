@@ -0,0 +1,65 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+from plotly import graph_objects as go
+
+from ui.src.figure_cache import FigureCache
+
+
+class TestFigureCache(TestCase):
+    """Tests for FigureCache."""
+
+    def test_figure_is_only_built_once_per_key(self):
+        cache = FigureCache("Test chart")
+        build = Mock(side_effect=go.Figure)
+
+        first = cache.get_or_build(key=("S01", "Available", "BLC"), build=build)
+        second = cache.get_or_build(key=("S01", "Available", "BLC"), build=build)
+
+        self.assertIs(first, second)
+        build.assert_called_once()
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+        self.assertEqual(0.5, cache.hit_rate)
+
+    def test_figure_is_rebuilt_for_a_new_key(self):
+        cache = FigureCache("Test chart")
+        build = Mock(side_effect=go.Figure)
+
+        first = cache.get_or_build(key=("S01", "Available", "BLC"), build=build)
+        second = cache.get_or_build(key=("S01", "Rented", "BLC"), build=build)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(2, build.call_count)
+        self.assertEqual(0.0, cache.hit_rate)
+
+    def test_least_recently_used_figure_is_evicted(self):
+        cache = FigureCache("Test chart", max_entries=2)
+        build = Mock(side_effect=go.Figure)
+
+        cache.get_or_build(key="a", build=build)
+        cache.get_or_build(key="b", build=build)
+        cache.get_or_build(key="a", build=build)  # "b" is now the least recently used
+        cache.get_or_build(key="c", build=build)
+        self.assertEqual(3, build.call_count)
+
+        cache.get_or_build(key="a", build=build)
+        self.assertEqual(3, build.call_count, "'a' should still be cached")
+        cache.get_or_build(key="b", build=build)
+        self.assertEqual(4, build.call_count, "'b' should have been evicted")
+
+    def test_clear_removes_figures_and_resets_counts(self):
+        cache = FigureCache("Test chart")
+        build = Mock(side_effect=go.Figure)
+        cache.get_or_build(key="a", build=build)
+        cache.get_or_build(key="a", build=build)
+
+        cache.clear()
+        self.assertEqual((0, 0), (cache.hits, cache.misses))
+        cache.get_or_build(key="a", build=build)
+        self.assertEqual(2, build.call_count)
+
+    def test_build_errors_are_not_cached(self):
+        cache = FigureCache("Test chart")
+        with self.assertRaises(ValueError):
+            cache.get_or_build(key="a", build=Mock(side_effect=ValueError))
+        self.assertIsInstance(cache.get_or_build(key="a", build=go.Figure), go.Figure)
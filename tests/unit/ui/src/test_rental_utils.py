@@ -12,7 +12,8 @@ from common.data_models import CompletedRental
 from common.utils import get_default_timezone
 from common.cne_dates import CNEDates
 from ui.src.data_service import DataService
-from ui.src.rental_utils import export_late_returns_to_pdf, submit_complete_rental_form
+from ui.src import rental_utils
+from ui.src.rental_utils import export_late_returns_to_pdf, get_late_returns_pdf, submit_complete_rental_form
 
 
 class TestRentalUtils(TestCase):
@@ -102,6 +103,18 @@ class TestExportLateReturnsToPdf(TestCase):
         self.assertIn("W0901001", text)
         self.assertNotIn("W0901002", text)
 
+    def test_cached_pdf_is_only_rendered_again_when_rentals_change(self):
+        get_late_returns_pdf.clear()
+        self.addCleanup(get_late_returns_pdf.clear)
+        with patch.object(rental_utils, "export_late_returns_to_pdf", return_value=b"pdf") as mock_export:
+            self.assertEqual(b"pdf", get_late_returns_pdf(self.rentals_df, date(2025, 9, 1)))
+            get_late_returns_pdf(self.rentals_df.copy(), date(2025, 9, 1))
+            mock_export.assert_called_once()
+
+            self.rentals_df.loc[1, "return_time"] = pd.Timestamp("2025-09-01T16:00:00-04:00")
+            get_late_returns_pdf(self.rentals_df, date(2025, 9, 1))
+            self.assertEqual(2, mock_export.call_count)
+
     def test_pdf_includes_required_columns_and_signature_lines(self):
         text = self._extract_text(export_late_returns_to_pdf(self.rentals_df.copy(), date(2025, 9, 1)))
         self.assertIn("John Doe", text)
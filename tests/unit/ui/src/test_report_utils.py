@@ -0,0 +1,72 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring,protected-access
+
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pymupdf
+from reportlab.platypus import Paragraph
+
+from ui.src import report_utils
+from ui.src.constants import Colour
+from ui.src.report_utils import build_pdf, build_styled_table, format_table_rows, get_report_context, load_fonts
+
+
+class TestReportContext(TestCase):
+
+    def _clear_caches(self):
+        load_fonts.cache_clear()
+        get_report_context.cache_clear()
+
+    def test_fonts_are_registered_once_per_process(self):
+        self._clear_caches()
+        # the fonts are never really registered below, so make later exports register them for real
+        self.addCleanup(self._clear_caches)
+        with patch("ui.src.report_utils.pdfmetrics.registerFont") as mock_register_font:
+            first_context = get_report_context()
+            second_context = get_report_context()
+            build_styled_table([["ID"], ["W01"]], col_widths=[72])
+        self.assertIs(first_context, second_context)
+        self.assertEqual(2, mock_register_font.call_count, "Only the regular and bold fonts should be registered")
+
+    def test_table_style_is_shared_across_tables(self):
+        context = get_report_context()
+        self.assertIs(context.table_style(left_align_columns=(1, 6)), context.table_style(left_align_columns=(1, 6)))
+        self.assertIsNot(context.table_style(left_align_columns=(1,)), context.table_style(left_align_columns=(1, 6)))
+
+    def test_table_rows_alternate_backgrounds(self):
+        commands = get_report_context().table_style().getCommands()
+        self.assertIn(
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [report_utils.colors.white, Colour.TABLE_ALTERNATE_LIGHT_GREY]),
+            commands,
+        )
+
+
+class TestFormatTableRows(TestCase):
+
+    def test_missing_values_are_left_empty(self):
+        data = pd.DataFrame({
+            "id": ["W0901001", "W0901002"],
+            "notes": [None, "Walker"],
+            "amount": [np.nan, 50],
+        })
+        self.assertEqual([["W0901001", "", ""], ["W0901002", "Walker", "50.0"]], format_table_rows(data))
+
+    def test_empty_frame_has_no_rows(self):
+        self.assertEqual([], format_table_rows(pd.DataFrame({"id": []})))
+
+
+class TestBuildPdf(TestCase):
+
+    def test_buffers_are_reused_between_exports(self):
+        first = build_pdf([Paragraph("First Report", get_report_context().normal)])
+        pooled_buffers = report_utils._buffer_pool.qsize()
+        second = build_pdf([Paragraph("Second Report", get_report_context().normal)])
+        self.assertEqual(pooled_buffers, report_utils._buffer_pool.qsize())
+        with pymupdf.open(stream=second, filetype="pdf") as pdf:
+            text = "".join(page.get_text() for page in pdf)
+        # the reused buffer must not leak the previous export's content
+        self.assertIn("Second Report", text)
+        self.assertNotIn("First Report", text)
+        self.assertTrue(first.startswith(b"%PDF"))
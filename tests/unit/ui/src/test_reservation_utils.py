@@ -195,3 +195,18 @@ class TestReservationUtils(TestCase):
                     )
                 except ZeroDivisionError:
                     self.fail("create_reservation_availability_chart raised ZeroDivisionError when limit=0")
+
+    def test_get_reservations_pdf_is_only_rendered_again_when_reservations_change(self):
+        """The cached reservations PDF is re-rendered only once the day's reservations change"""
+        reservation_utils.get_reservations_pdf.clear()
+        self.addCleanup(reservation_utils.get_reservations_pdf.clear)
+        reservations = pd.DataFrame([self.mock_reservation.model_dump()])
+
+        with patch.object(reservation_utils, "export_reservations_to_pdf", return_value=b"pdf") as mock_export:
+            self.assertEqual(b"pdf", reservation_utils.get_reservations_pdf(reservations, date(2025, 9, 1)))
+            reservation_utils.get_reservations_pdf(reservations.copy(), date(2025, 9, 1))
+            mock_export.assert_called_once()
+
+            reservations.loc[0, "status"] = ReservationStatus.PICKED_UP
+            reservation_utils.get_reservations_pdf(reservations, date(2025, 9, 1))
+            self.assertEqual(2, mock_export.call_count)
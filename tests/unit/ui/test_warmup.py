@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ui import warmup
+from ui.src.device_utils import get_dashboard_legend_chart
+from ui.src.report_utils import get_report_context
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def _imported_modules(code: str, auth_method: str = "local") -> set:
+    """Run the code in a fresh interpreter, returning the names of the modules it ended up importing"""
+    result = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys\nprint(' '.join(sys.modules))"],
+        capture_output=True, text=True, check=True, cwd=REPO_ROOT,
+        env={**os.environ, "AUTH_METHOD": auth_method, "PYTHONPATH": REPO_ROOT},
+    )
+    return set(result.stdout.split())
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_page_modules_do_not_import_the_pdf_libraries_or_authenticators(self):
+        modules = _imported_modules(
+            "import ui.forms, ui.src.auth_utils, ui.src.device_utils, ui.src.display_utils, ui.src.rental_utils, "
+            "ui.src.reservation_utils, ui.src.utils"
+        )
+
+        for module in ("reportlab", "pymupdf", "ui.auth.local_authenticator", "ui.auth.cognito_authenticator"):
+            self.assertNotIn(module, modules)
+
+    def test_only_the_selected_authenticator_is_imported(self):
+        code = "from ui.src.auth_utils import get_authenticator_class\nget_authenticator_class()"
+
+        local_modules = _imported_modules(code, auth_method="local")
+        cognito_modules = _imported_modules(code, auth_method="cognito")
+
+        self.assertIn("ui.auth.local_authenticator", local_modules)
+        self.assertNotIn("ui.auth.cognito_authenticator", local_modules)
+        self.assertIn("ui.auth.cognito_authenticator", cognito_modules)
+        self.assertNotIn("ui.auth.local_authenticator", cognito_modules)
+
+
+class TestWarmUp(unittest.TestCase):
+
+    def test_warm_up_imports_the_deferred_modules_and_fills_the_caches(self):
+        modules = _imported_modules("from ui.warmup import warm_up\nwarm_up()")
+
+        for module in ("reportlab.platypus", "pymupdf", "ui.auth.local_authenticator"):
+            self.assertIn(module, modules)
+
+        warmup.warm_up()
+        self.assertEqual(1, get_report_context.cache_info().currsize)
+        self.assertEqual(1, get_dashboard_legend_chart.cache_info().currsize)
+
+    @patch("ui.warmup.runtime.exists", return_value=True)
+    def test_failed_warm_up_does_not_stop_the_server(self, _):
+        with patch("ui.warmup.warm_up", side_effect=ImportError("no module")), \
+                self.assertLogs(warmup.logger, level="ERROR"):
+            warmup._warm_up_once_runtime_exists()  # pylint: disable=protected-access
+
+    @patch("ui.warmup.RUNTIME_WAIT_TIMEOUT_SECONDS", 0)
+    @patch("ui.warmup.runtime.exists", return_value=False)
+    def test_warm_up_is_skipped_when_the_runtime_does_not_start(self, _):
+        mock_warm_up = MagicMock()
+        with patch("ui.warmup.warm_up", mock_warm_up), self.assertLogs(warmup.logger, level="WARNING"):
+            warmup._warm_up_once_runtime_exists()  # pylint: disable=protected-access
+
+        mock_warm_up.assert_not_called()
+
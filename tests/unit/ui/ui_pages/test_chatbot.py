@@ -26,6 +26,17 @@ class TestChatbot(BaseTestCases.BaseUIPageTest):
         self.assertIn("There is 1 rental in progress today.", rendered)
         self.assertEqual(2, len(at.session_state["chat_messages"]))
 
+    def test_chatbot_error_is_displayed_without_recording_an_answer(self):
+        """An error streamed back in place of an answer should be shown, with no answer added to the conversation."""
+        mock_requests = MockRequests(mock_chat_error="All models are rate limited")
+        at = self._run_app_test_with_mock_requests(mock_requests=mock_requests)
+
+        at.chat_input[0].set_value("How many rentals are in progress?")
+        at = self._run_app_test_with_mock_requests(mock_requests=mock_requests, at=at, allow_errors=True)
+
+        self.assertIn("**Chatbot Error**: All models are rate limited", [error.value for error in at.error])
+        self.assertEqual(["user"], [message["role"] for message in at.session_state["chat_messages"]])
+
     def test_asking_a_question_displays_the_model_used(self):
         """The model that answered should be shown under the response, and persist across reruns."""
         mock_requests = MockRequests(mock_chat_response="answer", mock_chat_model="gemini-2.5-flash-lite")
@@ -46,14 +46,18 @@ class TestInventoryDashboard(BaseTestCases.BaseUIPageTest):
             # the only plotly_chart calls are the Scooter inventory chart and the legend (in that order)
             self.assertEqual(2, mock_plotly_chart.call_count)
             chart_fig = mock_plotly_chart.call_args_list[0].args[0]
-            # 1 column-header trace per location's column (each location wraps every
-            # _DASHBOARD_CHART_MAX_ROWS of its own devices) + 2 traces (rectangle + label) per device
+            # 1 column-header label per location's column (each location wraps every
+            # _DASHBOARD_CHART_MAX_ROWS of its own devices), all in one trace, then 1 cell trace per
+            # device status, 1 trace carrying every device's hover text and 1 trace labelling every device
             locations = {device["location"] for device in data}
             num_columns = sum(
                 math.ceil(sum(1 for device in data if device["location"] == location) / _DASHBOARD_CHART_MAX_ROWS)
                 for location in locations
             )
-            self.assertEqual(num_columns + 2 * len(data), len(chart_fig.data))
+            num_statuses = len({device["status"] for device in data})
+            self.assertEqual(num_columns, len(chart_fig.data[0].text))
+            self.assertEqual(1 + num_statuses + 2, len(chart_fig.data))
+            self.assertEqual(len(data), len(chart_fig.data[-1].text))
 
         self.assertTrue(any("No Wheelchairs" in caption.value for caption in at.caption))
 
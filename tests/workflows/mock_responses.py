@@ -7,6 +7,7 @@ from common.cne_dates import CNEDates
 _CNE_YEAR = CNEDates.get_cne_year()
 _DEFAULT_DATE = str(CNEDates.get_default_date())
 _RESERVATION_FORM_DEFAULT_DATE = str(CNEDates.get_default_new_reservation_date())
+_MOCK_S3_URL = "https://test-bucket.s3.amazonaws.com"
 
 
 class MockAPIResponses:
@@ -25,7 +26,12 @@ class MockAPIResponses:
         self.reservation_count = reservation_count
 
     def get(self, url, *args, **kwargs):
-        if "download_rental_form" in url:
+        if "rental_form_download_url" in url:
+            return Mock(
+                status_code=200,
+                json=Mock(return_value={"url": f"{_MOCK_S3_URL}/rental_form.pdf", "expires_in": 300}),
+            )
+        if url.startswith(_MOCK_S3_URL):
             return Mock(status_code=200, content=b"mock_pdf_content")
         if "get_full_inventory" in url:
             return Mock(status_code=200, json=Mock(return_value=self.inventory))
@@ -59,11 +59,13 @@ class ViewRentalsWorkflowTests(WorkflowTestCase):
                 self.assertEqual(1, len(at.dataframe), "Exactly one device type table should be shown")
 
     def test_pdf_export_called_when_late_returns_exist(self):
-        """When there are unreturned rentals for the date, the late returns PDF export can be triggered."""
+        """When there are unreturned rentals for the date, the late returns PDF export can be triggered,
+        but it is only rendered once the download button is clicked - not on every page load."""
         responses = MockAPIResponses(rentals=MOCK_SCOOTER_RENTALS)
-        with patch.object(rental_utils, "export_late_returns_to_pdf", return_value=b"mock_pdf"):
+        with patch.object(rental_utils, "export_late_returns_to_pdf", return_value=b"mock_pdf") as mock_export:
             at = self._run(responses)
         self.assertEqual(0, len(at.error), "Page should load without errors when late returns exist")
+        mock_export.assert_not_called()
 
     def test_no_late_returns_pdf_export_not_needed(self):
         """When all of the day's rentals have been returned, the page still loads without errors."""
@@ -14,7 +14,7 @@ from ui.auth.cognito.cookie_manager import CognitoAuthCookieManager, CognitoAuth
 from ui.auth.cognito.credentials import Credentials
 from ui.auth.cognito.exceptions import TokenVerificationException
 from ui.auth.cognito.session_state_manager import CognitoAuthSessionStateManager
-from ui.auth.cognito.utils import verify_access_token
+from ui.auth.cognito.utils import user_groups_cache, verify_access_token, verify_id_token
 
 logger = initialize_logger()
 
@@ -57,7 +57,8 @@ class CognitoAuthenticatorBase(ABC):
 
     def _get_user_groups(self, username: str) -> list[str]:
         """
-        Retrieves the groups that a user belongs to.
+        Retrieves the groups that a user belongs to, from the cache shared by every session when they were looked up
+        within the last few minutes (see ui.auth.cognito.utils.USER_GROUPS_TTL_SECONDS).
 
         Args:
             username (str): The username of the user.
@@ -65,12 +66,16 @@ class CognitoAuthenticatorBase(ABC):
         Returns:
             list[str]: A list of group names the user belongs to.
         """
+        groups = user_groups_cache.get(self.pool_id, username)
+        if groups is not None:
+            return groups
         try:
             response = self.client.admin_list_groups_for_user(
                 UserPoolId=self.pool_id,
                 Username=username
             )
             groups = [group["GroupName"] for group in response.get("Groups", [])]
+            user_groups_cache.put(self.pool_id, username, groups)
             return groups
         except self.client.exceptions.UserNotFoundException:
             logger.error("User not found: %s", username)
@@ -110,37 +115,33 @@ class CognitoAuthenticatorBase(ABC):
         return logged_in
 
     def _set_state_login(self, credentials: Credentials, persist: bool = True) -> bool:
+        # the tokens are verified locally (see ui.auth.cognito.utils), so restoring a session doesn't call Cognito
         try:
-            claims, user = verify_access_token(
+            claims = verify_access_token(
                 self.pool_id,
                 self.app_client_id,
                 self.pool_region,
                 credentials.access_token
             )
+            id_claims = verify_id_token(self.pool_id, self.app_client_id, self.pool_region, credentials.id_token)
         except TokenVerificationException as exc:
             logger.exception(exc)
             claims = None
         if claims:
             self.session_manager.set_credentials(credentials=credentials)
-            try:
-                email = user.email
-            except AttributeError:
-                email = None
-            groups = self._get_user_groups(username=claims["username"])
+            email = id_claims.get("email")
+            # Cognito leaves the cognito:groups claim out of the token altogether for a user in no groups, so only
+            # then ask the pool (in case they were added to one since the token was issued)
+            groups = claims.get("cognito:groups") or self._get_user_groups(username=claims["username"])
             self.session_manager.set_logged_in(username=claims["username"], email=email, groups=groups)
             if persist:
                 # Only write cookies on a fresh login/reset. When restoring an existing
                 # session the cookies already exist, and re-writing them would render the
                 # cookie component (and its empty spacing) on every page.
+                # The browser writes the cookies asynchronously, so the caller's st.rerun() right after this
+                # returns would drop the write -- the cookies stay pending until the browser acknowledges them
+                # instead (see _login_from_saved_credentials), rather than waiting here for the write to land.
                 self.cookie_manager.set_credentials(credentials=credentials)
-                # The cookie component sets document.cookie asynchronously in the browser
-                # (via an iframe postMessage round-trip). The caller calls st.rerun() right
-                # after this returns, which tears down that component before the round-trip
-                # completes -- confirmed by manual reproduction, the write is silently
-                # dropped and the "session" never actually reaches the browser, so refreshing
-                # immediately after logging in logs the user right back out. Give the
-                # round-trip time to land before anything reruns the script.
-                time.sleep(0.5)
             logger.info("Successfully logged in")
             return True
         logger.info("Could not log in")
@@ -164,6 +165,9 @@ class CognitoAuthenticatorBase(ABC):
             logger.info("Logging in from cookies")
             logged_in = self._login_from_cookies()
             logger.info("Logged in with cookies credentials: %s", logged_in)
+        if logged_in:
+            # keep rendering the cookie writes of a fresh login until the browser acknowledges them
+            self.cookie_manager.write_pending_credentials()
         logger.info("_login_from_saved_credentials finished")
         return logged_in
 
@@ -183,6 +187,9 @@ class CognitoAuthenticatorBase(ABC):
     def logout(self):
         """Logs out the currently logged user."""
         logger.info("Logout")
+        username = self.get_username()
+        if username:
+            user_groups_cache.invalidate(self.pool_id, username)
         self._set_state_logout()
         self.cookie_manager.reset_credentials()
 
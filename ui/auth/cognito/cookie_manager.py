@@ -10,6 +10,9 @@ from ui.auth.cognito.credentials import Credentials
 
 logger = initialize_logger()
 
+# the credential cookies that were set but that the browser hasn't acknowledged writing yet
+PENDING_COOKIES_KEY = "auth_pending_cookies"
+
 
 class CognitoAuthCookieManagerBase(ABC):
     """Base class for cognito authenticator cookie managers."""
@@ -26,6 +29,10 @@ class CognitoAuthCookieManagerBase(ABC):
     def reset_credentials(self) -> None:
         """Clears cookie credentials."""
 
+    @abstractmethod
+    def write_pending_credentials(self) -> bool:
+        """Finishes saving credentials to cookies. Returns True once they are saved."""
+
 
 class CognitoAuthCookieManagerNoop(CognitoAuthCookieManagerBase):
     """Dummy cognito authenticator cookie manager to be used when the authenticator does not
@@ -40,6 +47,9 @@ class CognitoAuthCookieManagerNoop(CognitoAuthCookieManagerBase):
     def reset_credentials(self) -> None:
         pass
 
+    def write_pending_credentials(self) -> bool:
+        return True
+
 
 class CognitoAuthCookieManager(CognitoAuthCookieManagerBase):
     """Cognito authenticator cookie manager that saves credentials to browser cookies."""
@@ -59,11 +69,32 @@ class CognitoAuthCookieManager(CognitoAuthCookieManagerBase):
         return self._cookie_manager
 
     def set_credentials(self, credentials: Credentials) -> None:
-        self.cookie_manager.set("id_token", credentials.id_token, key="set_id_token")
-        self.cookie_manager.set("access_token", credentials.access_token, key="set_access_token")
-        self.cookie_manager.set("refresh_token", credentials.refresh_token, key="set_refresh_token")
-        self.cookie_manager.set("expires_in", credentials.expires_in, key="set_expires_in")
-        self.cookie_manager.set("token_type", credentials.token_type, key="set_token_type")
+        # The cookie component sets document.cookie asynchronously in the browser (via an iframe postMessage
+        # round-trip), and rerunning the script before that lands tears the component down and silently drops the
+        # write. So the cookies stay pending, and their components are rendered again on every run (see
+        # write_pending_credentials) until the browser acknowledges the writes.
+        st.session_state[PENDING_COOKIES_KEY] = {
+            "id_token": credentials.id_token,
+            "access_token": credentials.access_token,
+            "refresh_token": credentials.refresh_token,
+            "expires_in": credentials.expires_in,
+            "token_type": credentials.token_type,
+        }
+        self.write_pending_credentials()
+
+    def write_pending_credentials(self) -> bool:
+        pending = st.session_state.get(PENDING_COOKIES_KEY)
+        if not pending:
+            return True
+        for name, value in pending.items():
+            self.cookie_manager.set(name, value, key=f"set_{name}")
+        # each cookie component's value turns True once the browser has written its cookie, which also reruns the
+        # script, so the acknowledgement is picked up on that rerun
+        if all(st.session_state.get(f"set_{name}") is True for name in pending):
+            del st.session_state[PENDING_COOKIES_KEY]
+            logger.info("Browser acknowledged the credential cookies")
+            return True
+        return False
 
     def load_credentials(self) -> Optional[Credentials]:
         # Read from the request cookies, which are available synchronously on the very
@@ -88,6 +119,7 @@ class CognitoAuthCookieManager(CognitoAuthCookieManagerBase):
                 logger.warning("Requested to delete non existing cookie: %s", name)
 
         logger.info("reset_credentials start")
+        st.session_state.pop(PENDING_COOKIES_KEY, None)
         delete_cookie("id_token")
         delete_cookie("access_token")
         delete_cookie("refresh_token")
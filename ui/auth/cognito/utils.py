@@ -1,19 +1,186 @@
-from typing import Dict, Any, Tuple
+"""Local verification of Cognito user pool tokens, and the cache of users' group memberships.
 
-import pycognito  # type: ignore
-from pycognito import Cognito
+Tokens are verified against the user pool's signing keys (its JWKS), which are fetched once per process and only
+fetched again when a token is signed with a key that isn't among them (i.e. after the pool rotated its keys).
+Verified tokens are remembered until they expire, and group memberships for a few minutes, so restoring a session on
+a rerun or browser refresh doesn't need any calls to Cognito.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import jwt
+import requests
+
+from common.logger import initialize_logger
 from ui.auth.cognito.exceptions import TokenVerificationException
 
+logger = initialize_logger()
+
+# how often the signing keys may be fetched again for a token signed with an unknown key (so tokens with made-up key
+# IDs can't make every verification fetch them), and how long they are kept at most before being fetched again
+JWKS_REFETCH_INTERVAL_SECONDS = 60
+JWKS_MAX_AGE_SECONDS = 24 * 60 * 60
+# how many verified tokens are remembered
+VERIFIED_TOKEN_CACHE_SIZE = 1024
+JWKS_TIMEOUT = 15
+# how long a user's groups are cached for, i.e. how long it may take for a change to their groups to take effect
+USER_GROUPS_TTL_SECONDS = 5 * 60
+
+
+class CognitoTokenVerifier:
+    """Thread-safe verifier of a user pool's ID and access tokens, with the pool's signing keys and the tokens it
+    verified cached
+
+    Args:
+        pool_id: Cognito pool ID.
+        app_client_id: Cognito Application client ID, which the tokens must have been issued to.
+        region: the AWS region of the pool.
+        fetch_jwks: optional function to fetch the pool's JWKS with (by default, from the pool's well-known URL).
+        clock: optional function giving the current time, in seconds since the epoch.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+            self,
+            pool_id: str,
+            app_client_id: str,
+            region: str,
+            fetch_jwks: Optional[Callable[[str], Dict[str, Any]]] = None,
+            clock: Callable[[], float] = time.time,
+    ):
+        self.app_client_id = app_client_id
+        self.issuer = f"https://cognito-idp.{region}.amazonaws.com/{pool_id}"
+        self._fetch_jwks = fetch_jwks or self._fetch_jwks_from_pool
+        self._clock = clock
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._keys_fetched_at: Optional[float] = None
+        self._verified: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fetch_jwks_from_pool(issuer: str) -> Dict[str, Any]:
+        response = requests.get(f"{issuer}/.well-known/jwks.json", timeout=JWKS_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+    def _get_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        """Get the signing key with the key ID, fetching the pool's keys if they're missing, stale, or don't include
+        it (as long as they weren't just fetched)"""
+        with self._lock:
+            now = self._clock()
+            age = None if self._keys_fetched_at is None else now - self._keys_fetched_at
+            if age is None or age > JWKS_MAX_AGE_SECONDS or (
+                    kid not in self._keys and age > JWKS_REFETCH_INTERVAL_SECONDS
+            ):
+                try:
+                    jwks = self._fetch_jwks(self.issuer)
+                except (requests.RequestException, ValueError) as exc:
+                    raise TokenVerificationException(f"Unable to fetch the signing keys: {exc}") from exc
+                self._keys = {key["kid"]: jwt.PyJWK(key) for key in jwks.get("keys", []) if "kid" in key}
+                self._keys_fetched_at = now
+                logger.info("Fetched %s signing keys from %s", len(self._keys), self.issuer)
+            if kid not in self._keys:
+                raise TokenVerificationException(f"Unknown signing key: {kid}")
+            return self._keys[kid]
+
+    def verify(self, token: str, token_use: str) -> Dict[str, Any]:
+        """Verify a token's signature, expiry, issuer, use ("id" or "access") and client, returning its claims"""
+        if not token:
+            raise TokenVerificationException(f"Empty {token_use} token")
+        with self._lock:
+            claims = self._verified.get((token_use, token))
+            if claims is not None and claims["exp"] > self._clock():
+                self._verified.move_to_end((token_use, token))
+                return claims
+
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+            claims = jwt.decode(
+                token,
+                self._get_key(kid).key,
+                algorithms=["RS256"],
+                # only ID tokens have an audience - access tokens name their client in the client_id claim instead
+                audience=self.app_client_id if token_use == "id" else None,
+                issuer=self.issuer,
+                # the expiry is checked below, against the same clock as the remembered tokens
+                options={"require": ["exp", "iss", "token_use"], "verify_exp": False, "verify_iat": False},
+            )
+        except jwt.PyJWTError as exc:
+            raise TokenVerificationException(f"Invalid {token_use} token: {exc}") from exc
+        if claims["exp"] <= self._clock():
+            raise TokenVerificationException(f"The {token_use} token has expired")
+        if claims["token_use"] != token_use:
+            raise TokenVerificationException(f"Expected an {token_use} token, got an {claims['token_use']} token")
+        if token_use == "access" and claims.get("client_id") != self.app_client_id:
+            raise TokenVerificationException("The access token was issued to a different client")
+
+        with self._lock:
+            now = self._clock()
+            self._verified[(token_use, token)] = claims
+            # drop the tokens that expired, then the least recently used ones beyond the cache size
+            for key in [key for key, cached in self._verified.items() if cached["exp"] <= now]:
+                del self._verified[key]
+            while len(self._verified) > VERIFIED_TOKEN_CACHE_SIZE:
+                self._verified.popitem(last=False)
+        return claims
+
+
+_verifiers: Dict[Tuple[str, str, str], CognitoTokenVerifier] = {}
+_verifiers_lock = threading.Lock()
+
+
+def get_token_verifier(pool_id: str, app_client_id: str, region: str) -> CognitoTokenVerifier:
+    """Get the process-wide verifier for the user pool and client, shared by every session"""
+    with _verifiers_lock:
+        key = (pool_id, app_client_id, region)
+        if key not in _verifiers:
+            _verifiers[key] = CognitoTokenVerifier(pool_id=pool_id, app_client_id=app_client_id, region=region)
+        return _verifiers[key]
+
+
+def verify_access_token(pool_id, app_client_id, region, token) -> Dict[str, Any]:
+    """Verify an access token, returning its claims (including the user's groups, in cognito:groups)"""
+    return get_token_verifier(pool_id, app_client_id, region).verify(token, "access")
+
+
+def verify_id_token(pool_id, app_client_id, region, token) -> Dict[str, Any]:
+    """Verify an ID token, returning its claims (including the user's email)"""
+    return get_token_verifier(pool_id, app_client_id, region).verify(token, "id")
+
+
+class UserGroupsCache:
+    """Thread-safe cache of each user's groups, shared by all of their sessions, with every entry expiring after the
+    TTL"""
+
+    def __init__(self, ttl_seconds: float = USER_GROUPS_TTL_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._groups: Dict[Tuple[str, str], Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, pool_id: str, username: str) -> Optional[List[str]]:
+        """Get the user's cached groups, or None if they aren't cached (or expired)"""
+        with self._lock:
+            cached = self._groups.get((pool_id, username))
+            if cached is None:
+                return None
+            expires_at, groups = cached
+            if expires_at <= self._clock():
+                del self._groups[(pool_id, username)]
+                return None
+            return list(groups)
+
+    def put(self, pool_id: str, username: str, groups: List[str]) -> None:
+        """Cache the user's groups for the TTL"""
+        with self._lock:
+            self._groups[(pool_id, username)] = (self._clock() + self.ttl_seconds, list(groups))
+
+    def invalidate(self, pool_id: str, username: str) -> None:
+        """Drop the user's cached groups, e.g. when they log out, so they are looked up again on their next login"""
+        with self._lock:
+            self._groups.pop((pool_id, username), None)
 
-def verify_access_token(pool_id, app_client_id, region, token) -> Tuple[Dict[str, Any], pycognito.UserObj]:
-    if not token:
-        raise TokenVerificationException("Empty access token")
 
-    u = Cognito(pool_id, app_client_id, user_pool_region=region)
-    try:
-        claims = u.verify_token(token, "access_token", "access")
-        user = u.get_user()
-        return claims, user
-    except pycognito.exceptions.TokenVerificationException as exc:
-        raise TokenVerificationException(exc) from exc
+user_groups_cache = UserGroupsCache()
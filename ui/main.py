@@ -1,7 +1,9 @@
 import streamlit as st
 
+from common.tracing import configure_tracing, start_span
 from ui.src.auth_utils import get_authenticator
 
+configure_tracing(service_name="cne-ui")
 authenticator = get_authenticator()
 
 # On a browser refresh Streamlit starts a fresh session with empty session state, so the
@@ -110,4 +112,6 @@ elif _PAGE_QUERY_KEY in st.query_params:
     # at Home rather than restoring the previous session's page.
     del st.query_params[_PAGE_QUERY_KEY]
 
-navigator.run()
+# Streamlit stops and reruns scripts by raising exceptions, which aren't failures of the page
+with start_span("streamlit rerun", attributes={"page": navigator.url_path}, record_exception=False):
+    navigator.run()
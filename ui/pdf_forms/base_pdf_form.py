@@ -1,6 +1,7 @@
 import pymupdf
 
 from common.data_models.rental import NewRental
+from common.tracing import traced
 
 
 # pylint: disable=too-few-public-methods
@@ -16,6 +17,7 @@ class BasePDFForm:
         """Create a dictionary of form fields to fill in the PDF"""
         raise NotImplementedError("Subclasses must implement this method")
 
+    @traced()
     def export_form_to_bytes(self) -> bytes:
         """Create a PDF form with the rental data, return the data as bytes"""
         field_values = self._create_form_field_values()
@@ -1,15 +1,35 @@
 import os
-from typing import Optional, Union
+from typing import Optional, Type
 
 import streamlit as st
 from streamlit.errors import StreamlitAPIException
 
-from ui.auth.cognito_authenticator import CognitoAuthenticator
-from ui.auth.local_authenticator import LocalAuthenticator
+from ui.auth.base_authenticator import BaseAuthenticator
 from version import APP_VERSION
 
 
-def get_authenticator() -> Union[LocalAuthenticator, CognitoAuthenticator]:
+def get_authenticator_class() -> Type[BaseAuthenticator]:
+    """
+    Get the authenticator class for the authentication method in the `AUTH_METHOD` environment variable
+    ("local" or "cognito"), importing only that authenticator's module so a deployment doesn't pay for importing the
+    other one's dependencies.
+
+    Raises:
+        ValueError: If the `AUTH_METHOD` environment variable contains an invalid value.
+    """
+    # pylint: disable=import-outside-toplevel
+    match os.getenv("AUTH_METHOD", default="local"):
+        case "local":
+            from ui.auth.local_authenticator import LocalAuthenticator
+            return LocalAuthenticator
+        case "cognito":
+            from ui.auth.cognito_authenticator import CognitoAuthenticator
+            return CognitoAuthenticator
+        case _:
+            raise ValueError("Invalid authentication method. Supported methods: local, cognito")
+
+
+def get_authenticator() -> BaseAuthenticator:
     """
     Retrieve the appropriate authenticator based on the authentication method.
 
@@ -24,13 +44,7 @@ def get_authenticator() -> Union[LocalAuthenticator, CognitoAuthenticator]:
     Raises:
         ValueError: If the `AUTH_METHOD` environment variable contains an invalid value.
     """
-    match os.getenv("AUTH_METHOD", default="local"):
-        case "local":
-            return LocalAuthenticator()
-        case "cognito":
-            return CognitoAuthenticator()
-        case _:
-            raise ValueError("Invalid authentication method. Supported methods: local, cognito")
+    return get_authenticator_class()()
 
 
 def initialize_page(page_header: Optional[str] = None, render_login: bool = False):
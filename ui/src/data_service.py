@@ -1,27 +1,32 @@
 import datetime
 import os
 from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
 
 import pandas as pd
 import requests
 import streamlit as st
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from requests import JSONDecodeError
 
 from common.constants import DeviceStatus, DeviceType, Location, ReservationStatus
 from common.data_models import (
     ChangeDeviceInfo,
     ChatResponse,
+    ChatStreamEvent,
+    ChatStreamEventType,
     CompletedRental,
     Device,
     NewDevice,
     NewRental,
     NewReservation,
+    RentalFormURL,
     RentalSummary,
     Reservation,
 )
 from common.logger import initialize_logger, timeit
+from common.tracing import inject_trace_headers, start_span
 from common.cne_dates import CNEDates
 
 logger = initialize_logger()
@@ -49,6 +54,15 @@ DEFAULT_TIMEOUT = 5
 CHAT_TIMEOUT = 60
 
 
+def _describe_s3_error(response: requests.Response) -> str:
+    """Describe a failed S3 request from the XML error S3 responds with (e.g. 'Request has expired (AccessDenied)')"""
+    try:
+        error = ElementTree.fromstring(response.text)
+    except ElementTree.ParseError:
+        return response.text or response.reason
+    return f"{error.findtext('Message', default=response.reason)} ({error.findtext('Code', default='S3 error')})"
+
+
 def auto_process_api_errors(func):
     """Automatically process API errors and raise appropriate exceptions."""
 
@@ -103,12 +117,14 @@ class DataService:
     ):
         if isinstance(json, BaseModel):
             json = json.model_dump(mode="json")
-        response = request_method(
-            url=f"http://{self.api_host}:{self.api_port}/{url_path}",
-            params=params,
-            json=json,
-            timeout=timeout,
-        )
+        with start_span(url_path, attributes={"url.path": url_path}, kind="client"):
+            response = request_method(
+                url=f"http://{self.api_host}:{self.api_port}/{url_path}",
+                params=params,
+                json=json,
+                headers=inject_trace_headers(),
+                timeout=timeout,
+            )
         if response.status_code == 200:
             return response
         if response.status_code == 404:
@@ -443,28 +459,61 @@ class DataService:
     # RENTAL FORMS
     # ==============================
 
+    def _get_rental_form_url(
+            self, url_path: str, rental_id: str, missing_ok: bool = False
+    ) -> Tuple[int, Optional[RentalFormURL]]:
+        """Get a presigned S3 URL for a rental form from the API (None if the rental form was not found and that is
+        ok), raise APIError with the API's reason if the API could not issue one"""
+        response = requests.get(
+            f"http://{self.api_host}:{self.api_port}/{url_path}",
+            params={"rental_id": rental_id},
+            headers=inject_trace_headers(),
+            timeout=DEFAULT_TIMEOUT,
+        )
+        if response.status_code == 404 and missing_ok:
+            return response.status_code, None
+        if response.status_code != 200:
+            try:
+                detail = response.json().get("detail", response.text)
+            except JSONDecodeError:
+                detail = response.text
+            raise APIError(message=f"Unable to get a URL for the rental form of rental `{rental_id}`: {detail}")
+        return response.status_code, RentalFormURL(**response.json())
+
+    @timeit(logger=logger)
     @auto_process_api_errors
-    def upload_rental_form(self, pdf_bytes: bytes, rental_id: str):
-        """Upload a rental form to S3 using the API."""
+    def upload_rental_form(self, pdf_bytes: bytes, rental_id: str) -> Tuple[int, Optional[str]]:
+        """Upload a rental form directly to S3 using a presigned URL issued by the API (with the reason S3 gave if the
+        upload failed)"""
+        _, presigned_url = self._get_rental_form_url(url_path="forms/rental_form_upload_url", rental_id=rental_id)
         response = requests.put(
-            f"http://{self.api_host}:{self.api_port}/forms/upload_rental_form",
-            params={"rental_id": rental_id},
-            files={"pdf_bytes": (f"{rental_id}.pdf", pdf_bytes, "application/pdf")},
+            presigned_url.url,
+            data=pdf_bytes,
+            headers={"Content-Type": "application/pdf"},
             timeout=DEFAULT_TIMEOUT,
         )
         self.download_rental_form.clear()
-        return response.status_code, response.json()
+        if response.status_code != 200:
+            return response.status_code, _describe_s3_error(response)
+        return response.status_code, None
 
     @st.cache_data(ttl=DEFAULT_CACHE_TTL, show_spinner=False)
     @timeit(logger=logger)
     @auto_process_api_errors
     def download_rental_form(_self, rental_id: str) -> Tuple[int, Optional[bytes]]:
-        """Download a rental form from S3 using the API"""
-        response = requests.get(
-            f"http://{_self.api_host}:{_self.api_port}/forms/download_rental_form",
-            params={"rental_id": rental_id},
-            timeout=DEFAULT_TIMEOUT,
+        """Download a rental form directly from S3 using a presigned URL issued by the API (None if S3 refused it, e.g.
+        the URL expired, rather than S3's error body)."""
+        status_code, presigned_url = _self._get_rental_form_url(
+            url_path="forms/rental_form_download_url", rental_id=rental_id, missing_ok=True
         )
+        if presigned_url is None:
+            return status_code, None
+        response = requests.get(presigned_url.url, timeout=DEFAULT_TIMEOUT)
+        if response.status_code != 200:
+            logger.warning(
+                "Unable to download the rental form of rental %s from S3: %s", rental_id, _describe_s3_error(response)
+            )
+            return response.status_code, None
         return response.status_code, response.content
 
     # ==============================
@@ -510,8 +559,9 @@ class DataService:
     # ==============================
 
     @auto_process_api_errors
-    def chat(self, message: str, history: List[Dict[str, str]]) -> ChatResponse:
-        """Ask the chatbot a question using the API.
+    def chat(self, message: str, history: List[Dict[str, str]], user: Optional[str] = None) -> ChatResponse:
+        """Ask the chatbot a question using the API, on behalf of the user (whose questions are queued fairly with
+        everyone else's when the chatbot is busy).
 
         Note: a longer timeout than the default is used since LLM responses are slower, and the response is
         not cached since every message is unique.
@@ -519,7 +569,50 @@ class DataService:
         response = self._make_request(
             request_method=requests.post,
             url_path="chat/ask",
-            json={"message": message, "history": history},
+            json={"message": message, "history": history, "user": user},
             timeout=CHAT_TIMEOUT,
         )
         return ChatResponse(**response.json())
+
+    @auto_process_api_errors
+    def chat_stream(
+            self, message: str, history: List[Dict[str, str]], user: Optional[str] = None
+    ) -> Iterator[ChatStreamEvent]:
+        """Ask the chatbot a question using the API on behalf of the user, returning the chatbot's events as they
+        are streamed back: the answer's text as it is generated, the tools the chatbot calls, and finally the
+        complete response.
+
+        Note: CHAT_TIMEOUT applies to each read of the stream rather than the whole answer.
+        """
+        response = requests.post(
+            url=f"http://{self.api_host}:{self.api_port}/chat/ask_stream",
+            json={"message": message, "history": history, "user": user},
+            headers=inject_trace_headers(),
+            stream=True,
+            timeout=CHAT_TIMEOUT,
+        )
+        if response.status_code != 200:
+            raise APIError(message="Unable to get an answer from the chatbot.", details=response.text)
+        return self._read_chat_stream(response)
+
+    @staticmethod
+    def _read_chat_stream(response: requests.Response) -> Iterator[ChatStreamEvent]:
+        """Read the chatbot's events from a streamed response. The page reads them after chat_stream has returned
+        (outside auto_process_api_errors), so a connection lost or an unreadable event partway through ends the
+        stream with an error event instead of raising."""
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("data:"):
+                    yield ChatStreamEvent.model_validate_json(line.removeprefix("data:"))
+        except requests.RequestException as exc:
+            logger.warning("Chatbot stream interrupted: %s", exc)
+            yield ChatStreamEvent(
+                type=ChatStreamEventType.ERROR, text="The connection to the chatbot was lost. Please try again."
+            )
+        except ValidationError as exc:
+            logger.warning("Unreadable chatbot stream event: %s", exc)
+            yield ChatStreamEvent(
+                type=ChatStreamEventType.ERROR, text="The chatbot sent a response that could not be read."
+            )
+        finally:
+            response.close()
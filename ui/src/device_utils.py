@@ -1,8 +1,9 @@
 import itertools
 import math
-from functools import wraps
+from functools import cache, wraps
 from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 from plotly import graph_objects as go
@@ -11,8 +12,11 @@ from common.constants import DeviceType, DeviceStatus, Location
 from common.data_models import NewDevice
 from common.cne_dates import CNEDates
 from ui.src.data_service import DataService
+from ui.src.figure_cache import FigureCache
 
 _TRANSPARENT_BACKGROUND = "rgba(0, 0, 0, 0)"
+# the Inventory Dashboard redraws its charts every 30s, so each device type's chart is reused until a device changes
+_dashboard_inventory_chart_cache = FigureCache("Dashboard inventory chart", max_entries=8)
 
 
 def get_manage_devices_str(action: str, device_type: DeviceType, num_devices: int) -> str:
@@ -135,35 +139,85 @@ def remove_devices(data_service: DataService, device_type: DeviceType, inventory
     return None
 
 
-def _add_device_status_cell(
-        fig: go.Figure, bbox: Tuple[float, float, float, float], device: pd.Series, font_size: int = 14
-):
-    """Add a coloured cell (status-filled rectangle + centered ID label) to a chart at the given
-    (x0, y0, x1, y1) bounding box. Shared by create_inventory_chart and create_dashboard_inventory_chart
-    so both charts render device cells identically, aside from the dashboard's larger font_size.
-    """
-    x0, y0, x1, y1 = bbox
-    colour = DeviceStatus.get_device_status_colour(device["status"])
+# device cells are drawn as filled rectangles, each 0.8 x 1.5 axis units
+_CELL_WIDTH = 0.8
+_CELL_HEIGHT = 1.5
+# each cell's hover text is carried by a grid of invisible markers spread over the cell, close enough together that
+# hovering anywhere on the cell (not just near its label) lands within Plotly's hover distance of one of them
+_HOVER_POINTS_ACROSS = 3
+_HOVER_POINTS_DOWN = 4
+
+
+def _add_device_hover_points(fig: go.Figure, devices: pd.DataFrame, x0: np.ndarray, y0: np.ndarray):
+    """Add each device's hover text to a chart, as a single trace of invisible markers spread over every device's
+    cell (see _add_device_status_cells for the cells' positions)"""
+    # the hover points sit at the centres of a _HOVER_POINTS_ACROSS x _HOVER_POINTS_DOWN grid over each cell
+    across = (np.arange(_HOVER_POINTS_ACROSS) + 0.5) / _HOVER_POINTS_ACROSS * _CELL_WIDTH
+    down = (np.arange(_HOVER_POINTS_DOWN) + 0.5) / _HOVER_POINTS_DOWN * _CELL_HEIGHT
+    offset_x, offset_y = (offsets.ravel() for offsets in np.meshgrid(across, down))
+    hover_text = (
+        "<b>" + devices["id"].astype(str) + "</b><br>Status: " + devices["status"].astype(str)
+        + "<br>Location: " + devices["location"].astype(str)
+    ).to_numpy()
     fig.add_trace(
         go.Scatter(
-            x=[x0, x0, x1, x1, x0],
-            y=[y0, y1, y1, y0, y0],
-            fill="toself",
-            fillcolor=colour,
-            line_color=colour,
-            mode="lines",
-            text=f"<b>{device['id']}</b><br>Status: {device['status']}<br>Location: {device['location']}",
+            x=(x0[:, np.newaxis] + offset_x).ravel(),
+            y=(y0[:, np.newaxis] - offset_y).ravel(),
+            mode="markers",
+            marker={"opacity": 0},
+            hovertext=np.repeat(hover_text, len(offset_x)).tolist(),
             hoverinfo="text",
             hoverlabel={"font_size": 14},
+            name="hover",
             showlegend=False,
         )
     )
+
+
+def _add_device_status_cells(
+        fig: go.Figure, devices: pd.DataFrame, x0: np.ndarray, y0: np.ndarray, font_size: int = 14
+):
+    """Add a coloured cell (status-filled rectangle + centered ID label) for every device to a chart, with each
+    device's cell spanning (x0, y0) to (x0 + _CELL_WIDTH, y0 - _CELL_HEIGHT). Shared by create_inventory_chart and
+    create_dashboard_inventory_chart so both charts render device cells identically, aside from the dashboard's
+    larger font_size.
+
+    The cells are drawn as one filled trace per device status (the rectangles separated by gaps), each device's
+    hover text as a single trace of invisible markers covering every cell, and the labels as a single text trace on
+    top, so the number of traces stays constant however many devices there are.
+    """
+    if devices.empty:
+        return
+    x1, y1 = x0 + _CELL_WIDTH, y0 - _CELL_HEIGHT
+    gaps = np.full(len(devices), np.nan)
+    # each rectangle is traced corner by corner back to its start, then broken off from the next by a gap
+    cell_x = np.column_stack([x0, x0, x1, x1, x0, gaps])
+    cell_y = np.column_stack([y0, y1, y1, y0, y0, gaps])
+    for status, positions in devices.groupby("status", sort=False).indices.items():
+        colour = DeviceStatus.get_device_status_colour(status)
+        fig.add_trace(
+            go.Scatter(
+                x=cell_x[positions].ravel(),
+                y=cell_y[positions].ravel(),
+                fill="toself",
+                fillcolor=colour,
+                line_color=colour,
+                mode="lines",
+                name=str(status),
+                hoverinfo="skip",
+                showlegend=False,
+            )
+        )
+
+    _add_device_hover_points(fig, devices, x0=x0, y0=y0)
+
+    ids = devices["id"].astype(str)
     fig.add_trace(
         go.Scatter(
-            x=[(x0 + x1) / 2.0],
-            y=[(y0 + y1) / 2.0],
+            x=(x0 + x1) / 2.0,
+            y=(y0 + y1) / 2.0,
             mode="text",
-            text=device["id"],
+            text=ids.tolist(),
             textfont={"color": "#EEEEEE", "size": font_size},
             textposition="middle center",
             showlegend=False,
@@ -189,14 +243,8 @@ def create_inventory_chart(inventory: pd.DataFrame):
     )
     fig.update_xaxes(range=[0, num_per_row], visible=False, showgrid=False, zeroline=False)
     fig.update_yaxes(range=[-2 * num_rows, 0], visible=False, showgrid=False, zeroline=False)
-    for i, (_, device) in enumerate(inventory.iterrows()):
-        bbox = (
-            i % num_per_row,
-            -2 * (i // num_per_row),
-            (i % num_per_row) + 0.8,
-            -2 * (i // num_per_row) - 1.5
-        )
-        _add_device_status_cell(fig, bbox, device)
+    row_index, col_index = np.divmod(np.arange(len(inventory)), num_per_row)
+    _add_device_status_cells(fig, inventory, x0=col_index.astype(float), y0=-2.0 * row_index)
     return fig
 
 
@@ -252,10 +300,9 @@ def _dashboard_chart_column_x_starts(location_column_counts: Dict[Location, int]
     return x_starts
 
 
-def _dashboard_chart_cell_bbox(x_start: float, row_index: int) -> Tuple[float, float, float, float]:
-    """Get the (x0, y0, x1, y1) bounding box for a dashboard chart cell at the given column/row."""
-    y0 = -2 * (row_index + 1)
-    return x_start, y0, x_start + 0.8, y0 - 1.5
+def _dashboard_chart_cell_y0(row_index: np.ndarray) -> np.ndarray:
+    """Get the top edge of the dashboard chart cells in the given rows (leaving the top row for the headers)."""
+    return -2.0 * (row_index + 1)
 
 
 def _add_dashboard_chart_column_headers(
@@ -264,21 +311,23 @@ def _add_dashboard_chart_column_headers(
         column_starts: Dict[Location, int],
         column_x_starts: List[float],
 ):
-    """Add the location label above each column of the dashboard chart."""
+    """Add the location label above each column of the dashboard chart, as a single text trace."""
+    header_x, header_text = [], []
     for location in _DASHBOARD_CHART_LOCATIONS:
         for block in range(location_column_counts[location]):
-            x_start = column_x_starts[column_starts[location] + block]
-            fig.add_trace(
-                go.Scatter(
-                    x=[x_start + 0.4],
-                    y=[-0.5],
-                    mode="text",
-                    text=f"<b>{location}</b>",
-                    textfont={"size": _DASHBOARD_CHART_FONT_SIZE},
-                    showlegend=False,
-                    hoverinfo="skip",
-                )
-            )
+            header_x.append(column_x_starts[column_starts[location] + block] + _CELL_WIDTH / 2.0)
+            header_text.append(f"<b>{location}</b>")
+    fig.add_trace(
+        go.Scatter(
+            x=header_x,
+            y=[-0.5] * len(header_x),
+            mode="text",
+            text=header_text,
+            textfont={"size": _DASHBOARD_CHART_FONT_SIZE},
+            showlegend=False,
+            hoverinfo="skip",
+        )
+    )
 
 
 def _add_dashboard_chart_location_dividers(
@@ -291,7 +340,7 @@ def _add_dashboard_chart_location_dividers(
     through the larger cross-location gap, so BLC and PG read as clearly separate blocks."""
     for previous_location, next_location in itertools.pairwise(_DASHBOARD_CHART_LOCATIONS):
         previous_last_col = column_starts[previous_location] + location_column_counts[previous_location] - 1
-        previous_end = column_x_starts[previous_last_col] + 0.8
+        previous_end = column_x_starts[previous_last_col] + _CELL_WIDTH
         next_start = column_x_starts[column_starts[next_location]]
         fig.add_vline(
             x=(previous_end + next_start) / 2.0,
@@ -345,16 +394,34 @@ def create_dashboard_inventory_chart(inventory: pd.DataFrame):
     _add_dashboard_chart_column_headers(fig, location_column_counts, column_starts, column_x_starts)
     _add_dashboard_chart_location_dividers(fig, location_column_counts, column_starts, column_x_starts)
 
+    # lay every location's devices out in ID order down its own columns, then draw all the cells at once
+    x_starts = np.asarray(column_x_starts)
+    location_inventories, cell_x0, cell_y0 = [], [], []
     for location in _DASHBOARD_CHART_LOCATIONS:
-        location_inventory = inventory[inventory["location"] == location].sort_values("id").reset_index(drop=True)
-        for i, (_, device) in enumerate(location_inventory.iterrows()):
-            block, row_index = divmod(i, _DASHBOARD_CHART_MAX_ROWS)
-            col_index = column_starts[location] + block
-            bbox = _dashboard_chart_cell_bbox(column_x_starts[col_index], row_index)
-            _add_device_status_cell(fig, bbox, device, font_size=_DASHBOARD_CHART_FONT_SIZE)
+        location_inventory = inventory[inventory["location"] == location].sort_values("id")
+        block, row_index = np.divmod(np.arange(len(location_inventory)), _DASHBOARD_CHART_MAX_ROWS)
+        location_inventories.append(location_inventory)
+        cell_x0.append(x_starts[column_starts[location] + block])
+        cell_y0.append(_dashboard_chart_cell_y0(row_index))
+    _add_device_status_cells(
+        fig,
+        pd.concat(location_inventories),
+        x0=np.concatenate(cell_x0),
+        y0=np.concatenate(cell_y0),
+        font_size=_DASHBOARD_CHART_FONT_SIZE,
+    )
     return fig
 
 
+def get_dashboard_inventory_chart(inventory: pd.DataFrame) -> go.Figure:
+    """Get the Inventory Dashboard chart for an inventory, reusing the previously built figure as long as no
+    device was added, removed, or changed status or location since."""
+    devices = tuple(sorted(inventory[["id", "status", "location"]].astype(str).itertuples(index=False, name=None)))
+    return _dashboard_inventory_chart_cache.get_or_build(
+        key=devices, build=lambda: create_dashboard_inventory_chart(inventory)
+    )
+
+
 # noinspection PyTypeChecker
 def create_dashboard_legend_chart():
     """Create a Plotly legend mapping each DeviceStatus to its colour, using the same coloured-cell
@@ -401,3 +468,9 @@ def create_dashboard_legend_chart():
             )
         )
     return fig
+
+
+@cache
+def get_dashboard_legend_chart() -> go.Figure:
+    """Get the Inventory Dashboard's legend chart, built once per process since it only depends on DeviceStatus."""
+    return create_dashboard_legend_chart()
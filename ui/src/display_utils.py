@@ -9,6 +9,7 @@ from common.constants import DeviceType, DeviceStatus, Location, ReservationStat
 from common.data_models import Device
 from common.utils import get_default_timezone
 from ui.src.constants import Colour, Page
+from ui.src.figure_cache import FigureCache
 
 TIME_FORMAT_STR = "hh:mm a"
 
@@ -18,33 +19,22 @@ def coerce_pandas_aware_datetime(data: pd.Series) -> pd.Series:
     return pd.to_datetime(data, errors="coerce", utc=True).dt.tz_convert(get_default_timezone())
 
 
+# the Home page and Inventory Dashboard redraw the same gauges on every rerun, so each is reused until its counts change
+_dual_indicator_chart_cache = FigureCache("Dual indicator chart", max_entries=32)
+
+
 # pylint: disable=too-many-arguments,too-many-positional-arguments
-def display_dual_indicator_chart(
+def create_dual_indicator_chart(
         left_title: str,
         right_title: str,
         left_value: Union[float, int],
         right_value: Union[float, int],
         left_total: Union[float, int],
         right_total: Union[float, int],
-        key: str,
         title_font_size: int = 14,
         height: int = 75,
-):
-    """
-    Display a dual indicator chart with left and right indicators.
-
-    Args:
-        left_title (str): The title of the left indicator
-        right_title (str): The title of the right indicator
-        left_value (Union[float, int]): The value of the left indicator
-        right_value (Union[float, int]): The value of the right indicator
-        left_total (Union[float, int]): The total value of the left indicator
-        right_total (Union[float, int]): The total value of the right indicator
-        key (str): The key for the Streamlit component
-        title_font_size (int): The font size for the left/right indicator titles
-        height (int): The height (in px) of the chart, e.g. to give a larger title_font_size
-            enough vertical room to avoid being clipped
-    """
+) -> go.Figure:
+    """Create a dual indicator chart with left and right indicators (see display_dual_indicator_chart)."""
     fig = go.Figure()
     if left_value < 0.3 * left_total:
         left_colour = Colour.INDICATOR_RED
@@ -85,6 +75,41 @@ def display_dual_indicator_chart(
         ),
     )
     fig.update_layout(height=height, margin={"t": 20, "b": 0, "l": 2, "r": 2}, grid={"rows": 1, "columns": 2})
+    return fig
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def display_dual_indicator_chart(
+        left_title: str,
+        right_title: str,
+        left_value: Union[float, int],
+        right_value: Union[float, int],
+        left_total: Union[float, int],
+        right_total: Union[float, int],
+        key: str,
+        title_font_size: int = 14,
+        height: int = 75,
+):
+    """
+    Display a dual indicator chart with left and right indicators.
+    The chart is reused from the figure cache while its values are unchanged.
+
+    Args:
+        left_title (str): The title of the left indicator
+        right_title (str): The title of the right indicator
+        left_value (Union[float, int]): The value of the left indicator
+        right_value (Union[float, int]): The value of the right indicator
+        left_total (Union[float, int]): The total value of the left indicator
+        right_total (Union[float, int]): The total value of the right indicator
+        key (str): The key for the Streamlit component
+        title_font_size (int): The font size for the left/right indicator titles
+        height (int): The height (in px) of the chart, e.g. to give a larger title_font_size
+            enough vertical room to avoid being clipped
+    """
+    chart_args = (left_title, right_title, left_value, right_value, left_total, right_total, title_font_size, height)
+    fig = _dual_indicator_chart_cache.get_or_build(
+        key=chart_args, build=lambda: create_dual_indicator_chart(*chart_args)
+    )
     st.plotly_chart(fig, key=key, config={'displayModeBar': False})
 
 
@@ -0,0 +1,67 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Callable
+
+from plotly import graph_objects as go
+
+from common.logger import initialize_logger
+
+logger = initialize_logger()
+
+
+class FigureCache:
+    """
+    A small, thread-safe LRU cache of Plotly figures, shared by every Streamlit session in the process.
+
+    Figures are looked up by a hashable key describing the data they were built from (e.g. the (id, status,
+    location) of every device), so a figure is only rebuilt once its data changes. The cached figures are shared
+    between sessions and must not be mutated (st.plotly_chart serializes a copy, so rendering them is safe).
+    """
+
+    def __init__(self, name: str, max_entries: int = 16):
+        self.name = name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._figures: "OrderedDict[Hashable, go.Figure]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the fraction of lookups served from the cache so far"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], go.Figure]) -> go.Figure:
+        """Get the figure cached under the key, building (and caching) it first if it isn't cached yet"""
+        with self._lock:
+            figure = self._figures.get(key)
+            if figure is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                logger.debug("%s cache hit (hit rate %.0f%%)", self.name, 100 * self.hit_rate)
+                return figure
+
+        start_time = time.perf_counter()
+        figure = build()
+        elapsed_time = time.perf_counter() - start_time
+
+        with self._lock:
+            self.misses += 1
+            self._figures[key] = figure
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+            logger.info(
+                "%s cache miss, built in %.4f seconds (hit rate %.0f%%)", self.name, elapsed_time, 100 * self.hit_rate
+            )
+        return figure
+
+    def clear(self):
+        """Remove every cached figure and reset the hit/miss counts"""
+        with self._lock:
+            self._figures.clear()
+            self.hits = 0
+            self.misses = 0
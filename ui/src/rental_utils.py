@@ -1,24 +1,26 @@
-import io
 from datetime import date, datetime
 from typing import List
 
 import pandas as pd
 import streamlit as st
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
 
 from common.constants import DeviceType, WALK_IN_RESERVATION_ID, RentalStatus
 from common.data_models import CompletedRental, NewRental, ChangeDeviceInfo
+from common.tracing import traced
 from common.utils import get_default_timezone
 from ui.forms import NewRentalForm
-from ui.pdf_forms.scooter_pdf_form import ScooterPDFForm
-from ui.pdf_forms.wheelchair_pdf_form import WheelchairPDFForm
 from common.cne_dates import CNEDates
-from ui.src.data_service import DataService
-from ui.src.reservation_utils import build_styled_table, load_fonts
-from ui.src.utils import clear_session_state_for_form, process_validation_errors
+from ui.src.data_service import APIError, DataService
+from ui.src.utils import (
+    PDF_EXPORT_CACHE_MAX_ENTRIES,
+    clear_session_state_for_form,
+    hash_report_data,
+    process_validation_errors,
+)
+
+# pylint: disable=import-outside-toplevel
+# ReportLab and PyMuPDF are only imported once a PDF is rendered, so the pages that import this module start without
+# them
 
 
 def on_dismiss_complete_rental_success_dialog():
@@ -69,6 +71,9 @@ def display_new_rental_success_dialog(rental_id: str, new_rental: NewRental, for
 
 def get_pdf_form_class(device_type: DeviceType):
     """Get the PDF form class based on the device type"""
+    from ui.pdf_forms.scooter_pdf_form import ScooterPDFForm
+    from ui.pdf_forms.wheelchair_pdf_form import WheelchairPDFForm
+
     if device_type == DeviceType.WHEELCHAIR:
         return WheelchairPDFForm
     if device_type == DeviceType.SCOOTER:
@@ -131,15 +136,19 @@ def submit_new_rental_form(new_rental: dict):
             rental_data=new_rental,
             rental_id=add_result,
         ).export_form_to_bytes()
-        status_code, upload_result = data_service.upload_rental_form(pdf_bytes=form_data, rental_id=add_result)
+        try:
+            status_code, upload_result = data_service.upload_rental_form(pdf_bytes=form_data, rental_id=add_result)
+        except APIError as exc:
+            status_code, upload_result = None, exc.message
 
         if status_code == 200:
             display_new_rental_success_dialog(rental_id=add_result, new_rental=new_rental, form_data=form_data)
         else:
+            # the rental itself was added, so only the form needs to be dealt with
             st.error(
                 f"""
-                **API Error**
-                * Error Code: {status_code}
+                **Rental Form Upload Error**: Rental `{add_result}` was added, but its form could not be uploaded.
+                * Error Code: {status_code or "N/A"}
                 * Error Message: {upload_result}
                 """
             )
@@ -191,35 +200,29 @@ def _append_device_late_returns_table(
         device_type: DeviceType,
         columns: List[str],
         column_headers: dict,
-        regular_font: str,
-        bold_font: str,
 ) -> None:
     """Append a heading and styled table of one device type's late returns to elements."""
-    elements.append(
-        Paragraph(
-            text=f"{device_type} Late Returns",
-            style=ParagraphStyle(name='CustomHeading2', parent=getSampleStyleSheet()['Heading2'],
-                                  fontName=bold_font)
-        )
-    )
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Spacer
+
+    from ui.src.report_utils import build_styled_table, build_table_data, get_report_context
+
+    elements.append(Paragraph(text=f"{device_type} Late Returns", style=get_report_context().heading2))
     elements.append(Spacer(1, 0.1 * inch))
 
     # the device ID column is labelled with the device type itself
     headers = [str(device_type) if col == "device_id" else column_headers[col] for col in columns]
-    table_data = [headers]
-    for _, row in device_late_returns.sort_values(by="rental_id").iterrows():
-        table_data.append(['' if pd.isna(item) else str(item) for item in row.tolist()])
+    table_data = build_table_data(headers=headers, data=device_late_returns.sort_values(by="rental_id"))
 
     table = build_styled_table(
         table_data,
         col_widths=[x * inch for x in (0.8, 1.75, 1.5, 0.75, 0.75, 0.75, 0.75, 1.25, 0.75)],
-        regular_font=regular_font,
-        bold_font=bold_font,
     )
     elements.append(table)
     elements.append(Spacer(1, 0.3 * inch))
 
 
+@traced()
 def export_late_returns_to_pdf(rentals_df: pd.DataFrame, rental_date: date) -> bytes:
     """
     Export a day's late (not yet returned) rentals to a PDF file, with a signature column
@@ -232,41 +235,29 @@ def export_late_returns_to_pdf(rentals_df: pd.DataFrame, rental_date: date) -> b
     Returns:
         PDF file as bytes that can be used for download
     """
-    regular_font, bold_font = load_fonts()
-
-    pdf_buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
-        pdf_buffer,
-        pagesize=landscape(letter),
-        topMargin=0.5 * inch,
-        bottomMargin=0.5 * inch,
-        leftMargin=0.5 * inch,
-        rightMargin=0.5 * inch,
-    )
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Spacer, Table
+
+    from ui.src.report_utils import build_pdf, get_report_context
+
+    report_context = get_report_context()
 
     elements = [
-        Paragraph(
-            text=f"Late Returns - {rental_date.strftime('%B %d, %Y')}",
-            style=ParagraphStyle(
-                name='CustomHeading1',
-                parent=getSampleStyleSheet()['Heading1'],
-                fontName=bold_font,
-            )
-        ),
+        Paragraph(text=f"Late Returns - {rental_date.strftime('%B %d, %Y')}", style=report_context.heading1),
         Spacer(1, 0.25 * inch),
     ]
 
     late_returns = rentals_df[rentals_df["return_time"].isna()].copy()
     if late_returns.empty:
-        elements.append(Paragraph(text="There are no late returns.", style=getSampleStyleSheet()["Normal"]))
+        elements.append(Paragraph(text="There are no late returns.", style=report_context.normal))
     else:
         late_returns["phone_number"] = late_returns["phone_number"].astype(str).str.replace(
             r"^tel:", "", regex=True
         )
-        late_returns["items_left_behind"] = late_returns["items_left_behind"].apply(
+        late_returns["items_left_behind"] = late_returns["items_left_behind"].map(
             lambda items: ", ".join(items) if items else ""
         )
-        late_returns["deposit_payment_amount"] = late_returns["deposit_payment_amount"].apply(
+        late_returns["deposit_payment_amount"] = late_returns["deposit_payment_amount"].map(
             lambda amount: f"${amount:.0f}"
         )
         late_returns["signature"] = ""
@@ -307,30 +298,28 @@ def export_late_returns_to_pdf(rentals_df: pd.DataFrame, rental_date: date) -> b
                     device_type=device_type,
                     columns=columns,
                     column_headers=column_headers,
-                    regular_font=regular_font,
-                    bold_font=bold_font,
                 )
 
     # Signature lines for handing off the late returns and deposits to CNE late returns staff
     elements.append(Spacer(1, 0.75 * inch))
-    signature_style = ParagraphStyle(
-        name='Signature',
-        parent=getSampleStyleSheet()['Normal'],
-        fontName=regular_font,
-        fontSize=11,
-    )
     signature_table = Table(
         [[
-            Paragraph("Issued by: " + "_" * 45, signature_style),
-            Paragraph("Received by: " + "_" * 45, signature_style),
+            Paragraph("Issued by: " + "_" * 45, report_context.signature),
+            Paragraph("Received by: " + "_" * 45, report_context.signature),
         ]],
         colWidths=[5 * inch, 5 * inch],
     )
     elements.append(signature_table)
 
     # Build PDF document
-    doc.build(elements)
+    return build_pdf(elements)
 
-    # Return the PDF file as bytes
-    pdf_buffer.seek(0)
-    return pdf_buffer.getvalue()
+
+@st.cache_data(max_entries=PDF_EXPORT_CACHE_MAX_ENTRIES, show_spinner=False,
+               hash_funcs={pd.DataFrame: hash_report_data})
+def get_late_returns_pdf(rentals_df: pd.DataFrame, rental_date: date) -> bytes:
+    """
+    Get the late returns PDF for a date, cached on the rentals themselves so the PDF is only
+    re-rendered once the day's rentals change.
+    """
+    return export_late_returns_to_pdf(rentals_df.copy(), rental_date)
@@ -0,0 +1,233 @@
+import io
+import os
+import queue
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from functools import cache
+from typing import Iterator, List, Sequence, Tuple
+
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from common.constants import DeviceType
+from ui.src.constants import Colour
+from ui.src.display_utils import coerce_pandas_aware_datetime
+
+# PDF exports are rendered by concurrent Streamlit sessions, so the buffers are handed out from a thread-safe
+# pool; buffers beyond this size are dropped on return rather than kept around for the life of the process
+_MAX_POOLED_BUFFERS = 4
+_buffer_pool: "queue.SimpleQueue[io.BytesIO]" = queue.SimpleQueue()
+
+
+@cache
+def load_fonts() -> Tuple[str, str]:
+    """
+    Load custom fonts for the application.
+    The fonts are registered with ReportLab once per process, on the first PDF export.
+    """
+    # Register Roboto fonts
+    roboto_font_path = os.path.join(os.getcwd(), "ui", "assets", "Roboto", "static")
+
+    # Register Roboto Regular and Bold
+    roboto_regular = os.path.join(roboto_font_path, "Roboto-Light.ttf")
+    roboto_bold = os.path.join(roboto_font_path, "Roboto-Medium.ttf")
+
+    if os.path.exists(roboto_regular) and os.path.exists(roboto_bold):
+        pdfmetrics.registerFont(TTFont('Roboto', roboto_regular))
+        pdfmetrics.registerFont(TTFont('Roboto-Bold', roboto_bold))
+
+        # Define font names to use
+        regular_font = 'Roboto'
+        bold_font = 'Roboto-Bold'
+    else:
+        # Fallback to Helvetica if Roboto is not found
+        regular_font = 'Helvetica'
+        bold_font = 'Helvetica-Bold'
+
+    return regular_font, bold_font
+
+
+@dataclass(frozen=True)
+class ReportContext:
+    """Fonts and paragraph styles shared by every PDF export (see get_report_context)"""
+    regular_font: str
+    bold_font: str
+    heading1: ParagraphStyle
+    heading2: ParagraphStyle
+    normal: ParagraphStyle
+    signature: ParagraphStyle
+
+    def table_style(self, left_align_columns: Tuple[int, ...] = (1,)) -> TableStyle:
+        """Get the shared header/stripe table style for the given left-aligned columns"""
+        return _build_table_style(self.regular_font, self.bold_font, left_align_columns)
+
+
+@cache
+def get_report_context() -> ReportContext:
+    """Get the report-rendering context, registering the fonts and building the styles on first use only"""
+    regular_font, bold_font = load_fonts()
+    sample_styles = getSampleStyleSheet()
+    return ReportContext(
+        regular_font=regular_font,
+        bold_font=bold_font,
+        heading1=ParagraphStyle(name='CustomHeading1', parent=sample_styles['Heading1'], fontName=bold_font),
+        heading2=ParagraphStyle(name='CustomHeading2', parent=sample_styles['Heading2'], fontName=bold_font),
+        normal=sample_styles['Normal'],
+        signature=ParagraphStyle(name='Signature', parent=sample_styles['Normal'], fontName=regular_font,
+                                 fontSize=11),
+    )
+
+
+@cache
+def _build_table_style(regular_font: str, bold_font: str, left_align_columns: Tuple[int, ...]) -> TableStyle:
+    """Build a table style once per font/alignment combination (Table.setStyle copies the commands out of it,
+    so a single instance can be shared by every table and session)"""
+    table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), Colour.TABLE_HEADER),  # Header background
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),  # Header text color
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),  # Center all cells
+        ('FONTNAME', (0, 0), (-1, 0), bold_font),  # Bold for header
+        ('FONTSIZE', (0, 0), (-1, 0), 11),  # Header font size
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),  # Header padding
+        # Data rows background, alternating white and light grey
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, Colour.TABLE_ALTERNATE_LIGHT_GREY]),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),  # Data rows text color
+        ('FONTNAME', (0, 1), (-1, -1), regular_font),  # Data rows font
+        ('FONTSIZE', (0, 1), (-1, -1), 10),  # Data rows font size
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),  # Vertically center all text
+        ('WORDWRAP', (0, 0), (-1, -1), True),  # Enable text wrapping for all cells
+    ])
+    for col in left_align_columns:
+        table_style.add('ALIGN', (col, 0), (col, -1), 'LEFT')
+    return table_style
+
+
+def build_styled_table(
+        table_data: list,
+        col_widths: list,
+        left_align_columns: Tuple[int, ...] = (1,),
+) -> Table:
+    """
+    Build a Table flowable with the header/stripe styling shared by the PDF exports in this app:
+    a bold header row, centered cells (except the given left-aligned columns), and alternating
+    row backgrounds.
+    """
+    table = Table(table_data, repeatRows=1, colWidths=col_widths)
+    table.setStyle(get_report_context().table_style(left_align_columns=tuple(left_align_columns)))
+    return table
+
+
+def format_table_rows(data: pd.DataFrame) -> List[List[str]]:
+    """
+    Format a DataFrame's rows as table cell strings in one vectorised pass, leaving cells empty for missing
+    values instead of showing "None"/"nan" (pandas can upcast a None in an object-dtype column to NaN)
+    """
+    data = data.astype(object)
+    return data.where(data.notna(), "").map(str).to_numpy().tolist()
+
+
+def build_table_data(headers: Sequence[str], data: pd.DataFrame) -> List[List[str]]:
+    """Build the rows of a table flowable: the header row followed by the formatted data rows"""
+    return [list(headers), *format_table_rows(data)]
+
+
+@contextmanager
+def _borrow_buffer() -> Iterator[io.BytesIO]:
+    """Borrow an empty in-memory buffer from the pool, returning it (emptied) to the pool afterwards"""
+    try:
+        buffer = _buffer_pool.get_nowait()
+    except queue.Empty:
+        buffer = io.BytesIO()
+    try:
+        yield buffer
+    finally:
+        buffer.seek(0)
+        buffer.truncate(0)
+        if _buffer_pool.qsize() < _MAX_POOLED_BUFFERS:
+            _buffer_pool.put(buffer)
+
+
+def build_pdf(elements: list) -> bytes:
+    """
+    Build a landscape letter PDF from the given flowables.
+
+    Returns:
+        PDF file as bytes that can be used for download
+    """
+    with _borrow_buffer() as pdf_buffer:
+        doc = SimpleDocTemplate(
+            pdf_buffer,
+            pagesize=landscape(letter),
+            topMargin=0.5 * inch,
+            bottomMargin=0.5 * inch,
+            leftMargin=0.5 * inch,
+            rightMargin=0.5 * inch,
+        )
+        doc.build(elements)
+        return pdf_buffer.getvalue()
+
+
+def build_reservations_pdf(reservations_df: pd.DataFrame, report_date: date) -> bytes:
+    """
+    Build the reservations PDF for a date, with one page per device type (see
+    reservation_utils.export_reservations_to_pdf).
+
+    Returns:
+        PDF file as bytes that can be used for download
+    """
+    report_context = get_report_context()
+
+    elements = []
+    reservations_df["reservation_time"] = coerce_pandas_aware_datetime(reservations_df["reservation_time"])
+    reservations_df["reservation_time"] = reservations_df["reservation_time"].dt.strftime("%I:%M %p")
+    reservations_df["phone_number"] = reservations_df["phone_number"].str.lstrip("tel:")
+    for _, device_type in enumerate(reservations_df['device_type'].unique()):
+        # pandas 3.0 stores the column as plain strings; restore the enum for .value / label access
+        device_type = DeviceType(device_type)
+        # Filter the reservations for this device type
+        device_reservations = reservations_df[reservations_df['device_type'] == device_type][
+            ["id", "name", "phone_number", "reservation_time", "location", "status", "notes"]
+        ]
+        device_reservations = device_reservations.rename(columns={"reservation_time": "time"})
+        device_reservations[DeviceType.get_short_label(device_type)] = None
+
+        # wrap text
+        device_reservations["name"] = device_reservations["name"].str.wrap(20, break_long_words=False)
+        device_reservations["notes"] = device_reservations["notes"].str.wrap(20, break_long_words=False)
+
+        # Add device type title to document
+        elements.append(
+            Paragraph(
+                text=f"{device_type.value.capitalize()} Reservations - {report_date.strftime('%B %d, %Y')}",
+                style=report_context.heading1,
+            )
+        )
+        elements.append(Spacer(1, 0.25 * inch))
+
+        # Prepare table data
+        table_data = build_table_data(
+            headers=[col.replace('_', ' ').title().replace("Id", "ID") for col in device_reservations.columns],
+            data=device_reservations,
+        )
+
+        # Create table
+        table = build_styled_table(
+            table_data,
+            col_widths=[x * inch for x in (0.8, 1.75, 1.5, 0.95, 0.95, 1.75, 1.75, 0.8)],
+            left_align_columns=(1, 6),  # Name, Notes
+        )
+        elements.append(table)
+        elements.append(PageBreak())
+
+    # Remove the last PageBreak to avoid an empty page
+    elements = elements[:-1] if elements else []
+
+    # Build PDF document
+    return build_pdf(elements)
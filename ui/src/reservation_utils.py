@@ -1,6 +1,4 @@
-import io
 import itertools
-import os
 from datetime import datetime, timedelta
 from typing import Union
 
@@ -8,24 +6,21 @@ import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 
 from common.constants import ReservationStatus, DeviceType, Location
 from common.data_models.reservation import Reservation, NewReservation
+from common.tracing import traced
 from common.utils import get_default_timezone
 from common.cne_dates import CNEDates
 from ui.forms.new_reservation_form import NewReservationForm
 from ui.forms.reservation_form import ReservationForm
 from ui.src.constants import Colour
 from ui.src.data_service import DataService
-from ui.src.display_utils import coerce_pandas_aware_datetime
-from ui.src.utils import process_validation_errors
+from ui.src.utils import PDF_EXPORT_CACHE_MAX_ENTRIES, hash_report_data, process_validation_errors
+
+# pylint: disable=import-outside-toplevel
+# ReportLab (via ui.src.report_utils) is only imported once a PDF is rendered, so the pages that import this module
+# start without it
 
 
 def on_dismiss_success_dialog():
@@ -200,72 +195,7 @@ def create_reservation_availability_chart(
     st.plotly_chart(fig, key=f"availability_chart_{device_type.value.lower()}", config={'displayModeBar': False})
 
 
-def load_fonts():
-    """
-    Load custom fonts for the application.
-    This function is called to ensure that the fonts are available for use in PDF generation.
-    """
-    # Register Roboto fonts
-    roboto_font_path = os.path.join(os.getcwd(), "ui", "assets", "Roboto", "static")
-
-    # Register Roboto Regular and Bold
-    roboto_regular = os.path.join(roboto_font_path, "Roboto-Light.ttf")
-    roboto_bold = os.path.join(roboto_font_path, "Roboto-Medium.ttf")
-
-    if os.path.exists(roboto_regular) and os.path.exists(roboto_bold):
-        pdfmetrics.registerFont(TTFont('Roboto', roboto_regular))
-        pdfmetrics.registerFont(TTFont('Roboto-Bold', roboto_bold))
-
-        # Define font names to use
-        regular_font = 'Roboto'
-        bold_font = 'Roboto-Bold'
-    else:
-        # Fallback to Helvetica if Roboto is not found
-        regular_font = 'Helvetica'
-        bold_font = 'Helvetica-Bold'
-
-    return regular_font, bold_font
-
-
-def build_styled_table(
-        table_data: list,
-        col_widths: list,
-        regular_font: str,
-        bold_font: str,
-        left_align_columns: tuple = (1,),
-) -> Table:
-    """
-    Build a Table flowable with the header/stripe styling shared by the PDF exports in this app:
-    a bold header row, centered cells (except the given left-aligned columns), and alternating
-    row backgrounds.
-    """
-    table = Table(table_data, repeatRows=1, colWidths=col_widths)
-    table_style = TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), Colour.TABLE_HEADER),  # Header background
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),  # Header text color
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),  # Center all cells
-        ('FONTNAME', (0, 0), (-1, 0), bold_font),  # Bold for header
-        ('FONTSIZE', (0, 0), (-1, 0), 11),  # Header font size
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),  # Header padding
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),  # Data rows background
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),  # Data rows text color
-        ('FONTNAME', (0, 1), (-1, -1), regular_font),  # Data rows font
-        ('FONTSIZE', (0, 1), (-1, -1), 10),  # Data rows font size
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),  # Vertically center all text
-        ('WORDWRAP', (0, 0), (-1, -1), True),  # Enable text wrapping for all cells
-    ])
-    for col in left_align_columns:
-        table_style.add('ALIGN', (col, 0), (col, -1), 'LEFT')
-
-    # Add alternating row colors
-    for i in range(1, len(table_data)):
-        if i % 2 == 0:
-            table_style.add('BACKGROUND', (0, i), (-1, i), Colour.TABLE_ALTERNATE_LIGHT_GREY)
-
-    table.setStyle(table_style)
-    return table
-
-
+@traced()
 def export_reservations_to_pdf(reservations_df: pd.DataFrame, date: datetime.date) -> bytes:
     """
     Export reservations to a PDF file with one page per device type.
@@ -277,77 +207,16 @@ def export_reservations_to_pdf(reservations_df: pd.DataFrame, date: datetime.dat
     Returns:
         PDF file as bytes that can be used for download
     """
+    from ui.src.report_utils import build_reservations_pdf
 
-    regular_font, bold_font = load_fonts()
+    return build_reservations_pdf(reservations_df=reservations_df, report_date=date)
 
-    # Use BytesIO to create in-memory PDF file
-    pdf_buffer = io.BytesIO()
 
-    # Create PDF document
-    doc = SimpleDocTemplate(
-        pdf_buffer,
-        pagesize=landscape(letter),
-        topMargin=0.5 * inch,
-        bottomMargin=0.5 * inch,
-        leftMargin=0.5 * inch,
-        rightMargin=0.5 * inch
-    )
-
-    elements = []
-    reservations_df["reservation_time"] = coerce_pandas_aware_datetime(reservations_df["reservation_time"])
-    reservations_df["reservation_time"] = reservations_df["reservation_time"].dt.strftime("%I:%M %p")
-    reservations_df["phone_number"] = reservations_df["phone_number"].str.lstrip("tel:")
-    for _, device_type in enumerate(reservations_df['device_type'].unique()):
-        # pandas 3.0 stores the column as plain strings; restore the enum for .value / label access
-        device_type = DeviceType(device_type)
-        # Filter the reservations for this device type
-        device_reservations = reservations_df[reservations_df['device_type'] == device_type][
-            ["id", "name", "phone_number", "reservation_time", "location", "status", "notes"]
-        ]
-        device_reservations = device_reservations.rename(columns={"reservation_time": "time"})
-        device_reservations[DeviceType.get_short_label(device_type)] = None
-
-        # wrap text
-        device_reservations["name"] = device_reservations["name"].str.wrap(20, break_long_words=False)
-        device_reservations["notes"] = device_reservations["notes"].str.wrap(20, break_long_words=False)
-
-        # Add device type title to document
-        elements.append(
-            Paragraph(
-                text=f"{device_type.value.capitalize()} Reservations - {date.strftime('%B %d, %Y')}",
-                style=ParagraphStyle(
-                    name='CustomHeading1',
-                    parent=getSampleStyleSheet()['Heading1'],
-                    fontName=bold_font,
-                )
-            )
-        )
-        elements.append(Spacer(1, 0.25 * inch))
-
-        # Prepare table data
-        table_data = [[col.replace('_', ' ').title().replace("Id", "ID") for col in device_reservations.columns]]
-        for _, row in device_reservations.iterrows():
-            # Leave cells empty for missing values instead of showing "None"/"nan" (pandas can upcast a
-            # None from an object-dtype column to NaN when mixed with the other string-dtype columns here)
-            table_data.append(['' if pd.isna(item) else str(item) for item in row.tolist()])
-
-        # Create table
-        table = build_styled_table(
-            table_data,
-            col_widths=[x * inch for x in (0.8, 1.75, 1.5, 0.95, 0.95, 1.75, 1.75, 0.8)],
-            regular_font=regular_font,
-            bold_font=bold_font,
-            left_align_columns=(1, 6),  # Name, Notes
-        )
-        elements.append(table)
-        elements.append(PageBreak())
-
-    # Remove the last PageBreak to avoid an empty page
-    elements = elements[:-1] if elements else []
-
-    # Build PDF document
-    doc.build(elements)
-
-    # Return the PDF file as bytes
-    pdf_buffer.seek(0)
-    return pdf_buffer.getvalue()
+@st.cache_data(max_entries=PDF_EXPORT_CACHE_MAX_ENTRIES, show_spinner=False,
+               hash_funcs={pd.DataFrame: hash_report_data})
+def get_reservations_pdf(reservations_df: pd.DataFrame, date: datetime.date) -> bytes:
+    """
+    Get the reservations PDF for a date, cached on the reservations themselves so the PDF is only
+    re-rendered once the day's reservations change.
+    """
+    return export_reservations_to_pdf(reservations_df=reservations_df.copy(), date=date)
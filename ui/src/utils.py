@@ -11,6 +11,9 @@ from common.utils import get_default_timezone
 from common.cne_dates import CNEDates
 from ui.src.data_service import DataService
 
+# each cached PDF is one date's export, so only a handful of dates need to stay cached at a time
+PDF_EXPORT_CACHE_MAX_ENTRIES = 8
+
 
 def clean_dataframe_record(row: pd.DataFrame) -> dict:
     """Extract a single-row DataFrame as a dict, converting pandas NA values to None.
@@ -135,3 +138,14 @@ def process_validation_errors(error_key: str):
         return wrapper
 
     return inner
+
+
+def hash_report_data(data: pd.DataFrame) -> bytes:
+    """
+    Hash a DataFrame on its contents for caching rendered reports (Streamlit's default DataFrame hash falls back to
+    pickling when cells hold lists, which is not stable across equal copies of the same data)
+    """
+    return b"".join((
+        "\x1f".join(map(str, data.columns)).encode(),
+        pd.util.hash_pandas_object(data.astype(str), index=True).to_numpy().tobytes(),
+    ))
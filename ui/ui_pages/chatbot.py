@@ -1,9 +1,10 @@
 import streamlit as st
 
+from common.data_models import ChatStreamEventType
 from ui.src.auth_utils import initialize_page
 from ui.src.data_service import DataService
 
-initialize_page(page_header="Chatbot")
+authenticator = initialize_page(page_header="Chatbot")
 data_service = DataService()
 
 st.caption(
@@ -26,6 +27,46 @@ def clear_chat():
     st.session_state["chat_token_usage"] = dict(EMPTY_TOKEN_USAGE)
 
 
+def answer_question(question: str):
+    """Stream the chatbot's answer to the question, then record it (and its token usage) in the conversation."""
+    # pass the prior history (excluding the just-added user message) for context - only role/content
+    # are sent, since ChatMessage forbids the extra "model" key stored on assistant messages
+    history = [
+        {"role": message["role"], "content": message["content"]}
+        for message in st.session_state["chat_messages"][:-1]
+    ]
+    progress = st.empty()
+    progress.caption("Thinking...")
+    chat_events = data_service.chat_stream(message=question, history=history, user=authenticator.get_current_user())
+    # the complete response (with the token usage) only arrives with the last event of the stream
+    streamed = {"response": None}
+
+    def stream_answer():
+        """Yield the answer's text as it is streamed, showing which data is being looked up in the meantime."""
+        for event in chat_events:
+            if event.type == ChatStreamEventType.TOKEN:
+                progress.empty()
+                yield event.text
+            elif event.type == ChatStreamEventType.TOOL_CALL:
+                progress.caption(f"Looking up `{event.text}`...")
+            elif event.type == ChatStreamEventType.DONE:
+                streamed["response"] = event.response
+            elif event.type == ChatStreamEventType.ERROR:
+                progress.error(f"**Chatbot Error**: {event.text}")
+
+    st.write_stream(stream_answer())
+    chat_response = streamed["response"]
+    if chat_response is not None:
+        st.caption(f"Model: {chat_response.model}")
+        st.session_state["chat_messages"].append({
+            "role": "assistant", "content": chat_response.answer, "model": chat_response.model
+        })
+        for field in EMPTY_TOKEN_USAGE:
+            st.session_state["chat_token_usage"][field] += getattr(chat_response, field)
+        # rerun so the clear chat button and token caption below pick up the new state
+        st.rerun()
+
+
 # render the prior conversation
 for message in st.session_state["chat_messages"]:
     with st.chat_message(message["role"]):
@@ -40,24 +81,7 @@ if prompt := st.chat_input("Ask a question..."):
         st.markdown(prompt)
 
     with st.chat_message("assistant"):
-        with st.spinner("Thinking..."):
-            # pass the prior history (excluding the just-added user message) for context - only role/content
-            # are sent, since ChatMessage forbids the extra "model" key stored on assistant messages
-            history = [
-                {"role": message["role"], "content": message["content"]}
-                for message in st.session_state["chat_messages"][:-1]
-            ]
-            chat_response = data_service.chat(message=prompt, history=history)
-        if chat_response is not None:
-            st.markdown(chat_response.answer)
-            st.caption(f"Model: {chat_response.model}")
-            st.session_state["chat_messages"].append({
-                "role": "assistant", "content": chat_response.answer, "model": chat_response.model
-            })
-            for field in EMPTY_TOKEN_USAGE:
-                st.session_state["chat_token_usage"][field] += getattr(chat_response, field)
-            # rerun so the clear chat button and token caption below pick up the new state
-            st.rerun()
+        answer_question(prompt)
 
 tokens_col, clear_col = st.columns([3, 1], vertical_alignment="bottom")
 usage = st.session_state["chat_token_usage"]
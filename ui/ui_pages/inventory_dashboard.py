@@ -5,9 +5,9 @@ from common.cne_dates import CNEDates
 from ui.src.auth_utils import initialize_page
 from ui.src.data_service import DataService
 from ui.src.device_utils import (
-    create_dashboard_inventory_chart,
-    create_dashboard_legend_chart,
     get_dashboard_chart_column_weight,
+    get_dashboard_inventory_chart,
+    get_dashboard_legend_chart,
 )
 from ui.src.display_utils import display_dual_indicator_rental_chart, display_dual_indicator_reservation_chart
 
@@ -79,7 +79,7 @@ def _render_inventory_charts(scooter_inventory, wheelchair_inventory):
                 if inventory.empty:
                     st.caption(f"No {device_type}s in inventory")
                     continue
-                chart = create_dashboard_inventory_chart(inventory)
+                chart = get_dashboard_inventory_chart(inventory)
                 st.plotly_chart(chart, config={'displayModeBar': False})
 
 
@@ -107,7 +107,7 @@ def _render_dashboard():
     _render_gauge_cards(reservations, rentals)
     _render_inventory_charts(*full_inventory)
     with st.container(border=True):
-        st.plotly_chart(create_dashboard_legend_chart(), config={'displayModeBar': False})
+        st.plotly_chart(get_dashboard_legend_chart(), config={'displayModeBar': False})
 
 
 _render_dashboard()
@@ -0,0 +1,96 @@
+"""Warm start for the Streamlit UI.
+
+Streamlit runs each page as a script, so the modules a page imports (and the process-wide caches they fill) are only
+loaded by the first session that opens it - which leaves the first staff member to log in after a deploy waiting on
+imports and font loading. Starting the server through this module warms the process up in the background instead,
+once Streamlit's runtime is up (so the pages' ``st.cache_data`` caches are created against the runtime's storage):
+
+    python -m ui.warmup ui/main.py --server.address 0.0.0.0 --server.port 8095
+
+The arguments are passed on to ``streamlit run`` as they are.
+"""
+import importlib
+import logging
+import sys
+import threading
+import time
+
+import pycountry
+from streamlit import runtime
+from streamlit.web import cli as stcli
+
+from common.logger import initialize_logger
+
+logger = initialize_logger()
+
+# the modules the pages import, along with the ones the PDF exports only import once a PDF is rendered
+WARM_UP_MODULES = (
+    "ui.forms",
+    "ui.src.data_service",
+    "ui.src.device_utils",
+    "ui.src.display_utils",
+    "ui.src.rental_utils",
+    "ui.src.report_utils",
+    "ui.src.reservation_utils",
+    "ui.pdf_forms.scooter_pdf_form",
+    "ui.pdf_forms.wheelchair_pdf_form",
+)
+# Streamlit warns about every st.dialog/st.cache_data decorator run outside a session, as the warm-up's are
+SCRIPT_RUN_CONTEXT_LOGGER = "streamlit.runtime.scriptrunner_utils.script_run_context"
+RUNTIME_POLL_INTERVAL_SECONDS = 0.1
+RUNTIME_WAIT_TIMEOUT_SECONDS = 60
+
+
+def warm_up() -> float:
+    """Import the UI's modules and build its process-wide caches, returning how long it took (in seconds)"""
+    # pylint: disable=import-outside-toplevel
+    start = time.perf_counter()
+    for module in WARM_UP_MODULES:
+        importlib.import_module(module)
+
+    from ui.src.auth_utils import get_authenticator_class
+    from ui.src.device_utils import get_dashboard_legend_chart
+    from ui.src.report_utils import get_report_context
+
+    get_authenticator_class()
+    # registers the fonts with ReportLab and builds the shared table style
+    get_report_context().table_style()
+    get_dashboard_legend_chart()
+    # pycountry only loads its databases on first use, i.e. when the new rental form lists the countries
+    pycountry.countries.lookup("Canada")
+    pycountry.subdivisions.get(country_code="CA")
+
+    duration = time.perf_counter() - start
+    logger.info("Warmed up the UI in %.2f seconds", duration)
+    return duration
+
+
+def _warm_up_once_runtime_exists() -> None:
+    deadline = time.monotonic() + RUNTIME_WAIT_TIMEOUT_SECONDS
+    while not runtime.exists():
+        if time.monotonic() > deadline:
+            logger.warning("Streamlit's runtime didn't start within %s seconds, skipping warm-up",
+                           RUNTIME_WAIT_TIMEOUT_SECONDS)
+            return
+        time.sleep(RUNTIME_POLL_INTERVAL_SECONDS)
+    script_run_context_logger = logging.getLogger(SCRIPT_RUN_CONTEXT_LOGGER)
+    level = script_run_context_logger.level
+    script_run_context_logger.setLevel(logging.ERROR)
+    try:
+        warm_up()
+    except Exception:  # pylint: disable=broad-exception-caught
+        # the pages import everything themselves anyway, so a failed warm-up only costs the first session its speed
+        logger.exception("Unable to warm up the UI")
+    finally:
+        script_run_context_logger.setLevel(level)
+
+
+def main() -> None:
+    """Start warming up in the background, then run the Streamlit server with the given arguments"""
+    threading.Thread(target=_warm_up_once_runtime_exists, name="ui-warm-up", daemon=True).start()
+    sys.argv = ["streamlit", "run", *sys.argv[1:]]
+    sys.exit(stcli.main())  # pylint: disable=no-value-for-parameter
+
+
+if __name__ == "__main__":
+    main()